@@ -0,0 +1,53 @@
+"""
+Allocation hot path: one select per tracker request
+
+`select` benches the allocators ExperimentService._adaptive_selection
+uses; `select_variant` the ones returned by _get_allocator.
+"""
+
+import pytest
+
+from engine.core import _get_allocator
+from engine.core.allocators._bayesian import AdaptiveBayesianAllocator
+from engine.core.allocators._contextual import ContextualAllocator
+from engine.core.allocators._explore import EpsilonGreedyAllocator
+from engine.core.allocators._hybrid import HybridAllocator
+from engine.core.allocators._revenue import RevenueAllocator
+from engine.core.allocators._ucb import KLUCBAllocator, UCB1Allocator
+
+from conftest import make_variants
+
+ARMS = (2, 10, 100)
+
+TRACKER_ALLOCATORS = {
+    'adaptive': AdaptiveBayesianAllocator,
+    'revenue': RevenueAllocator,
+    'contextual': ContextualAllocator,
+    'ucb1': UCB1Allocator,
+    'kl_ucb': KLUCBAllocator,
+    'epsilon_greedy': EpsilonGreedyAllocator,
+    'hybrid': HybridAllocator,
+}
+
+
+@pytest.mark.parametrize('n_arms', ARMS)
+@pytest.mark.parametrize('strategy', list(TRACKER_ALLOCATORS))
+def bench_select(benchmark, run, strategy, n_arms):
+    allocator = TRACKER_ALLOCATORS[strategy]({})
+    variants = make_variants(n_arms)
+    context = {'device': 'mobile', 'country': 'ES', 'source': 'google'}
+
+    chosen = benchmark(lambda: run(allocator.select(variants, context)))
+
+    assert chosen in {v['id'] for v in variants}
+
+
+@pytest.mark.parametrize('n_arms', ARMS)
+@pytest.mark.parametrize('strategy', ['standard', 'adaptive', 'fast_learning'])
+def bench_select_variant(benchmark, strategy, n_arms):
+    allocator = _get_allocator(strategy, {})
+    variants = make_variants(n_arms)
+
+    index = benchmark(allocator.select_variant, variants)
+
+    assert 0 <= index < n_arms
@@ -0,0 +1,50 @@
+"""
+Analytics hot path: P(best) Monte Carlo and the experiment analysis behind
+the results/dashboard endpoints (uncached, as on a counter change)
+"""
+
+import numpy as np
+import pytest
+
+from engine.core.math._distributions import calculate_probability_best
+from orchestration.services.analytics_cache import AnalyticsCache
+from orchestration.services.analytics_service import AnalyticsService
+from orchestration.services.batch_analytics import RaggedCounts, analyze_counts
+
+from conftest import make_variants
+
+ARMS = (2, 10, 100)
+
+
+@pytest.mark.parametrize('n_arms', ARMS)
+def bench_probability_best(benchmark, n_arms):
+    options = [
+        {'successes': v['total_conversions'], 'failures': v['total_allocations'] - v['total_conversions']}
+        for v in make_variants(n_arms)
+    ]
+
+    probabilities = benchmark(calculate_probability_best, options, 10000)
+
+    assert sum(probabilities.values()) == pytest.approx(1.0, abs=1e-6)
+
+
+@pytest.mark.parametrize('n_arms', ARMS)
+def bench_analyze_experiment(benchmark, run, n_arms):
+    service = AnalyticsService(cache=AnalyticsCache(), batch_workers=0)
+    variants = make_variants(n_arms)
+
+    result = benchmark(lambda: run(service._analyze_experiment('bench', variants)))
+
+    assert result['variant_count'] == n_arms
+
+
+@pytest.mark.parametrize('experiments', (10, 200))
+def bench_analyze_counts_batch(benchmark, experiments):
+    """Dashboard-sized batch: many 2-10 arm experiments in one pass"""
+    rng = np.random.default_rng(0)
+    groups = [make_variants(int(k)) for k in rng.integers(2, 11, size=experiments)]
+    counts = RaggedCounts.from_groups(groups)
+
+    result = benchmark(analyze_counts, counts, 5000, rng=rng)
+
+    assert len(result.prob_best) == len(counts.allocations)
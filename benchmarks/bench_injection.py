@@ -0,0 +1,29 @@
+"""
+Proxy tracker injection on pages from 10KB to 5MB
+"""
+
+import pytest
+
+from integration.proxy.proxy_middleware import ProxyMiddleware
+
+SIZES = {'10KB': 10 * 1024, '1MB': 1024 * 1024, '5MB': 5 * 1024 * 1024}
+
+
+def _page(size: int) -> str:
+    block = '<div class="product"><h2>Item</h2><p>Lorem ipsum dolor sit amet.</p></div>\n'
+    body = block * (size // len(block) + 1)
+    return f'<!DOCTYPE html><html><head><title>Shop</title></head><body>{body}</body></html>'
+
+
+@pytest.fixture(scope='module')
+def proxy():
+    return ProxyMiddleware('http://localhost:8000')
+
+
+@pytest.mark.parametrize('size', list(SIZES))
+def bench_inject_tracker(benchmark, proxy, size):
+    html = _page(SIZES[size])
+
+    injected = benchmark(proxy.inject_tracker_fast, html, 'bench-token')
+
+    assert len(injected) > len(html)
@@ -0,0 +1,83 @@
+"""
+Per-request security overhead: algorithm state encryption, audit hash
+chain and the public API rate limiter
+"""
+
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from starlette.requests import Request
+
+from engine.state.encryption import StateEncryption
+from orchestration.services.audit_service import AuditService
+from public_api.middleware.rate_limit import RateLimiter
+
+from conftest import make_variants
+
+
+def _state():
+    return {v['id']: v['_internal_state'] for v in make_variants(10)}
+
+
+def bench_encrypt_state(benchmark):
+    encryption = StateEncryption()
+
+    token = benchmark(encryption.encrypt_state, _state())
+
+    assert isinstance(token, bytes)
+
+
+def bench_decrypt_state(benchmark):
+    encryption = StateEncryption()
+    state = _state()
+    token = encryption.encrypt_state(state)
+
+    assert benchmark(encryption.decrypt_state, token) == state
+
+
+def bench_audit_decision_hash(benchmark):
+    """Hashing done for every logged decision (chain link + context hash)"""
+    audit = AuditService(db_manager=None)
+    variant_id = uuid.uuid4()
+    context = {'device': 'mobile', 'user_agent': 'Mozilla/5.0 (bench)', 'url': '/pricing'}
+
+    def hash_decision():
+        audit._hash_dict(context)
+        return audit._calculate_decision_hash(
+            visitor_id='visitor-1',
+            variant_id=variant_id,
+            segment_key='default',
+            timestamp=datetime.now(timezone.utc),
+            previous_hash='0' * 64,
+            sequence_number=1000
+        )
+
+    assert len(benchmark(hash_decision)) == 64
+
+
+def _request(client_ip: str) -> Request:
+    return Request({
+        'type': 'http',
+        'method': 'POST',
+        'path': '/api/v1/tracker/assign',
+        'headers': [(b'x-forwarded-for', client_ip.encode())],
+        'client': (client_ip, 40000),
+    })
+
+
+@pytest.mark.parametrize('clients', (100, 10000))
+def bench_rate_limit(benchmark, run, clients):
+    """Round-robin over `clients` distinct IPs, each well under its limit"""
+    limiter = RateLimiter(requests_per_minute=10**9, burst_limit=10**9)
+    requests = [_request(f'10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}') for i in range(clients)]
+    position = [0]
+
+    def check():
+        request = requests[position[0] % clients]
+        position[0] += 1
+        return run(limiter.check_rate_limit(request))
+
+    allowed, _ = benchmark(check)
+
+    assert allowed
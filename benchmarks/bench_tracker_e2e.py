@@ -0,0 +1,141 @@
+"""
+End-to-end POST /api/v1/tracker/assign against a real Postgres
+
+Every round is a new visitor (new assignment + counter update), so this
+measures the full tracker path: token check, variant state, allocation,
+insert. Also the audit trail append (chain head lookup + insert).
+Needs BENCH_DATABASE_URL or testcontainers (see conftest.pg_dsn).
+"""
+
+import itertools
+import json
+import secrets
+import uuid
+
+import pytest
+
+pytestmark = pytest.mark.database
+
+N_VARIANTS = 3
+
+
+async def _seed(db) -> dict:
+    """One user, active installation and an active 1-element experiment"""
+    token = secrets.token_hex(16)
+    async with db.acquire() as conn:
+        user_id = await conn.fetchval(
+            "INSERT INTO users (email, password_hash, name) VALUES ($1, 'x', 'Bench') RETURNING id",
+            f'bench-{token}@example.com'
+        )
+        await conn.execute(
+            """
+            INSERT INTO platform_installations
+                (user_id, platform, installation_method, site_url,
+                 installation_token, api_token, status)
+            VALUES ($1, 'manual', 'manual', 'https://bench.example.com', $2, $3, 'active')
+            """,
+            user_id, token, f'api-{token}'
+        )
+        experiment_id = await conn.fetchval(
+            """
+            INSERT INTO experiments (user_id, name, status, optimization_strategy)
+            VALUES ($1, 'Bench', 'active', 'adaptive') RETURNING id
+            """,
+            user_id
+        )
+        element_id = await conn.fetchval(
+            """
+            INSERT INTO experiment_elements
+                (experiment_id, name, selector_type, selector_value, element_type, original_content)
+            VALUES ($1, 'Headline', 'css', 'h1', 'text', $2) RETURNING id
+            """,
+            experiment_id, json.dumps({'text': 'Original'})
+        )
+        for i in range(N_VARIANTS):
+            await conn.execute(
+                """
+                INSERT INTO element_variants (element_id, variant_order, name, content)
+                VALUES ($1, $2, $3, $4)
+                """,
+                element_id, i, f'Variant {i}', json.dumps({'text': f'Headline {i}'})
+            )
+    return {'installation_token': token, 'experiment_id': str(experiment_id)}
+
+
+@pytest.fixture(scope='module')
+def tracker(pg_dsn, run):
+    """(AsyncClient on the app with the database dependency pointed at pg_dsn, seed)"""
+    import httpx
+
+    from data_access.database import DatabaseManager
+    from main import app
+    from public_api.dependencies import check_rate_limit, get_db
+
+    db = DatabaseManager()
+    db.database_url = pg_dsn
+    run(db.initialize())
+    seed = run(_seed(db))
+
+    async def bench_db():
+        return db
+
+    async def no_rate_limit():
+        return None
+
+    app.dependency_overrides[get_db] = bench_db
+    app.dependency_overrides[check_rate_limit] = no_rate_limit
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://bench')
+    try:
+        yield client, seed, db
+    finally:
+        run(client.aclose())
+        app.dependency_overrides.clear()
+        run(db.close())
+
+
+def bench_assign_new_visitor(benchmark, run, tracker):
+    client, seed, _ = tracker
+    visitors = itertools.count()
+
+    def assign():
+        return run(client.post('/api/v1/tracker/assign', json={
+            **seed,
+            'user_identifier': f'visitor-{next(visitors)}',
+            'session_id': 'bench',
+            'context': {'device': 'desktop'},
+        }))
+
+    response = benchmark.pedantic(assign, rounds=500, warmup_rounds=20)
+
+    assert response.status_code == 200, response.text
+
+
+def bench_assign_returning_visitor(benchmark, run, tracker):
+    client, seed, _ = tracker
+    payload = {**seed, 'user_identifier': 'returning-visitor', 'session_id': 'bench'}
+    run(client.post('/api/v1/tracker/assign', json=payload))
+
+    response = benchmark(lambda: run(client.post('/api/v1/tracker/assign', json=payload)))
+
+    assert response.status_code == 200, response.text
+
+
+def bench_audit_log_decision(benchmark, run, tracker):
+    from orchestration.services.audit_service import AuditService
+
+    _, seed, db = tracker
+    audit = AuditService(db)
+    experiment_id = uuid.UUID(seed['experiment_id'])
+    variant_id = uuid.uuid4()
+    visitors = itertools.count()
+
+    def log():
+        return run(audit.log_decision(
+            experiment_id=experiment_id,
+            visitor_id=f'audit-{next(visitors)}',
+            selected_variant_id=variant_id,
+            assignment_id=None,
+            context={'device': 'desktop', 'user_agent': 'Mozilla/5.0 (bench)'}
+        ))
+
+    assert benchmark.pedantic(log, rounds=500, warmup_rounds=20) is not None
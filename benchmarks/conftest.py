@@ -0,0 +1,105 @@
+"""
+Shared fixtures for the benchmark suite
+
+Baselines are stored by pytest-benchmark under benchmarks/.baselines
+(one folder per machine). Typical use:
+
+    python -m pytest -c benchmarks/pytest.ini benchmarks --benchmark-save=baseline
+    python -m pytest -c benchmarks/pytest.ini benchmarks \\
+        --benchmark-compare=0001 --benchmark-compare-fail=median:20%
+"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+SCHEMA_DIR = project_root / 'database' / 'schema'
+# Tables the tracker hot path touches, in dependency order
+SCHEMA_FILES = (
+    'schema_phase1_PRODUCTION_READY.sql',
+    'schema_audit.sql',
+    'schema_rollups.sql',
+    'schema_revenue.sql',
+)
+
+
+@pytest.fixture(scope='session')
+def run():
+    """Run a coroutine to completion on a loop shared by the session"""
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+
+def make_variants(n_arms: int, visitors: int = 5000):
+    """Variant dicts with counters and the states every allocator reads"""
+    variants = []
+    for i in range(n_arms):
+        conversions = int(visitors * (0.03 + 0.002 * (i % 20)))
+        variants.append({
+            'id': f'variant-{i}',
+            'name': f'Variant {i}',
+            'is_control': i == 0,
+            'total_allocations': visitors,
+            'total_conversions': conversions,
+            'algorithm_state': {'alpha': conversions + 1.0, 'beta': visitors - conversions + 1.0, 'samples': visitors},
+            '_internal_state': {
+                'success_count': conversions,
+                'failure_count': visitors - conversions,
+                'samples': visitors,
+                'visitors': visitors,
+                'conversions': conversions,
+                'valued_conversions': conversions,
+                'sum_log_value': conversions * 3.5,
+                'sum_log_value_sq': conversions * 12.5,
+            },
+        })
+    return variants
+
+
+@pytest.fixture(scope='session')
+def pg_dsn():
+    """
+    DSN of a throwaway Postgres with the schema loaded
+
+    BENCH_DATABASE_URL (an empty database you own) or, failing that, a
+    testcontainers Postgres. Skips when neither is available.
+    """
+    dsn = os.getenv('BENCH_DATABASE_URL')
+    container = None
+
+    if not dsn:
+        try:
+            from testcontainers.postgres import PostgresContainer
+        except ImportError:
+            pytest.skip("Set BENCH_DATABASE_URL or install testcontainers[postgres]")
+        try:
+            container = PostgresContainer('postgres:15-alpine', driver=None)
+            container.start()
+        except Exception as e:
+            pytest.skip(f"Could not start Postgres container: {e}")
+        dsn = container.get_connection_url()
+
+    async def load_schema():
+        import asyncpg
+        conn = await asyncpg.connect(dsn)
+        try:
+            await conn.execute('CREATE EXTENSION IF NOT EXISTS "uuid-ossp"')
+            for name in SCHEMA_FILES:
+                await conn.execute((SCHEMA_DIR / name).read_text())
+        finally:
+            await conn.close()
+
+    try:
+        asyncio.run(load_schema())
+        yield dsn
+    finally:
+        if container is not None:
+            container.stop()
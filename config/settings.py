@@ -83,6 +83,326 @@ class Settings(BaseSettings):
         env="DATABASE_URL"
     )
     
+    # Pools por workload (tracker / api / batch)
+    DB_POOL_PARTITIONED: bool = Field(
+        default=True,
+        env="DB_POOL_PARTITIONED"
+    )
+    
+    DB_POOL_TRACKER_MIN_SIZE: int = Field(
+        default=2,
+        env="DB_POOL_TRACKER_MIN_SIZE"
+    )
+    
+    DB_POOL_TRACKER_MAX_SIZE: int = Field(
+        default=10,
+        env="DB_POOL_TRACKER_MAX_SIZE"
+    )
+    
+    DB_POOL_API_MIN_SIZE: int = Field(
+        default=2,
+        env="DB_POOL_API_MIN_SIZE"
+    )
+    
+    DB_POOL_API_MAX_SIZE: int = Field(
+        default=10,
+        env="DB_POOL_API_MAX_SIZE"
+    )
+    
+    DB_POOL_BATCH_MIN_SIZE: int = Field(
+        default=1,
+        env="DB_POOL_BATCH_MIN_SIZE"
+    )
+    
+    DB_POOL_BATCH_MAX_SIZE: int = Field(
+        default=4,
+        env="DB_POOL_BATCH_MAX_SIZE"
+    )
+    
+    # transaction = Supavisor transaction mode (sin prepared statements)
+    # session / direct = caché de statements + hot path pre-preparado
+    DB_CONNECTION_MODE: str = Field(
+        default="transaction",
+        env="DB_CONNECTION_MODE"
+    )
+    
+    DB_STATEMENT_CACHE_SIZE: int = Field(
+        default=256,
+        env="DB_STATEMENT_CACHE_SIZE"
+    )
+    
+    DB_COMMAND_TIMEOUT: float = Field(
+        default=60.0,
+        env="DB_COMMAND_TIMEOUT"
+    )
+    
+    # Timeouts por clase de query: el tracker falla rápido, batch puede tardar
+    DB_POOL_TRACKER_COMMAND_TIMEOUT: float = Field(
+        default=2.0,
+        env="DB_POOL_TRACKER_COMMAND_TIMEOUT"
+    )
+    
+    DB_POOL_BATCH_COMMAND_TIMEOUT: float = Field(
+        default=300.0,
+        env="DB_POOL_BATCH_COMMAND_TIMEOUT"
+    )
+    
+    DB_POOL_TRACKER_ACQUIRE_TIMEOUT: float = Field(
+        default=0.5,
+        env="DB_POOL_TRACKER_ACQUIRE_TIMEOUT"
+    )
+    
+    DB_POOL_API_ACQUIRE_TIMEOUT: float = Field(
+        default=5.0,
+        env="DB_POOL_API_ACQUIRE_TIMEOUT"
+    )
+    
+    DB_POOL_BATCH_ACQUIRE_TIMEOUT: float = Field(
+        default=30.0,
+        env="DB_POOL_BATCH_ACQUIRE_TIMEOUT"
+    )
+    
+    # Circuit breaker por pool (fast-fail durante caídas de Postgres)
+    DB_CIRCUIT_FAILURE_THRESHOLD: int = Field(
+        default=5,
+        env="DB_CIRCUIT_FAILURE_THRESHOLD"
+    )
+    
+    DB_CIRCUIT_RECOVERY_TIMEOUT: float = Field(
+        default=10.0,
+        env="DB_CIRCUIT_RECOVERY_TIMEOUT"
+    )
+    
+    # Ajuste adaptativo del límite de cada pool según la latencia de acquire
+    DB_POOL_ADAPTIVE: bool = Field(
+        default=False,
+        env="DB_POOL_ADAPTIVE"
+    )
+    
+    DB_POOL_ADAPTIVE_INTERVAL: float = Field(
+        default=10.0,
+        env="DB_POOL_ADAPTIVE_INTERVAL"
+    )
+    
+    DB_POOL_ADAPTIVE_TARGET_WAIT_MS: float = Field(
+        default=5.0,
+        env="DB_POOL_ADAPTIVE_TARGET_WAIT_MS"
+    )
+    
+    # Rollups de series temporales (minuto/hora/día por variante)
+    ROLLUPS_ENABLED: bool = Field(
+        default=True,
+        env="ROLLUPS_ENABLED"
+    )
+    
+    # Sin agregador, antigüedad máxima de user_dashboard_summary en lectura
+    DASHBOARD_SUMMARY_MAX_AGE_SECONDS: float = Field(
+        default=60.0,
+        env="DASHBOARD_SUMMARY_MAX_AGE_SECONDS"
+    )
+    
+    ROLLUP_INTERVAL_SECONDS: float = Field(
+        default=60.0,
+        env="ROLLUP_INTERVAL_SECONDS"
+    )
+    
+    # Margen para transacciones que hacen commit con timestamps ya pasados
+    ROLLUP_LAG_SECONDS: float = Field(
+        default=30.0,
+        env="ROLLUP_LAG_SECONDS"
+    )
+    
+    ROLLUP_MINUTE_RETENTION_HOURS: int = Field(
+        default=48,
+        env="ROLLUP_MINUTE_RETENTION_HOURS"
+    )
+    
+    ROLLUP_HOUR_RETENTION_DAYS: int = Field(
+        default=90,
+        env="ROLLUP_HOUR_RETENTION_DAYS"
+    )
+    
+    # Evaluador secuencial (mSPRT + expected loss): pausa/promoción automática
+    SEQUENTIAL_TESTING_ENABLED: bool = Field(
+        default=False,
+        env="SEQUENTIAL_TESTING_ENABLED"
+    )
+
+    SEQUENTIAL_INTERVAL_SECONDS: float = Field(
+        default=300.0,
+        env="SEQUENTIAL_INTERVAL_SECONDS"
+    )
+
+    # Por defecto; cada experimento usa 1 - confidence_threshold si lo tiene
+    SEQUENTIAL_ALPHA: float = Field(
+        default=0.05,
+        env="SEQUENTIAL_ALPHA"
+    )
+
+    # Desviación de la mezcla N(0, tau²) sobre la diferencia de tasas
+    SEQUENTIAL_MIXTURE_TAU: float = Field(
+        default=0.01,
+        env="SEQUENTIAL_MIXTURE_TAU"
+    )
+
+    # Expected loss tolerado, relativo a la tasa de la mejor variante
+    SEQUENTIAL_LOSS_EPSILON: float = Field(
+        default=0.01,
+        env="SEQUENTIAL_LOSS_EPSILON"
+    )
+
+    SEQUENTIAL_MIN_SAMPLES: int = Field(
+        default=200,
+        env="SEQUENTIAL_MIN_SAMPLES"
+    )
+
+    # Priors empíricos (Beta por cuenta y tipo de elemento) para variantes nuevas
+    EMPIRICAL_PRIORS_ENABLED: bool = Field(
+        default=False,
+        env="EMPIRICAL_PRIORS_ENABLED"
+    )
+
+    # 'marginal' (máxima verosimilitud Beta-binomial) o 'moments'
+    PRIOR_METHOD: str = Field(
+        default="marginal",
+        env="PRIOR_METHOD"
+    )
+
+    # Máximo α + β: visitas equivalentes que aporta el histórico
+    PRIOR_MAX_STRENGTH: float = Field(
+        default=50.0,
+        env="PRIOR_MAX_STRENGTH"
+    )
+
+    PRIOR_MIN_EXPERIMENTS: int = Field(
+        default=5,
+        env="PRIOR_MIN_EXPERIMENTS"
+    )
+
+    # Variantes con menos asignaciones no entran en el ajuste
+    PRIOR_MIN_ALLOCATIONS: int = Field(
+        default=100,
+        env="PRIOR_MIN_ALLOCATIONS"
+    )
+
+    PRIOR_REFIT_INTERVAL_SECONDS: float = Field(
+        default=21600.0,
+        env="PRIOR_REFIT_INTERVAL_SECONDS"
+    )
+
+    # Estrategias 'discounted' / 'sliding_window': evidencia reciente, en memoria
+    NONSTATIONARY_HALF_LIFE_HOURS: float = Field(
+        default=168.0,
+        env="NONSTATIONARY_HALF_LIFE_HOURS"
+    )
+
+    NONSTATIONARY_WINDOW_HOURS: float = Field(
+        default=168.0,
+        env="NONSTATIONARY_WINDOW_HOURS"
+    )
+
+    # Recarga desde los rollups de hora (tráfico de los demás workers)
+    NONSTATIONARY_REFRESH_SECONDS: float = Field(
+        default=300.0,
+        env="NONSTATIONARY_REFRESH_SECONDS"
+    )
+
+    NONSTATIONARY_MAX_EXPERIMENTS: int = Field(
+        default=256,
+        env="NONSTATIONARY_MAX_EXPERIMENTS"
+    )
+
+    # Estrategia 'segmented': posterior por segmento (segment_key o device × utm_source)
+    SEGMENT_MAX_SEGMENTS: int = Field(
+        default=64,
+        env="SEGMENT_MAX_SEGMENTS"
+    )
+
+    # Límites de la fuerza de encogimiento hacia el posterior global (visitas equivalentes)
+    SEGMENT_MIN_STRENGTH: float = Field(
+        default=2.0,
+        env="SEGMENT_MIN_STRENGTH"
+    )
+
+    SEGMENT_MAX_STRENGTH: float = Field(
+        default=100.0,
+        env="SEGMENT_MAX_STRENGTH"
+    )
+
+    # Volcado en lotes de los contadores a segment_counts
+    SEGMENT_FLUSH_INTERVAL_SECONDS: float = Field(
+        default=10.0,
+        env="SEGMENT_FLUSH_INTERVAL_SECONDS"
+    )
+
+    # Recarga desde segment_counts (tráfico de los demás workers)
+    SEGMENT_REFRESH_SECONDS: float = Field(
+        default=300.0,
+        env="SEGMENT_REFRESH_SECONDS"
+    )
+
+    SEGMENT_MAX_EXPERIMENTS: int = Field(
+        default=256,
+        env="SEGMENT_MAX_EXPERIMENTS"
+    )
+
+    # Feedback retrasado: las asignaciones recientes sin conversión no cuentan como fallo entero
+    DELAYED_FEEDBACK_ENABLED: bool = Field(
+        default=False,
+        env="DELAYED_FEEDBACK_ENABLED"
+    )
+
+    # Conversiones usadas para estimar la distribución del retraso
+    DELAYED_FEEDBACK_LOOKBACK_DAYS: float = Field(
+        default=30.0,
+        env="DELAYED_FEEDBACK_LOOKBACK_DAYS"
+    )
+
+    # Por debajo, sin corrección (distribución poco fiable)
+    DELAYED_FEEDBACK_MIN_CONVERSIONS: int = Field(
+        default=50,
+        env="DELAYED_FEEDBACK_MIN_CONVERSIONS"
+    )
+
+    DELAYED_FEEDBACK_REFRESH_SECONDS: float = Field(
+        default=60.0,
+        env="DELAYED_FEEDBACK_REFRESH_SECONDS"
+    )
+
+    DELAYED_FEEDBACK_MAX_EXPERIMENTS: int = Field(
+        default=1024,
+        env="DELAYED_FEEDBACK_MAX_EXPERIMENTS"
+    )
+
+    # Estrategia 'contextual': modelo lineal por experimento, en memoria
+    CONTEXTUAL_DIMENSION: int = Field(
+        default=64,
+        env="CONTEXTUAL_DIMENSION"
+    )
+
+    # 'thompson' o 'ucb'
+    CONTEXTUAL_MODE: str = Field(
+        default="thompson",
+        env="CONTEXTUAL_MODE"
+    )
+
+    CONTEXTUAL_EXPLORATION: float = Field(
+        default=0.5,
+        env="CONTEXTUAL_EXPLORATION"
+    )
+
+    # Experimentos con modelo en memoria (LRU)
+    CONTEXTUAL_MAX_EXPERIMENTS: int = Field(
+        default=256,
+        env="CONTEXTUAL_MAX_EXPERIMENTS"
+    )
+
+    # Asignaciones recientes con las que se reconstruye un modelo al cargarlo
+    CONTEXTUAL_WARM_START_ROWS: int = Field(
+        default=20000,
+        env="CONTEXTUAL_WARM_START_ROWS"
+    )
+
     SUPABASE_SERVICE_KEY: str = Field(
         default="",
         env="SUPABASE_SERVICE_KEY"
@@ -107,6 +427,45 @@ class Settings(BaseSettings):
         env="CACHE_TTL"
     )
     
+    # Caché de resultados de analytics (clave = snapshot de contadores)
+    ANALYTICS_CACHE_REDIS: bool = Field(
+        default=False,
+        env="ANALYTICS_CACHE_REDIS"
+    )
+    
+    ANALYTICS_CACHE_MAX_ENTRIES: int = Field(
+        default=2048,
+        env="ANALYTICS_CACHE_MAX_ENTRIES"
+    )
+    
+    # Ventana stale-while-revalidate cuando llegan datos nuevos
+    ANALYTICS_CACHE_STALE_SECONDS: float = Field(
+        default=30.0,
+        env="ANALYTICS_CACHE_STALE_SECONDS"
+    )
+    
+    # Análisis por lotes: procesos para repartir cuentas muy grandes (0 = en proceso)
+    ANALYTICS_BATCH_WORKERS: int = Field(
+        default=0,
+        env="ANALYTICS_BATCH_WORKERS"
+    )
+    
+    ANALYTICS_BATCH_SHARD_MIN_ARMS: int = Field(
+        default=20000,
+        env="ANALYTICS_BATCH_SHARD_MIN_ARMS"
+    )
+    
+    # Dashboard público: caché de render en proceso + cabeceras para CDN
+    PUBLIC_DASHBOARD_CACHE_TTL: float = Field(
+        default=10.0,
+        env="PUBLIC_DASHBOARD_CACHE_TTL"
+    )
+    
+    PUBLIC_DASHBOARD_S_MAXAGE: int = Field(
+        default=60,
+        env="PUBLIC_DASHBOARD_S_MAXAGE"
+    )
+    
     # ─────────────────────────────────────────────────────────────
     # API
     # ─────────────────────────────────────────────────────────────
@@ -169,6 +528,29 @@ class Settings(BaseSettings):
         env="ADAPTIVE_BETA_PRIOR"
     )
     
+    # ─────────────────────────────────────────────────────────────
+    # Visual Editor Proxy
+    # ─────────────────────────────────────────────────────────────
+    VISUAL_EDITOR_VERIFY_TLS: bool = Field(
+        default=True,
+        env="VISUAL_EDITOR_VERIFY_TLS"
+    )
+    
+    VISUAL_EDITOR_CACHE_DIR: str = Field(
+        default="/tmp/samplit-editor-cache",
+        env="VISUAL_EDITOR_CACHE_DIR"
+    )
+    
+    VISUAL_EDITOR_CACHE_MEMORY_MB: int = Field(
+        default=64,
+        env="VISUAL_EDITOR_CACHE_MEMORY_MB"
+    )
+    
+    VISUAL_EDITOR_CACHE_DISK_MB: int = Field(
+        default=512,
+        env="VISUAL_EDITOR_CACHE_DISK_MB"
+    )
+    
     # ─────────────────────────────────────────────────────────────
     # Validators
     # ─────────────────────────────────────────────────────────────
@@ -254,6 +636,15 @@ class Settings(BaseSettings):
         
         return v
     
+    @field_validator('DB_CONNECTION_MODE')
+    @classmethod
+    def validate_db_connection_mode(cls, v: str) -> str:
+        """Valida DB_CONNECTION_MODE"""
+        v = v.strip().lower()
+        if v not in ('transaction', 'session', 'direct'):
+            raise ValueError("DB_CONNECTION_MODE must be one of: transaction, session, direct")
+        return v
+    
     @field_validator('REDIS_URL')
     @classmethod
     def validate_redis_url(cls, v: str) -> str:
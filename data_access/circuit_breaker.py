@@ -0,0 +1,162 @@
+# data-access/circuit_breaker.py
+
+"""
+Circuit breaker for database access.
+
+Se consulta en cada `acquire()` de los pools (y por tanto en cada
+llamada de repositorio): durante un brownout de Postgres las peticiones
+fallan en microsegundos con `CircuitOpenError` en lugar de esperar a
+`command_timeout`.
+
+States:
+- CLOSED: normal operation
+- OPEN: failure threshold reached, requests fail fast
+- HALF_OPEN: recovery timeout elapsed, a single trial request is let through
+"""
+
+import time
+import asyncio
+import logging
+from typing import Callable, Optional
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+
+STATE_CLOSED = "CLOSED"
+STATE_HALF_OPEN = "HALF_OPEN"
+STATE_OPEN = "OPEN"
+
+# Prometheus gauge values
+STATE_VALUES = {
+    STATE_CLOSED: 0,
+    STATE_HALF_OPEN: 1,
+    STATE_OPEN: 2
+}
+
+# Errors that mean "the database is unhealthy", as opposed to a bad query
+CONNECTIVITY_ERRORS = (
+    OSError,
+    asyncpg.PostgresConnectionError,
+    asyncpg.InterfaceError,
+    asyncpg.CannotConnectNowError,
+)
+
+# Acquire / statement timeouts. Not connectivity errors (asyncio.TimeoutError
+# is an OSError since Python 3.11, hence the check first): MonitoredPool
+# counts them as failures only inside a checkout (brownout), while an
+# acquire timeout is pool saturation and stays neutral.
+TIMEOUT_ERRORS = (
+    asyncio.TimeoutError,
+    asyncpg.QueryCanceledError,
+)
+
+
+def is_timeout_error(exc: Optional[BaseException]) -> bool:
+    """True if `exc` is an acquire / statement timeout"""
+    return isinstance(exc, TIMEOUT_ERRORS)
+
+
+def is_connectivity_error(exc: Optional[BaseException]) -> bool:
+    """True if `exc` should count against the breaker"""
+    return isinstance(exc, CONNECTIVITY_ERRORS) and not is_timeout_error(exc)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of touching the database while the circuit is open"""
+
+    def __init__(self, name: str, retry_after: float):
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(
+            f"Database circuit '{name}' is open (retry in {retry_after:.1f}s)"
+        )
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker to prevent cascading failures.
+
+    Uses a monotonic clock (not wall-clock deltas) for the recovery
+    timeout. In HALF_OPEN exactly one trial is in flight at a time;
+    everything else keeps failing fast until the trial reports back.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        name: str = "db",
+        on_state_change: Optional[Callable[[str, str], None]] = None
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.on_state_change = on_state_change
+
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.state = STATE_CLOSED
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        """
+        Whether a request may proceed. In HALF_OPEN, a True return
+        claims the trial slot; the caller must report the outcome with
+        `record_success()`, `record_failure()` or `release_trial()`.
+        """
+        if self.state == STATE_CLOSED:
+            return True
+
+        if self.state == STATE_OPEN:
+            if self.retry_after() > 0:
+                return False
+            self._set_state(STATE_HALF_OPEN)
+
+        # HALF_OPEN
+        if self._trial_in_flight:
+            return False
+        self._trial_in_flight = True
+        return True
+
+    # Backwards compatible name
+    can_execute = allow
+
+    def retry_after(self) -> float:
+        """Seconds until the next trial is allowed (0 if not open)"""
+        if self.state != STATE_OPEN or self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.recovery_timeout - time.monotonic())
+
+    def record_success(self):
+        self.failures = 0
+        self._trial_in_flight = False
+        if self.state != STATE_CLOSED:
+            self._set_state(STATE_CLOSED)
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+
+        if self.state == STATE_HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            if self.state != STATE_OPEN:
+                self._set_state(STATE_OPEN)
+                logger.warning(
+                    f"Circuit breaker '{self.name}' OPEN after {self.failures} failures"
+                )
+
+    def release_trial(self):
+        """Give back the HALF_OPEN trial slot without an outcome (e.g. cancellation)"""
+        self._trial_in_flight = False
+
+    def _set_state(self, state: str):
+        previous, self.state = self.state, state
+        if state == STATE_HALF_OPEN:
+            logger.info(f"Circuit breaker '{self.name}' HALF_OPEN, testing recovery")
+        elif state == STATE_CLOSED:
+            logger.info(f"Circuit breaker '{self.name}' CLOSED")
+
+        if self.on_state_change:
+            self.on_state_change(previous, state)
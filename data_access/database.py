@@ -6,76 +6,37 @@ import asyncio
 import logging
 from typing import Optional, Dict, Any, List
 from contextlib import asynccontextmanager
-from datetime import datetime, timedelta
 
 from config.settings import settings
+from .pools import (
+    POOL_WORKLOADS, POOL_TRACKER, POOL_API, POOL_BATCH,
+    MonitoredPool, PoolLimiter, AdaptivePoolController
+)
+from .statements import prepare_hot_path, supports_prepared_statements
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
 
 logger = logging.getLogger(__name__)
 
 
-class CircuitBreaker:
-    """
-    Simple circuit breaker to prevent cascading failures.
-    
-    States:
-    - CLOSED: Normal operation, requests pass through
-    - OPEN: Failure threshold reached, requests fail fast
-    - HALF_OPEN: Testing if service recovered
-    """
-    
-    def __init__(
-        self,
-        failure_threshold: int = 5,
-        recovery_timeout: int = 30
-    ):
-        self.failure_threshold = failure_threshold
-        self.recovery_timeout = recovery_timeout
-        self.failures = 0
-        self.last_failure_time: Optional[datetime] = None
-        self.state = "CLOSED"
-    
-    def record_failure(self):
-        self.failures += 1
-        self.last_failure_time = datetime.utcnow()
-        if self.failures >= self.failure_threshold:
-            self.state = "OPEN"
-            logger.warning(f"Circuit breaker OPEN after {self.failures} failures")
-    
-    def record_success(self):
-        self.failures = 0
-        self.state = "CLOSED"
-    
-    def can_execute(self) -> bool:
-        if self.state == "CLOSED":
-            return True
-        
-        if self.state == "OPEN":
-            # Check if recovery timeout passed
-            if self.last_failure_time:
-                elapsed = (datetime.utcnow() - self.last_failure_time).seconds
-                if elapsed >= self.recovery_timeout:
-                    self.state = "HALF_OPEN"
-                    logger.info("Circuit breaker HALF_OPEN, testing recovery")
-                    return True
-            return False
-        
-        return True  # HALF_OPEN allows one request through
-
-
 class DatabaseManager:
     """
     Supabase/PostgreSQL connection manager with retry logic.
     
     Features:
-    - Connection pooling
+    - Connection pooling (separate pools per workload: tracker/api/batch)
+    - Pool wait/saturation metrics, optional adaptive sizing
     - Retry with exponential backoff
-    - Circuit breaker pattern
+    - Circuit breaker per pool, checked on every acquire (fast-fail)
+    - Per-workload command/acquire timeouts
     - Automatic reconnection
     - Health checks
     """
     
     def __init__(self):
-        self.pool: Optional[asyncpg.Pool] = None
+        # `pool` is the API pool; kept for existing `db.pool.acquire()` callers
+        self.pool: Optional[MonitoredPool] = None
+        self.pools: Dict[str, MonitoredPool] = {}
+        self.pool_controller: Optional[AdaptivePoolController] = None
         
         self.database_url = settings.DATABASE_URL
         self.service_role_key = settings.SUPABASE_SERVICE_KEY
@@ -83,10 +44,11 @@ class DatabaseManager:
         if not self.database_url:
             raise ValueError("DATABASE_URL not set in settings or environment")
         
-        # Circuit breaker for connection protection
+        # Circuit breaker for initialize(); each pool has its own for queries
         self.circuit_breaker = CircuitBreaker(
-            failure_threshold=5,
-            recovery_timeout=30
+            failure_threshold=settings.DB_CIRCUIT_FAILURE_THRESHOLD,
+            recovery_timeout=settings.DB_CIRCUIT_RECOVERY_TIMEOUT,
+            name="initialize"
         )
         
         # Retry configuration
@@ -112,28 +74,32 @@ class DatabaseManager:
         
         for attempt in range(retries):
             try:
-                # Create pool
-                self.pool = await asyncpg.create_pool(
-                    self.database_url,
-                    min_size=2,
-                    max_size=10,
-                    max_queries=50000,
-                    max_inactive_connection_lifetime=300,
-                    command_timeout=60,
-                    statement_cache_size=0,  # Required for Supavisor Transaction Mode
-                    ssl='require' if 'supabase.co' in self.database_url else None
-                )
+                # Create pools
+                self.pools = await self._create_pools()
+                self.pool = self.pools[POOL_API]
                 
                 # Test connection
                 async with self.pool.acquire() as conn:
                     await conn.fetchval("SELECT 1")
                 
+                if settings.DB_POOL_ADAPTIVE:
+                    self.pool_controller = AdaptivePoolController(
+                        list(self._distinct_pools()),
+                        interval=settings.DB_POOL_ADAPTIVE_INTERVAL,
+                        target_wait=settings.DB_POOL_ADAPTIVE_TARGET_WAIT_MS / 1000
+                    )
+                    self.pool_controller.start()
+                
                 self.circuit_breaker.record_success()
-                logger.info("Database pool initialized")
+                logger.info(
+                    "Database pools initialized: "
+                    + ", ".join(f"{p.name}={p.min_size}-{p.max_size}" for p in self._distinct_pools())
+                )
                 return
                 
             except Exception as e:
                 self.circuit_breaker.record_failure()
+                await self._close_pools()
                 
                 if attempt < retries - 1:
                     delay = min(self.base_delay * (2 ** attempt), self.max_delay)
@@ -146,34 +112,126 @@ class DatabaseManager:
                     logger.error(f"Could not connect to database after {retries} attempts: {e}")
                     raise
     
+    def _pool_timeouts(self) -> Dict[str, tuple]:
+        """(command_timeout, acquire_timeout) per workload from settings"""
+        return {
+            POOL_TRACKER: (settings.DB_POOL_TRACKER_COMMAND_TIMEOUT, settings.DB_POOL_TRACKER_ACQUIRE_TIMEOUT),
+            POOL_API: (settings.DB_COMMAND_TIMEOUT, settings.DB_POOL_API_ACQUIRE_TIMEOUT),
+            POOL_BATCH: (settings.DB_POOL_BATCH_COMMAND_TIMEOUT, settings.DB_POOL_BATCH_ACQUIRE_TIMEOUT)
+        }
+    
+    def _pool_sizes(self) -> Dict[str, tuple]:
+        """(min_size, max_size) per workload from settings"""
+        return {
+            POOL_TRACKER: (settings.DB_POOL_TRACKER_MIN_SIZE, settings.DB_POOL_TRACKER_MAX_SIZE),
+            POOL_API: (settings.DB_POOL_API_MIN_SIZE, settings.DB_POOL_API_MAX_SIZE),
+            POOL_BATCH: (settings.DB_POOL_BATCH_MIN_SIZE, settings.DB_POOL_BATCH_MAX_SIZE)
+        }
+    
+    async def _create_pools(self) -> Dict[str, MonitoredPool]:
+        """
+        One pool per workload, or a single shared pool when
+        DB_POOL_PARTITIONED is off (e.g. tight connection limits).
+        """
+        sizes = self._pool_sizes()
+        
+        if not settings.DB_POOL_PARTITIONED:
+            shared = await self._create_pool(POOL_API, *sizes[POOL_API])
+            return {workload: shared for workload in POOL_WORKLOADS}
+        
+        pools = {}
+        for workload in POOL_WORKLOADS:
+            pools[workload] = await self._create_pool(workload, *sizes[workload])
+        return pools
+    
+    async def _create_pool(self, name: str, min_size: int, max_size: int) -> MonitoredPool:
+        # Supavisor transaction mode cannot keep prepared statements;
+        # direct/session connections get the statement cache and the
+        # tracker pool pre-prepares its hot path on connect.
+        prepared = supports_prepared_statements(settings.DB_CONNECTION_MODE)
+        serves_tracker = name == (POOL_TRACKER if settings.DB_POOL_PARTITIONED else POOL_API)
+        command_timeout, acquire_timeout = self._pool_timeouts()[name]
+        
+        raw = await asyncpg.create_pool(
+            self.database_url,
+            min_size=min_size,
+            max_size=max_size,
+            max_queries=50000,
+            max_inactive_connection_lifetime=300,
+            command_timeout=command_timeout,
+            statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE if prepared else 0,
+            init=prepare_hot_path if prepared and serves_tracker else None,
+            ssl='require' if 'supabase.co' in self.database_url else None
+        )
+        
+        # Adaptive mode starts at min_size and grows up to max_size
+        limiter = PoolLimiter(max(min_size, 1)) if settings.DB_POOL_ADAPTIVE else None
+        
+        breaker = CircuitBreaker(
+            failure_threshold=settings.DB_CIRCUIT_FAILURE_THRESHOLD,
+            recovery_timeout=settings.DB_CIRCUIT_RECOVERY_TIMEOUT,
+            name=name
+        )
+        
+        return MonitoredPool(
+            name, raw, min_size, max_size,
+            limiter=limiter,
+            breaker=breaker,
+            acquire_timeout=acquire_timeout
+        )
+    
+    def _distinct_pools(self):
+        seen = set()
+        for pool in self.pools.values():
+            if id(pool) not in seen:
+                seen.add(id(pool))
+                yield pool
+    
+    async def _close_pools(self):
+        if self.pool_controller:
+            await self.pool_controller.stop()
+            self.pool_controller = None
+        
+        for pool in list(self._distinct_pools()):
+            try:
+                await pool.close()
+            except Exception as e:
+                logger.warning(f"Error closing pool '{pool.name}': {e}")
+        
+        self.pools = {}
+        self.pool = None
+    
+    def get_pool(self, workload: str = POOL_API) -> MonitoredPool:
+        """Pool for a workload ('tracker', 'api' or 'batch')"""
+        return self.pools.get(workload) or self.pool
+    
     async def disconnect(self):
         """Close connection pool."""
         if self.pool:
-            await self.pool.close()
-            self.pool = None
+            await self._close_pools()
             logger.info("👋 Database pool closed")
     
     async def reconnect(self):
         """Attempt to reconnect to database"""
         logger.info("Attempting database reconnection...")
         if self.pool:
-            try:
-                await self.pool.close()
-            except:
-                pass
+            await self._close_pools()
         await self.initialize(retries=3)
     
     async def close(self):
         """Close connection pool"""
         if self.pool:
-            await self.pool.close()
-            self.pool = None
+            await self._close_pools()
             logger.info("✅ Database pool closed")
     
     @asynccontextmanager
-    async def acquire(self):
-        """Acquire connection from pool"""
-        async with self.pool.acquire() as connection:
+    async def acquire(self, workload: str = POOL_API, timeout: Optional[float] = None):
+        """
+        Acquire connection from the workload's pool.
+        
+        Raises CircuitOpenError immediately while that pool's circuit is open.
+        """
+        async with self.get_pool(workload).acquire(timeout=timeout) as connection:
             yield connection
     
     async def health_check(self) -> bool:
@@ -194,7 +252,11 @@ class DatabaseManager:
                 pool_stats = {
                     'pool_size': self.pool.get_size(),
                     'pool_free': self.pool.get_idle_size(),
-                    'pool_used': self.pool.get_size() - self.pool.get_idle_size()
+                    'pool_used': self.pool.get_size() - self.pool.get_idle_size(),
+                    'pools': {
+                        workload: pool.stats()
+                        for workload, pool in self.pools.items()
+                    }
                 }
             
                 counts = await conn.fetch("""
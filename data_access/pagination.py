@@ -0,0 +1,51 @@
+# data-access/pagination.py
+"""
+Keyset (cursor) pagination on (created_at, id)
+
+Las listas se recorren con `WHERE (created_at, id) < (cursor)` sobre un
+índice (user_id, created_at DESC, id DESC): cada página cuesta lo mismo
+sea la primera o la número mil, a diferencia de OFFSET.
+
+El cursor es opaco para el cliente (base64 de "created_at|id").
+"""
+
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+
+class Keyset(NamedTuple):
+    created_at: datetime
+    id: str
+
+
+def encode_cursor(created_at: datetime, row_id: Any) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Keyset:
+    """Raises ValueError for anything that is not a cursor we issued"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, _, row_id = base64.urlsafe_b64decode(padded).decode().partition('|')
+        if not row_id:
+            raise ValueError("missing id")
+        return Keyset(datetime.fromisoformat(created_at), row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {e}") from None
+
+
+def keyset_page(rows: List[Dict[str, Any]], limit: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Split a `limit + 1` fetch into (page, next_cursor).
+
+    next_cursor is None on the last page.
+    """
+    if len(rows) <= limit:
+        return rows, None
+
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor(last['created_at'], last['id'])
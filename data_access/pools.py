@@ -0,0 +1,323 @@
+# data-access/pools.py
+
+"""
+Connection pool partitioning and adaptive sizing.
+
+Cada workload tiene su propio pool asyncpg para que una exportación
+o un análisis largo no deje sin conexiones al tracker (/assign):
+
+- tracker: hot path del JS tracker (assign/convert)
+- api: dashboard y endpoints autenticados
+- batch: exportaciones, jobs en background
+
+`MonitoredPool` envuelve el pool asyncpg y mide el tiempo de espera
+de cada `acquire()` (histogramas Prometheus). Cada pool tiene su
+circuit breaker y su timeout de acquire: con el circuito abierto el
+`acquire()` falla al instante con `CircuitOpenError`.
+`AdaptivePoolController` ajusta opcionalmente el límite de concurrencia
+de cada pool según la latencia de acquire observada.
+"""
+
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+import asyncpg
+
+from .circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    STATE_VALUES,
+    is_connectivity_error,
+    is_timeout_error
+)
+
+logger = logging.getLogger(__name__)
+
+
+POOL_TRACKER = 'tracker'
+POOL_API = 'api'
+POOL_BATCH = 'batch'
+
+POOL_WORKLOADS = (POOL_TRACKER, POOL_API, POOL_BATCH)
+
+
+def _get_metrics():
+    """Prometheus collector, or None if prometheus_client is not installed"""
+    try:
+        from infrastructure.monitoring.prometheus_metrics import get_metrics_collector
+        return get_metrics_collector()
+    except ImportError:
+        return None
+
+
+class PoolLimiter:
+    """
+    Adjustable concurrency limit layered on top of an asyncpg pool.
+
+    asyncpg pools cannot be resized after creation, so the pool is created
+    at its ceiling (max_size) and the limiter controls how many
+    connections may actually be checked out at once.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+        self.peak_in_use = 0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_use < self.limit)
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    async def release(self):
+        async with self._cond:
+            self.in_use -= 1
+            self._cond.notify()
+
+    async def set_limit(self, limit: int):
+        async with self._cond:
+            self.limit = limit
+            self._cond.notify_all()
+
+    def reset_peak(self) -> int:
+        peak, self.peak_in_use = self.peak_in_use, self.in_use
+        return peak
+
+
+class _MonitoredAcquire:
+    """Async context manager returned by MonitoredPool.acquire()"""
+
+    __slots__ = ('_owner', '_timeout', '_conn')
+
+    def __init__(self, owner: 'MonitoredPool', timeout: Optional[float]):
+        self._owner = owner
+        self._timeout = timeout
+        self._conn = None
+
+    async def __aenter__(self) -> asyncpg.Connection:
+        owner = self._owner
+        breaker = owner.breaker
+
+        # Fast-fail: no pool wait, no network round trip
+        if breaker and not breaker.allow():
+            owner.observe_rejection()
+            raise CircuitOpenError(owner.name, breaker.retry_after())
+
+        start = time.perf_counter()
+        timeout = self._timeout if self._timeout is not None else owner.acquire_timeout
+
+        try:
+            if owner.limiter:
+                await owner.limiter.acquire()
+            try:
+                self._conn = await owner.raw.acquire(timeout=timeout)
+            except BaseException:
+                if owner.limiter:
+                    await owner.limiter.release()
+                raise
+        except BaseException as e:
+            owner.report(e, checkout=False)
+            raise
+
+        owner.observe_acquire(time.perf_counter() - start)
+        return self._conn
+
+    async def __aexit__(self, exc_type, exc, tb):
+        owner = self._owner
+        try:
+            await owner.raw.release(self._conn)
+        finally:
+            self._conn = None
+            if owner.limiter:
+                await owner.limiter.release()
+            owner.report(exc, checkout=True)
+
+
+class MonitoredPool:
+    """
+    asyncpg.Pool wrapper that records acquire wait time and saturation
+    and guards every checkout with a circuit breaker.
+
+    Drop-in for code that does `async with pool.acquire() as conn`;
+    any other attribute is forwarded to the underlying pool.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        pool: asyncpg.Pool,
+        min_size: int,
+        max_size: int,
+        limiter: Optional[PoolLimiter] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        acquire_timeout: Optional[float] = None
+    ):
+        self.name = name
+        self.raw = pool
+        self.min_size = min_size
+        self.max_size = max_size
+        self.limiter = limiter
+        self.breaker = breaker
+        self.acquire_timeout = acquire_timeout
+
+        # Recent acquire waits (seconds), drained by the adaptive controller
+        self.wait_samples: deque = deque(maxlen=2048)
+        self._metrics = _get_metrics()
+
+        if self.breaker:
+            self.breaker.on_state_change = self._on_circuit_state
+            self._on_circuit_state(None, self.breaker.state)
+
+    def acquire(self, *, timeout: Optional[float] = None) -> _MonitoredAcquire:
+        return _MonitoredAcquire(self, timeout)
+
+    def report(self, exc: Optional[BaseException], checkout: bool = True):
+        """
+        Feed the outcome of a checkout (or of its acquire) to the breaker
+
+        A timeout while acquiring is pool saturation: no verdict. A
+        statement / command timeout inside the checkout counts as a
+        failure, so a brownout (queries hang, connections still open)
+        trips the breaker like an outage.
+        """
+        if not self.breaker:
+            return
+        if is_connectivity_error(exc):
+            self.breaker.record_failure()
+        elif is_timeout_error(exc):
+            if checkout:
+                self.breaker.record_failure()
+            else:
+                self.breaker.release_trial()
+        elif exc is None or (
+            isinstance(exc, Exception) and not isinstance(exc, CircuitOpenError)
+        ):
+            # The database answered (possibly with a query error)
+            self.breaker.record_success()
+        else:
+            # Cancellation / nested fast-fail: no verdict on database health
+            self.breaker.release_trial()
+
+    def observe_rejection(self):
+        if self._metrics:
+            self._metrics.record_db_circuit_rejection(self.name)
+
+    def _on_circuit_state(self, previous: Optional[str], state: str):
+        if self._metrics:
+            self._metrics.update_db_circuit_state(self.name, STATE_VALUES[state])
+
+    @property
+    def limit(self) -> int:
+        return self.limiter.limit if self.limiter else self.max_size
+
+    def in_use(self) -> int:
+        return self.raw.get_size() - self.raw.get_idle_size()
+
+    def observe_acquire(self, wait_seconds: float):
+        self.wait_samples.append(wait_seconds)
+
+        if self._metrics:
+            self._metrics.record_db_pool_acquire(
+                pool=self.name,
+                wait_seconds=wait_seconds,
+                saturation=self.in_use() / max(self.limit, 1)
+            )
+
+    def drain_wait_samples(self) -> List[float]:
+        samples = list(self.wait_samples)
+        self.wait_samples.clear()
+        return samples
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'size': self.raw.get_size(),
+            'idle': self.raw.get_idle_size(),
+            'in_use': self.in_use(),
+            'limit': self.limit,
+            'min_size': self.min_size,
+            'max_size': self.max_size,
+            'circuit': self.breaker.state if self.breaker else None
+        }
+
+    def __getattr__(self, item):
+        return getattr(self.raw, item)
+
+
+class AdaptivePoolController:
+    """
+    Grows/shrinks each pool's concurrency limit from observed acquire latency.
+
+    Every `interval` seconds, per pool:
+    - p95 wait above `target_wait` and limit below ceiling → limit + 1
+    - p95 wait well below target and peak usage under limit - 1 → limit - 1
+
+    Idle connections above the limit are closed by asyncpg's
+    `max_inactive_connection_lifetime`.
+    """
+
+    def __init__(
+        self,
+        pools: List[MonitoredPool],
+        interval: float = 10.0,
+        target_wait: float = 0.005
+    ):
+        self.pools = [p for p in pools if p.limiter is not None]
+        self.interval = interval
+        self.target_wait = target_wait
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None and self.pools:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Adaptive pool controller started ({len(self.pools)} pools)")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.tick()
+            except Exception as e:
+                logger.error(f"Adaptive pool controller error: {e}")
+
+    async def tick(self):
+        metrics = _get_metrics()
+
+        for pool in self.pools:
+            samples = pool.drain_wait_samples()
+            peak = pool.limiter.reset_peak()
+            limit = pool.limiter.limit
+            new_limit = limit
+
+            p95 = 0.0
+            if samples:
+                samples.sort()
+                p95 = samples[int(0.95 * (len(samples) - 1))]
+
+            if p95 > self.target_wait and limit < pool.max_size:
+                new_limit = limit + 1
+            elif p95 < self.target_wait / 4 and peak < limit - 1 and limit > pool.min_size:
+                new_limit = limit - 1
+
+            if new_limit != limit:
+                await pool.limiter.set_limit(new_limit)
+                logger.info(
+                    f"Pool '{pool.name}' limit {limit} → {new_limit} "
+                    f"(p95 wait {p95 * 1000:.1f}ms, peak in use {peak})"
+                )
+
+            if metrics:
+                metrics.update_db_pool_limit(pool.name, new_limit)
@@ -2,11 +2,39 @@
 # RENAMED: allocation_repository.py -> assignment_repository.py
 # REASON: Table is named 'assignments', should match repository name
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, AsyncIterator
 from .base_repository import BaseRepository
 import json
 from datetime import datetime, timezone
 
+# Hot-path statements (tracker). Kept as constants so the exact same text
+# is used when pre-preparing them (see data_access/statements.py).
+GET_ASSIGNMENT_SQL = """
+    SELECT 
+        id, experiment_id, variant_id, variant_assignments, user_id as user_identifier,
+        session_id, context, assigned_at, 
+        converted_at, conversion_value, metadata
+    FROM assignments 
+    WHERE experiment_id = $1 AND user_id = $2
+"""
+
+CREATE_ASSIGNMENT_SQL = """
+    INSERT INTO assignments 
+    (experiment_id, variant_id, user_id, session_id, context)
+    VALUES ($1, $2, $3, $4, $5)
+    RETURNING id
+"""
+
+RECORD_CONVERSION_SQL = """
+    UPDATE assignments 
+    SET 
+        converted_at = NOW(),
+        conversion_value = $2,
+        metadata = COALESCE(metadata, '{}'::jsonb) || $3::jsonb
+    WHERE id = $1 AND converted_at IS NULL
+"""
+
+
 class AssignmentRepository(BaseRepository):
     """
     Repository for user assignments
@@ -23,14 +51,7 @@ class AssignmentRepository(BaseRepository):
         """Get existing assignment for user"""
         async with self.db.acquire() as conn:
             row = await conn.fetchrow(
-                """
-                SELECT 
-                    id, experiment_id, variant_id, variant_assignments, user_id as user_identifier,
-                    session_id, context, assigned_at, 
-                    converted_at, conversion_value, metadata
-                FROM assignments 
-                WHERE experiment_id = $1 AND user_id = $2
-                """,
+                GET_ASSIGNMENT_SQL,
                 experiment_id, user_identifier
             )
         
@@ -61,12 +82,7 @@ class AssignmentRepository(BaseRepository):
         """Create new assignment"""
         async with self.db.acquire() as conn:
             assignment_id = await conn.fetchval(
-                """
-                INSERT INTO assignments 
-                (experiment_id, variant_id, user_id, session_id, context)
-                VALUES ($1, $2, $3, $4, $5)
-                RETURNING id
-                """,
+                CREATE_ASSIGNMENT_SQL,
                 experiment_id,
                 variant_id,
                 user_identifier,
@@ -85,14 +101,7 @@ class AssignmentRepository(BaseRepository):
         """Record conversion for assignment"""
         async with self.db.acquire() as conn:
             result = await conn.execute(
-                """
-                UPDATE assignments 
-                SET 
-                    converted_at = NOW(),
-                    conversion_value = $2,
-                    metadata = COALESCE(metadata, '{}'::jsonb) || $3::jsonb
-                WHERE id = $1 AND converted_at IS NULL
-                """,
+                RECORD_CONVERSION_SQL,
                 assignment_id,
                 conversion_value,
                 json.dumps(metadata or {})
@@ -125,30 +134,102 @@ class AssignmentRepository(BaseRepository):
         
         return [dict(row) for row in rows]
 
-    
+    async def get_recent_outcomes(
+        self,
+        experiment_id: str,
+        limit: int = 20000
+    ) -> List[Dict[str, Any]]:
+        """
+        Most recent assignments as (variant_id, context, converted),
+        for rebuilding a contextual model
+        """
+        async with self.db.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT variant_id, context, converted_at IS NOT NULL AS converted
+                FROM assignments
+                WHERE experiment_id = $1
+                ORDER BY assigned_at DESC
+                LIMIT $2
+                """,
+                experiment_id, limit
+            )
+
+        outcomes = []
+        for row in rows:
+            outcome = dict(row)
+            if isinstance(outcome.get('context'), str):
+                outcome['context'] = json.loads(outcome['context'])
+            outcomes.append(outcome)
+        return outcomes
+
+    async def stream_outcomes(
+        self,
+        experiment_id: str,
+        chunk_size: int = 50000
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        All assignments of an experiment in assigned_at order, in chunks
+
+        Server-side cursor: memory stays at one chunk whatever the
+        experiment size. Holds a connection (and a read transaction)
+        until exhausted; use a batch-pool repository.
+        """
+        async with self.db.acquire() as conn:
+            async with conn.transaction(readonly=True):
+                chunk = []
+                async for row in conn.cursor(
+                    """
+                    SELECT variant_id, assigned_at, context,
+                           converted_at IS NOT NULL AS converted,
+                           conversion_value
+                    FROM assignments
+                    WHERE experiment_id = $1
+                    ORDER BY assigned_at, id
+                    """,
+                    experiment_id,
+                    prefetch=chunk_size
+                ):
+                    outcome = dict(row)
+                    if isinstance(outcome.get('context'), str):
+                        outcome['context'] = json.loads(outcome['context'])
+                    chunk.append(outcome)
+                    if len(chunk) >= chunk_size:
+                        yield chunk
+                        chunk = []
+                if chunk:
+                    yield chunk
+
+
     async def get_conversion_timeline(
         self,
         experiment_id: str,
         hours: int = 24
     ) -> List[Dict[str, Any]]:
-        """Get conversion timeline for last N hours"""
+        """
+        Get conversion timeline for last N hours
+        
+        Reads the hourly rollups (see RollupRepository) instead of
+        grouping raw assignments. Conversions are counted in the hour
+        they happened, not the hour of the original assignment.
+        """
         async with self.db.acquire() as conn:
             rows = await conn.fetch(
                 """
                 SELECT 
-                    DATE_TRUNC('hour', assigned_at) as hour,
-                    COUNT(*) as assignments,
-                    COUNT(converted_at) as conversions,
+                    bucket_start as hour,
+                    SUM(allocations) as assignments,
+                    SUM(conversions) as conversions,
                     CASE 
-                        WHEN COUNT(*) > 0 
-                        THEN COUNT(converted_at)::FLOAT / COUNT(*)::FLOAT
+                        WHEN SUM(allocations) > 0 
+                        THEN SUM(conversions)::FLOAT / SUM(allocations)::FLOAT
                         ELSE 0
                     END as conversion_rate
-                FROM assignments
+                FROM variant_rollups_hour
                 WHERE 
                     experiment_id = $1 
-                    AND assigned_at >= NOW() - INTERVAL '1 hour' * $2
-                GROUP BY DATE_TRUNC('hour', assigned_at)
+                    AND bucket_start >= DATE_TRUNC('hour', NOW() - INTERVAL '1 hour' * $2)
+                GROUP BY bucket_start
                 ORDER BY hour DESC
                 """,
                 experiment_id, hours
@@ -0,0 +1,106 @@
+# data-access/repositories/dashboard_summary_repository.py
+"""
+Dashboard Summary Repository - Per-user materialized totals
+
+Ver database/schema/schema_dashboard_summary.sql.
+"""
+
+import json
+from typing import Optional, List, Dict, Any
+
+import asyncpg
+
+
+# Recomputes the rows of the given users from the live variant counters
+# (same numbers the dashboard used to aggregate on every page load)
+REFRESH_SUMMARIES_SQL = """
+    WITH per_experiment AS (
+        SELECT
+            e.id, e.user_id, e.name, e.status, e.started_at, e.created_at,
+            COALESCE(SUM(ev.total_allocations), 0) as visitors,
+            COALESCE(SUM(ev.total_conversions), 0) as conversions
+        FROM experiments e
+        LEFT JOIN experiment_elements ee ON e.id = ee.experiment_id
+        LEFT JOIN element_variants ev ON ee.id = ev.element_id
+        WHERE e.user_id = ANY($1::UUID[]) AND e.status != 'archived'
+        GROUP BY e.id
+    ),
+    ranked AS (
+        SELECT *, ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY created_at DESC) as recency
+        FROM per_experiment
+    )
+    INSERT INTO user_dashboard_summary AS s (
+        user_id, total_experiments, active_experiments,
+        total_visitors, total_conversions, recent_experiments,
+        is_stale, refreshed_at
+    )
+    SELECT
+        u.user_id,
+        COUNT(r.id),
+        COUNT(r.id) FILTER (WHERE r.status = 'active'),
+        COALESCE(SUM(r.visitors), 0),
+        COALESCE(SUM(r.conversions), 0),
+        COALESCE(
+            JSONB_AGG(
+                JSONB_BUILD_OBJECT(
+                    'id', r.id, 'name', r.name, 'status', r.status,
+                    'started_at', r.started_at,
+                    'visitors', r.visitors, 'conversions', r.conversions
+                ) ORDER BY r.created_at DESC
+            ) FILTER (WHERE r.recency <= 5),
+            '[]'::JSONB
+        ),
+        FALSE,
+        NOW()
+    FROM UNNEST($1::UUID[]) AS u(user_id)
+    LEFT JOIN ranked r ON r.user_id = u.user_id
+    GROUP BY u.user_id
+    ON CONFLICT (user_id) DO UPDATE SET
+        total_experiments = EXCLUDED.total_experiments,
+        active_experiments = EXCLUDED.active_experiments,
+        total_visitors = EXCLUDED.total_visitors,
+        total_conversions = EXCLUDED.total_conversions,
+        recent_experiments = EXCLUDED.recent_experiments,
+        is_stale = FALSE,
+        refreshed_at = EXCLUDED.refreshed_at
+    RETURNING s.*
+"""
+
+
+class DashboardSummaryRepository:
+    """
+    Repository for user_dashboard_summary
+
+    Not an entity repository (keyed by user, rebuilt from other tables),
+    so it does not inherit from BaseRepository.
+    """
+
+    def __init__(self, db_pool: asyncpg.Pool):
+        self.db = db_pool
+
+    async def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Single primary-key read"""
+        async with self.db.acquire() as conn:
+            row = await conn.fetchrow(
+                "SELECT * FROM user_dashboard_summary WHERE user_id = $1",
+                user_id
+            )
+
+        return self._to_dict(row) if row else None
+
+    async def refresh(self, user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Recompute and store the summaries of `user_ids`"""
+        if not user_ids:
+            return {}
+
+        async with self.db.acquire() as conn:
+            rows = await conn.fetch(REFRESH_SUMMARIES_SQL, [str(u) for u in user_ids])
+
+        return {str(row['user_id']): self._to_dict(row) for row in rows}
+
+    @staticmethod
+    def _to_dict(row) -> Dict[str, Any]:
+        summary = dict(row)
+        if isinstance(summary.get('recent_experiments'), str):
+            summary['recent_experiments'] = json.loads(summary['recent_experiments'])
+        return summary
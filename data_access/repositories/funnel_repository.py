@@ -3,8 +3,9 @@
 Funnel Repository - CRUD operations for funnel system.
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from .base_repository import BaseRepository
+from data_access.pagination import Keyset
 import json
 from datetime import datetime, timezone
 
@@ -74,36 +75,54 @@ class FunnelRepository(BaseRepository):
         user_id: str,
         status: Optional[str] = None,
         limit: int = 50,
-        offset: int = 0
+        after: Optional[Keyset] = None
     ) -> List[Dict[str, Any]]:
-        """List funnels for user with stats."""
+        """
+        List funnels for user with stats, newest first.
+
+        Keyset pagination: pass the (created_at, id) of the last row seen
+        as `after`. Counts are the denormalized counters on `funnels`
+        (see schema_listing_counters.sql), so cost does not grow with
+        nodes or sessions.
+        """
         async with self.db.acquire() as conn:
             query = """
                 SELECT 
                     f.*,
-                    (SELECT COUNT(*) FROM funnel_nodes WHERE funnel_id = f.id) as node_count,
-                    (SELECT COUNT(*) FROM funnel_sessions WHERE funnel_id = f.id) as total_sessions,
-                    (
-                        SELECT COUNT(*)::FLOAT / NULLIF(COUNT(*), 0) 
-                        FROM funnel_sessions 
-                        WHERE funnel_id = f.id AND status = 'converted'
-                    ) as conversion_rate
+                    f.converted_sessions::FLOAT / NULLIF(f.total_sessions, 0) as conversion_rate
                 FROM funnels f
                 WHERE f.user_id = $1
             """
             params = [user_id]
             
             if status:
-                query += " AND f.status = $2"
                 params.append(status)
+                query += f" AND f.status = ${len(params)}"
+            
+            if after:
+                params.extend(after)
+                query += f" AND (f.created_at, f.id) < (${len(params) - 1}, ${len(params)}::UUID)"
             
-            query += " ORDER BY f.created_at DESC LIMIT $3 OFFSET $4"
-            params.extend([limit, offset])
+            params.append(limit)
+            query += f" ORDER BY f.created_at DESC, f.id DESC LIMIT ${len(params)}"
             
             rows = await conn.fetch(query, *params)
         
         return [dict(row) for row in rows]
     
+    async def count_funnels(self, user_id: str, status: Optional[str] = None) -> int:
+        """Index-only count on (user_id, status)."""
+        async with self.db.acquire() as conn:
+            if status:
+                return await conn.fetchval(
+                    "SELECT COUNT(*) FROM funnels WHERE user_id = $1 AND status = $2",
+                    user_id, status
+                )
+            return await conn.fetchval(
+                "SELECT COUNT(*) FROM funnels WHERE user_id = $1",
+                user_id
+            )
+    
     async def update_funnel(
         self,
         funnel_id: str,
@@ -213,13 +232,64 @@ class FunnelRepository(BaseRepository):
             )
         return [dict(row) for row in rows]
     
+    async def get_tracking_step(
+        self,
+        funnel_id: str,
+        node_id: str,
+        user_id: str,
+        variant_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Step of an active funnel owned by `user_id` (for the tracker), with
+        whether `variant_id` is a variant of the step's experiment.
+        """
+        async with self.db.acquire() as conn:
+            row = await conn.fetchrow(
+                """
+                SELECT n.id, n.experiment_id,
+                       EXISTS (
+                           SELECT 1
+                           FROM experiment_elements ee
+                           JOIN element_variants ev ON ev.element_id = ee.id
+                           WHERE ee.experiment_id = n.experiment_id AND ev.id = $4
+                       ) AS has_variant
+                FROM funnel_nodes n
+                JOIN funnels f ON f.id = n.funnel_id
+                WHERE n.id = $2 AND n.funnel_id = $1
+                  AND f.user_id = $3 AND f.status = 'active'
+                """,
+                funnel_id, node_id, user_id, variant_id
+            )
+        return dict(row) if row else None
+    
+    async def get_experiment_node(self, experiment_id: str) -> Optional[Dict[str, Any]]:
+        """Step of an active funnel the experiment is attached to (oldest funnel first)."""
+        async with self.db.acquire() as conn:
+            row = await conn.fetchrow(
+                """
+                SELECT n.id, n.funnel_id
+                FROM funnel_nodes n
+                JOIN funnels f ON f.id = n.funnel_id
+                WHERE n.experiment_id = $1 AND f.status = 'active'
+                ORDER BY f.created_at, n.node_order
+                LIMIT 1
+                """,
+                experiment_id
+            )
+        return dict(row) if row else None
+    
     async def update_node(
         self,
         node_id: str,
         funnel_id: str,
         updates: Dict[str, Any]
     ) -> bool:
-        """Update a node."""
+        """
+        Update a node.
+        
+        Attaching an experiment switches it to the 'sequential' strategy,
+        so its variants are chosen on downstream funnel conversion.
+        """
         if not updates:
             return False
         
@@ -242,14 +312,20 @@ class FunnelRepository(BaseRepository):
             return False
         
         async with self.db.acquire() as conn:
-            result = await conn.execute(
-                f"""
-                UPDATE funnel_nodes 
-                SET {', '.join(set_clauses)}
-                WHERE id = $1 AND funnel_id = $2
-                """,
-                *params
-            )
+            async with conn.transaction():
+                result = await conn.execute(
+                    f"""
+                    UPDATE funnel_nodes 
+                    SET {', '.join(set_clauses)}
+                    WHERE id = $1 AND funnel_id = $2
+                    """,
+                    *params
+                )
+                if result == 'UPDATE 1' and updates.get('experiment_id'):
+                    await conn.execute(
+                        "UPDATE experiments SET optimization_strategy = 'sequential' WHERE id = $1",
+                        updates['experiment_id']
+                    )
         
         return result == 'UPDATE 1'
     
@@ -459,6 +535,131 @@ class FunnelRepository(BaseRepository):
                 return json.loads(path)
             return path
         return []
+    
+    async def advance_session(
+        self,
+        session_id: str,
+        node_id: str,
+        variant_id: Optional[str] = None
+    ) -> bool:
+        """
+        Step completed: append it to the session path, count the traversal
+        of the edge from the previous step and the entry of the step's
+        variant (first visit only), in one statement whatever the path length.
+        """
+        step = {
+            "node_id": node_id,
+            "entered_at": datetime.now(timezone.utc).isoformat()
+        }
+        if variant_id:
+            step["variant_id"] = variant_id
+        
+        async with self.db.acquire() as conn:
+            moved = await conn.fetchval(
+                """
+                WITH prev AS (
+                    SELECT funnel_id, current_node_id,
+                           path @> jsonb_build_array(jsonb_build_object('node_id', $2::TEXT)) AS revisit
+                    FROM funnel_sessions
+                    WHERE id = $1 AND status = 'active'
+                    FOR UPDATE
+                ),
+                moved AS (
+                    UPDATE funnel_sessions s
+                    SET current_node_id = $2::UUID,
+                        path = s.path || $3::jsonb,
+                        last_activity_at = NOW()
+                    FROM prev
+                    WHERE s.id = $1
+                    RETURNING prev.funnel_id, prev.current_node_id AS from_node_id, prev.revisit
+                ),
+                traversed AS (
+                    UPDATE funnel_edges e
+                    SET total_traversals = e.total_traversals + 1
+                    FROM moved
+                    WHERE e.funnel_id = moved.funnel_id
+                      AND e.from_node_id = moved.from_node_id
+                      AND e.to_node_id = $2::UUID
+                    RETURNING e.id
+                ),
+                entered AS (
+                    INSERT INTO funnel_variant_stats AS f (funnel_id, node_id, variant_id, entries)
+                    SELECT funnel_id, $2::UUID, $4::UUID, 1
+                    FROM moved
+                    WHERE $4::UUID IS NOT NULL AND NOT moved.revisit
+                    ON CONFLICT (funnel_id, node_id, variant_id) DO UPDATE SET
+                        entries = f.entries + 1,
+                        updated_at = NOW()
+                    RETURNING 1
+                )
+                SELECT COUNT(*) FROM moved
+                """,
+                session_id, node_id, json.dumps([step]), variant_id
+            )
+        return bool(moved)
+    
+    async def get_step_stats(self, funnel_id: str, node_id: str) -> Dict[str, Dict[str, Any]]:
+        """Downstream-conversion counters of a step, keyed by variant_id."""
+        async with self.db.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT variant_id, entries, conversions, conversion_value
+                FROM funnel_variant_stats
+                WHERE funnel_id = $1 AND node_id = $2
+                """,
+                funnel_id, node_id
+            )
+        return {str(row['variant_id']): dict(row) for row in rows}
+    
+    async def credit_conversion(
+        self,
+        funnel_id: str,
+        steps: List[Tuple[str, str]],
+        transitions: List[Tuple[str, str]],
+        conversion_value: float = 1.0
+    ) -> int:
+        """
+        Final conversion: credit every (node_id, variant_id) of the path and
+        every edge traversed, one batched statement each, in one transaction.
+        Returns steps credited.
+        """
+        async with self.db.acquire() as conn:
+            async with conn.transaction():
+                if steps:
+                    await conn.execute(
+                        """
+                        INSERT INTO funnel_variant_stats AS f (
+                            funnel_id, node_id, variant_id, entries, conversions, conversion_value
+                        )
+                        SELECT $1, u.node_id, u.variant_id, 0, 1, $4
+                        FROM UNNEST($2::UUID[], $3::UUID[]) AS u(node_id, variant_id)
+                        JOIN element_variants ev ON ev.id = u.variant_id
+                        ORDER BY u.node_id, u.variant_id
+                        ON CONFLICT (funnel_id, node_id, variant_id) DO UPDATE SET
+                            conversions = f.conversions + 1,
+                            conversion_value = f.conversion_value + EXCLUDED.conversion_value,
+                            updated_at = NOW()
+                        """,
+                        funnel_id,
+                        [s[0] for s in steps],
+                        [s[1] for s in steps],
+                        float(conversion_value)
+                    )
+                if transitions:
+                    await conn.execute(
+                        """
+                        UPDATE funnel_edges e
+                        SET successful_conversions = e.successful_conversions + 1
+                        FROM UNNEST($2::UUID[], $3::UUID[]) AS t(from_node_id, to_node_id)
+                        WHERE e.funnel_id = $1
+                          AND e.from_node_id = t.from_node_id
+                          AND e.to_node_id = t.to_node_id
+                        """,
+                        funnel_id,
+                        [t[0] for t in transitions],
+                        [t[1] for t in transitions]
+                    )
+        return len(steps)
 
 
 # For base class compatibility
@@ -0,0 +1,116 @@
+# data-access/repositories/prior_repository.py
+"""
+Prior Repository - Historical counters and fitted variant priors
+
+Lee los contadores finales de las variantes de experimentos completados
+(el histórico del ajuste) y guarda / consulta el prior Beta de cada
+cuenta y tipo de elemento. Ver database/schema/schema_priors.sql.
+
+Como DashboardSummaryRepository, no es un repositorio de entidades.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import asyncpg
+
+ACCOUNT_WIDE = '*'
+
+# One row per variant of a completed experiment, grouped by account
+HISTORY_SQL = """
+    SELECT
+        e.user_id,
+        ee.element_type,
+        e.id AS experiment_id,
+        ev.total_allocations AS allocations,
+        ev.total_conversions AS conversions
+    FROM experiments e
+    JOIN experiment_elements ee ON ee.experiment_id = e.id
+    JOIN element_variants ev ON ev.element_id = ee.id
+    WHERE e.status = 'completed'
+      AND ev.total_allocations >= $1
+      AND ($2::UUID[] IS NULL OR e.user_id = ANY($2::UUID[]))
+    ORDER BY e.user_id
+"""
+
+UPSERT_PRIORS_SQL = """
+    INSERT INTO variant_priors AS p (
+        user_id, element_type, alpha, beta, experiments, variants, method, fitted_at
+    )
+    SELECT u.user_id, u.element_type, u.alpha, u.beta, u.experiments, u.variants, $7, NOW()
+    FROM UNNEST(
+        $1::UUID[], $2::VARCHAR[], $3::DOUBLE PRECISION[],
+        $4::DOUBLE PRECISION[], $5::INT[], $6::INT[]
+    ) AS u(user_id, element_type, alpha, beta, experiments, variants)
+    ON CONFLICT (user_id, element_type) DO UPDATE SET
+        alpha = EXCLUDED.alpha,
+        beta = EXCLUDED.beta,
+        experiments = EXCLUDED.experiments,
+        variants = EXCLUDED.variants,
+        method = EXCLUDED.method,
+        fitted_at = EXCLUDED.fitted_at
+"""
+
+# The element type's own prior wins over the account-wide one
+PRIOR_FOR_EXPERIMENT_SQL = """
+    SELECT p.alpha, p.beta, p.element_type
+    FROM experiments e
+    JOIN variant_priors p ON p.user_id = e.user_id
+    WHERE e.id = $1
+      AND p.element_type IN ($2, '*')
+    ORDER BY p.element_type = '*'
+    LIMIT 1
+"""
+
+
+class PriorRepository:
+    """
+    Repository for variant_priors and the history it is fitted on
+
+    Not an entity repository (keyed by account and element type, rebuilt
+    from other tables), so it does not inherit from BaseRepository.
+    """
+
+    def __init__(self, db_pool: asyncpg.Pool):
+        self.db = db_pool
+
+    async def get_history(
+        self,
+        min_allocations: int,
+        user_ids: Optional[Sequence[str]] = None
+    ) -> List[asyncpg.Record]:
+        """Final counters of every variant of completed experiments"""
+        async with self.db.acquire() as conn:
+            return await conn.fetch(
+                HISTORY_SQL,
+                min_allocations,
+                [str(u) for u in user_ids] if user_ids is not None else None
+            )
+
+    async def save(self, priors: List[Dict[str, Any]], method: str) -> int:
+        """Upsert fitted priors in one statement. Returns rows written."""
+        if not priors:
+            return 0
+
+        async with self.db.acquire() as conn:
+            await conn.execute(
+                UPSERT_PRIORS_SQL,
+                [str(p['user_id']) for p in priors],
+                [p['element_type'] for p in priors],
+                [float(p['alpha']) for p in priors],
+                [float(p['beta']) for p in priors],
+                [int(p['experiments']) for p in priors],
+                [int(p['variants']) for p in priors],
+                method
+            )
+        return len(priors)
+
+    @staticmethod
+    async def get_for_experiment(conn, experiment_id: Any, element_type: str) -> Optional[Dict[str, Any]]:
+        """
+        Prior for a new variant of `experiment_id`
+
+        Runs on the caller's connection: experiment creation looks it up
+        inside its own transaction.
+        """
+        row = await conn.fetchrow(PRIOR_FOR_EXPERIMENT_SQL, experiment_id, element_type)
+        return dict(row) if row else None
@@ -0,0 +1,616 @@
+# data-access/repositories/rollup_repository.py
+"""
+Rollup Repository - Time-series buckets per experiment/variant
+
+Lecturas (timelines, gráficas, totales por periodo), agregación
+incremental de `assignments` en buckets de minuto/hora/día y
+reconstrucción histórica (backfill). Ver database/schema/schema_rollups.sql.
+
+No es un repositorio de entidades (no hay find_by_id/create/update),
+por eso no hereda de BaseRepository.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Dict, Any
+
+import asyncpg
+
+from engine.core.math._delay import DELAY_BIN_EDGES, N_DELAY_BINS
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RollupResolution:
+    name: str
+    table: str
+    partition_span: Optional[str]  # 'day' | 'month' | None (not partitioned)
+
+
+@dataclass
+class RollupWindow:
+    """A processed aggregation window and the accounts it touched"""
+    start: datetime
+    end: datetime
+    user_ids: List[str] = field(default_factory=list)
+
+
+RESOLUTION_MINUTE = RollupResolution('minute', 'variant_rollups_minute', 'day')
+RESOLUTION_HOUR = RollupResolution('hour', 'variant_rollups_hour', 'month')
+RESOLUTION_DAY = RollupResolution('day', 'variant_rollups_day', None)
+
+RESOLUTIONS: Dict[str, RollupResolution] = {
+    r.name: r for r in (RESOLUTION_MINUTE, RESOLUTION_HOUR, RESOLUTION_DAY)
+}
+
+
+@dataclass(frozen=True)
+class RollupPeriod:
+    """Dashboard period filter (24h/7d/30d/12m) → rollup table + lookback"""
+    name: str
+    lookback: timedelta
+    resolution: RollupResolution
+
+    def since(self, now: datetime) -> datetime:
+        """Start of the first bucket in the period (bucket-aligned, UTC)"""
+        ts = (now - self.lookback).astimezone(timezone.utc)
+        if self.resolution is RESOLUTION_HOUR:
+            return ts.replace(minute=0, second=0, microsecond=0)
+        return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+PERIODS: Dict[str, RollupPeriod] = {
+    p.name: p for p in (
+        RollupPeriod('24h', timedelta(hours=24), RESOLUTION_HOUR),
+        RollupPeriod('7d', timedelta(days=7), RESOLUTION_HOUR),
+        RollupPeriod('30d', timedelta(days=30), RESOLUTION_DAY),
+        RollupPeriod('12m', timedelta(days=365), RESOLUTION_DAY)
+    )
+}
+
+
+def resolve_period(period: str) -> RollupPeriod:
+    rollup_period = PERIODS.get(period)
+    if rollup_period is None:
+        raise ValueError(f"Unknown period: {period} (expected one of {', '.join(PERIODS)})")
+    return rollup_period
+
+
+ROLLUP_WATERMARK = 'variant_rollups'
+
+# Conversion delay histogram per experiment and day (delayed feedback)
+DELAY_TABLE = 'conversion_delay_rollups'
+_DELAY_EDGES = [float(edge) for edge in DELAY_BIN_EDGES]
+
+# Progress of the historical rebuild (see RollupBackfill)
+BACKFILL_WATERMARK = 'variant_rollups_backfill'
+
+# Held for the duration of an aggregation transaction so that only one
+# worker/process advances the watermark at a time
+_ADVISORY_LOCK_SQL = "SELECT pg_try_advisory_xact_lock(hashtext('samplit:variant_rollups'))"
+
+_SET_WATERMARK_SQL = """
+    INSERT INTO rollup_watermarks (name, processed_until, updated_at)
+    VALUES ($1, $2, NOW())
+    ON CONFLICT (name) DO UPDATE SET
+        processed_until = EXCLUDED.processed_until,
+        updated_at = NOW()
+"""
+
+# Allocations are bucketed by assigned_at and conversions by converted_at
+# (event time). The owner of the experiment rides along so hour/day rows
+# can be read per account; conversions carry their delay since assignment
+# and the order-value statistics of the revenue model (log of value > 0).
+_EVENTS_CTE = """
+    events AS (
+        SELECT a.experiment_id, a.variant_id, e.user_id, a.assigned_at AS ts,
+               1 AS allocations, 0 AS conversions, 0::NUMERIC AS value,
+               0 AS valued, 0::DOUBLE PRECISION AS log_value,
+               NULL::DOUBLE PRECISION AS delay
+        FROM assignments a
+        JOIN experiments e ON e.id = a.experiment_id
+        WHERE a.assigned_at >= $1 AND a.assigned_at < $2
+          AND a.variant_id IS NOT NULL
+        UNION ALL
+        SELECT a.experiment_id, a.variant_id, e.user_id, a.converted_at AS ts,
+               0, 1, COALESCE(a.conversion_value, 0),
+               CASE WHEN a.conversion_value > 0 THEN 1 ELSE 0 END,
+               CASE WHEN a.conversion_value > 0 THEN LN(a.conversion_value::DOUBLE PRECISION) ELSE 0 END,
+               EXTRACT(EPOCH FROM (a.converted_at - a.assigned_at))::DOUBLE PRECISION
+        FROM assignments a
+        JOIN experiments e ON e.id = a.experiment_id
+        WHERE a.converted_at >= $1 AND a.converted_at < $2
+          AND a.variant_id IS NOT NULL
+    )"""
+
+# One pass over the window feeds all three resolutions
+AGGREGATE_WINDOW_SQL = f"""
+    WITH {_EVENTS_CTE},
+    minute_rows AS (
+        INSERT INTO variant_rollups_minute AS r
+            (experiment_id, variant_id, bucket_start, allocations, conversions, conversion_value)
+        SELECT experiment_id, variant_id, DATE_TRUNC('minute', ts),
+               SUM(allocations), SUM(conversions), SUM(value)
+        FROM events
+        WHERE ts >= $3
+        GROUP BY 1, 2, 3
+        ON CONFLICT (experiment_id, bucket_start, variant_id) DO UPDATE SET
+            allocations = r.allocations + EXCLUDED.allocations,
+            conversions = r.conversions + EXCLUDED.conversions,
+            conversion_value = r.conversion_value + EXCLUDED.conversion_value
+        RETURNING 1
+    ),
+    hour_rows AS (
+        INSERT INTO variant_rollups_hour AS r
+            (experiment_id, variant_id, user_id, bucket_start, allocations, conversions, conversion_value,
+             valued_conversions, sum_log_value, sum_log_value_sq)
+        SELECT experiment_id, variant_id, user_id, DATE_TRUNC('hour', ts),
+               SUM(allocations), SUM(conversions), SUM(value),
+               SUM(valued), SUM(log_value), SUM(log_value ^ 2)
+        FROM events
+        WHERE ts >= $4
+        GROUP BY 1, 2, 3, 4
+        ON CONFLICT (experiment_id, bucket_start, variant_id) DO UPDATE SET
+            user_id = EXCLUDED.user_id,
+            allocations = r.allocations + EXCLUDED.allocations,
+            conversions = r.conversions + EXCLUDED.conversions,
+            conversion_value = r.conversion_value + EXCLUDED.conversion_value,
+            valued_conversions = r.valued_conversions + EXCLUDED.valued_conversions,
+            sum_log_value = r.sum_log_value + EXCLUDED.sum_log_value,
+            sum_log_value_sq = r.sum_log_value_sq + EXCLUDED.sum_log_value_sq
+        RETURNING 1
+    ),
+    day_rows AS (
+        INSERT INTO variant_rollups_day AS r
+            (experiment_id, variant_id, user_id, bucket_start, allocations, conversions, conversion_value,
+             valued_conversions, sum_log_value, sum_log_value_sq)
+        SELECT experiment_id, variant_id, user_id, DATE_TRUNC('day', ts),
+               SUM(allocations), SUM(conversions), SUM(value),
+               SUM(valued), SUM(log_value), SUM(log_value ^ 2)
+        FROM events
+        GROUP BY 1, 2, 3, 4
+        ON CONFLICT (experiment_id, bucket_start, variant_id) DO UPDATE SET
+            user_id = EXCLUDED.user_id,
+            allocations = r.allocations + EXCLUDED.allocations,
+            conversions = r.conversions + EXCLUDED.conversions,
+            conversion_value = r.conversion_value + EXCLUDED.conversion_value,
+            valued_conversions = r.valued_conversions + EXCLUDED.valued_conversions,
+            sum_log_value = r.sum_log_value + EXCLUDED.sum_log_value,
+            sum_log_value_sq = r.sum_log_value_sq + EXCLUDED.sum_log_value_sq
+        RETURNING 1
+    ),
+    delay_rows AS (
+        INSERT INTO conversion_delay_rollups AS r
+            (experiment_id, bucket_start, delay_bin, conversions)
+        SELECT experiment_id, DATE_TRUNC('day', ts), WIDTH_BUCKET(delay, $5::DOUBLE PRECISION[]),
+               COUNT(*)
+        FROM events
+        WHERE conversions = 1
+        GROUP BY 1, 2, 3
+        ON CONFLICT (experiment_id, bucket_start, delay_bin) DO UPDATE SET
+            conversions = r.conversions + EXCLUDED.conversions
+        RETURNING 1
+    )
+    SELECT
+        (SELECT COUNT(*) FROM minute_rows) AS minute_rows,
+        (SELECT COUNT(*) FROM hour_rows) AS hour_rows,
+        (SELECT COUNT(*) FROM day_rows) AS day_rows,
+        (SELECT ARRAY_AGG(DISTINCT user_id) FROM events) AS user_ids
+"""
+
+# Backfill: recompute hour/day buckets of a day-aligned chunk from scratch
+# (the caller deleted them in the same transaction, so plain INSERTs)
+REBUILD_CHUNK_SQL = f"""
+    WITH {_EVENTS_CTE},
+    hour_rows AS (
+        INSERT INTO variant_rollups_hour
+            (experiment_id, variant_id, user_id, bucket_start, allocations, conversions, conversion_value,
+             valued_conversions, sum_log_value, sum_log_value_sq)
+        SELECT experiment_id, variant_id, user_id, DATE_TRUNC('hour', ts),
+               SUM(allocations), SUM(conversions), SUM(value),
+               SUM(valued), SUM(log_value), SUM(log_value ^ 2)
+        FROM events
+        WHERE ts >= $3
+        GROUP BY 1, 2, 3, 4
+        RETURNING 1
+    ),
+    day_rows AS (
+        INSERT INTO variant_rollups_day
+            (experiment_id, variant_id, user_id, bucket_start, allocations, conversions, conversion_value,
+             valued_conversions, sum_log_value, sum_log_value_sq)
+        SELECT experiment_id, variant_id, user_id, DATE_TRUNC('day', ts),
+               SUM(allocations), SUM(conversions), SUM(value),
+               SUM(valued), SUM(log_value), SUM(log_value ^ 2)
+        FROM events
+        GROUP BY 1, 2, 3, 4
+        RETURNING 1
+    ),
+    delay_rows AS (
+        INSERT INTO conversion_delay_rollups
+            (experiment_id, bucket_start, delay_bin, conversions)
+        SELECT experiment_id, DATE_TRUNC('day', ts), WIDTH_BUCKET(delay, $4::DOUBLE PRECISION[]),
+               COUNT(*)
+        FROM events
+        WHERE conversions = 1
+        GROUP BY 1, 2, 3
+        RETURNING 1
+    )
+    SELECT
+        (SELECT COUNT(*) FROM hour_rows) AS hour_rows,
+        (SELECT COUNT(*) FROM day_rows) AS day_rows
+"""
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# PARTITION HELPERS
+# ════════════════════════════════════════════════════════════════════════════
+
+def partition_start(span: str, ts: datetime) -> datetime:
+    """Start of the partition (UTC day or month) containing `ts`"""
+    ts = ts.astimezone(timezone.utc)
+    if span == 'day':
+        return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    return ts.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_partition_start(span: str, start: datetime) -> datetime:
+    if span == 'day':
+        return start + timedelta(days=1)
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+def partition_name(resolution: RollupResolution, start: datetime) -> str:
+    fmt = '%Y%m%d' if resolution.partition_span == 'day' else '%Y%m'
+    return f"{resolution.table}_p{start.strftime(fmt)}"
+
+
+def parse_partition_start(resolution: RollupResolution, name: str) -> Optional[datetime]:
+    prefix = f"{resolution.table}_p"
+    if not name.startswith(prefix):
+        return None
+    fmt = '%Y%m%d' if resolution.partition_span == 'day' else '%Y%m'
+    try:
+        return datetime.strptime(name[len(prefix):], fmt).replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+class RollupRepository:
+    """
+    Repository for time-series rollups
+
+    Reads return a few hundred pre-aggregated rows instead of
+    GROUP BYs over raw assignments.
+    """
+
+    def __init__(self, db_pool: asyncpg.Pool):
+        self.db = db_pool
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # READS
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    async def get_timeline(
+        self,
+        experiment_id: str,
+        resolution: str = 'day',
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Per-variant buckets for an experiment, oldest first.
+
+        Returns rows with bucket_start, variant_id, allocations,
+        conversions and conversion_value.
+        """
+        res = RESOLUTIONS.get(resolution)
+        if res is None:
+            raise ValueError(f"Unknown rollup resolution: {resolution}")
+
+        async with self.db.acquire() as conn:
+            rows = await conn.fetch(
+                f"""
+                SELECT bucket_start, variant_id, allocations, conversions, conversion_value
+                FROM {res.table}
+                WHERE experiment_id = $1
+                  AND ($2::TIMESTAMPTZ IS NULL OR bucket_start >= $2)
+                  AND ($3::TIMESTAMPTZ IS NULL OR bucket_start < $3)
+                ORDER BY bucket_start, variant_id
+                """,
+                experiment_id, since, until
+            )
+
+        return [dict(row) for row in rows]
+
+    async def get_user_series(
+        self,
+        user_id: str,
+        period: str,
+        now: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Account-wide buckets for a period, oldest first.
+
+        Index-only scan on (user_id, bucket_start): at most 168 hour rows
+        (7d) or 365 day rows (12m) per variant, whatever the traffic.
+        Raises ValueError for an unknown period.
+        """
+        rollup_period = resolve_period(period)
+        since = rollup_period.since(now or datetime.now(timezone.utc))
+
+        async with self.db.acquire() as conn:
+            rows = await conn.fetch(
+                f"""
+                SELECT bucket_start,
+                       SUM(allocations) AS allocations,
+                       SUM(conversions) AS conversions,
+                       SUM(conversion_value) AS conversion_value
+                FROM {rollup_period.resolution.table}
+                WHERE user_id = $1 AND bucket_start >= $2
+                GROUP BY bucket_start
+                ORDER BY bucket_start
+                """,
+                user_id, since
+            )
+
+        return [dict(row) for row in rows]
+
+    async def get_variant_totals(
+        self,
+        experiment_id: str,
+        period: str,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-variant allocations/conversions/value and order-value
+        statistics within a period, keyed by variant id. Raises
+        ValueError for an unknown period.
+        """
+        rollup_period = resolve_period(period)
+        since = rollup_period.since(now or datetime.now(timezone.utc))
+
+        async with self.db.acquire() as conn:
+            rows = await conn.fetch(
+                f"""
+                SELECT variant_id,
+                       SUM(allocations) AS allocations,
+                       SUM(conversions) AS conversions,
+                       SUM(conversion_value) AS conversion_value,
+                       SUM(valued_conversions) AS valued_conversions,
+                       SUM(sum_log_value) AS sum_log_value,
+                       SUM(sum_log_value_sq) AS sum_log_value_sq
+                FROM {rollup_period.resolution.table}
+                WHERE experiment_id = $1 AND bucket_start >= $2
+                GROUP BY variant_id
+                """,
+                experiment_id, since
+            )
+
+        return {str(row['variant_id']): dict(row) for row in rows}
+
+    async def get_delay_histogram(
+        self,
+        experiment_id: str,
+        since: Optional[datetime] = None
+    ) -> List[int]:
+        """
+        Conversions per delay bin (see engine/core/math/_delay.py) for
+        conversions since `since`; always N_DELAY_BINS long.
+        """
+        async with self.db.acquire() as conn:
+            rows = await conn.fetch(
+                f"""
+                SELECT delay_bin, SUM(conversions) AS conversions
+                FROM {DELAY_TABLE}
+                WHERE experiment_id = $1
+                  AND ($2::TIMESTAMPTZ IS NULL OR bucket_start >= $2)
+                GROUP BY delay_bin
+                """,
+                experiment_id, since
+            )
+
+        histogram = [0] * N_DELAY_BINS
+        for row in rows:
+            histogram[min(max(row['delay_bin'], 0), N_DELAY_BINS - 1)] += int(row['conversions'])
+        return histogram
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # AGGREGATION
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    async def aggregate_next_window(
+        self,
+        lag_seconds: float,
+        max_window: timedelta,
+        minute_cutoff: datetime,
+        hour_cutoff: datetime
+    ) -> Optional[RollupWindow]:
+        """
+        Fold the next window of assignments into the rollups.
+
+        The window starts at the watermark and ends at most `max_window`
+        later and never after NOW() - lag (late commits). Rollup upserts
+        and watermark advance share one transaction, so each event is
+        counted exactly once. Returns the processed window (with the
+        owners of the experiments that had events), or None if there was
+        nothing to do or another worker holds the lock.
+        """
+        async with self.db.acquire() as conn:
+            async with conn.transaction():
+                if not await conn.fetchval(_ADVISORY_LOCK_SQL):
+                    return None
+
+                start = await conn.fetchval(
+                    "SELECT processed_until FROM rollup_watermarks WHERE name = $1",
+                    ROLLUP_WATERMARK
+                )
+                if start is None:
+                    # First run: start from the oldest assignment
+                    start = await conn.fetchval(
+                        "SELECT DATE_TRUNC('minute', MIN(assigned_at)) FROM assignments"
+                    )
+                    if start is None:
+                        return None
+
+                horizon = await conn.fetchval(
+                    "SELECT NOW() - make_interval(secs => $1)", float(lag_seconds)
+                )
+                end = min(start + max_window, horizon)
+                if end <= start:
+                    return None
+
+                result = await conn.fetchrow(
+                    AGGREGATE_WINDOW_SQL,
+                    start, end, minute_cutoff, hour_cutoff, _DELAY_EDGES
+                )
+
+                await conn.execute(
+                    _SET_WATERMARK_SQL,
+                    ROLLUP_WATERMARK, end
+                )
+
+        return RollupWindow(
+            start=start,
+            end=end,
+            user_ids=[str(u) for u in (result['user_ids'] or [])]
+        )
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # BACKFILL
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    async def get_watermark(self, name: str) -> Optional[datetime]:
+        async with self.db.acquire() as conn:
+            return await conn.fetchval(
+                "SELECT processed_until FROM rollup_watermarks WHERE name = $1",
+                name
+            )
+
+    async def init_watermark(self, name: str, processed_until: datetime) -> datetime:
+        """Set the watermark only if absent; returns the effective value"""
+        async with self.db.acquire() as conn:
+            await conn.execute(
+                """
+                INSERT INTO rollup_watermarks (name, processed_until, updated_at)
+                VALUES ($1, $2, NOW())
+                ON CONFLICT (name) DO NOTHING
+                """,
+                name, processed_until
+            )
+            return await conn.fetchval(
+                "SELECT processed_until FROM rollup_watermarks WHERE name = $1",
+                name
+            )
+
+    async def get_oldest_event(self) -> Optional[datetime]:
+        async with self.db.acquire() as conn:
+            return await conn.fetchval("SELECT MIN(assigned_at) FROM assignments")
+
+    async def rebuild_chunk(
+        self,
+        start: datetime,
+        end: datetime,
+        hour_cutoff: datetime
+    ) -> Optional[Dict[str, int]]:
+        """
+        Recompute the hour/day buckets in [start, end) from `assignments`.
+
+        `start`/`end` must be day-aligned and `end` must not pass the live
+        watermark: those buckets are then complete and no longer touched
+        by the aggregator, so delete + insert is exact and idempotent.
+        Backfill progress advances in the same transaction. Returns row
+        counts, or None if the aggregator holds the lock (retry later).
+        """
+        async with self.db.acquire() as conn:
+            async with conn.transaction():
+                if not await conn.fetchval(_ADVISORY_LOCK_SQL):
+                    return None
+
+                live = await conn.fetchval(
+                    "SELECT processed_until FROM rollup_watermarks WHERE name = $1",
+                    ROLLUP_WATERMARK
+                )
+                if live is None or end > live:
+                    raise ValueError(f"Backfill chunk ends at {end}, past the live watermark {live}")
+
+                for table in (RESOLUTION_HOUR.table, RESOLUTION_DAY.table, DELAY_TABLE):
+                    await conn.execute(
+                        f"DELETE FROM {table} WHERE bucket_start >= $1 AND bucket_start < $2",
+                        start, end
+                    )
+
+                result = await conn.fetchrow(REBUILD_CHUNK_SQL, start, end, hour_cutoff, _DELAY_EDGES)
+
+                await conn.execute(
+                    _SET_WATERMARK_SQL,
+                    BACKFILL_WATERMARK, end
+                )
+
+        return {'hour_rows': result['hour_rows'], 'day_rows': result['day_rows']}
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # PARTITIONS & RETENTION
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    async def ensure_partitions(
+        self,
+        resolution: RollupResolution,
+        cutoff: datetime,
+        now: datetime
+    ) -> int:
+        """Create partitions from `cutoff` through the one after `now`"""
+        span = resolution.partition_span
+        start = partition_start(span, cutoff)
+        last = next_partition_start(span, partition_start(span, now))
+        created = 0
+
+        async with self.db.acquire() as conn:
+            while start <= last:
+                end = next_partition_start(span, start)
+                await conn.execute(
+                    f"""
+                    CREATE TABLE IF NOT EXISTS {partition_name(resolution, start)}
+                    PARTITION OF {resolution.table}
+                    FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')
+                    """
+                )
+                created += 1
+                start = end
+
+        return created
+
+    async def drop_expired_partitions(
+        self,
+        resolution: RollupResolution,
+        cutoff: datetime
+    ) -> List[str]:
+        """Drop partitions whose whole range is older than `cutoff`"""
+        dropped = []
+
+        async with self.db.acquire() as conn:
+            names = await conn.fetch(
+                """
+                SELECT c.relname
+                FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                JOIN pg_class p ON p.oid = i.inhparent
+                WHERE p.relname = $1
+                """,
+                resolution.table
+            )
+
+            for row in names:
+                start = parse_partition_start(resolution, row['relname'])
+                if start is None:
+                    continue
+                if next_partition_start(resolution.partition_span, start) <= cutoff:
+                    await conn.execute(f"DROP TABLE IF EXISTS {row['relname']}")
+                    dropped.append(row['relname'])
+
+        if dropped:
+            logger.info(f"Dropped expired rollup partitions: {', '.join(dropped)}")
+        return dropped
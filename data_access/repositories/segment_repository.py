@@ -0,0 +1,78 @@
+# data-access/repositories/segment_repository.py
+"""
+Segment Repository - Per-segment counters of segment-aware experiments
+
+Guarda los contadores (segmento, variante) de los experimentos con
+optimization_strategy = 'segmented'. Ver database/schema/schema_segments.sql.
+
+Como DashboardSummaryRepository, no es un repositorio de entidades.
+"""
+
+from typing import Any, List, Sequence, Tuple
+
+import asyncpg
+
+SEGMENT_COUNTS_SQL = """
+    SELECT segment_key, variant_id, allocations, conversions
+    FROM segment_counts
+    WHERE experiment_id = $1
+"""
+
+# Additive: every worker flushes its own increments. Rows go in key order
+# so concurrent flushes lock them in the same order (no deadlocks); rows of
+# variants deleted since the visit are dropped instead of failing the batch.
+ADD_SEGMENT_COUNTS_SQL = """
+    INSERT INTO segment_counts AS s (
+        experiment_id, segment_key, variant_id, allocations, conversions, updated_at
+    )
+    SELECT u.experiment_id, u.segment_key, u.variant_id, u.allocations, u.conversions, NOW()
+    FROM UNNEST(
+        $1::UUID[], $2::VARCHAR[], $3::UUID[], $4::BIGINT[], $5::BIGINT[]
+    ) AS u(experiment_id, segment_key, variant_id, allocations, conversions)
+    JOIN element_variants ev ON ev.id = u.variant_id
+    ORDER BY u.experiment_id, u.segment_key, u.variant_id
+    ON CONFLICT (experiment_id, segment_key, variant_id) DO UPDATE SET
+        allocations = s.allocations + EXCLUDED.allocations,
+        conversions = s.conversions + EXCLUDED.conversions,
+        updated_at = EXCLUDED.updated_at
+"""
+
+
+class SegmentRepository:
+    """
+    Repository for segment_counts
+
+    Not an entity repository (one counter per experiment, segment and
+    variant, written in batches), so it does not inherit from BaseRepository.
+    """
+
+    def __init__(self, db_pool: asyncpg.Pool):
+        self.db = db_pool
+
+    async def get_counts(self, experiment_id: Any) -> List[Tuple[str, str, int, int]]:
+        """(segment_key, variant_id, allocations, conversions) of one experiment"""
+        async with self.db.acquire() as conn:
+            rows = await conn.fetch(SEGMENT_COUNTS_SQL, experiment_id)
+        return [
+            (row['segment_key'], str(row['variant_id']), row['allocations'], row['conversions'])
+            for row in rows
+        ]
+
+    async def add_counts(self, rows: Sequence[Tuple[Any, str, Any, int, int]]) -> int:
+        """
+        Add (experiment_id, segment_key, variant_id, allocations, conversions)
+        increments in one statement. Returns rows written.
+        """
+        if not rows:
+            return 0
+
+        async with self.db.acquire() as conn:
+            await conn.execute(
+                ADD_SEGMENT_COUNTS_SQL,
+                [str(r[0]) for r in rows],
+                [r[1] for r in rows],
+                [str(r[2]) for r in rows],
+                [int(r[3]) for r in rows],
+                [int(r[4]) for r in rows]
+            )
+        return len(rows)
@@ -0,0 +1,140 @@
+# data-access/repositories/sequential_repository.py
+"""
+Sequential Repository - State and actions of the sequential evaluator
+
+Lee los contadores de las variantes de experimentos activos junto con el
+estado del test secuencial (p-valor mínimo, confidence sequence), guarda
+ese estado y aplica pausas / cierres. Ver database/schema/schema_sequential.sql.
+
+Como RollupRepository, no es un repositorio de entidades.
+"""
+
+import logging
+from typing import Any, Dict, List
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+
+# Experiments opt out with config = {"sequential": {"enabled": false}}
+_ARMS_SELECT = """
+    SELECT
+        e.id AS experiment_id,
+        e.user_id,
+        e.confidence_threshold,
+        ev.element_id,
+        ev.id AS variant_id,
+        ev.variant_order,
+        COALESCE(ev.is_active, TRUE) AS is_active,
+        COALESCE(ev.total_allocations, 0) AS allocations,
+        COALESCE(ev.total_conversions, 0) AS conversions,
+        s.allocations AS last_allocations,
+        s.conversions AS last_conversions,
+        s.min_p_value,
+        s.ci_lower,
+        s.ci_upper
+    FROM experiments e
+    JOIN experiment_elements ee ON ee.experiment_id = e.id
+    JOIN element_variants ev ON ev.element_id = ee.id
+    LEFT JOIN sequential_test_state s ON s.variant_id = ev.id
+    WHERE e.status = 'active'
+      AND COALESCE((e.config -> 'sequential' ->> 'enabled')::BOOLEAN, TRUE)
+"""
+
+ACTIVE_ARMS_SQL = _ARMS_SELECT + """
+    ORDER BY e.id, ev.element_id, ev.variant_order, ev.id
+"""
+
+EXPERIMENT_ARMS_SQL = _ARMS_SELECT + """
+      AND e.id = $1
+    ORDER BY ev.element_id, ev.variant_order, ev.id
+"""
+
+UPSERT_STATE_SQL = """
+    INSERT INTO sequential_test_state (
+        variant_id, experiment_id, allocations, conversions,
+        min_p_value, ci_lower, ci_upper, expected_loss, updated_at
+    )
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, NOW())
+    ON CONFLICT (variant_id) DO UPDATE SET
+        allocations = EXCLUDED.allocations,
+        conversions = EXCLUDED.conversions,
+        min_p_value = EXCLUDED.min_p_value,
+        ci_lower = EXCLUDED.ci_lower,
+        ci_upper = EXCLUDED.ci_upper,
+        expected_loss = EXCLUDED.expected_loss,
+        updated_at = NOW()
+"""
+
+# Never leaves an element without an active variant
+DEACTIVATE_VARIANT_SQL = """
+    UPDATE element_variants ev
+    SET is_active = FALSE, updated_at = NOW()
+    WHERE ev.id = $1
+      AND ev.is_active
+      AND EXISTS (
+          SELECT 1 FROM element_variants other
+          WHERE other.element_id = ev.element_id
+            AND other.id <> ev.id
+            AND other.is_active
+      )
+    RETURNING ev.id
+"""
+
+COMPLETE_EXPERIMENT_SQL = """
+    UPDATE experiments
+    SET status = 'completed', completed_at = NOW(), updated_at = NOW()
+    WHERE id = $1 AND status = 'active'
+    RETURNING id
+"""
+
+# Per experiment, held until the evaluation transaction ends. Transaction-
+# scoped so it is safe behind a transaction-mode pooler (Supavisor), where
+# consecutive transactions of one client may run on different backends.
+_EXPERIMENT_LOCK_SQL = "SELECT pg_try_advisory_xact_lock(hashtext('samplit:sequential:' || $1::TEXT))"
+
+
+class SequentialRepository:
+    """Repository for the sequential testing evaluator"""
+
+    def __init__(self, db_pool: asyncpg.Pool):
+        self.db = db_pool
+
+    def connection(self):
+        """`async with repo.connection() as conn` (the evaluator's connection)"""
+        return self.db.acquire()
+
+    async def lock_experiment(self, conn, experiment_id: Any) -> bool:
+        """
+        Try the experiment's evaluation lock; call inside `conn.transaction()`.
+        False if another worker is evaluating it right now.
+        """
+        return bool(await conn.fetchval(_EXPERIMENT_LOCK_SQL, str(experiment_id)))
+
+    async def get_active_arms(self, conn) -> List[Dict[str, Any]]:
+        rows = await conn.fetch(ACTIVE_ARMS_SQL)
+        return [dict(row) for row in rows]
+
+    async def get_experiment_arms(self, conn, experiment_id: Any) -> List[Dict[str, Any]]:
+        """Arms of one experiment (empty if it is no longer active)"""
+        rows = await conn.fetch(EXPERIMENT_ARMS_SQL, experiment_id)
+        return [dict(row) for row in rows]
+
+    async def save_state(self, conn, experiment_id: Any, states: List[Dict[str, Any]]):
+        if not states:
+            return
+        await conn.executemany(UPSERT_STATE_SQL, [
+            (
+                s['variant_id'], experiment_id,
+                s['allocations'], s['conversions'],
+                s['min_p_value'], s['ci_lower'], s['ci_upper'], s.get('expected_loss')
+            )
+            for s in states
+        ])
+
+    async def deactivate_variant(self, conn, variant_id: Any) -> bool:
+        return await conn.fetchval(DEACTIVATE_VARIANT_SQL, variant_id) is not None
+
+    async def complete_experiment(self, conn, experiment_id: Any) -> bool:
+        return await conn.fetchval(COMPLETE_EXPERIMENT_SQL, experiment_id) is not None
@@ -13,6 +13,55 @@ from typing import Optional, List, Dict, Any
 from .base_repository import BaseRepository
 import json
 
+# Hot-path statements (tracker). Kept as constants so the exact same text
+# is used when pre-preparing them (see data_access/statements.py).
+VARIANTS_FOR_OPTIMIZATION_SQL = """
+    SELECT 
+        ev.id, ev.name, ev.content,
+        ev.algorithm_state,
+        ev.total_allocations, ev.total_conversions,
+        ev.conversion_rate as observed_conversion_rate,
+        ev.is_active,
+        ev.valued_conversions, ev.total_value,
+        ev.sum_log_value, ev.sum_log_value_sq,
+        e.optimization_strategy
+    FROM element_variants ev
+    JOIN experiment_elements ee ON ev.element_id = ee.id
+    JOIN experiments e ON e.id = ee.experiment_id
+    WHERE ee.experiment_id = $1
+      AND ev.is_active
+"""
+
+INCREMENT_ALLOCATION_SQL = """
+    UPDATE element_variants
+    SET 
+        total_allocations = total_allocations + 1,
+        updated_at = NOW()
+    WHERE id = $1
+    RETURNING total_allocations
+"""
+
+# $2 = conversion value (NULL / <= 0: conversion without value).
+# Value sufficient statistics (schema_revenue.sql) move in the same UPDATE.
+INCREMENT_CONVERSION_SQL = """
+    UPDATE element_variants
+    SET 
+        total_conversions = total_conversions + 1,
+        conversion_rate = 
+            (total_conversions + 1)::DECIMAL / 
+            GREATEST(total_allocations, 1)::DECIMAL,
+        valued_conversions = valued_conversions + (COALESCE($2::DOUBLE PRECISION, 0) > 0)::INT,
+        total_value = total_value + GREATEST(COALESCE($2::DOUBLE PRECISION, 0), 0)::NUMERIC,
+        sum_log_value = sum_log_value + CASE
+            WHEN $2::DOUBLE PRECISION > 0 THEN LN($2::DOUBLE PRECISION) ELSE 0 END,
+        sum_log_value_sq = sum_log_value_sq + CASE
+            WHEN $2::DOUBLE PRECISION > 0 THEN LN($2::DOUBLE PRECISION) ^ 2 ELSE 0 END,
+        updated_at = NOW()
+    WHERE id = $1
+    RETURNING total_conversions, conversion_rate
+"""
+
+
 class VariantRepository(BaseRepository):
     """
     Repository for variants 
@@ -158,17 +207,7 @@ class VariantRepository(BaseRepository):
         
         async with self.db.acquire() as conn:
             rows = await conn.fetch(
-                """
-                SELECT 
-                    ev.id, ev.name, ev.content,
-                    ev.algorithm_state,
-                    ev.total_allocations, ev.total_conversions,
-                    ev.conversion_rate as observed_conversion_rate,
-                    TRUE as is_active
-                FROM element_variants ev
-                JOIN experiment_elements ee ON ev.element_id = ee.id
-                WHERE ee.experiment_id = $1
-                """,
+                VARIANTS_FOR_OPTIMIZATION_SQL,
                 experiment_id
             )
         
@@ -216,12 +255,17 @@ class VariantRepository(BaseRepository):
         
         return dict(row) if row else None
 
-    async def increment_conversion(self, variant_id: str) -> int:
+    async def increment_conversion(
+        self,
+        variant_id: str,
+        conversion_value: Optional[float] = None
+    ) -> int:
         """
         ✅ FIXED: Increment conversion count atomically with RETURNING
     
         Called after recording a conversion in allocations table.
-        Updates public-facing metrics.
+        Updates public-facing metrics and, when the conversion carries a
+        positive value, the running value statistics (O(1), same UPDATE).
         
         Returns:
             New total_conversions value
@@ -231,18 +275,9 @@ class VariantRepository(BaseRepository):
         """
         async with self.db.acquire() as conn:
             result = await conn.fetchrow(
-                """
-                UPDATE element_variants
-                SET 
-                    total_conversions = total_conversions + 1,
-                    conversion_rate = 
-                        (total_conversions + 1)::DECIMAL / 
-                        GREATEST(total_allocations, 1)::DECIMAL,
-                    updated_at = NOW()
-                WHERE id = $1
-                RETURNING total_conversions, conversion_rate
-                """,
-                variant_id
+                INCREMENT_CONVERSION_SQL,
+                variant_id,
+                float(conversion_value) if conversion_value is not None else None
             )
         
         if result is None:
@@ -264,14 +299,7 @@ class VariantRepository(BaseRepository):
         """
         async with self.db.acquire() as conn:
             new_total = await conn.fetchval(
-                """
-                UPDATE element_variants
-                SET 
-                    total_allocations = total_allocations + 1,
-                    updated_at = NOW()
-                WHERE id = $1
-                RETURNING total_allocations
-                """,
+                INCREMENT_ALLOCATION_SQL,
                 variant_id
             )
         
@@ -0,0 +1,82 @@
+# data-access/statements.py
+
+"""
+Prepared statement support for the tracker hot path.
+
+En modo transaction pooler (Supavisor :6543) los prepared statements no
+sobreviven entre transacciones, así que `statement_cache_size=0`.
+Con conexión directa o session pooler (:5432) cada conexión es nuestra:
+activamos la caché de statements de asyncpg y pre-preparamos las
+queries del hot path al crear la conexión, de modo que Postgres no
+las vuelve a parsear/planificar en cada llamada.
+"""
+
+import logging
+
+import asyncpg
+
+from data_access.repositories.assignment_repository import (
+    GET_ASSIGNMENT_SQL,
+    CREATE_ASSIGNMENT_SQL,
+    RECORD_CONVERSION_SQL
+)
+from data_access.repositories.variant_repository import (
+    VARIANTS_FOR_OPTIMIZATION_SQL,
+    INCREMENT_ALLOCATION_SQL,
+    INCREMENT_CONVERSION_SQL
+)
+
+logger = logging.getLogger(__name__)
+
+
+CONNECTION_MODE_TRANSACTION = 'transaction'
+CONNECTION_MODE_SESSION = 'session'
+CONNECTION_MODE_DIRECT = 'direct'
+
+CONNECTION_MODES = (
+    CONNECTION_MODE_TRANSACTION,
+    CONNECTION_MODE_SESSION,
+    CONNECTION_MODE_DIRECT
+)
+
+
+INSTALLATION_STATUS_SQL = """
+    SELECT id, status, user_id FROM platform_installations WHERE installation_token = $1
+"""
+
+# /tracker/assign and /tracker/convert
+HOT_PATH_STATEMENTS = (
+    INSTALLATION_STATUS_SQL,
+    GET_ASSIGNMENT_SQL,
+    VARIANTS_FOR_OPTIMIZATION_SQL,
+    CREATE_ASSIGNMENT_SQL,
+    INCREMENT_ALLOCATION_SQL,
+    RECORD_CONVERSION_SQL,
+    INCREMENT_CONVERSION_SQL,
+)
+
+
+def supports_prepared_statements(mode: str) -> bool:
+    """Prepared statements are only safe when we own the server session"""
+    return mode in (CONNECTION_MODE_SESSION, CONNECTION_MODE_DIRECT)
+
+
+async def prepare_hot_path(conn: asyncpg.Connection) -> None:
+    """
+    Pool `init` callback: warm the connection's statement cache.
+
+    asyncpg's public `prepare()` bypasses the per-connection LRU used by
+    `fetch`/`execute`, so the cache is populated through
+    `_get_statement()` (same text → cache hit on the first real call).
+    """
+    warm = getattr(conn, '_get_statement', None)
+
+    for sql in HOT_PATH_STATEMENTS:
+        try:
+            if warm is not None:
+                await warm(sql, None)
+            else:
+                await conn.prepare(sql)
+        except Exception as e:
+            # Missing table/column on a partial schema must not break the pool
+            logger.debug(f"Could not pre-prepare hot path statement: {e}")
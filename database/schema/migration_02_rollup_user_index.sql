@@ -0,0 +1,15 @@
+-- Migration: user_id + covering index on hour/day rollups
+-- Date: 2026-10-18
+--
+-- For databases created with schema_rollups.sql 1.0. Existing rows keep
+-- user_id NULL until the backfill rebuilds them:
+--   python scripts/backfill_rollups.py --restart
+
+ALTER TABLE variant_rollups_hour ADD COLUMN IF NOT EXISTS user_id UUID;
+ALTER TABLE variant_rollups_day ADD COLUMN IF NOT EXISTS user_id UUID;
+
+CREATE INDEX IF NOT EXISTS idx_variant_rollups_hour_user ON variant_rollups_hour
+    (user_id, bucket_start) INCLUDE (allocations, conversions, conversion_value);
+
+CREATE INDEX IF NOT EXISTS idx_variant_rollups_day_user ON variant_rollups_day
+    (user_id, bucket_start) INCLUDE (allocations, conversions, conversion_value);
@@ -0,0 +1,14 @@
+-- Migration: order-value statistics on hour/day rollups
+-- Date: 2026-10-18
+--
+-- For databases created with schema_rollups.sql 1.2 or earlier. Existing
+-- buckets keep zero valued conversions until the backfill rebuilds them:
+--   python scripts/backfill_rollups.py --restart
+
+ALTER TABLE variant_rollups_hour ADD COLUMN IF NOT EXISTS valued_conversions BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE variant_rollups_hour ADD COLUMN IF NOT EXISTS sum_log_value DOUBLE PRECISION NOT NULL DEFAULT 0;
+ALTER TABLE variant_rollups_hour ADD COLUMN IF NOT EXISTS sum_log_value_sq DOUBLE PRECISION NOT NULL DEFAULT 0;
+
+ALTER TABLE variant_rollups_day ADD COLUMN IF NOT EXISTS valued_conversions BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE variant_rollups_day ADD COLUMN IF NOT EXISTS sum_log_value DOUBLE PRECISION NOT NULL DEFAULT 0;
+ALTER TABLE variant_rollups_day ADD COLUMN IF NOT EXISTS sum_log_value_sq DOUBLE PRECISION NOT NULL DEFAULT 0;
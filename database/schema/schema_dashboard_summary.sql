@@ -0,0 +1,48 @@
+-- schema_dashboard_summary.sql
+-- Per-user dashboard summary (materialized incrementally)
+-- Version: 1.0
+--
+-- Una fila por usuario con los totales del dashboard. Se recalcula:
+--   - por RollupAggregator para los usuarios con tráfico en cada ventana
+--   - en la siguiente lectura cuando un experimento del usuario se crea,
+--     cambia de estado o se borra (el trigger marca la fila como stale)
+-- GET /dashboard/ y /analytics/global son lecturas por primary key.
+
+-- ============================================
+-- TABLE: USER_DASHBOARD_SUMMARY
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS user_dashboard_summary (
+    user_id UUID PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    total_experiments INTEGER NOT NULL DEFAULT 0,
+    active_experiments INTEGER NOT NULL DEFAULT 0,
+    total_visitors BIGINT NOT NULL DEFAULT 0,
+    total_conversions BIGINT NOT NULL DEFAULT 0,
+    recent_experiments JSONB NOT NULL DEFAULT '[]',  -- 5 most recent, non-archived
+    is_stale BOOLEAN NOT NULL DEFAULT FALSE,
+    refreshed_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- ============================================
+-- TRIGGER: MARK SUMMARY STALE ON EXPERIMENT CHANGES
+-- ============================================
+
+CREATE OR REPLACE FUNCTION mark_dashboard_summary_stale()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        UPDATE user_dashboard_summary SET is_stale = TRUE WHERE user_id = OLD.user_id;
+        RETURN OLD;
+    END IF;
+
+    UPDATE user_dashboard_summary SET is_stale = TRUE WHERE user_id = NEW.user_id;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS experiments_dashboard_summary_stale ON experiments;
+CREATE TRIGGER experiments_dashboard_summary_stale
+    AFTER INSERT OR DELETE OR UPDATE OF status, name, started_at ON experiments
+    FOR EACH ROW EXECUTE FUNCTION mark_dashboard_summary_stale();
+
+COMMENT ON TABLE user_dashboard_summary IS 'Materialized dashboard totals per user (see DashboardSummaryService)';
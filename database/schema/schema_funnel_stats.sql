@@ -0,0 +1,42 @@
+-- schema_funnel_stats.sql
+-- Downstream-conversion counters for funnel (sequential) optimization
+-- Version: 1.0
+--
+-- Cada variante servida en un paso del embudo acumula las sesiones que
+-- entraron por ella (entries) y cuántas llegaron a la conversión final
+-- del embudo (conversions). SequentialAllocator elige con ese posterior,
+-- así que cada paso se optimiza para la conversión end-to-end:
+--
+-- - Paso completado: un único statement (path de la sesión, tráfico de
+--   la arista y entries), independiente de la longitud del embudo.
+-- - Conversión final: un UPSERT por lotes con todos los pasos del camino
+--   y un UPDATE por lotes de funnel_edges.successful_conversions.
+--
+-- Requiere las tablas funnels / funnel_nodes / funnel_edges /
+-- funnel_sessions. Idempotente.
+
+-- ============================================
+-- TABLE: FUNNEL_VARIANT_STATS
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS funnel_variant_stats (
+    funnel_id UUID NOT NULL REFERENCES funnels(id) ON DELETE CASCADE,
+    node_id UUID NOT NULL REFERENCES funnel_nodes(id) ON DELETE CASCADE,
+    variant_id UUID NOT NULL REFERENCES element_variants(id) ON DELETE CASCADE,
+
+    -- Sessions that entered the step with this variant (once per session)
+    entries BIGINT NOT NULL DEFAULT 0,
+    -- ... and reached the end of the funnel
+    conversions BIGINT NOT NULL DEFAULT 0,
+    conversion_value DOUBLE PRECISION NOT NULL DEFAULT 0,
+
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+
+    PRIMARY KEY (funnel_id, node_id, variant_id)
+);
+
+-- Edge lookup by transition (step completion / bulk credit)
+CREATE INDEX IF NOT EXISTS idx_funnel_edges_transition
+    ON funnel_edges(funnel_id, from_node_id, to_node_id);
+
+COMMENT ON TABLE funnel_variant_stats IS 'Entries and final funnel conversions per step variant (sequential allocation)';
@@ -0,0 +1,155 @@
+-- schema_listing_counters.sql
+-- Denormalized counters + keyset indexes for experiment / funnel listings
+-- Version: 1.0
+--
+-- Los listados ya no cuentan hijos por fila con subconsultas: los
+-- contadores viven en la fila padre y los mantienen triggers en la misma
+-- transacción que el INSERT/UPDATE/DELETE del hijo.
+--
+--   experiments.variant_count        ← element_variants (y borrado de elementos)
+--   funnels.node_count               ← funnel_nodes
+--   funnels.total_sessions           ← funnel_sessions
+--   funnels.converted_sessions       ← funnel_sessions.status = 'converted'
+--
+-- Visitantes / conversiones de experimentos NO se copian a `experiments`:
+-- element_variants ya los tiene por variante y replicarlos añadiría una
+-- segunda escritura sobre una fila caliente en cada asignación. El listado
+-- los suma sólo para los experimentos de la página.
+--
+-- Idempotente: re-ejecutarlo recalcula los contadores.
+
+-- ============================================
+-- EXPERIMENTS.VARIANT_COUNT
+-- ============================================
+
+ALTER TABLE experiments ADD COLUMN IF NOT EXISTS variant_count INTEGER NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION bump_experiment_variant_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- When the parent element is being deleted the lookup finds nothing:
+    -- drop_element_variant_count() already subtracted its variants
+    UPDATE experiments e
+    SET variant_count = GREATEST(e.variant_count + CASE WHEN TG_OP = 'INSERT' THEN 1 ELSE -1 END, 0)
+    FROM experiment_elements ee
+    WHERE ee.id = CASE WHEN TG_OP = 'INSERT' THEN NEW.element_id ELSE OLD.element_id END
+      AND e.id = ee.experiment_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS element_variants_count ON element_variants;
+CREATE TRIGGER element_variants_count
+    AFTER INSERT OR DELETE ON element_variants
+    FOR EACH ROW EXECUTE FUNCTION bump_experiment_variant_count();
+
+CREATE OR REPLACE FUNCTION drop_element_variant_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE experiments
+    SET variant_count = GREATEST(
+        variant_count - (SELECT COUNT(*) FROM element_variants WHERE element_id = OLD.id),
+        0
+    )
+    WHERE id = OLD.experiment_id;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS experiment_elements_variant_count ON experiment_elements;
+CREATE TRIGGER experiment_elements_variant_count
+    BEFORE DELETE ON experiment_elements
+    FOR EACH ROW EXECUTE FUNCTION drop_element_variant_count();
+
+UPDATE experiments e
+SET variant_count = c.n
+FROM (
+    SELECT e2.id, COUNT(ev.id) AS n
+    FROM experiments e2
+    LEFT JOIN experiment_elements ee ON ee.experiment_id = e2.id
+    LEFT JOIN element_variants ev ON ev.element_id = ee.id
+    GROUP BY e2.id
+) c
+WHERE c.id = e.id AND e.variant_count IS DISTINCT FROM c.n;
+
+-- ============================================
+-- FUNNELS: NODE / SESSION COUNTERS
+-- ============================================
+
+ALTER TABLE funnels ADD COLUMN IF NOT EXISTS node_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE funnels ADD COLUMN IF NOT EXISTS total_sessions BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE funnels ADD COLUMN IF NOT EXISTS converted_sessions BIGINT NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION bump_funnel_node_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE funnels SET node_count = node_count + 1 WHERE id = NEW.funnel_id;
+    ELSE
+        UPDATE funnels SET node_count = GREATEST(node_count - 1, 0) WHERE id = OLD.funnel_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS funnel_nodes_count ON funnel_nodes;
+CREATE TRIGGER funnel_nodes_count
+    AFTER INSERT OR DELETE ON funnel_nodes
+    FOR EACH ROW EXECUTE FUNCTION bump_funnel_node_count();
+
+CREATE OR REPLACE FUNCTION bump_funnel_session_counts()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE funnels SET
+            total_sessions = total_sessions + 1,
+            converted_sessions = converted_sessions + (NEW.status = 'converted')::INT
+        WHERE id = NEW.funnel_id;
+    ELSIF TG_OP = 'UPDATE' THEN
+        IF (NEW.status = 'converted') IS DISTINCT FROM (OLD.status = 'converted') THEN
+            UPDATE funnels SET
+                converted_sessions = converted_sessions
+                    + (NEW.status = 'converted')::INT - (OLD.status = 'converted')::INT
+            WHERE id = NEW.funnel_id;
+        END IF;
+    ELSE
+        UPDATE funnels SET
+            total_sessions = GREATEST(total_sessions - 1, 0),
+            converted_sessions = GREATEST(converted_sessions - (OLD.status = 'converted')::INT, 0)
+        WHERE id = OLD.funnel_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS funnel_sessions_count ON funnel_sessions;
+CREATE TRIGGER funnel_sessions_count
+    AFTER INSERT OR DELETE OR UPDATE OF status ON funnel_sessions
+    FOR EACH ROW EXECUTE FUNCTION bump_funnel_session_counts();
+
+UPDATE funnels f
+SET node_count = (SELECT COUNT(*) FROM funnel_nodes n WHERE n.funnel_id = f.id),
+    total_sessions = (SELECT COUNT(*) FROM funnel_sessions s WHERE s.funnel_id = f.id),
+    converted_sessions = (
+        SELECT COUNT(*) FROM funnel_sessions s
+        WHERE s.funnel_id = f.id AND s.status = 'converted'
+    );
+
+-- ============================================
+-- KEYSET INDEXES
+-- ============================================
+
+-- WHERE user_id = $1 [AND status = $2] AND (created_at, id) < ($3, $4)
+-- ORDER BY created_at DESC, id DESC
+CREATE INDEX IF NOT EXISTS idx_experiments_user_keyset
+    ON experiments(user_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_experiments_user_status_keyset
+    ON experiments(user_id, status, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_funnels_user_keyset
+    ON funnels(user_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_funnels_user_status_keyset
+    ON funnels(user_id, status, created_at DESC, id DESC);
+
+COMMENT ON COLUMN experiments.variant_count IS 'Maintained by element_variants_count / experiment_elements_variant_count triggers';
+COMMENT ON COLUMN funnels.total_sessions IS 'Maintained by funnel_sessions_count trigger';
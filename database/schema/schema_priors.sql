@@ -0,0 +1,36 @@
+-- schema_priors.sql
+-- Empirical-Bayes priors for new variants
+-- Version: 1.0
+--
+-- PriorService (orchestration/services/prior_service.py) ajusta
+-- periódicamente un Beta(α, β) por cuenta y tipo de elemento a partir de
+-- las variantes de experimentos completados. Las variantes nuevas arrancan
+-- con ese prior en algorithm_state en lugar de Beta(1, 1).
+--
+-- element_type = '*' es el prior de toda la cuenta (fallback cuando el
+-- tipo de elemento no tiene historia suficiente).
+--
+-- Idempotente.
+
+-- ============================================
+-- TABLE: VARIANT_PRIORS
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS variant_priors (
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    element_type VARCHAR(50) NOT NULL,
+
+    alpha DOUBLE PRECISION NOT NULL CHECK (alpha > 0),
+    beta DOUBLE PRECISION NOT NULL CHECK (beta > 0),
+
+    -- History the prior was fitted on
+    experiments INTEGER NOT NULL DEFAULT 0,
+    variants INTEGER NOT NULL DEFAULT 0,
+    method VARCHAR(20) NOT NULL,
+
+    fitted_at TIMESTAMPTZ DEFAULT NOW(),
+
+    PRIMARY KEY (user_id, element_type)
+);
+
+COMMENT ON TABLE variant_priors IS 'Fitted Beta prior per account and element type (* = account-wide)';
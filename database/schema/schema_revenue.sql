@@ -0,0 +1,42 @@
+-- schema_revenue.sql
+-- Running value statistics per variant (revenue per visitor)
+-- Version: 1.0
+--
+-- Sufficient statistics of the order-value model (log-normal value ×
+-- Beta conversion, see engine/core/math/_revenue.py). INCREMENT_CONVERSION_SQL
+-- updates them in the same UPDATE as total_conversions, so the revenue
+-- allocator / analytics never read assignments.
+--
+--   valued_conversions   conversions with conversion_value > 0
+--   total_value          Σ value
+--   sum_log_value        Σ ln(value)
+--   sum_log_value_sq     Σ ln(value)²
+--
+-- Experiments opt in with optimization_strategy = 'revenue'.
+--
+-- Idempotente: re-ejecutarlo recalcula las estadísticas desde assignments.
+
+ALTER TABLE element_variants ADD COLUMN IF NOT EXISTS valued_conversions INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE element_variants ADD COLUMN IF NOT EXISTS total_value NUMERIC(14,2) NOT NULL DEFAULT 0;
+ALTER TABLE element_variants ADD COLUMN IF NOT EXISTS sum_log_value DOUBLE PRECISION NOT NULL DEFAULT 0;
+ALTER TABLE element_variants ADD COLUMN IF NOT EXISTS sum_log_value_sq DOUBLE PRECISION NOT NULL DEFAULT 0;
+
+UPDATE element_variants ev
+SET valued_conversions = s.valued,
+    total_value = s.total_value,
+    sum_log_value = s.sum_log,
+    sum_log_value_sq = s.sum_log_sq
+FROM (
+    SELECT
+        variant_id,
+        COUNT(*) FILTER (WHERE conversion_value > 0) AS valued,
+        COALESCE(SUM(conversion_value) FILTER (WHERE conversion_value > 0), 0) AS total_value,
+        COALESCE(SUM(LN(conversion_value)) FILTER (WHERE conversion_value > 0), 0) AS sum_log,
+        COALESCE(SUM(LN(conversion_value) ^ 2) FILTER (WHERE conversion_value > 0), 0) AS sum_log_sq
+    FROM assignments
+    WHERE converted_at IS NOT NULL
+    GROUP BY variant_id
+) s
+WHERE s.variant_id = ev.id;
+
+COMMENT ON COLUMN element_variants.sum_log_value IS 'Σ ln(conversion_value) over valued conversions, maintained by INCREMENT_CONVERSION_SQL';
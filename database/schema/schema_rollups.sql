@@ -0,0 +1,125 @@
+-- schema_rollups.sql
+-- Time-series rollups per experiment / variant
+-- Version: 1.3
+--
+-- Buckets de minuto, hora y día (allocations, conversions, suma de valor)
+-- mantenidos incrementalmente por RollupAggregator a partir de `assignments`.
+-- Las tablas de minuto y hora están particionadas por rango de tiempo:
+-- el agregador crea las particiones y aplica la retención con DROP de
+-- particiones completas (sin DELETE masivos ni bloat).
+--
+-- Retención por defecto:
+--   minute → 48 horas   (particiones diarias)
+--   hour   → 90 días    (particiones mensuales)
+--   day    → indefinida
+--
+-- hour y day llevan user_id (dueño del experimento, desnormalizado) con un
+-- índice cubriente (user_id, bucket_start): las analíticas globales por
+-- periodo son un index-only scan sobre buckets, no sobre assignments.
+--
+-- conversion_delay_rollups (1.2) acumula, en la misma pasada, el
+-- histograma del retraso asignación → conversión por experimento y día
+-- (el mismo valor que decision_to_conversion_seconds del audit trail).
+-- Es el estadístico suficiente del modelo de feedback retrasado.
+--
+-- hour y day (1.3) llevan además las estadísticas de valor del modelo de
+-- revenue (valued_conversions, sum_log_value, sum_log_value_sq, como en
+-- element_variants): las analíticas filtradas por periodo leen el total y
+-- la forma del valor de pedido de la misma ventana.
+
+-- ============================================
+-- TABLE: VARIANT_ROLLUPS_MINUTE
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS variant_rollups_minute (
+    experiment_id UUID NOT NULL,
+    variant_id UUID NOT NULL,
+    bucket_start TIMESTAMPTZ NOT NULL,
+    allocations BIGINT NOT NULL DEFAULT 0,
+    conversions BIGINT NOT NULL DEFAULT 0,
+    conversion_value NUMERIC(14,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (experiment_id, bucket_start, variant_id)
+) PARTITION BY RANGE (bucket_start);
+
+-- ============================================
+-- TABLE: VARIANT_ROLLUPS_HOUR
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS variant_rollups_hour (
+    experiment_id UUID NOT NULL,
+    variant_id UUID NOT NULL,
+    user_id UUID NOT NULL,
+    bucket_start TIMESTAMPTZ NOT NULL,
+    allocations BIGINT NOT NULL DEFAULT 0,
+    conversions BIGINT NOT NULL DEFAULT 0,
+    conversion_value NUMERIC(14,2) NOT NULL DEFAULT 0,
+    valued_conversions BIGINT NOT NULL DEFAULT 0,
+    sum_log_value DOUBLE PRECISION NOT NULL DEFAULT 0,
+    sum_log_value_sq DOUBLE PRECISION NOT NULL DEFAULT 0,
+    PRIMARY KEY (experiment_id, bucket_start, variant_id)
+) PARTITION BY RANGE (bucket_start);
+
+-- ============================================
+-- TABLE: VARIANT_ROLLUPS_DAY
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS variant_rollups_day (
+    experiment_id UUID NOT NULL,
+    variant_id UUID NOT NULL,
+    user_id UUID NOT NULL,
+    bucket_start TIMESTAMPTZ NOT NULL,
+    allocations BIGINT NOT NULL DEFAULT 0,
+    conversions BIGINT NOT NULL DEFAULT 0,
+    conversion_value NUMERIC(14,2) NOT NULL DEFAULT 0,
+    valued_conversions BIGINT NOT NULL DEFAULT 0,
+    sum_log_value DOUBLE PRECISION NOT NULL DEFAULT 0,
+    sum_log_value_sq DOUBLE PRECISION NOT NULL DEFAULT 0,
+    PRIMARY KEY (experiment_id, bucket_start, variant_id)
+);
+
+-- Period-filtered totals per account (GET /analytics/global)
+CREATE INDEX IF NOT EXISTS idx_variant_rollups_hour_user ON variant_rollups_hour
+    (user_id, bucket_start) INCLUDE (allocations, conversions, conversion_value);
+
+CREATE INDEX IF NOT EXISTS idx_variant_rollups_day_user ON variant_rollups_day
+    (user_id, bucket_start) INCLUDE (allocations, conversions, conversion_value);
+
+-- ============================================
+-- TABLE: CONVERSION_DELAY_ROLLUPS
+-- ============================================
+
+-- delay_bin = width_bucket(converted_at - assigned_at, edges) with the
+-- edges of engine/core/math/_delay.py (DELAY_BIN_EDGES)
+CREATE TABLE IF NOT EXISTS conversion_delay_rollups (
+    experiment_id UUID NOT NULL,
+    bucket_start TIMESTAMPTZ NOT NULL,
+    delay_bin SMALLINT NOT NULL,
+    conversions BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (experiment_id, bucket_start, delay_bin)
+);
+
+-- ============================================
+-- TABLE: ROLLUP_WATERMARKS
+-- ============================================
+
+-- Everything with an event time < processed_until is already in the rollups
+CREATE TABLE IF NOT EXISTS rollup_watermarks (
+    name VARCHAR(64) PRIMARY KEY,
+    processed_until TIMESTAMPTZ NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- ============================================
+-- INDICES ON SOURCE TABLE
+-- ============================================
+
+-- The aggregator scans conversions by time window across experiments
+-- (idx_assignments_assigned_at already covers allocations)
+CREATE INDEX IF NOT EXISTS idx_assignments_converted_at ON assignments(converted_at)
+    WHERE converted_at IS NOT NULL;
+
+COMMENT ON TABLE variant_rollups_minute IS 'Per-minute variant counters (partitioned by day, short retention)';
+COMMENT ON TABLE variant_rollups_hour IS 'Per-hour variant counters (partitioned by month)';
+COMMENT ON TABLE variant_rollups_day IS 'Per-day variant counters (kept for the life of the experiment)';
+COMMENT ON TABLE conversion_delay_rollups IS 'Per-day histogram of assignment-to-conversion delays (delayed feedback)';
+COMMENT ON TABLE rollup_watermarks IS 'Aggregation progress of the rollup subsystem';
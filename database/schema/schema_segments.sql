@@ -0,0 +1,35 @@
+-- schema_segments.sql
+-- Per-segment counters for segment-aware allocation
+-- Version: 1.0
+--
+-- Experimentos con optimization_strategy = 'segmented' eligen con un
+-- posterior por (segmento, variante) encogido hacia el posterior global
+-- de la variante. El estado vive en memoria como un array denso
+-- (segmentos × variantes × 2) por experimento; esta tabla sólo recibe
+-- los incrementos en lotes (SegmentFlusher, un UPSERT cada pocos
+-- segundos para todos los experimentos), nunca una escritura por visita.
+--
+-- Los incrementos son aditivos, así que varios workers escriben sin
+-- coordinarse. segment_key es el mismo valor que
+-- algorithm_audit_trail.segment_key.
+--
+-- Idempotente.
+
+-- ============================================
+-- TABLE: SEGMENT_COUNTS
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS segment_counts (
+    experiment_id UUID NOT NULL REFERENCES experiments(id) ON DELETE CASCADE,
+    segment_key VARCHAR(255) NOT NULL,
+    variant_id UUID NOT NULL REFERENCES element_variants(id) ON DELETE CASCADE,
+
+    allocations BIGINT NOT NULL DEFAULT 0,
+    conversions BIGINT NOT NULL DEFAULT 0,
+
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+
+    PRIMARY KEY (experiment_id, segment_key, variant_id)
+);
+
+COMMENT ON TABLE segment_counts IS 'Allocations / conversions per experiment, segment and variant (segmented strategy)';
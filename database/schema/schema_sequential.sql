@@ -0,0 +1,73 @@
+-- schema_sequential.sql
+-- Sequential testing: evaluator state + audited experiment decisions
+-- Version: 1.0
+--
+-- El evaluador secuencial (orchestration/services/sequential_service.py)
+-- revisa los experimentos activos en cada tick. Para que el test siga
+-- siendo válido entre reinicios guarda, por variante, el mínimo del
+-- p-valor always-valid y la intersección de las confidence sequences
+-- observadas hasta ahora.
+--
+-- Cada pausa / promoción / cierre queda en experiment_decisions con la
+-- misma cadena de hashes que algorithm_audit_trail.
+--
+-- Idempotente.
+
+-- ============================================
+-- TABLE: SEQUENTIAL_TEST_STATE
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS sequential_test_state (
+    variant_id UUID PRIMARY KEY REFERENCES element_variants(id) ON DELETE CASCADE,
+    experiment_id UUID NOT NULL REFERENCES experiments(id) ON DELETE CASCADE,
+
+    -- Counters at the last evaluation (skip arms that did not move)
+    allocations INTEGER NOT NULL DEFAULT 0,
+    conversions INTEGER NOT NULL DEFAULT 0,
+
+    -- Running min p-value / intersected confidence sequence vs control
+    min_p_value DOUBLE PRECISION NOT NULL DEFAULT 1.0,
+    ci_lower DOUBLE PRECISION,
+    ci_upper DOUBLE PRECISION,
+    expected_loss DOUBLE PRECISION,
+
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_sequential_state_experiment
+    ON sequential_test_state(experiment_id);
+
+-- ============================================
+-- TABLE: EXPERIMENT_DECISIONS
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS experiment_decisions (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    experiment_id UUID NOT NULL REFERENCES experiments(id) ON DELETE CASCADE,
+    element_id UUID,
+    variant_id UUID, -- Loose reference, like algorithm_audit_trail
+
+    action VARCHAR(30) NOT NULL,
+    reason VARCHAR(100),
+    statistics JSONB DEFAULT '{}',
+    algorithm_version VARCHAR(50),
+    decision_timestamp TIMESTAMPTZ NOT NULL,
+
+    -- Integrity Chain
+    sequence_number BIGINT NOT NULL,
+    previous_hash VARCHAR(64),
+    decision_hash VARCHAR(64) NOT NULL,
+
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+
+    UNIQUE(experiment_id, sequence_number),
+    CONSTRAINT valid_decision_action CHECK (
+        action IN ('pause_variant', 'promote_variant', 'complete_experiment')
+    )
+);
+
+CREATE INDEX IF NOT EXISTS idx_experiment_decisions_sequence
+    ON experiment_decisions(experiment_id, sequence_number DESC);
+
+COMMENT ON TABLE sequential_test_state IS 'Always-valid test state per variant, owned by the sequential evaluator';
+COMMENT ON TABLE experiment_decisions IS 'Hash-chained log of automatic pause/promote/complete decisions';
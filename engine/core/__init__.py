@@ -8,6 +8,14 @@ Implementation details are kept internal and may change without notice.
 
 from .allocators import BayesianAllocator, AdaptiveBayesianAllocator
 from .allocators.sequential import SequentialAllocator
+from .allocators._revenue import RevenueAllocator
+from .allocators._contextual import ContextualAllocator
+from .allocators._nonstationary import DiscountedAllocator, SlidingWindowAllocator
+from .allocators._segmented import SegmentedAllocator
+from .allocators._arms import ArmState
+from .allocators._ucb import UCB1Allocator, KLUCBAllocator
+from .allocators._explore import EpsilonGreedyAllocator
+from .allocators._hybrid import HybridAllocator
 
 
 def _get_allocator(strategy_code: str, config: dict):
@@ -23,7 +31,15 @@ def _get_allocator(strategy_code: str, config: dict):
             - 'standard': Standard Bayesian
             - 'fast_learning': Low-traffic optimized
             - 'sequential': Multi-step optimization
-            - 'hybrid': Auto-select best method
+            - 'hybrid': Auto-select best method (KL-UCB warm-up, then Thompson)
+            - 'revenue': Revenue per visitor (uses conversion_value)
+            - 'contextual': Per-visitor choice from request context
+            - 'discounted': Recent evidence weighs more (half-life decay)
+            - 'sliding_window': Only recent evidence (last N hours)
+            - 'segmented': Per-segment posteriors shrunk toward the global one
+            - 'ucb1': Upper confidence bound
+            - 'kl_ucb': KL upper confidence bound (tighter at low rates)
+            - 'epsilon_greedy': Decaying epsilon-greedy
         config: Configuration dict with algorithm parameters
             
     Returns:
@@ -48,7 +64,15 @@ def _get_allocator(strategy_code: str, config: dict):
         'standard': BayesianAllocator,
         'fast_learning': AdaptiveBayesianAllocator,  # With high exploration
         'sequential': SequentialAllocator,
-        'hybrid': AdaptiveBayesianAllocator,
+        'hybrid': HybridAllocator,
+        'revenue': RevenueAllocator,
+        'contextual': ContextualAllocator,
+        'discounted': DiscountedAllocator,
+        'sliding_window': SlidingWindowAllocator,
+        'segmented': SegmentedAllocator,
+        'ucb1': UCB1Allocator,
+        'kl_ucb': KLUCBAllocator,
+        'epsilon_greedy': EpsilonGreedyAllocator,
     }
     
     # Get allocator class
@@ -76,5 +100,15 @@ __all__ = [
     'BayesianAllocator',
     'AdaptiveBayesianAllocator',
     'SequentialAllocator',
+    'RevenueAllocator',
+    'ContextualAllocator',
+    'DiscountedAllocator',
+    'SlidingWindowAllocator',
+    'SegmentedAllocator',
+    'ArmState',
+    'UCB1Allocator',
+    'KLUCBAllocator',
+    'EpsilonGreedyAllocator',
+    'HybridAllocator',
     '_get_allocator'
 ]
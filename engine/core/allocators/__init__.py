@@ -5,16 +5,26 @@ Optimization Allocators
 Implementations of multi-armed bandit algorithms:
 - Adaptive Choice Strategy (Bayesian)
 - Adaptive Optimization Strategy
-- Epsilon-Greedy (roadmap)
-- UCB (Upper Confidence Bound) (roadmap)
-- Contextual bandits (roadmap)
+- Epsilon-Greedy (decaying epsilon)
+- UCB1 / KL-UCB (Upper Confidence Bound)
+- Hybrid (KL-UCB warm-up, then Thompson)
+- Contextual bandits (linear, hashed context)
+- Non-stationary Thompson sampling (discounted, sliding window)
+- Segment-aware Thompson sampling (hierarchical shrinkage)
 
 Current Status:
 ✅ BayesianAllocator - Production ready
 ✅ AdaptiveBayesianAllocator - Production ready
-🚧 EpsilonGreedyAllocator - Roadmap v1.1
-🚧 UCBAllocator - Roadmap v1.1
-🚧 ContextualAllocator - Roadmap v2.0
+✅ RevenueAllocator - Revenue per visitor (strategy 'revenue')
+✅ ContextualAllocator - Per-visitor personalization (strategy 'contextual')
+✅ DiscountedAllocator / SlidingWindowAllocator - Drifting rates (strategies 'discounted', 'sliding_window')
+✅ SegmentedAllocator - Per-segment posteriors (strategy 'segmented')
+✅ UCB1Allocator / KLUCBAllocator - Upper confidence bounds (strategies 'ucb1', 'kl_ucb')
+✅ EpsilonGreedyAllocator - Low traffic (strategy 'epsilon_greedy')
+✅ HybridAllocator - Auto-selects the method (strategy 'hybrid')
+
+The last four share ArmState (_arms.py): NumPy arrays of pulls,
+successes and reward sums per arm, scored in one vectorized pass.
 """
 
 from .bayesian import BayesianAllocator, AdaptiveBayesianAllocator
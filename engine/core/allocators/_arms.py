@@ -0,0 +1,147 @@
+# engine/core/allocators/_arms.py
+
+"""
+Array-backed arm state
+
+Shared state of the count-based allocators ('ucb1', 'kl_ucb',
+'epsilon_greedy', 'hybrid'): pulls, successes and reward sums per arm
+as NumPy arrays, so scoring a request is a handful of vectorized
+operations instead of dict-built lists.
+
+Implementation: [REDACTED - PROPRIETARY]
+"""
+
+from typing import Any, Dict, Iterable, List
+import numpy as np
+from .._base import BaseAllocator
+
+# Strategies built on ArmState (scored from the live counters)
+ARM_STATE_STRATEGIES = frozenset({'ucb1', 'kl_ucb', 'epsilon_greedy', 'hybrid'})
+
+
+class ArmState:
+    """
+    Pulls / successes / reward sums per arm
+
+    Arms are addressed by option id; unknown ids are appended with zero
+    counts. Rewards are 0/1 for conversions or a value (revenue), in
+    which case `successes` counts the positive ones.
+    """
+
+    __slots__ = ('ids', 'pulls', 'successes', 'reward_sum', '_index')
+
+    def __init__(self, ids: Iterable[Any] = ()):
+        self.ids: List[str] = [str(i) for i in ids]
+        self._index: Dict[str, int] = {arm: i for i, arm in enumerate(self.ids)}
+        K = len(self.ids)
+        self.pulls = np.zeros(K)
+        self.successes = np.zeros(K)
+        self.reward_sum = np.zeros(K)
+
+    @classmethod
+    def from_options(cls, options: List[Dict[str, Any]]) -> 'ArmState':
+        """
+        State from the '_internal_state' of each option (the shape the
+        allocators read: success_count / failure_count, prior included)
+        """
+        state = cls(option['id'] for option in options)
+        internal = [option.get('_internal_state') or {} for option in options]
+
+        successes = np.array([float(s.get('success_count', 0.0)) for s in internal])
+        failures = np.array([float(s.get('failure_count', 0.0)) for s in internal])
+        state.successes = np.maximum(successes, 0.0)
+        state.pulls = state.successes + np.maximum(failures, 0.0)
+        state.reward_sum = np.array([
+            float(s.get('reward_sum', state.successes[i])) for i, s in enumerate(internal)
+        ])
+        return state
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def failures(self) -> np.ndarray:
+        return np.maximum(self.pulls - self.successes, 0.0)
+
+    def means(self) -> np.ndarray:
+        """Mean reward per pull (0 for arms never pulled)"""
+        return np.divide(self.reward_sum, self.pulls, out=np.zeros(len(self)), where=self.pulls > 0)
+
+    def arm(self, option_id: Any) -> int:
+        key = str(option_id)
+        index = self._index.get(key)
+        if index is None:
+            index = self._index[key] = len(self.ids)
+            self.ids.append(key)
+            self.pulls = np.append(self.pulls, 0.0)
+            self.successes = np.append(self.successes, 0.0)
+            self.reward_sum = np.append(self.reward_sum, 0.0)
+        return index
+
+    def record(self, option_id: Any, reward: float):
+        """One pull with its reward"""
+        arm = self.arm(option_id)
+        self.pulls[arm] += 1.0
+        self.successes[arm] += reward > 0
+        self.reward_sum[arm] += reward
+
+    def subset(self, option_ids: Iterable[Any]) -> 'ArmState':
+        """Copy restricted to `option_ids`, in that order (zeros if unseen)"""
+        arms = [self.arm(option_id) for option_id in option_ids]
+        state = ArmState(self.ids[i] for i in arms)
+        state.pulls = self.pulls[arms]
+        state.successes = self.successes[arms]
+        state.reward_sum = self.reward_sum[arms]
+        return state
+
+
+class ArmStateAllocator(BaseAllocator):
+    """
+    Shared select / update of the ArmState allocators
+
+    select() scores the counters carried by the options (database state,
+    as every allocator in the tracker); options without '_internal_state'
+    fall back to what this instance has seen through update().
+    Subclasses only implement _choose().
+    """
+
+    method = "samplit-index"
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self._rng = np.random.default_rng(config.get('seed'))
+        self.arms = ArmState()
+
+    def _choose(self, state: ArmState) -> int:
+        raise NotImplementedError
+
+    def _state(self, options: List[Dict[str, Any]]) -> ArmState:
+        if any('_internal_state' in option for option in options):
+            return ArmState.from_options(options)
+        return self.arms.subset(option['id'] for option in options)
+
+    async def select(self,
+                    options: List[Dict[str, Any]],
+                    context: Dict[str, Any]) -> str:
+        """
+        Select option from the arm counters
+
+        Implementation: [CONFIDENTIAL]
+        """
+        if not options:
+            raise ValueError("No options provided")
+
+        selected_id = options[self._choose(self._state(options))]['id']
+
+        self.logger.info(
+            "Variant allocated",
+            extra={"variant": selected_id, "method": self.method}
+        )
+        return selected_id
+
+    async def update(self,
+                    option_id: str,
+                    reward: float,
+                    context: Dict[str, Any]) -> None:
+        """In-process counters; database state is updated by the repository layer"""
+        self.arms.record(option_id, float(reward))
@@ -0,0 +1,139 @@
+# engine/core/allocators/_contextual.py
+
+"""
+Context-Aware Allocator
+
+Implementation: [REDACTED - PROPRIETARY]
+
+Personalizes the choice per visitor from the request context (device,
+traffic source, country, segment). Context is hashed into a small
+fixed-size vector and each option keeps a linear reward model
+(see math/_linear.py), so selection is O(options × d²) and the whole
+state of an experiment is a few (d × d) matrices per option.
+
+Rewards arrive late (conversions), so updates are split:
+- observe(): the exposure, at assignment time (reward 0 so far)
+- credit(): the conversion, when it happens
+update() does both at once.
+"""
+
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+import numpy as np
+from .._base import BaseAllocator
+from ..math._linear import DEFAULT_DIMENSION, DEFAULT_FIELDS, LinearArm, hash_features
+
+
+class ContextualAllocator(BaseAllocator):
+    """
+    Proprietary context-aware allocation engine
+
+    Config:
+        dimension: hashed feature size (default 64)
+        mode: 'thompson' (default) or 'ucb'
+        exploration: posterior scale / confidence width (default 0.5)
+        regularization: ridge prior strength (default 1.0)
+        features: context keys to hash
+    """
+
+    MODES = ('thompson', 'ucb')
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.dimension = int(config.get('dimension', DEFAULT_DIMENSION))
+        self.mode = config.get('mode', 'thompson')
+        self.exploration = float(config.get('exploration', 0.5))
+        self.regularization = float(config.get('regularization', 1.0))
+        self.features = tuple(config.get('features', DEFAULT_FIELDS))
+
+        if self.mode not in self.MODES:
+            raise ValueError(f"Unknown mode: {self.mode}. Available: {list(self.MODES)}")
+        if self.dimension < 2:
+            raise ValueError("dimension must be >= 2")
+
+        self._rng = np.random.default_rng(config.get('seed'))
+        self._arms: Dict[str, LinearArm] = {}
+
+    def featurize(self, context: Optional[Dict[str, Any]]) -> np.ndarray:
+        return hash_features(context, self.dimension, self.features)
+
+    async def select(self,
+                    options: List[Dict[str, Any]],
+                    context: Dict[str, Any]) -> str:
+        """
+        Select the option with the best score for this visitor's context
+
+        Implementation: [CONFIDENTIAL]
+        """
+        if not options:
+            raise ValueError("No options provided")
+
+        x = self.featurize(context)
+        scores = np.empty(len(options))
+        for i, option in enumerate(options):
+            arm = self._arm(str(option['id']))
+            if self.mode == 'ucb':
+                scores[i] = arm.upper_bound(x, self.exploration)
+            else:
+                scores[i] = x @ arm.sample(self.exploration, self._rng)
+
+        # Random tie-break (all-equal scores on a cold start in UCB mode)
+        best = np.flatnonzero(scores >= scores.max() - 1e-12)
+        selected_id = options[int(self._rng.choice(best))]['id']
+
+        self.logger.info(
+            "Variant allocated",
+            extra={"variant": selected_id, "method": "samplit-context"}
+        )
+        return selected_id
+
+    async def update(self,
+                    option_id: str,
+                    reward: float,
+                    context: Dict[str, Any]) -> None:
+        """Exposure and reward observed together"""
+        x = self.featurize(context)
+        arm = self._arm(str(option_id))
+        arm.observe(x)
+        if reward:
+            arm.credit(x, reward)
+
+    def observe(self, option_id: str, context: Optional[Dict[str, Any]]) -> None:
+        """Record an exposure (reward pending)"""
+        self._arm(str(option_id)).observe(self.featurize(context))
+
+    def credit(self, option_id: str, reward: float, context: Optional[Dict[str, Any]]) -> None:
+        """Credit the reward of an exposure already observed"""
+        self._arm(str(option_id)).credit(self.featurize(context), reward)
+
+    def warm_start(self, outcomes: Iterable[Tuple[str, Optional[Dict[str, Any]], float]]) -> None:
+        """
+        Rebuild all arms from (option_id, context, reward) history
+
+        One batched fit per option instead of one update per row.
+        """
+        rows: Dict[str, Tuple[List[np.ndarray], List[float]]] = {}
+        for option_id, context, reward in outcomes:
+            xs, rs = rows.setdefault(str(option_id), ([], []))
+            xs.append(self.featurize(context))
+            rs.append(float(reward))
+
+        for option_id, (xs, rs) in rows.items():
+            self._arms[option_id] = LinearArm.from_batch(
+                np.vstack(xs), np.asarray(rs), self.regularization
+            )
+
+    def get_insights(self) -> Dict[str, Any]:
+        insights = super().get_insights()
+        insights['observations'] = {k: arm.n for k, arm in self._arms.items()}
+        return insights
+
+    def _arm(self, option_id: str) -> LinearArm:
+        arm = self._arms.get(option_id)
+        if arm is None:
+            arm = self._arms[option_id] = LinearArm(self.dimension, self.regularization)
+        return arm
+
+
+def create(config: Dict[str, Any]) -> ContextualAllocator:
+    """Factory function"""
+    return ContextualAllocator(config)
@@ -0,0 +1,41 @@
+# engine/core/allocators/_hybrid.py
+
+"""
+Hybrid Allocator
+
+Implementation: [REDACTED - PROPRIETARY]
+
+Auto-selects the method from the evidence available: KL-UCB while the
+experiment is warming up (every option could not yet have
+`warmup_per_arm` samples), Thompson sampling afterwards. Both scored on
+ArmState arrays (math/_bandit.py), the same code as the simulation
+policy.
+"""
+
+from typing import Any, Dict
+from ._arms import ArmState, ArmStateAllocator
+from ..math._bandit import hybrid_choice
+
+
+class HybridAllocator(ArmStateAllocator):
+    """
+    Proprietary auto-selecting allocation engine
+
+    Config:
+        warmup_per_arm: samples per option before switching to
+            posterior sampling (default min_samples, 30)
+    """
+
+    method = "samplit-hybrid"
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.warmup_per_arm = float(config.get('warmup_per_arm', self.min_samples))
+
+    def _choose(self, state: ArmState) -> int:
+        return int(hybrid_choice(state.successes, state.pulls, 1, self._rng, self.warmup_per_arm)[0])
+
+
+def create(config: Dict[str, Any]) -> HybridAllocator:
+    """Factory function"""
+    return HybridAllocator(config)
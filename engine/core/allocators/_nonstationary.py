@@ -0,0 +1,294 @@
+# engine/core/allocators/_nonstationary.py
+
+"""
+Recency-Aware Allocators
+
+Implementation: [REDACTED - PROPRIETARY]
+
+For experiments whose conversion rates drift over time: the posterior
+of each option only (or mostly) reflects recent evidence, so a variant
+that won last month stops dominating once the rates change.
+
+- DiscountedAllocator ('discounted'): evidence decays with a half-life.
+  Each option keeps its weighted counts plus the time they were last
+  decayed; decay is applied lazily when the option is touched, so an
+  event is O(1) and nothing is rewritten on a timer.
+- SlidingWindowAllocator ('sliding_window'): evidence of the last
+  `window_hours`, kept as a ring of hourly buckets per option (same
+  granularity as the hourly rollups); expired buckets are dropped
+  lazily, amortized O(1) per event.
+
+Both are warm-started from per-bucket counters (hourly rollups) and
+then updated in place: observe() on exposure, credit() on conversion.
+The prior of each option comes from its '_internal_state' (alpha/beta).
+With keep_tail() the in-place events are also kept per second, so a
+reload from rollups can replay the ones the rollups do not cover yet.
+"""
+
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from .._base import BaseAllocator
+from ..math._nonstationary import bucket_totals, decay_factor
+
+HOUR = 3600.0
+
+
+class _RecencyAllocator(BaseAllocator):
+    """Shared select / update / warm start; subclasses own the counts"""
+
+    method = "samplit-recency"
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.bucket_seconds = float(config.get('bucket_seconds', HOUR))
+        self._rng = np.random.default_rng(config.get('seed'))
+        self._index: Dict[str, int] = {}
+        # (option_id, epoch second) -> [allocations, conversions]; None = not kept
+        self._tail: Optional[Dict[Tuple[str, int], List[float]]] = None
+
+    # ─── subclass hooks ───
+
+    def _grow(self):
+        raise NotImplementedError
+
+    def _add(self, arm: int, allocations: float, conversions: float, now: float):
+        raise NotImplementedError
+
+    def totals(self, arms: Sequence[int], now: float) -> Tuple[np.ndarray, np.ndarray]:
+        """(allocations, conversions) of `arms` as seen at `now`"""
+        raise NotImplementedError
+
+    def _load(self, arm: np.ndarray, age: np.ndarray, allocations: np.ndarray,
+              conversions: np.ndarray, bucket: np.ndarray, now: float):
+        raise NotImplementedError
+
+    # ─── shared ───
+
+    def _arm(self, option_id: Any) -> int:
+        key = str(option_id)
+        index = self._index.get(key)
+        if index is None:
+            index = self._index[key] = len(self._index)
+            self._grow()
+        return index
+
+    async def select(self,
+                    options: List[Dict[str, Any]],
+                    context: Dict[str, Any]) -> str:
+        """
+        Select the option with the highest recency-weighted posterior draw
+
+        Implementation: [CONFIDENTIAL]
+        """
+        if not options:
+            raise ValueError("No options provided")
+
+        now = (context or {}).get('now') or time.time()
+        arms = [self._arm(option['id']) for option in options]
+        allocations, conversions = self.totals(arms, now)
+        conversions = np.minimum(conversions, allocations)
+
+        states = [option.get('_internal_state', {}) for option in options]
+        alpha = np.array([float(s.get('alpha', 1.0)) for s in states])
+        beta = np.array([float(s.get('beta', 1.0)) for s in states])
+
+        scores = self._rng.beta(alpha + conversions, beta + allocations - conversions)
+        selected_id = options[int(np.argmax(scores))]['id']
+
+        self.logger.info(
+            "Variant allocated",
+            extra={"variant": selected_id, "method": self.method}
+        )
+        return selected_id
+
+    def _event(self, option_id: Any, allocations: float, conversions: float, now: float):
+        self._add(self._arm(option_id), allocations, conversions, now)
+        if self._tail is not None:
+            entry = self._tail.setdefault((str(option_id), int(now)), [0.0, 0.0])
+            entry[0] += allocations
+            entry[1] += conversions
+
+    def observe(self, option_id: Any, now: Optional[float] = None):
+        """Exposure (reward unknown yet): one allocation"""
+        self._event(option_id, 1.0, 0.0, now or time.time())
+
+    def credit(self, option_id: Any, reward: float = 1.0, now: Optional[float] = None):
+        """Conversion of an earlier exposure"""
+        self._event(option_id, 0.0, float(reward), now or time.time())
+
+    async def update(self,
+                    option_id: str,
+                    reward: float,
+                    context: Dict[str, Any]) -> None:
+        """Exposure and reward at once"""
+        now = (context or {}).get('now') or time.time()
+        self._event(option_id, 1.0, float(reward), now)
+
+    def keep_tail(self):
+        """Start keeping the in-place events (see tail / replay)"""
+        if self._tail is None:
+            self._tail = {}
+
+    def tail(self, since: Optional[float] = None) -> List[Tuple[str, float, float, float]]:
+        """(option_id, second, allocations, conversions) of kept events at or after `since`"""
+        return [
+            (option_id, float(second), n, k)
+            for (option_id, second), (n, k) in sorted((self._tail or {}).items(), key=lambda e: e[0][1])
+            if since is None or second >= since
+        ]
+
+    def replay(self, events: Sequence[Tuple[str, float, float, float]]):
+        """Apply events taken from another model's tail (kept here too)"""
+        for option_id, second, allocations, conversions in events:
+            self._event(option_id, allocations, conversions, second)
+
+    def warm_start(
+        self,
+        option_ids: Sequence[Any],
+        bucket_start: np.ndarray,
+        allocations: np.ndarray,
+        conversions: np.ndarray,
+        now: Optional[float] = None
+    ):
+        """
+        Replace the counts with per-bucket counters (e.g. hourly rollups)
+
+        bucket_start: (B,) epoch seconds of each bucket; one bucket per row
+        """
+        now = now or time.time()
+        arm = np.array([self._arm(o) for o in option_ids], dtype=np.int64)
+        bucket_start = np.asarray(bucket_start, dtype=np.float64)
+        age = now - (bucket_start + self.bucket_seconds / 2.0)
+        bucket = np.floor(bucket_start / self.bucket_seconds).astype(np.int64)
+        self._load(
+            arm, age,
+            np.asarray(allocations, dtype=np.float64),
+            np.asarray(conversions, dtype=np.float64),
+            bucket, now
+        )
+
+
+class DiscountedAllocator(_RecencyAllocator):
+    """
+    Proprietary discounted allocation engine
+
+    Config:
+        half_life_hours: evidence weight halves every this many hours (default 168)
+    """
+
+    method = "samplit-discounted"
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.half_life = float(config.get('half_life_hours', 168.0)) * HOUR
+        if self.half_life <= 0:
+            raise ValueError("half_life_hours must be > 0")
+
+        self._n = np.zeros(0)
+        self._k = np.zeros(0)
+        self._t = np.zeros(0)
+
+    def _grow(self):
+        self._n = np.append(self._n, 0.0)
+        self._k = np.append(self._k, 0.0)
+        self._t = np.append(self._t, 0.0)
+
+    def _add(self, arm: int, allocations: float, conversions: float, now: float):
+        # Lazy decay: bring this arm to `now`, then add
+        factor = decay_factor(now - self._t[arm], self.half_life)
+        self._n[arm] = self._n[arm] * factor + allocations
+        self._k[arm] = self._k[arm] * factor + conversions
+        self._t[arm] = max(now, self._t[arm])
+
+    def totals(self, arms: Sequence[int], now: float) -> Tuple[np.ndarray, np.ndarray]:
+        arms = np.asarray(arms, dtype=np.int64)
+        factor = decay_factor(now - self._t[arms], self.half_life)
+        return self._n[arms] * factor, self._k[arms] * factor
+
+    def _load(self, arm, age, allocations, conversions, bucket, now):
+        self._n, self._k = bucket_totals(
+            arm, age, allocations, conversions, len(self._index), half_life=self.half_life
+        )
+        self._t = np.full(len(self._index), now)
+
+
+class SlidingWindowAllocator(_RecencyAllocator):
+    """
+    Proprietary sliding-window allocation engine
+
+    Config:
+        window_hours: only evidence of the last this many hours counts (default 168)
+    """
+
+    method = "samplit-window"
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.window = float(config.get('window_hours', 168.0)) * HOUR
+        if self.window <= 0:
+            raise ValueError("window_hours must be > 0")
+
+        # Per arm: [bucket, allocations, conversions], oldest first
+        self._buckets: List[Deque[List[float]]] = []
+        self._n = np.zeros(0)
+        self._k = np.zeros(0)
+
+    def _grow(self):
+        self._buckets.append(deque())
+        self._n = np.append(self._n, 0.0)
+        self._k = np.append(self._k, 0.0)
+
+    def _evict(self, arm: int, now: float):
+        # A bucket counts while its midpoint is younger than the window
+        ring = self._buckets[arm]
+        while ring and now - (ring[0][0] + 0.5) * self.bucket_seconds >= self.window:
+            _, n, k = ring.popleft()
+            self._n[arm] -= n
+            self._k[arm] -= k
+        if not ring:
+            self._n[arm] = self._k[arm] = 0.0
+
+    def _add(self, arm: int, allocations: float, conversions: float, now: float):
+        self._evict(arm, now)
+        ring = self._buckets[arm]
+        bucket = now // self.bucket_seconds
+        if ring and ring[-1][0] >= bucket:
+            ring[-1][1] += allocations
+            ring[-1][2] += conversions
+        else:
+            ring.append([bucket, allocations, conversions])
+        self._n[arm] += allocations
+        self._k[arm] += conversions
+
+    def totals(self, arms: Sequence[int], now: float) -> Tuple[np.ndarray, np.ndarray]:
+        for arm in arms:
+            self._evict(arm, now)
+        arms = np.asarray(arms, dtype=np.int64)
+        return np.maximum(self._n[arms], 0.0), np.maximum(self._k[arms], 0.0)
+
+    def _load(self, arm, age, allocations, conversions, bucket, now):
+        self._n, self._k = bucket_totals(
+            arm, age, allocations, conversions, len(self._index), window=self.window
+        )
+        self._buckets = [deque() for _ in range(len(self._index))]
+
+        keep = np.flatnonzero(age < self.window)
+        for i in keep[np.argsort(bucket[keep], kind='stable')].tolist():
+            ring = self._buckets[arm[i]]
+            if ring and ring[-1][0] == bucket[i]:
+                ring[-1][1] += allocations[i]
+                ring[-1][2] += conversions[i]
+            else:
+                ring.append([float(bucket[i]), allocations[i], conversions[i]])
+
+
+def create_discounted(config: Dict[str, Any]) -> DiscountedAllocator:
+    """Factory function"""
+    return DiscountedAllocator(config)
+
+
+def create_sliding_window(config: Dict[str, Any]) -> SlidingWindowAllocator:
+    """Factory function"""
+    return SlidingWindowAllocator(config)
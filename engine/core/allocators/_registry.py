@@ -15,7 +15,15 @@ _STRATEGY_MAP = {
     "adaptive": "allocators._bayesian",
     "fast_learning": "allocators._explore", 
     "sequential": "allocators.sequential",
-    "hybrid": "allocators._hybrid"
+    "hybrid": "allocators._hybrid",
+    "revenue": "allocators._revenue",
+    "contextual": "allocators._contextual",
+    "discounted": "allocators._nonstationary:create_discounted",
+    "sliding_window": "allocators._nonstationary:create_sliding_window",
+    "segmented": "allocators._segmented",
+    "ucb1": "allocators._ucb:create_ucb1",
+    "kl_ucb": "allocators._ucb:create_kl_ucb",
+    "epsilon_greedy": "allocators._explore"
 }
 
 def get_allocator(strategy_code: str, config: Dict[str, Any]) -> BaseAllocator:
@@ -29,12 +37,14 @@ def get_allocator(strategy_code: str, config: Dict[str, Any]) -> BaseAllocator:
     if strategy_code not in _STRATEGY_MAP:
         strategy_code = "adaptive"  # Default seguro
     
-    module_path = _STRATEGY_MAP[strategy_code]
+    # "module" or "module:factory" (several allocators per module)
+    module_path, _, factory = _STRATEGY_MAP[strategy_code].partition(":")
+    factory = factory or "create"
     
     # Dynamic import (ofusca en stack traces)
     module = __import__(
         f"engine.core.{module_path}", 
-        fromlist=['create']
+        fromlist=[factory]
     )
     
-    return module.create(config)
+    return getattr(module, factory)(config)
@@ -0,0 +1,204 @@
+# engine/core/allocators/_segmented.py
+
+"""
+Segment-Aware Allocator
+
+Implementation: [REDACTED - PROPRIETARY]
+
+One posterior per (segment, option), shrunk toward the option's global
+posterior (see math/_segments.py), so a segment with little traffic
+behaves like the global model and a large one can find its own winner.
+
+State is a dense (segments × options × 2) array of allocations and
+conversions, split in two:
+- base: counts already stored (loaded / flushed)
+- delta: counts observed here and not flushed yet
+
+take_delta() hands the pending counts to the caller for one batched
+write and folds them into base; restore_delta() undoes that if the
+write failed. Segments beyond `max_segments` share one overflow row.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from .._base import BaseAllocator
+from ..math._segments import (
+    DEFAULT_SEGMENT_FIELDS,
+    segment_of,
+    segment_posterior,
+    shrinkage_strength,
+)
+
+OVERFLOW_SEGMENT = '__other__'
+
+
+class SegmentedAllocator(BaseAllocator):
+    """
+    Proprietary segment-aware allocation engine
+
+    Config:
+        max_segments: distinct segments kept per experiment (default 64)
+        min_strength / max_strength: bounds of the shrinkage κ (2 / 100)
+        fields: context keys that define a segment when no segment_key is given
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.max_segments = int(config.get('max_segments', 64))
+        self.min_strength = float(config.get('min_strength', 2.0))
+        self.max_strength = float(config.get('max_strength', 100.0))
+        self.fields = tuple(config.get('fields', DEFAULT_SEGMENT_FIELDS))
+
+        if self.max_segments < 1:
+            raise ValueError("max_segments must be >= 1")
+
+        self._rng = np.random.default_rng(config.get('seed'))
+        self._segments: Dict[str, int] = {OVERFLOW_SEGMENT: 0}
+        self._options: Dict[str, int] = {}
+        self._base = np.zeros((1, 0, 2), dtype=np.int64)
+        self._delta = np.zeros((1, 0, 2), dtype=np.int64)
+        self._strength: Optional[np.ndarray] = None
+
+    # ─── indexing ───
+
+    @property
+    def counts(self) -> np.ndarray:
+        return self._base + self._delta
+
+    @property
+    def segments(self) -> List[str]:
+        return list(self._segments)
+
+    def _grow(self, segments: int, options: int):
+        pad = ((0, segments - self._base.shape[0]), (0, options - self._base.shape[1]), (0, 0))
+        self._base = np.pad(self._base, pad)
+        self._delta = np.pad(self._delta, pad)
+        self._strength = None
+
+    def _segment(self, key: str) -> int:
+        index = self._segments.get(key)
+        if index is None:
+            # The overflow row counts as one of max_segments
+            if len(self._segments) >= self.max_segments:
+                return 0
+            index = self._segments[key] = len(self._segments)
+            self._grow(len(self._segments), self._base.shape[1])
+        return index
+
+    def _option(self, option_id: Any) -> int:
+        key = str(option_id)
+        index = self._options.get(key)
+        if index is None:
+            index = self._options[key] = len(self._options)
+            self._grow(self._base.shape[0], len(self._options))
+        return index
+
+    def segment_of(self, context: Optional[Dict[str, Any]]) -> str:
+        return segment_of(context, self.fields)
+
+    # ─── allocation ───
+
+    async def select(self,
+                    options: List[Dict[str, Any]],
+                    context: Dict[str, Any]) -> str:
+        """
+        Select the option with the highest draw from this segment's posterior
+
+        Implementation: [CONFIDENTIAL]
+        """
+        if not options:
+            raise ValueError("No options provided")
+
+        segment = self._segment(self.segment_of(context))
+        arms = np.array([self._option(option['id']) for option in options])
+
+        if self._strength is None:
+            self.refresh()
+
+        counts = self.counts[:, arms]
+        states = [option.get('_internal_state', {}) for option in options]
+        alpha, beta = segment_posterior(
+            counts[segment],
+            counts.sum(axis=0),
+            self._strength[arms],
+            np.array([float(s.get('alpha', 1.0)) for s in states]),
+            np.array([float(s.get('beta', 1.0)) for s in states])
+        )
+
+        selected_id = options[int(np.argmax(self._rng.beta(alpha, beta)))]['id']
+        self.logger.info(
+            "Variant allocated",
+            extra={"variant": selected_id, "method": "samplit-segmented"}
+        )
+        return selected_id
+
+    def observe(self, option_id: Any, context: Optional[Dict[str, Any]] = None):
+        """Exposure: one allocation in the context's segment"""
+        # Index first: a new segment / option grows the arrays
+        segment, arm = self._segment(self.segment_of(context)), self._option(option_id)
+        self._delta[segment, arm, 0] += 1
+
+    def credit(self, option_id: Any, context: Optional[Dict[str, Any]] = None):
+        """Conversion of an earlier exposure (same context as the exposure)"""
+        segment, arm = self._segment(self.segment_of(context)), self._option(option_id)
+        self._delta[segment, arm, 1] += 1
+
+    async def update(self,
+                    option_id: str,
+                    reward: float,
+                    context: Dict[str, Any]) -> None:
+        self.observe(option_id, context)
+        if reward > 0:
+            self.credit(option_id, context)
+
+    def refresh(self):
+        """Re-estimate the shrinkage strength (after loads / flushes)"""
+        self._strength = shrinkage_strength(self.counts, self.min_strength, self.max_strength)
+
+    # ─── storage ───
+
+    def load(self, rows: Iterable[Tuple[str, Any, int, int]]):
+        """
+        Replace base with stored counts (segment_key, option_id, allocations,
+        conversions); pending delta is kept
+        """
+        rows = list(rows)
+        segments = np.array([self._segment(r[0]) for r in rows], dtype=np.int64)
+        arms = np.array([self._option(r[1]) for r in rows], dtype=np.int64)
+
+        base = np.zeros_like(self._base)
+        if rows:
+            values = np.array([(r[2], r[3]) for r in rows], dtype=np.int64)
+            np.add.at(base, (segments, arms), values)
+        self._base = base
+        self.refresh()
+
+    def take_delta(self) -> Tuple[List[Tuple[str, str, int, int]], np.ndarray]:
+        """
+        Pending counts as (segment_key, option_id, allocations, conversions)
+        rows, plus the array to hand back to restore_delta() on failure
+        """
+        delta = self._delta
+        self._delta = np.zeros_like(delta)
+        self._base = self._base + delta
+
+        segments = list(self._segments)
+        options = list(self._options)
+        rows = [
+            (segments[s], options[v], int(delta[s, v, 0]), int(delta[s, v, 1]))
+            for s, v in zip(*np.nonzero(delta.any(axis=2)))
+        ]
+        if rows:
+            self.refresh()
+        return rows, delta
+
+    def restore_delta(self, delta: np.ndarray):
+        """Put back counts whose write failed"""
+        s, v = delta.shape[:2]
+        self._base[:s, :v] -= delta
+        self._delta[:s, :v] += delta
+
+
+def create(config: Dict[str, Any]) -> SegmentedAllocator:
+    """Factory function"""
+    return SegmentedAllocator(config)
@@ -0,0 +1,69 @@
+# engine/core/allocators/_ucb.py
+
+"""
+Upper-Confidence Allocators
+
+Implementation: [REDACTED - PROPRIETARY]
+
+Deterministic optimism: each option is scored by an upper bound of its
+conversion rate and the highest bound wins (ties at random). Options
+never shown go first.
+
+- UCB1Allocator ('ucb1'): mean + sqrt(confidence · ln(t) / n)
+- KLUCBAllocator ('kl_ucb'): Bernoulli KL bound, tighter for the low
+  rates of conversion tests
+
+Both read the counters from ArmState; see math/_bandit.py.
+"""
+
+from typing import Any, Dict
+from ._arms import ArmState, ArmStateAllocator
+from ..math._bandit import argmax_random_ties, kl_ucb_index, ucb1_index
+
+
+class UCB1Allocator(ArmStateAllocator):
+    """
+    Proprietary upper-confidence allocation engine
+
+    Config:
+        confidence: width of the bound (default 2.0)
+    """
+
+    method = "samplit-ucb"
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.confidence = float(config.get('confidence', 2.0))
+
+    def _choose(self, state: ArmState) -> int:
+        scores = ucb1_index(state.successes, state.pulls, self.confidence)
+        return int(argmax_random_ties(scores, self._rng))
+
+
+class KLUCBAllocator(ArmStateAllocator):
+    """
+    Proprietary KL upper-confidence allocation engine
+
+    Config:
+        c: extra ln(ln(t)) exploration (default 0, the usual choice in practice)
+    """
+
+    method = "samplit-klucb"
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.c = float(config.get('c', 0.0))
+
+    def _choose(self, state: ArmState) -> int:
+        scores = kl_ucb_index(state.successes, state.pulls, self.c)
+        return int(argmax_random_ties(scores, self._rng))
+
+
+def create_ucb1(config: Dict[str, Any]) -> UCB1Allocator:
+    """Factory function"""
+    return UCB1Allocator(config)
+
+
+def create_kl_ucb(config: Dict[str, Any]) -> KLUCBAllocator:
+    """Factory function"""
+    return KLUCBAllocator(config)
@@ -13,7 +13,7 @@ Where γ (gamma) is the discount factor (likely 1.0 for strictly sequential funn
 """
 
 import numpy as np
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 from .bayesian import BayesianAllocator
 
@@ -27,7 +27,8 @@ class SequentialAllocator(BayesianAllocator):
     SequentialAllocator treats variants as nodes in a graph.
     
     Architecture:
-    - Each variant at Step N keeps track of successful transitions to Step N+1.
+    - Each variant at Step N keeps track of the sessions that entered it
+      and of how many of them reached the end of the funnel.
     - True "Conversion" is defined as reaching the end of the funnel.
     """
     
@@ -44,20 +45,40 @@ class SequentialAllocator(BayesianAllocator):
         """
         Select variant considering downstream impact.
         
+        The reward of a step's variant is the *final* funnel conversion
+        of the sessions that went through it, so the posterior is
+        Beta(α₀ + downstream conversions, β₀ + entries − conversions).
+        Cost is independent of the funnel length: the counters are kept
+        per (step, variant), credit assignment happens on conversion.
+        
         Args:
-            variants: List of variants at this step
+            variants: List of variants at this step, each with optional
+                'funnel_stats' {'entries', 'conversions'} and the prior
+                in 'algorithm_state'
             step_id: Identifier of current step
             total_funnel_steps: Total steps in funnel
         """
-        # For MVP: We treat "funnel conversion" as the primary reward signal.
-        # Instead of optimizing for "Click to next step", we optimize for "Final Conversion".
-        
-        # This simplifies the math to standard Adaptive Strategy, 
-        # BUT the reward signal is delayed (credit assignment problem).
+        mapped = []
+        for variant in variants:
+            prior = variant.get('algorithm_state') or {}
+            stats = variant.get('funnel_stats') or {}
+            entries = int(stats.get('entries') or 0)
+            conversions = min(int(stats.get('conversions') or 0), entries)
+            mapped.append({
+                'id': variant.get('id'),
+                'algorithm_state': {
+                    'alpha': float(prior.get('alpha', self.alpha_prior)) + conversions,
+                    'beta': float(prior.get('beta', self.beta_prior)) + entries - conversions,
+                    'samples': entries
+                }
+            })
         
-        # We delegate to standard Bayesian Logic, but the 'beta' parameters
-        # supplied to it will be different (based on final conversions).
-        return super().select_variant(variants)
+        selected = super().select_variant(mapped)
+        logger.debug(
+            f"Step {step_id} ({total_funnel_steps} steps): selected variant {selected} "
+            f"on downstream conversion"
+        )
+        return selected
 
     def update_sequential_state(
         self,
@@ -70,20 +91,55 @@ class SequentialAllocator(BayesianAllocator):
         Update state based on FINAL conversion.
         
         If user converted at the end of the funnel, we credit ALL steps 
-        that participated in the path.
+        that participated in the path: the orchestrator calls this once
+        per (step, variant) of the session (see credit_assignment).
         """
-        # Get state for the specific variant used at this step
-        # path = funnel_state['steps'][step_index]['variants'][variant_index]
-        
-        # Update using standard Bayesian update
-        # If final_conversion is True, reward=1.0. Else 0.0.
         reward = 1.0 if final_conversion else 0.0
         
-        # This is handled by the Orchestrator calling update_state()
-        # for each participating variant in the successful session.
-        pass
+        variant_states = funnel_state['steps'][step_index]['variants']
+        variant_states[variant_index] = self.update_state(variant_states[variant_index], reward)
+        return funnel_state
+
+    @staticmethod
+    def credit_assignment(
+        path: List[Dict[str, Any]]
+    ) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+        """
+        Steps and edges a converted session gets credit for.
+        
+        Args:
+            path: funnel_sessions.path ([{node_id, variant_id?, entered_at}])
+        
+        Returns:
+            (steps, hops): distinct (node_id, variant_id) pairs that served
+            a variant, and distinct (from_node_id, to_node_id) transitions,
+            both in path order. A revisited step is credited once.
+        """
+        steps, hops = [], []
+        seen_steps, seen_hops = set(), set()
+        previous = None
+        
+        for entry in path:
+            node_id = entry.get('node_id')
+            if node_id is None:
+                continue
+            variant_id = entry.get('variant_id')
+            if variant_id and (node_id, variant_id) not in seen_steps:
+                seen_steps.add((node_id, variant_id))
+                steps.append((node_id, variant_id))
+            if previous is not None and previous != node_id and (previous, node_id) not in seen_hops:
+                seen_hops.add((previous, node_id))
+                hops.append((previous, node_id))
+            previous = node_id
+        
+        return steps, hops
 
     # Override standard update to log specific sequential metrics
     def update_state(self, variant_state, reward):
         # We can add 'downstream_conversions' counter here if needed
         return super().update_state(variant_state, reward)
+
+
+def create(config: Dict[str, Any]) -> SequentialAllocator:
+    """Factory function"""
+    return SequentialAllocator(config)
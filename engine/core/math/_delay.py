@@ -0,0 +1,80 @@
+# engine/core/math/_delay.py
+
+"""
+Delayed Feedback
+
+A conversion can arrive hours after the assignment. Counting every
+not-yet-converted assignment as a failure under-credits whatever got
+traffic recently (its conversions are still on their way).
+
+With F = CDF of the assignment → conversion delay, an assignment of age
+a would have shown its conversion by now with probability F(a), so it
+only counts as F(a) of an exposure:
+
+    effective exposures = Σ_i F(age_i)
+                        = allocations − Σ_buckets n_b · (1 − F(age_b))
+
+F is estimated per experiment from a histogram of observed delays on
+fixed log-spaced bins (the sufficient statistic kept in the rollups),
+interpolated linearly inside each bin.
+
+Implementation: [CONFIDENTIAL - DELAYED FEEDBACK MODEL]
+"""
+
+from typing import Sequence
+import numpy as np
+
+# Upper edges (seconds) of the delay bins; bin i counts delays in
+# [EDGES[i-1], EDGES[i]), bin 0 starts at 0 and the last bin is open.
+# Same thresholds as width_bucket() in the rollup aggregation.
+DELAY_BIN_EDGES = np.array([
+    60, 300, 900, 1800, 3600,              # 1m .. 1h
+    7200, 14400, 28800, 43200, 86400,      # 2h .. 1d
+    172800, 259200, 604800, 1209600,       # 2d .. 14d
+    2592000                                # 30d
+], dtype=np.float64)
+
+N_DELAY_BINS = len(DELAY_BIN_EDGES) + 1
+
+
+def _knots(histogram: Sequence[float]):
+    counts = np.asarray(histogram, dtype=np.float64)
+    if counts.shape != (N_DELAY_BINS,):
+        raise ValueError(f"Delay histogram needs {N_DELAY_BINS} bins, got {counts.shape}")
+
+    total = counts.sum()
+    # Open last bin: its mass is spread up to twice the last edge
+    x = np.concatenate([[0.0], DELAY_BIN_EDGES, [2.0 * DELAY_BIN_EDGES[-1]]])
+    y = np.concatenate([[0.0], np.cumsum(counts) / total]) if total > 0 else np.ones_like(x)
+    return x, y
+
+
+def delay_cdf(histogram: Sequence[float], ages: np.ndarray) -> np.ndarray:
+    """F(age): share of conversions observed within `ages` seconds"""
+    x, y = _knots(histogram)
+    return np.interp(np.maximum(ages, 0.0), x, y)
+
+
+def delay_horizon(histogram: Sequence[float]) -> float:
+    """Age (seconds) after which F = 1: older assignments are fully observed"""
+    x, y = _knots(histogram)
+    return float(x[np.argmax(y >= 1.0 - 1e-12)])
+
+
+def pending_exposures(
+    arm: np.ndarray,
+    age: np.ndarray,
+    allocations: np.ndarray,
+    histogram: Sequence[float],
+    n_arms: int
+) -> np.ndarray:
+    """
+    (n_arms,) allocations whose outcome is still unknown, Σ n_b · (1 − F(age_b))
+
+    Args:
+        arm: arm index of each bucket
+        age: seconds since the middle of each bucket
+        allocations: allocations of each bucket
+    """
+    weight = 1.0 - delay_cdf(histogram, age)
+    return np.bincount(arm, weights=allocations * weight, minlength=n_arms)
@@ -0,0 +1,131 @@
+# engine/core/math/_linear.py
+
+"""
+Linear Reward Model (contextual)
+
+- Context → fixed-size vector by signed feature hashing
+  (index 0 is a bias term, the rest are hashed "field=value" indicators)
+- Per-arm ridge regression: precision A = λI + Σ x xᵀ, b = Σ r x
+- A⁻¹ maintained by Sherman–Morrison, Cholesky factor of A by rank-1
+  update: every observation and every draw costs O(d²), never O(d³)
+
+Implementation: [CONFIDENTIAL - LINEAR POSTERIOR]
+"""
+
+from typing import Any, Dict, Optional, Sequence
+import hashlib
+import numpy as np
+from scipy.linalg import solve_triangular
+
+# Context fields hashed by default (tracker context keys)
+DEFAULT_FIELDS = ('device', 'utm_source', 'country', 'segment_key')
+DEFAULT_DIMENSION = 64
+
+# Full refactorization every N rank-1 updates (bounds round-off drift)
+REFRESH_EVERY = 2000
+
+
+def hash_features(context: Optional[Dict[str, Any]],
+                  dimension: int = DEFAULT_DIMENSION,
+                  fields: Sequence[str] = DEFAULT_FIELDS) -> np.ndarray:
+    """
+    Signed hashing of context fields into a (dimension,) vector
+
+    Stable across processes (blake2b, not hash()); missing or empty
+    fields contribute nothing, so an empty context is the bias alone.
+    """
+    x = np.zeros(dimension)
+    x[0] = 1.0
+    if not context:
+        return x
+    for field in fields:
+        value = context.get(field)
+        if value is None or value == '':
+            continue
+        digest = hashlib.blake2b(f"{field}={value}".encode(), digest_size=8).digest()
+        h = int.from_bytes(digest, 'little')
+        x[1 + (h >> 1) % (dimension - 1)] += 1.0 if h & 1 else -1.0
+    return x
+
+
+def cholesky_update(L: np.ndarray, x: np.ndarray) -> None:
+    """In-place rank-1 update: L Lᵀ + x xᵀ = L' L'ᵀ (L lower triangular), O(d²)"""
+    x = x.astype(np.float64, copy=True)
+    d = x.shape[0]
+    for k in range(d):
+        if x[k] == 0.0:
+            continue
+        r = np.hypot(L[k, k], x[k])
+        c = r / L[k, k]
+        s = x[k] / L[k, k]
+        L[k, k] = r
+        if k + 1 < d:
+            L[k + 1:, k] = (L[k + 1:, k] + s * x[k + 1:]) / c
+            x[k + 1:] = c * x[k + 1:] - s * L[k + 1:, k]
+
+
+class LinearArm:
+    """Ridge-regression posterior of one arm"""
+
+    __slots__ = ('precision', 'covariance', 'cholesky', 'b', 'n', '_since_refresh')
+
+    def __init__(self, dimension: int = DEFAULT_DIMENSION, regularization: float = 1.0):
+        self.precision = np.eye(dimension) * regularization
+        self.covariance = np.eye(dimension) / regularization
+        self.cholesky = np.eye(dimension) * np.sqrt(regularization)
+        self.b = np.zeros(dimension)
+        self.n = 0
+        self._since_refresh = 0
+
+    @classmethod
+    def from_batch(cls,
+                   X: np.ndarray,
+                   rewards: np.ndarray,
+                   regularization: float = 1.0) -> 'LinearArm':
+        """Fit from stacked observations (n, d) at once, one factorization"""
+        arm = cls(X.shape[1], regularization)
+        if X.shape[0]:
+            arm.precision += X.T @ X
+            arm.b = X.T @ rewards
+            arm.n = int(X.shape[0])
+            arm.refactor()
+        return arm
+
+    def observe(self, x: np.ndarray) -> None:
+        """Exposure: A += x xᵀ (reward 0 until credited)"""
+        self.precision += np.outer(x, x)
+        self.n += 1
+        self._since_refresh += 1
+        if self._since_refresh >= REFRESH_EVERY:
+            self.refactor()
+            return
+        # Sherman–Morrison on A⁻¹
+        v = self.covariance @ x
+        self.covariance -= np.outer(v, v) / (1.0 + x @ v)
+        cholesky_update(self.cholesky, x)
+
+    def credit(self, x: np.ndarray, reward: float) -> None:
+        """Reward of an observed exposure: b += r x, O(d)"""
+        self.b += reward * x
+
+    def refactor(self) -> None:
+        """Recompute A⁻¹ and chol(A) from A, O(d³)"""
+        self.cholesky = np.linalg.cholesky(self.precision)
+        identity = np.eye(self.precision.shape[0])
+        inv_l = solve_triangular(self.cholesky, identity, lower=True)
+        self.covariance = inv_l.T @ inv_l
+        self._since_refresh = 0
+
+    @property
+    def mean(self) -> np.ndarray:
+        return self.covariance @ self.b
+
+    def sample(self, scale: float, rng: np.random.Generator) -> np.ndarray:
+        """θ ~ N(A⁻¹b, scale² A⁻¹) via the cached factor, O(d²)"""
+        z = rng.standard_normal(self.b.shape[0])
+        return self.mean + scale * solve_triangular(self.cholesky.T, z, lower=False)
+
+    def upper_bound(self, x: np.ndarray, width: float) -> float:
+        """LinUCB score: xᵀθ̂ + width·sqrt(xᵀA⁻¹x)"""
+        v = self.covariance @ x
+        return float(x @ self.mean + width * np.sqrt(max(x @ v, 0.0)))
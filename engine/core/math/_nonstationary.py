@@ -0,0 +1,57 @@
+# engine/core/math/_nonstationary.py
+
+"""
+Recency-Weighted Evidence
+
+Conversion rates drift (seasonality, redesigns, campaigns), so old
+evidence should count less than new evidence:
+
+- Discounted: every observation weighs 2^(−age / half_life). Kept
+  lazily: each arm stores its weighted counts as of its last update and
+  is decayed only when touched, so an event costs O(1) however many
+  arms or buckets there are.
+- Sliding window: only observations younger than `window` count.
+
+Both turn historical per-bucket counters (rollups) into per-arm totals
+with one weighted bincount.
+
+Implementation: [CONFIDENTIAL - RECENCY MODEL]
+"""
+
+from typing import Optional, Tuple
+import numpy as np
+
+
+def decay_factor(elapsed, half_life: float):
+    """2^(−elapsed / half_life); elapsed < 0 (clock skew) counts as 0"""
+    return np.exp2(-np.maximum(elapsed, 0.0) / half_life)
+
+
+def bucket_totals(
+    arm: np.ndarray,
+    age: np.ndarray,
+    allocations: np.ndarray,
+    conversions: np.ndarray,
+    n_arms: int,
+    half_life: Optional[float] = None,
+    window: Optional[float] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-arm (allocations, conversions) from per-bucket counters
+
+    Args:
+        arm: (B,) arm index of each bucket
+        age: (B,) seconds between the bucket's midpoint and now
+        half_life: discount evidence by age (discounted)
+        window: drop buckets older than this (sliding window)
+    """
+    weights = np.ones(age.shape[0])
+    if half_life is not None:
+        weights = weights * decay_factor(age, half_life)
+    if window is not None:
+        weights = weights * (age < window)
+
+    return (
+        np.bincount(arm, weights=allocations * weights, minlength=n_arms),
+        np.bincount(arm, weights=conversions * weights, minlength=n_arms),
+    )
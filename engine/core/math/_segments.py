@@ -0,0 +1,93 @@
+# engine/core/math/_segments.py
+
+"""
+Segment Posteriors with Shrinkage
+
+Each (segment, option) keeps allocations/conversions in a dense
+(segments × options × 2) array. A segment's posterior is shrunk toward
+the option's global posterior:
+
+    p[s, v] ~ Beta(κ_v m_v + k[s, v], κ_v (1 − m_v) + n[s, v] − k[s, v])
+
+m_v = global posterior mean of option v (all segments pooled), and κ_v
+= how many visitors the global rate is worth inside a segment, estimated
+by method of moments from the spread of the segment rates (minus
+binomial noise). Segments that behave alike get a large κ (shrink hard),
+segments that really differ get a small one; a segment with little
+traffic follows the global rate either way.
+
+Implementation: [CONFIDENTIAL - HIERARCHICAL SEGMENT MODEL]
+"""
+
+from typing import Any, Dict, Optional, Sequence
+import numpy as np
+
+DEFAULT_SEGMENT = 'default'
+DEFAULT_SEGMENT_FIELDS = ('device', 'utm_source')
+
+# VARCHAR(255) in algorithm_audit_trail / segment_counts
+_MAX_KEY_LENGTH = 255
+
+
+def segment_of(
+    context: Optional[Dict[str, Any]],
+    fields: Sequence[str] = DEFAULT_SEGMENT_FIELDS
+) -> str:
+    """
+    Segment key of a request context
+
+    An explicit context['segment_key'] wins; otherwise the segment is the
+    combination of `fields` present (e.g. 'device=mobile|utm_source=google').
+    """
+    context = context or {}
+    explicit = context.get('segment_key')
+    if explicit and explicit != DEFAULT_SEGMENT:
+        return str(explicit)[:_MAX_KEY_LENGTH]
+
+    parts = [f"{f}={str(context[f]).strip().lower()}" for f in fields if context.get(f)]
+    return '|'.join(parts)[:_MAX_KEY_LENGTH] or DEFAULT_SEGMENT
+
+
+def shrinkage_strength(
+    counts: np.ndarray,
+    min_strength: float = 2.0,
+    max_strength: float = 100.0
+) -> np.ndarray:
+    """
+    (options,) κ per option from (segments × options × 2) counts
+
+    Method of moments on the allocation-weighted segment rates.
+    """
+    n = counts[..., 0].astype(np.float64)
+    k = counts[..., 1].astype(np.float64)
+    total = np.maximum(n.sum(axis=0), 1.0)
+    mean = (k.sum(axis=0) + 1.0) / (n.sum(axis=0) + 2.0)
+
+    active = n > 0
+    rate = np.divide(k, n, out=np.zeros_like(k), where=active)
+    spread = ((n / total) * (rate - mean) ** 2).sum(axis=0)
+    # Weighted E[p(1−p)/n] over segments: pure sampling noise
+    noise = mean * (1.0 - mean) * active.sum(axis=0) / total
+    between = np.maximum(spread - noise, 1e-12)
+
+    return np.clip(mean * (1.0 - mean) / between - 1.0, min_strength, max_strength)
+
+
+def segment_posterior(
+    segment_counts: np.ndarray,
+    total_counts: np.ndarray,
+    strength: np.ndarray,
+    prior_alpha: np.ndarray,
+    prior_beta: np.ndarray
+) -> tuple:
+    """
+    (alpha, beta) of one segment's options
+
+    segment_counts / total_counts: (options, 2) [allocations, conversions]
+    prior_alpha / prior_beta: the options' own prior (algorithm_state)
+    """
+    n_total, k_total = total_counts[:, 0], total_counts[:, 1]
+    mean = (prior_alpha + k_total) / (prior_alpha + prior_beta + n_total)
+
+    n, k = segment_counts[:, 0], np.minimum(segment_counts[:, 1], segment_counts[:, 0])
+    return strength * mean + k, strength * (1.0 - mean) + n - k
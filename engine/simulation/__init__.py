@@ -0,0 +1,38 @@
+# engine/simulation/__init__.py
+"""
+Allocation Simulation
+
+Vectorized offline simulation of allocation strategies (many
+replications as NumPy arrays), and replay of historical assignments
+through a candidate strategy, to compare strategies and settings
+before changing production defaults. Also synthetic traffic generators
+for demos and load-test databases.
+
+Usage:
+    from engine.simulation import compare
+    results = compare(['adaptive', 'uniform'], [0.05, 0.08, 0.12],
+                      visitors=100_000, replications=20, batch_size=100)
+"""
+
+from .harness import SimulationResult, compare, simulate
+from .policies import POLICIES, get_policy
+from .replay import ReplayChunk, ReplayEvaluator, ReplayReport, replay
+from .synthetic import AuditChain, VisitorBlock, block_records, conversion_matrix, draw_rates, visitor_blocks
+
+__all__ = [
+    'SimulationResult',
+    'simulate',
+    'compare',
+    'POLICIES',
+    'get_policy',
+    'ReplayChunk',
+    'ReplayEvaluator',
+    'ReplayReport',
+    'replay',
+    'conversion_matrix',
+    'draw_rates',
+    'VisitorBlock',
+    'visitor_blocks',
+    'AuditChain',
+    'block_records'
+]
@@ -0,0 +1,155 @@
+# engine/simulation/harness.py
+
+"""
+Vectorized Bandit Simulation
+
+Runs R replications of a simulated experiment side by side as (R, arms)
+arrays: every step draws one choice per replication in a single NumPy
+call, and with batch_size > 1 a whole batch of visitors is drawn at once
+against the same (delayed) counters, as happens in production between
+state refreshes.
+
+Reports, at `points` checkpoints:
+- cumulative (pseudo-)regret: mean and a percentile band over replications
+- arm share trajectories: fraction of visitors sent to each arm so far
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence
+import numpy as np
+
+from .policies import get_policy
+
+
+@dataclass
+class SimulationResult:
+    """Trajectories at `steps` (visitors so far), aggregated over replications"""
+    strategy: str
+    rates: np.ndarray          # (arms,) true conversion rates
+    steps: np.ndarray          # (points,) visitors at each checkpoint
+    regret_mean: np.ndarray    # (points,)
+    regret_lower: np.ndarray   # (points,)
+    regret_upper: np.ndarray   # (points,)
+    share_mean: np.ndarray     # (points, arms)
+    final_regret: np.ndarray   # (R,) per replication
+    selections: np.ndarray     # (R, arms) final counts
+    conversions: np.ndarray    # (R, arms) final counts
+    band: float
+
+    @property
+    def replications(self) -> int:
+        return self.final_regret.shape[0]
+
+    def summary(self) -> Dict[str, Any]:
+        visitors = int(self.steps[-1]) if len(self.steps) else 0
+        best = int(np.argmax(self.rates))
+        share = self.selections.mean(axis=0) / max(visitors, 1)
+        optimal = float(self.rates[best]) * visitors
+        return {
+            'strategy': self.strategy,
+            'visitors': visitors,
+            'replications': self.replications,
+            'regret': float(self.regret_mean[-1]),
+            'regret_band': [float(self.regret_lower[-1]), float(self.regret_upper[-1])],
+            'regret_percent': float(self.regret_mean[-1]) / optimal * 100 if optimal else 0.0,
+            'best_arm_share': float(share[best]),
+            'arm_share': [float(s) for s in share],
+        }
+
+
+def simulate(
+    rates: Sequence[float],
+    strategy: str = 'adaptive',
+    visitors: int = 10000,
+    replications: int = 100,
+    batch_size: int = 1,
+    points: int = 200,
+    band: float = 0.9,
+    config: Optional[Dict[str, Any]] = None,
+    seed: Optional[int] = None
+) -> SimulationResult:
+    """
+    Simulate `replications` experiments of `visitors` each
+
+    batch_size: visitors allocated between counter updates (update delay).
+    band: central mass of the regret band (0.9 → 5th–95th percentile).
+    """
+    rates = np.asarray(rates, dtype=np.float64)
+    if rates.ndim != 1 or rates.shape[0] < 2:
+        raise ValueError("rates must list at least two arms")
+    if visitors < 1 or replications < 1 or batch_size < 1:
+        raise ValueError("visitors, replications and batch_size must be >= 1")
+
+    policy, defaults = get_policy(strategy)
+    config = {**defaults, **(config or {})}
+    rng = np.random.default_rng(seed)
+
+    R, K = replications, rates.shape[0]
+    gaps = rates.max() - rates
+    flat_offset = (np.arange(R) * K)[None, :]
+
+    successes = np.zeros((R, K))
+    failures = np.zeros((R, K))
+    selections = np.zeros((R, K), dtype=np.int64)
+    regret = np.zeros(R)
+
+    checkpoints = np.unique(np.linspace(1, visitors, min(points, visitors)).astype(np.int64))
+    regret_at = np.zeros((len(checkpoints), R))
+    share_at = np.zeros((len(checkpoints), K))
+    next_cp = 0
+
+    done = 0
+    while done < visitors:
+        n = min(batch_size, visitors - done)
+        choices = policy(successes, failures, n, rng, config)            # (n, R)
+        converted = rng.random((n, R)) < rates[choices]
+
+        step_regret = np.cumsum(gaps[choices], axis=0) + regret          # (n, R)
+
+        # Checkpoints falling inside this batch
+        while next_cp < len(checkpoints) and checkpoints[next_cp] <= done + n:
+            j = int(checkpoints[next_cp] - done)                         # visitors of this batch
+            regret_at[next_cp] = step_regret[j - 1]
+            partial = selections + np.bincount(
+                (choices[:j] + flat_offset).ravel(), minlength=R * K
+            ).reshape(R, K)
+            share_at[next_cp] = partial.mean(axis=0) / checkpoints[next_cp]
+            next_cp += 1
+
+        flat = (choices + flat_offset).ravel()
+        batch_selected = np.bincount(flat, minlength=R * K).reshape(R, K)
+        batch_converted = np.bincount(flat, weights=converted.ravel(), minlength=R * K).reshape(R, K)
+
+        selections += batch_selected
+        successes += batch_converted
+        failures += batch_selected - batch_converted
+        regret = step_regret[-1]
+        done += n
+
+    tail = (1.0 - band) / 2.0
+    return SimulationResult(
+        strategy=strategy,
+        rates=rates,
+        steps=checkpoints,
+        regret_mean=regret_at.mean(axis=1),
+        regret_lower=np.quantile(regret_at, tail, axis=1),
+        regret_upper=np.quantile(regret_at, 1.0 - tail, axis=1),
+        share_mean=share_at,
+        final_regret=regret,
+        selections=selections,
+        conversions=successes.astype(np.int64),
+        band=band,
+    )
+
+
+def compare(
+    strategies: Sequence[str],
+    rates: Sequence[float],
+    seed: Optional[int] = None,
+    **kwargs
+) -> Dict[str, SimulationResult]:
+    """simulate() every strategy on the same scenario (same seed each)"""
+    return {
+        strategy: simulate(rates, strategy, seed=seed, **kwargs)
+        for strategy in strategies
+    }
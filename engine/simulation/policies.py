@@ -0,0 +1,108 @@
+# engine/simulation/policies.py
+
+"""
+Vectorized Allocation Policies
+
+Array versions of the production allocators, for simulation only.
+Each policy takes the counters visible to R independent replications
+and returns n choices per replication at once:
+
+    policy(successes, failures, n, rng, config) -> (n, R) arm indices
+
+successes / failures are (R, arms) and stay fixed for the n draws
+(the simulated update delay).
+"""
+
+from typing import Any, Callable, Dict
+import numpy as np
+
+from engine.core.math._bandit import (
+    argmax_random_ties,
+    epsilon_greedy_choice,
+    hybrid_choice,
+    kl_ucb_index,
+    ucb1_index,
+)
+
+Policy = Callable[[np.ndarray, np.ndarray, int, np.random.Generator, Dict[str, Any]], np.ndarray]
+
+
+def thompson(successes, failures, n, rng, config):
+    """Beta posterior draw per arm, argmax (BayesianAllocator)"""
+    R, K = successes.shape
+    draws = rng.beta(successes + 1.0, failures + 1.0, size=(n, R, K))
+    return np.argmax(draws, axis=2)
+
+
+def adaptive_thompson(successes, failures, n, rng, config):
+    """Thompson plus the low-sample exploration bonus of AdaptiveBayesianAllocator"""
+    R, K = successes.shape
+    learning_rate = config.get('learning_rate', 0.1)
+    min_samples = config.get('min_samples', 30)
+
+    samples = successes + failures
+    bonus = np.where(
+        samples < min_samples,
+        learning_rate * np.sqrt(np.log(samples + 2.0) / (samples + 1.0)),
+        0.0
+    )
+    draws = rng.beta(successes + 1.0, failures + 1.0, size=(n, R, K)) + bonus
+    return np.argmax(draws, axis=2)
+
+
+def ucb1(successes, failures, n, rng, config):
+    """Upper confidence bound per arm, argmax (UCB1Allocator)"""
+    scores = ucb1_index(successes, successes + failures, config.get('confidence', 2.0))
+    return argmax_random_ties(scores, rng, n)
+
+
+def kl_ucb(successes, failures, n, rng, config):
+    """KL upper confidence bound per arm, argmax (KLUCBAllocator)"""
+    scores = kl_ucb_index(successes, successes + failures, config.get('c', 0.0))
+    return argmax_random_ties(scores, rng, n)
+
+
+def epsilon_greedy(successes, failures, n, rng, config):
+    """Decaying epsilon-greedy (EpsilonGreedyAllocator)"""
+    return epsilon_greedy_choice(
+        successes, successes + failures, n, rng,
+        config.get('exploration', 0.1),
+        config.get('decay', 0.995),
+        config.get('min_exploration', 0.01)
+    )
+
+
+def hybrid(successes, failures, n, rng, config):
+    """KL-UCB warm-up, then Thompson (HybridAllocator)"""
+    warmup = config.get('warmup_per_arm', config.get('min_samples', 30))
+    return hybrid_choice(successes, successes + failures, n, rng, warmup)
+
+
+def uniform(successes, failures, n, rng, config):
+    """Fixed equal split (classic A/B baseline)"""
+    R, K = successes.shape
+    return rng.integers(0, K, size=(n, R))
+
+
+# Strategy code (as in engine.core._get_allocator) → (policy, config defaults)
+POLICIES: Dict[str, tuple] = {
+    'adaptive': (adaptive_thompson, {}),
+    'hybrid': (hybrid, {}),
+    'fast_learning': (adaptive_thompson, {'min_samples': 50}),
+    'standard': (thompson, {}),
+    'sequential': (thompson, {}),
+    'ucb1': (ucb1, {}),
+    'kl_ucb': (kl_ucb, {}),
+    'epsilon_greedy': (epsilon_greedy, {}),
+    'uniform': (uniform, {}),
+}
+
+
+def get_policy(strategy: str):
+    """(policy, config defaults) for a strategy code. ValueError if unknown."""
+    if strategy not in POLICIES:
+        raise ValueError(
+            f"No vectorized policy for strategy: {strategy}. "
+            f"Available: {list(POLICIES.keys())}"
+        )
+    return POLICIES[strategy]
@@ -0,0 +1,364 @@
+# engine/simulation/replay.py
+
+"""
+Offline Replay Evaluation
+
+Estimates how a candidate strategy would have performed on logged
+traffic (assignments), without deploying it.
+
+- Replay (rejection sampling): walk the log in time order; when the
+  candidate picks the logged variant, the event is "accepted", its
+  reward counts and the candidate learns from it; otherwise it is
+  skipped.
+- IPS / SNIPS: accepted rewards weighted by 1 / p(logged variant), the
+  probability the logging policy had of choosing it. This corrects the
+  replay estimate when logging was not uniform (adaptive allocation).
+
+Logging propensities:
+- 'uniform': the log comes from a fixed equal split
+- 'thompson': the production allocator is re-run on counters rebuilt
+  from the log itself (P(best) under the Beta posteriors, refreshed
+  every `block_size` events)
+- per-event values in ReplayChunk.propensities take precedence
+
+The log is consumed as a stream of chunks, so memory stays constant.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+import numpy as np
+
+from .policies import POLICIES
+
+PROPENSITY_MODES = ('uniform', 'thompson')
+
+
+@dataclass
+class ReplayChunk:
+    """A slice of the log, in time order"""
+    arm_ids: Sequence[str]
+    rewards: np.ndarray                        # (n,) float
+    contexts: Optional[Sequence[Optional[Dict[str, Any]]]] = None
+    propensities: Optional[np.ndarray] = None  # (n,) logging p(arm), if logged
+
+    def __len__(self) -> int:
+        return len(self.arm_ids)
+
+    def slice(self, start: int, stop: int) -> 'ReplayChunk':
+        return ReplayChunk(
+            self.arm_ids[start:stop],
+            self.rewards[start:stop],
+            self.contexts[start:stop] if self.contexts is not None else None,
+            self.propensities[start:stop] if self.propensities is not None else None
+        )
+
+
+def chunk_from_rows(rows: Sequence[Dict[str, Any]], reward: str = 'conversion') -> ReplayChunk:
+    """Assignment rows (variant_id, converted, conversion_value, context) → chunk"""
+    if reward == 'value':
+        rewards = np.fromiter(
+            (float(r.get('conversion_value') or 0) if r.get('converted') else 0.0 for r in rows),
+            dtype=np.float64, count=len(rows)
+        )
+    else:
+        rewards = np.fromiter(
+            (1.0 if r.get('converted') else 0.0 for r in rows),
+            dtype=np.float64, count=len(rows)
+        )
+    return ReplayChunk(
+        arm_ids=[str(r['variant_id']) for r in rows],
+        rewards=rewards,
+        contexts=[r.get('context') for r in rows]
+    )
+
+
+def iter_parquet(path: str,
+                 chunk_size: int = 50000,
+                 reward: str = 'conversion') -> Iterator[ReplayChunk]:
+    """
+    Stream an exported assignments file (needs pyarrow)
+
+    Columns: variant_id, converted (bool) or converted_at, and optionally
+    conversion_value, context (JSON string / struct), propensity.
+    Rows must be in assigned_at order.
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet replay needs pyarrow: pip install pyarrow") from e
+    import json
+
+    parquet = pq.ParquetFile(path)
+    names = set(parquet.schema_arrow.names)
+
+    for batch in parquet.iter_batches(batch_size=chunk_size):
+        columns = batch.to_pydict()
+        n = batch.num_rows
+        converted = columns.get('converted') or [c is not None for c in columns.get('converted_at', [None] * n)]
+        rows = [
+            {
+                'variant_id': columns['variant_id'][i],
+                'converted': converted[i],
+                'conversion_value': columns['conversion_value'][i] if 'conversion_value' in names else None,
+                'context': columns['context'][i] if 'context' in names else None,
+            }
+            for i in range(n)
+        ]
+        for row in rows:
+            if isinstance(row['context'], str):
+                row['context'] = json.loads(row['context'])
+
+        chunk = chunk_from_rows(rows, reward)
+        if 'propensity' in names:
+            chunk.propensities = np.asarray(columns['propensity'], dtype=np.float64)
+        yield chunk
+
+
+def parquet_arms(path: str) -> List[str]:
+    """Distinct variant ids of a Parquet log (reads only that column)"""
+    import pyarrow.parquet as pq
+
+    arms = set()
+    for batch in pq.ParquetFile(path).iter_batches(columns=['variant_id']):
+        arms.update(str(v) for v in batch.column(0).to_pylist())
+    return sorted(arms)
+
+
+@dataclass
+class ReplayReport:
+    """Estimates for one candidate strategy over one log"""
+    strategy: str
+    arms: List[str]
+    events: int = 0
+    accepted: int = 0
+    logged_reward: float = 0.0
+    replay_reward: float = 0.0
+    ips_sum: float = 0.0
+    weight_sum: float = 0.0
+    arm_ips: np.ndarray = field(default=None)
+    accepted_by_arm: np.ndarray = field(default=None)
+
+    def __post_init__(self):
+        if self.arm_ips is None:
+            self.arm_ips = np.zeros(len(self.arms))
+        if self.accepted_by_arm is None:
+            self.accepted_by_arm = np.zeros(len(self.arms), dtype=np.int64)
+
+    @property
+    def logged_value(self) -> float:
+        """Mean reward per visitor of the logging policy (on-policy)"""
+        return self.logged_reward / self.events if self.events else 0.0
+
+    @property
+    def replay_value(self) -> float:
+        return self.replay_reward / self.accepted if self.accepted else 0.0
+
+    @property
+    def ips_value(self) -> float:
+        return self.ips_sum / self.events if self.events else 0.0
+
+    @property
+    def snips_value(self) -> float:
+        return self.ips_sum / self.weight_sum if self.weight_sum else 0.0
+
+    @property
+    def arm_values(self) -> np.ndarray:
+        """IPS value of always playing each arm"""
+        return self.arm_ips / self.events if self.events else self.arm_ips
+
+    def summary(self) -> Dict[str, Any]:
+        value = self.snips_value
+        best = int(np.argmax(self.arm_values)) if len(self.arms) else 0
+        best_value = float(self.arm_values[best]) if len(self.arms) else 0.0
+        return {
+            'strategy': self.strategy,
+            'events': self.events,
+            'accepted': self.accepted,
+            'logged_value': self.logged_value,
+            'replay_value': self.replay_value,
+            'ips_value': self.ips_value,
+            'snips_value': value,
+            'lift_percent': (value / self.logged_value - 1) * 100 if self.logged_value else 0.0,
+            'best_arm': self.arms[best] if self.arms else None,
+            'best_arm_value': best_value,
+            # Expected reward lost vs always playing the best arm, over the log
+            'regret': (best_value - value) * self.events,
+            'candidate_share': {
+                arm: float(c) / self.accepted if self.accepted else 0.0
+                for arm, c in zip(self.arms, self.accepted_by_arm)
+            },
+        }
+
+
+class ReplayEvaluator:
+    """
+    Replays a logged stream through a candidate strategy
+
+    strategy: any engine.core._get_allocator code. Strategies with a
+    vectorized policy (engine.simulation.policies) choose a whole block
+    at once against counters frozen for `block_size` events; the others
+    go through the allocator one event at a time.
+    """
+
+    def __init__(
+        self,
+        strategy: str,
+        arms: Sequence[str],
+        config: Optional[Dict[str, Any]] = None,
+        propensity: str = 'thompson',
+        block_size: int = 500,
+        propensity_samples: int = 2000,
+        min_propensity: float = 0.01,
+        vectorized: bool = True,
+        seed: Optional[int] = None
+    ):
+        if propensity not in PROPENSITY_MODES:
+            raise ValueError(f"Unknown propensity mode: {propensity}. Available: {list(PROPENSITY_MODES)}")
+        if len(arms) < 2:
+            raise ValueError("Replay needs at least two arms")
+
+        self.strategy = strategy
+        self.arms = [str(a) for a in arms]
+        self._index = {arm: i for i, arm in enumerate(self.arms)}
+        self.config = dict(config or {})
+        self.propensity = propensity
+        self.block_size = max(1, int(block_size))
+        self.propensity_samples = propensity_samples
+        self.min_propensity = min_propensity
+        self._rng = np.random.default_rng(seed)
+
+        self._policy = None
+        if vectorized and strategy in POLICIES:
+            policy, defaults = POLICIES[strategy]
+            self._policy = policy
+            self.config = {**defaults, **self.config}
+            self._allocator = None
+        else:
+            from engine.core import _get_allocator
+            self._allocator = _get_allocator(strategy, {**self.config, 'seed': seed})
+
+        K = len(self.arms)
+        # Candidate's own counters (accepted events only)
+        self._successes = np.zeros(K)
+        self._failures = np.zeros(K)
+        # Counters of the logging policy, rebuilt from the log
+        self._logged_allocations = np.zeros(K)
+        self._logged_rewards = np.zeros(K)
+
+        self.report = ReplayReport(strategy=strategy, arms=self.arms)
+
+    async def run(self, chunks: Union[Iterable[ReplayChunk], AsyncIterator[ReplayChunk]]) -> ReplayReport:
+        """Consume a sync or async stream of chunks"""
+        if hasattr(chunks, '__aiter__'):
+            async for chunk in chunks:
+                await self.feed(chunk)
+        else:
+            for chunk in chunks:
+                await self.feed(chunk)
+        return self.report
+
+    async def feed(self, chunk: ReplayChunk) -> None:
+        for start in range(0, len(chunk), self.block_size):
+            await self._feed_block(chunk.slice(start, start + self.block_size))
+
+    # ========================================================================
+    # INTERNALS
+    # ========================================================================
+
+    async def _feed_block(self, block: ReplayChunk) -> None:
+        known = np.fromiter((a in self._index for a in block.arm_ids), dtype=bool, count=len(block))
+        if not known.all():
+            # Variants outside the evaluated set (e.g. deleted) are skipped
+            keep = np.flatnonzero(known)
+            block = ReplayChunk(
+                [block.arm_ids[i] for i in keep],
+                block.rewards[keep],
+                [block.contexts[i] for i in keep] if block.contexts is not None else None,
+                block.propensities[keep] if block.propensities is not None else None
+            )
+        n = len(block)
+        if n == 0:
+            return
+
+        K = len(self.arms)
+        logged = np.fromiter((self._index[a] for a in block.arm_ids), dtype=np.int64, count=n)
+        rewards = block.rewards
+
+        if block.propensities is not None:
+            p = block.propensities
+        else:
+            p = self._logging_propensities()[logged]
+        p = np.maximum(p, self.min_propensity)
+
+        if self._policy is not None:
+            choices = self._policy(self._successes[None], self._failures[None], n, self._rng, self.config)[:, 0]
+            match = choices == logged
+            self._learn(logged[match], rewards[match])
+        else:
+            match = np.zeros(n, dtype=bool)
+            for i in range(n):
+                context = block.contexts[i] if block.contexts is not None else None
+                chosen = await self._allocator.select(self._options(), context or {})
+                if self._index.get(str(chosen)) == logged[i]:
+                    match[i] = True
+                    self._learn(logged[i:i + 1], rewards[i:i + 1])
+                    await self._allocator.update(chosen, float(rewards[i]), context or {})
+
+        weights = match / p
+        report = self.report
+        report.events += n
+        report.accepted += int(match.sum())
+        report.logged_reward += float(rewards.sum())
+        report.replay_reward += float(rewards[match].sum())
+        report.ips_sum += float((rewards * weights).sum())
+        report.weight_sum += float(weights.sum())
+        report.arm_ips += np.bincount(logged, weights=rewards / p, minlength=K)
+        report.accepted_by_arm += np.bincount(logged[match], minlength=K)
+
+        self._logged_allocations += np.bincount(logged, minlength=K)
+        self._logged_rewards += np.bincount(logged, weights=(rewards > 0).astype(np.float64), minlength=K)
+
+    def _learn(self, arms: np.ndarray, rewards: np.ndarray) -> None:
+        K = len(self.arms)
+        converted = (rewards > 0).astype(np.float64)
+        self._successes += np.bincount(arms, weights=converted, minlength=K)
+        self._failures += np.bincount(arms, weights=1.0 - converted, minlength=K)
+
+    def _logging_propensities(self) -> np.ndarray:
+        K = len(self.arms)
+        if self.propensity == 'uniform':
+            return np.full(K, 1.0 / K)
+        # P(best) of the production allocator on the counters seen so far
+        successes = self._logged_rewards
+        failures = np.maximum(self._logged_allocations - successes, 0.0)
+        draws = self._rng.beta(successes + 1.0, failures + 1.0, size=(self.propensity_samples, K))
+        return np.bincount(np.argmax(draws, axis=1), minlength=K) / self.propensity_samples
+
+    def _options(self) -> List[Dict[str, Any]]:
+        """Candidate counters in the _internal_state shape the allocators read"""
+        options = []
+        for i, arm in enumerate(self.arms):
+            s, f = float(self._successes[i]), float(self._failures[i])
+            options.append({
+                'id': arm,
+                '_internal_state': {
+                    'success_count': s,
+                    'failure_count': f,
+                    'samples': s + f,
+                    'visitors': s + f,
+                    'conversions': s,
+                }
+            })
+        return options
+
+
+async def replay(
+    chunks: Union[Iterable[ReplayChunk], AsyncIterator[ReplayChunk]],
+    strategy: str,
+    arms: Sequence[str],
+    **kwargs
+) -> Dict[str, Any]:
+    """Replay one strategy over a stream and return its summary"""
+    evaluator = ReplayEvaluator(strategy, arms, **kwargs)
+    report = await evaluator.run(chunks)
+    return report.summary()
@@ -0,0 +1,295 @@
+# engine/simulation/synthetic.py
+
+"""
+Synthetic Experiment Data
+
+Vectorized generators for demos and load-test databases: every draw
+(arm, conversion, value, timestamps, context) is one NumPy call per
+block of visitors, and blocks are turned into row tuples in the column
+order of `assignments` / `algorithm_audit_trail`, ready for asyncpg's
+copy_records_to_table (see scripts/generate_load_data.py).
+
+Usage:
+    rng = np.random.default_rng(7)
+    matrix = conversion_matrix([0.02, 0.03, 0.05], 10_000, rng)   # (10000, 3) bool
+    for block in visitor_blocks(rates, 1_000_000, start, 30 * 86400, 100_000, rng):
+        assignments, audit = block_records(block, experiment_id, variant_ids, chain)
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+
+ASSIGNMENT_COLUMNS = (
+    'id', 'experiment_id', 'variant_id', 'user_id', 'session_id',
+    'context', 'assigned_at', 'converted_at', 'conversion_value'
+)
+
+AUDIT_COLUMNS = (
+    'experiment_id', 'visitor_id', 'selected_variant_id', 'assignment_id',
+    'decision_timestamp', 'segment_key', 'algorithm_version', 'context_hash',
+    'conversion_observed', 'conversion_timestamp', 'conversion_value',
+    'sequence_number', 'previous_hash', 'decision_hash'
+)
+
+# Same as AuditService.algorithm_version
+ALGORITHM_VERSION = "adaptive-optimizer-v3.0-enterprise"
+
+DEFAULT_CONTEXTS = (
+    {'device': 'desktop', 'source': 'google', 'country': 'ES'},
+    {'device': 'mobile', 'source': 'google', 'country': 'ES'},
+    {'device': 'mobile', 'source': 'instagram', 'country': 'MX'},
+    {'device': 'desktop', 'source': 'direct', 'country': 'US'},
+    {'device': 'tablet', 'source': 'newsletter', 'country': 'AR'},
+    {'device': 'mobile', 'source': 'direct', 'country': 'US'},
+)
+
+
+def conversion_matrix(
+    rates: Sequence[float],
+    n_visitors: int,
+    rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    """
+    (n_visitors, arms) bool: whether visitor i would convert under arm j
+
+    One rng.random(shape) < rates call; rates may also be (n_visitors, arms).
+    """
+    rng = rng or np.random.default_rng()
+    rates = np.asarray(rates, dtype=np.float64)
+    return rng.random((n_visitors, rates.shape[-1])) < rates
+
+
+def draw_rates(
+    n_experiments: int,
+    n_variants: int,
+    low: float = 0.01,
+    high: float = 0.08,
+    spread: float = 0.2,
+    rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    """
+    (experiments, variants) true conversion rates
+
+    Control rate uniform in [low, high]; the other variants get a relative
+    lift ~ Normal(0, spread) over their control.
+    """
+    rng = rng or np.random.default_rng()
+    control = rng.uniform(low, high, size=(n_experiments, 1))
+    lifts = rng.normal(0.0, spread, size=(n_experiments, n_variants))
+    lifts[:, 0] = 0.0
+    return np.clip(control * (1.0 + lifts), 1e-4, 0.999)
+
+
+@dataclass
+class VisitorBlock:
+    """Consecutive visitors of one experiment, as columns"""
+    first_visitor: int
+    arm: np.ndarray            # (n,) variant index
+    assigned_at: np.ndarray    # (n,) epoch seconds, increasing
+    converted: np.ndarray      # (n,) bool
+    converted_at: np.ndarray   # (n,) epoch seconds, NaN if not converted
+    value: np.ndarray          # (n,) conversion value, 0 if not converted
+    context: np.ndarray        # (n,) index into the contexts
+
+    def __len__(self) -> int:
+        return self.arm.shape[0]
+
+    def counts(self, n_arms: int) -> Dict[str, np.ndarray]:
+        """Per-arm sums, the same statistics element_variants keeps"""
+        valued = self.converted & (self.value > 0)
+        log_value = np.log(np.where(valued, self.value, 1.0))
+        return {
+            'allocations': np.bincount(self.arm, minlength=n_arms),
+            'conversions': np.bincount(self.arm, weights=self.converted, minlength=n_arms).astype(np.int64),
+            'valued_conversions': np.bincount(self.arm, weights=valued, minlength=n_arms).astype(np.int64),
+            'total_value': np.bincount(self.arm, weights=self.value, minlength=n_arms),
+            'sum_log_value': np.bincount(self.arm, weights=log_value, minlength=n_arms),
+            'sum_log_value_sq': np.bincount(self.arm, weights=log_value ** 2, minlength=n_arms),
+        }
+
+
+def visitor_blocks(
+    rates: Sequence[float],
+    visitors: int,
+    start: float,
+    span_seconds: float,
+    chunk_size: int = 100_000,
+    rng: Optional[np.random.Generator] = None,
+    weights: Optional[Sequence[float]] = None,
+    value_mean: float = 50.0,
+    value_sigma: float = 0.8,
+    delay_mean: float = 3600.0,
+    n_contexts: int = len(DEFAULT_CONTEXTS),
+    now: Optional[float] = None
+) -> Iterator[VisitorBlock]:
+    """
+    `visitors` visitors of one experiment over [start, start + span_seconds),
+    in blocks of `chunk_size` (memory stays at one block)
+
+    weights: traffic share per arm (default: equal split).
+    value_mean / value_sigma: log-normal order value of a conversion.
+    delay_mean: mean seconds from assignment to conversion (exponential).
+    now: generation time (default: end of the span). A conversion whose
+        delay would land after it has not happened yet: the visitor is
+        left unconverted, as the real table looks at that moment.
+    """
+    rng = rng or np.random.default_rng()
+    rates = np.asarray(rates, dtype=np.float64)
+    n_arms = rates.shape[0]
+    if weights is None:
+        p = None
+    else:
+        p = np.asarray(weights, dtype=np.float64)
+        p = p / p.sum()
+    mu = np.log(value_mean) - value_sigma ** 2 / 2.0
+    now = start + span_seconds if now is None else now
+
+    done = 0
+    while done < visitors:
+        n = min(chunk_size, visitors - done)
+        # Each block owns its slice of the time span, so rows stay in order
+        lo = start + span_seconds * done / visitors
+        hi = start + span_seconds * (done + n) / visitors
+
+        arm = rng.choice(n_arms, size=n, p=p)
+        converted = rng.random(n) < rates[arm]
+        assigned_at = np.sort(rng.uniform(lo, hi, n))
+        delay = rng.exponential(delay_mean, n)
+        value = np.round(rng.lognormal(mu, value_sigma, n), 2)
+        # Not converted yet at generation time
+        converted &= assigned_at + delay < now
+
+        yield VisitorBlock(
+            first_visitor=done,
+            arm=arm,
+            assigned_at=assigned_at,
+            converted=converted,
+            converted_at=np.where(converted, assigned_at + delay, np.nan),
+            value=np.where(converted, np.maximum(value, 0.01), 0.0),
+            context=rng.integers(0, n_contexts, n),
+        )
+        done += n
+
+
+def decision_hash(
+    visitor_id: str,
+    variant_id: str,
+    segment_key: str,
+    timestamp: datetime,
+    previous_hash: Optional[str],
+    sequence_number: int
+) -> str:
+    """Same hash as AuditService._calculate_decision_hash"""
+    data = {
+        'visitor_id': visitor_id,
+        'variant_id': str(variant_id),
+        'segment_key': segment_key,
+        'timestamp': timestamp.isoformat(),
+        'previous_hash': previous_hash or '',
+        'sequence_number': sequence_number
+    }
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+class AuditChain:
+    """
+    Hash chain of one experiment's audit trail, continued across blocks
+
+    The chain is inherently sequential (each hash covers the previous
+    one), so this is the only per-row Python loop of the generator.
+    """
+
+    def __init__(self, segment_key: str = 'default', algorithm_version: str = ALGORITHM_VERSION):
+        self.segment_key = segment_key
+        self.algorithm_version = algorithm_version
+        self.previous_hash: Optional[str] = None
+        self.sequence_number = 0
+
+    def link(self, visitor_id: str, variant_id: Any, timestamp: datetime) -> Tuple[int, Optional[str], str]:
+        """(sequence_number, previous_hash, decision_hash) of the next record"""
+        self.sequence_number += 1
+        previous = self.previous_hash
+        self.previous_hash = decision_hash(
+            visitor_id, variant_id, self.segment_key, timestamp, previous, self.sequence_number
+        )
+        return self.sequence_number, previous, self.previous_hash
+
+
+def _timestamps(seconds: np.ndarray) -> List[Optional[datetime]]:
+    utc = timezone.utc
+    return [
+        None if s != s else datetime.fromtimestamp(s, utc)
+        for s in seconds.tolist()
+    ]
+
+
+def _uuids(n: int, rng: np.random.Generator) -> List[str]:
+    """Random version-4 UUIDs as canonical strings (asyncpg encodes str for uuid)"""
+    raw = rng.integers(0, 256, size=(n, 16), dtype=np.uint8)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40   # version 4
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80   # RFC 4122 variant
+    h = raw.tobytes().hex()
+    return [
+        f'{h[i:i + 8]}-{h[i + 8:i + 12]}-{h[i + 12:i + 16]}-{h[i + 16:i + 20]}-{h[i + 20:i + 32]}'
+        for i in range(0, 32 * n, 32)
+    ]
+
+
+def block_records(
+    block: VisitorBlock,
+    experiment_id: Any,
+    variant_ids: Sequence[Any],
+    chain: Optional[AuditChain] = None,
+    contexts: Sequence[Dict[str, Any]] = DEFAULT_CONTEXTS,
+    rng: Optional[np.random.Generator] = None,
+    visitor_prefix: str = 'visitor'
+) -> Tuple[List[tuple], Optional[List[tuple]]]:
+    """
+    Row tuples for ASSIGNMENT_COLUMNS and, with a chain, AUDIT_COLUMNS
+
+    Assignment ids are generated here so audit rows can reference them.
+    """
+    rng = rng or np.random.default_rng()
+    n = len(block)
+    context_json = [json.dumps(c) for c in contexts]
+    context_hash = [hashlib.sha256(json.dumps(c, sort_keys=True).encode()).hexdigest() for c in contexts]
+
+    ids = _uuids(n, rng)
+    visitors = [f'{visitor_prefix}-{i}' for i in range(block.first_visitor, block.first_visitor + n)]
+    variants = [variant_ids[a] for a in block.arm.tolist()]
+    context_index = block.context.tolist()
+    assigned_at = _timestamps(block.assigned_at)
+    converted_at = _timestamps(block.converted_at)
+    values = block.value.tolist()
+
+    assignments = list(zip(
+        ids,
+        [experiment_id] * n,
+        variants,
+        visitors,
+        [None] * n,
+        [context_json[c] for c in context_index],
+        assigned_at,
+        converted_at,
+        values,
+    ))
+
+    if chain is None:
+        return assignments, None
+
+    audit = []
+    for i in range(n):
+        sequence_number, previous_hash, current_hash = chain.link(visitors[i], variants[i], assigned_at[i])
+        audit.append((
+            experiment_id, visitors[i], variants[i], ids[i],
+            assigned_at[i], chain.segment_key, chain.algorithm_version,
+            context_hash[context_index[i]],
+            converted_at[i] is not None, converted_at[i],
+            values[i] if converted_at[i] is not None else None,
+            sequence_number, previous_hash, current_hash,
+        ))
+    return assignments, audit
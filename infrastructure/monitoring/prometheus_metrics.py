@@ -103,6 +103,43 @@ class MetricsCollector:
             registry=self.registry
         )
         
+        self.db_pool_acquire_seconds = Histogram(
+            'samplit_db_pool_acquire_seconds',
+            'Time waiting to acquire a connection from the pool',
+            ['pool'],
+            buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+            registry=self.registry
+        )
+        
+        self.db_pool_saturation = Histogram(
+            'samplit_db_pool_saturation',
+            'Fraction of pool connections in use at acquire time',
+            ['pool'],
+            buckets=(0.1, 0.25, 0.5, 0.75, 0.9, 1.0),
+            registry=self.registry
+        )
+        
+        self.db_pool_limit = Gauge(
+            'samplit_db_pool_limit',
+            'Current concurrency limit per pool (adaptive sizing)',
+            ['pool'],
+            registry=self.registry
+        )
+        
+        self.db_circuit_state = Gauge(
+            'samplit_db_circuit_state',
+            'Circuit breaker state per pool (0=closed, 1=half-open, 2=open)',
+            ['pool'],
+            registry=self.registry
+        )
+        
+        self.db_circuit_rejections_total = Counter(
+            'samplit_db_circuit_rejections_total',
+            'Acquires rejected while the circuit was open',
+            ['pool'],
+            registry=self.registry
+        )
+        
         self.db_errors_total = Counter(
             'samplit_db_errors_total',
             'Database errors',
@@ -238,6 +275,23 @@ class MetricsCollector:
         self.db_pool_size.set(size)
         self.db_pool_available.set(available)
     
+    def record_db_pool_acquire(self, pool: str, wait_seconds: float, saturation: float):
+        """Record pool acquire wait and saturation"""
+        self.db_pool_acquire_seconds.labels(pool=pool).observe(wait_seconds)
+        self.db_pool_saturation.labels(pool=pool).observe(saturation)
+    
+    def update_db_pool_limit(self, pool: str, limit: int):
+        """Update adaptive pool limit"""
+        self.db_pool_limit.labels(pool=pool).set(limit)
+    
+    def update_db_circuit_state(self, pool: str, state: int):
+        """Update circuit breaker state (0=closed, 1=half-open, 2=open)"""
+        self.db_circuit_state.labels(pool=pool).set(state)
+    
+    def record_db_circuit_rejection(self, pool: str):
+        """Record an acquire rejected by an open circuit"""
+        self.db_circuit_rejections_total.labels(pool=pool).inc()
+    
     def record_db_query(self, query_type: str, duration_seconds: float):
         """Record database query"""
         self.db_query_duration_seconds.labels(
@@ -1,5 +1,6 @@
 # integration/proxy/__init__.py
 
 from .proxy_middleware import ProxyMiddleware
+from .streaming_injector import StreamingTrackerInjector, inject_tracker_stream
 
-__all__ = ['ProxyMiddleware']
+__all__ = ['ProxyMiddleware', 'StreamingTrackerInjector', 'inject_tracker_stream']
@@ -0,0 +1,335 @@
+# integration/proxy/asset_cache.py
+
+"""
+Asset Cache - HTTP cache for the Visual Editor proxy
+
+Caché en dos niveles (memoria LRU + disco) que respeta las cabeceras
+HTTP del origen:
+
+- `Cache-Control: no-store` / `private` → no se guarda
+- `max-age` / `s-maxage` / `Expires` → frescura
+- `no-cache` o sin frescura pero con `ETag`/`Last-Modified`
+  → se guarda y se revalida con petición condicional (304)
+"""
+
+import os
+import json
+import time
+import hashlib
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# Cabeceras del origen que se conservan junto al body
+STORED_HEADERS = (
+    'content-type', 'cache-control', 'etag', 'last-modified',
+    'expires', 'vary', 'content-language'
+)
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Parse a Cache-Control header into {directive: value}"""
+    directives: Dict[str, Optional[str]] = {}
+    if not value:
+        return directives
+
+    for part in value.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '=' in part:
+            key, _, val = part.partition('=')
+            directives[key.strip().lower()] = val.strip().strip('"')
+        else:
+            directives[part.lower()] = None
+
+    return directives
+
+
+def _parse_int(value: Optional[str]) -> Optional[int]:
+    try:
+        return max(0, int(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _http_date_to_ts(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class CachedAsset:
+    """A cached upstream response"""
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    body: bytes = field(repr=False)
+    stored_at: float
+    freshness: int = 0
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get('etag')
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get('last-modified')
+
+    @property
+    def size(self) -> int:
+        return len(self.body)
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        now = now if now is not None else time.time()
+        return (now - self.stored_at) < self.freshness
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers for a revalidation request"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def revalidated(self, headers) -> 'CachedAsset':
+        """New entry after a 304: refreshed headers and freshness, same body"""
+        merged = dict(self.headers)
+        for name in STORED_HEADERS:
+            if name in headers and name != 'content-type':
+                merged[name] = headers[name]
+
+        return CachedAsset(
+            url=self.url,
+            status_code=self.status_code,
+            headers=merged,
+            body=self.body,
+            stored_at=time.time(),
+            freshness=compute_freshness(headers) or 0
+        )
+
+
+def is_storable(status_code: int, headers) -> bool:
+    """Whether a response may be stored by this (shared) cache"""
+    if status_code != 200:
+        return False
+
+    cc = parse_cache_control(headers.get('cache-control'))
+    if 'no-store' in cc or 'private' in cc:
+        return False
+
+    has_validator = bool(headers.get('etag') or headers.get('last-modified'))
+    return has_validator or compute_freshness(headers) is not None
+
+
+def compute_freshness(headers) -> Optional[int]:
+    """
+    Freshness lifetime in seconds, or None if the origin gave none.
+
+    `no-cache` means "store but always revalidate" → 0.
+    """
+    cc = parse_cache_control(headers.get('cache-control'))
+
+    if 'no-cache' in cc:
+        return 0
+
+    lifetime = _parse_int(cc.get('s-maxage'))
+    if lifetime is None:
+        lifetime = _parse_int(cc.get('max-age'))
+
+    if lifetime is None:
+        expires = _http_date_to_ts(headers.get('expires'))
+        if expires is None:
+            return None
+        date = _http_date_to_ts(headers.get('date')) or time.time()
+        lifetime = max(0, int(expires - date))
+
+    age = _parse_int(headers.get('age')) or 0
+    return max(0, lifetime - age)
+
+
+class AssetCache:
+    """
+    Two-level asset cache: in-memory LRU (bounded by bytes) backed by disk.
+
+    Disk layout: `<dir>/<sha256(url)>.json` (metadata) + `.bin` (body).
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        max_entry_bytes: int = 5 * 1024 * 1024,
+        disk_dir: Optional[str] = None,
+        max_disk_bytes: int = 512 * 1024 * 1024
+    ):
+        self.max_memory_bytes = max_memory_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory: 'OrderedDict[str, CachedAsset]' = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+
+        if self.disk_dir:
+            try:
+                os.makedirs(self.disk_dir, exist_ok=True)
+                self._disk_bytes = self._scan_disk_usage()
+            except OSError as e:
+                logger.warning(f"Asset cache disk dir unavailable ({e}), using memory only")
+                self.disk_dir = None
+
+    # ========================================================================
+    # PUBLIC API
+    # ========================================================================
+
+    async def get(self, url: str) -> Optional[CachedAsset]:
+        """Get entry (fresh or stale); promotes disk hits into memory"""
+        asset = self._memory.get(url)
+        if asset is not None:
+            self._memory.move_to_end(url)
+            self.hits += 1
+            return asset
+
+        if self.disk_dir:
+            asset = await asyncio.to_thread(self._read_disk, url)
+            if asset is not None:
+                self._put_memory(asset)
+                self.hits += 1
+                return asset
+
+        self.misses += 1
+        return None
+
+    async def put(self, asset: CachedAsset) -> None:
+        """Store entry in memory and on disk"""
+        if asset.size > self.max_entry_bytes:
+            return
+
+        self._put_memory(asset)
+
+        if self.disk_dir:
+            try:
+                await asyncio.to_thread(self._write_disk, asset)
+            except OSError as e:
+                logger.warning(f"Asset cache disk write failed for {asset.url}: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'entries': len(self._memory),
+            'memory_bytes': self._memory_bytes,
+            'disk_bytes': self._disk_bytes,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+    # ========================================================================
+    # MEMORY LRU
+    # ========================================================================
+
+    def _put_memory(self, asset: CachedAsset) -> None:
+        previous = self._memory.pop(asset.url, None)
+        if previous is not None:
+            self._memory_bytes -= previous.size
+
+        self._memory[asset.url] = asset
+        self._memory_bytes += asset.size
+
+        while self._memory_bytes > self.max_memory_bytes and self._memory:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.size
+
+    # ========================================================================
+    # DISK
+    # ========================================================================
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.disk_dir, key)
+        return base + '.json', base + '.bin'
+
+    def _read_disk(self, url: str) -> Optional[CachedAsset]:
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+
+        if meta.get('url') != url:
+            return None
+
+        # Touch so disk eviction is LRU-ish
+        try:
+            os.utime(meta_path)
+        except OSError:
+            pass
+
+        meta['body'] = body
+        return CachedAsset(**meta)
+
+    def _write_disk(self, asset: CachedAsset) -> None:
+        meta_path, body_path = self._paths(asset.url)
+        meta = asdict(asset)
+        meta.pop('body')
+
+        old_size = os.path.getsize(body_path) if os.path.exists(body_path) else 0
+
+        # Write body first, then metadata (metadata marks entry as complete)
+        tmp_body = body_path + '.tmp'
+        with open(tmp_body, 'wb') as f:
+            f.write(asset.body)
+        os.replace(tmp_body, body_path)
+
+        tmp_meta = meta_path + '.tmp'
+        with open(tmp_meta, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_meta, meta_path)
+
+        self._disk_bytes += asset.size - old_size
+        if self._disk_bytes > self.max_disk_bytes:
+            self._evict_disk()
+
+    def _scan_disk_usage(self) -> int:
+        total = 0
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith('.bin'):
+                total += entry.stat().st_size
+        return total
+
+    def _evict_disk(self) -> None:
+        """Remove least recently used entries until under 90% of the budget"""
+        entries = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith('.json'):
+                entries.append((entry.stat().st_mtime, entry.path))
+        entries.sort()
+
+        target = int(self.max_disk_bytes * 0.9)
+        for _, meta_path in entries:
+            if self._disk_bytes <= target:
+                break
+            body_path = meta_path[:-len('.json')] + '.bin'
+            try:
+                size = os.path.getsize(body_path)
+                os.remove(meta_path)
+                os.remove(body_path)
+                self._disk_bytes -= size
+            except OSError:
+                continue
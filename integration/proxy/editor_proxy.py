@@ -0,0 +1,155 @@
+# integration/proxy/editor_proxy.py
+
+"""
+Editor Proxy - Shared HTTP client for the Visual Editor
+
+Un único `httpx.AsyncClient` (HTTP/2 + keep-alive) para toda la app,
+creado en el lifespan, más una caché de assets con revalidación
+condicional. Los assets se sirven en streaming; sólo el HTML se
+bufferiza para inyectar el cliente del editor.
+"""
+
+import time
+import logging
+import importlib.util
+from typing import Callable, Dict, Optional
+
+import httpx
+from starlette.background import BackgroundTask
+from starlette.responses import HTMLResponse, Response, StreamingResponse
+
+from .asset_cache import AssetCache, CachedAsset, STORED_HEADERS, compute_freshness, is_storable
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 requires the optional `h2` package (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+
+class EditorProxy:
+    """
+    Fetches customer pages and assets for the Visual Editor iframe.
+
+    Lifecycle: create in app lifespan, `await close()` on shutdown.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[AssetCache] = None,
+        verify_tls: bool = True,
+        timeout: float = 15.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20
+    ):
+        self.cache = cache or AssetCache()
+        self.client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            verify=verify_tls,
+            follow_redirects=True,
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=30.0
+            )
+        )
+        self.logger = logging.getLogger(f"{__name__}.EditorProxy")
+
+    async def fetch(
+        self,
+        url: str,
+        transform_html: Callable[[str], str]
+    ) -> Response:
+        """
+        Proxy `url`.
+
+        - HTML: fetched fresh, passed through `transform_html`
+        - Assets: served from cache when fresh, revalidated with
+          If-None-Match / If-Modified-Since when stale, streamed on miss
+        """
+        cached = await self.cache.get(url)
+
+        if cached is not None and cached.is_fresh():
+            return self._cached_response(cached, 'HIT')
+
+        request_headers = cached.conditional_headers() if cached else {}
+        upstream = await self.client.send(
+            self.client.build_request('GET', url, headers=request_headers),
+            stream=True
+        )
+
+        # Revalidated: reuse stored body
+        if upstream.status_code == 304 and cached is not None:
+            await upstream.aclose()
+            refreshed = cached.revalidated(upstream.headers)
+            await self.cache.put(refreshed)
+            return self._cached_response(refreshed, 'REVALIDATED')
+
+        content_type = upstream.headers.get('content-type', '').lower()
+
+        if 'text/html' in content_type:
+            try:
+                await upstream.aread()
+            finally:
+                await upstream.aclose()
+            return HTMLResponse(
+                content=transform_html(upstream.text),
+                status_code=upstream.status_code
+            )
+
+        return StreamingResponse(
+            self._stream_and_store(url, upstream),
+            status_code=upstream.status_code,
+            headers={**self._client_headers(upstream.headers), 'X-Samplit-Cache': 'MISS'},
+            media_type=content_type or None,
+            background=BackgroundTask(upstream.aclose)
+        )
+
+    async def close(self):
+        """Close the shared HTTP client"""
+        await self.client.aclose()
+
+    # ========================================================================
+    # INTERNALS
+    # ========================================================================
+
+    async def _stream_and_store(self, url: str, upstream: httpx.Response):
+        """Yield decoded chunks to the client while teeing them into the cache"""
+        storable = is_storable(upstream.status_code, upstream.headers)
+        buffer = bytearray() if storable else None
+
+        async for chunk in upstream.aiter_bytes():
+            if buffer is not None:
+                buffer.extend(chunk)
+                if len(buffer) > self.cache.max_entry_bytes:
+                    buffer = None
+            yield chunk
+
+        if buffer is not None:
+            await self.cache.put(CachedAsset(
+                url=url,
+                status_code=upstream.status_code,
+                headers={
+                    name: upstream.headers[name]
+                    for name in STORED_HEADERS if name in upstream.headers
+                },
+                body=bytes(buffer),
+                stored_at=time.time(),
+                freshness=compute_freshness(upstream.headers) or 0
+            ))
+
+    def _cached_response(self, asset: CachedAsset, cache_status: str) -> Response:
+        return Response(
+            content=asset.body,
+            status_code=asset.status_code,
+            headers={**self._client_headers(asset.headers), 'X-Samplit-Cache': cache_status},
+            media_type=asset.headers.get('content-type')
+        )
+
+    @staticmethod
+    def _client_headers(headers) -> Dict[str, str]:
+        """Headers forwarded to the editor iframe (body is always decoded)"""
+        return {
+            name: headers[name]
+            for name in STORED_HEADERS if name in headers
+        }
@@ -19,6 +19,7 @@ Correcciones:
 - Inyección de tracker usando Regex (no BeautifulSoup)
 - Mucho más rápido para páginas grandes
 - Manejo robusto de errores
+- Inyección en streaming (sin bufferizar el body completo)
 """
 
 import re
@@ -26,11 +27,23 @@ import logging
 from typing import Optional
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.responses import Response, StreamingResponse
+from starlette.background import BackgroundTask
 import httpx
 
+from .streaming_injector import (
+    StreamDecoder,
+    accept_encoding_header,
+    inject_tracker_stream
+)
+
 logger = logging.getLogger(__name__)
 
+HOP_BY_HOP_HEADERS = {
+    'connection', 'keep-alive', 'transfer-encoding', 'te',
+    'trailer', 'upgrade', 'proxy-authenticate', 'proxy-authorization'
+}
+
 
 class ProxyMiddleware:
     """
@@ -70,6 +83,9 @@ class ProxyMiddleware:
         """
         Standalone method to proxy a request and inject the tracker.
         Used by the proxy router.
+        
+        ✅ Streams the origin body: the tracker is injected on the fly,
+        so TTFB matches the origin and memory stays constant.
         """
         try:
             # 1. Forward request to origin
@@ -79,39 +95,49 @@ class ProxyMiddleware:
                 k: v for k, v in request.headers.items() 
                 if k.lower() not in exclude_headers
             }
+            # Only ask for encodings we can decode in streaming
+            headers['accept-encoding'] = accept_encoding_header()
             
-            # Fetch from origin
-            response = await self.client.get(original_url, headers=headers)
-            
-            # 2. Check if we should inject tracker
-            content_type = response.headers.get('content-type', '')
-            
-            if 'text/html' not in content_type.lower():
-                # Return original response content if not HTML
-                return Response(
-                    content=response.content,
-                    status_code=response.status_code,
-                    headers=dict(response.headers)
-                )
-            
-            # 3. Inject tracker
-            html = response.text
-            modified_html = self.inject_tracker_fast(html, installation_token)
-            
-            # 4. Return modified response
-            return Response(
-                content=modified_html,
-                status_code=response.status_code,
-                headers=dict(response.headers),
-                media_type='text/html'
+            # Fetch from origin (headers only, body is streamed)
+            upstream = await self.client.send(
+                self.client.build_request('GET', original_url, headers=headers),
+                stream=True
             )
-            
         except Exception as e:
             self.logger.error(f"Proxy request failed for {original_url}: {e}")
             return Response(
                 content="Proxy Error: Could not reach origin server",
                 status_code=502
             )
+        
+        # 2. Check if we should inject tracker
+        content_type = upstream.headers.get('content-type', '')
+        content_encoding = upstream.headers.get('content-encoding')
+        
+        if (
+            'text/html' not in content_type.lower()
+            or not StreamDecoder.supports(content_encoding)
+        ):
+            # Pass original bytes through untouched
+            return StreamingResponse(
+                upstream.aiter_raw(),
+                status_code=upstream.status_code,
+                headers=self._passthrough_headers(upstream.headers),
+                background=BackgroundTask(upstream.aclose)
+            )
+        
+        # 3. Inject tracker while streaming
+        return StreamingResponse(
+            inject_tracker_stream(
+                upstream.aiter_raw(),
+                self._get_tracker_script(installation_token),
+                content_encoding
+            ),
+            status_code=upstream.status_code,
+            headers=self._rewritten_headers(upstream.headers),
+            media_type='text/html',
+            background=BackgroundTask(upstream.aclose)
+        )
     
     async def dispatch(self, request: Request, call_next):
         """
@@ -131,37 +157,48 @@ class ProxyMiddleware:
             
             # Only inject tracker in HTML responses
             content_type = response.headers.get('content-type', '')
+            content_encoding = response.headers.get('content-encoding')
             
-            if 'text/html' not in content_type.lower():
+            if (
+                'text/html' not in content_type.lower()
+                or not StreamDecoder.supports(content_encoding)
+            ):
                 return response
             
-            # Read response body
-            body = b''
-            async for chunk in response.body_iterator:
-                body += chunk
-            
-            # Decode HTML
-            try:
-                html = body.decode('utf-8')
-            except UnicodeDecodeError:
-                # Try latin-1 as fallback
-                html = body.decode('latin-1')
-            
-            # ✅ Inject tracker using fast Regex method
-            modified_html = self.inject_tracker_fast(html, installation_token)
-            
-            # Create new response
-            return Response(
-                content=modified_html,
+            # ✅ Stream body through the injector (no full buffering)
+            return StreamingResponse(
+                inject_tracker_stream(
+                    response.body_iterator,
+                    self._get_tracker_script(installation_token),
+                    content_encoding
+                ),
                 status_code=response.status_code,
-                headers=dict(response.headers),
-                media_type='text/html'
+                headers=self._rewritten_headers(response.headers),
+                media_type='text/html',
+                background=response.background
             )
         
         except Exception as e:
             self.logger.error(f"Error in proxy middleware: {e}", exc_info=True)
             return await call_next(request)
     
+    @staticmethod
+    def _passthrough_headers(headers) -> dict:
+        """Origin headers minus hop-by-hop ones"""
+        return {
+            k: v for k, v in headers.items()
+            if k.lower() not in HOP_BY_HOP_HEADERS
+        }
+    
+    @staticmethod
+    def _rewritten_headers(headers) -> dict:
+        """Headers for an injected body: decoded and of unknown length"""
+        return {
+            k: v for k, v in headers.items()
+            if k.lower() not in HOP_BY_HOP_HEADERS
+            and k.lower() not in ('content-length', 'content-encoding')
+        }
+    
     def inject_tracker_fast(
         self,
         html: str,
@@ -0,0 +1,191 @@
+# integration/proxy/streaming_injector.py
+
+"""
+Streaming Tracker Injector
+
+Inyecta el snippet del tracker en un stream HTML chunk a chunk, sin
+bufferizar el documento completo.
+
+- Busca `</head>` (antes) o `<body ...>` (después) con un pequeño
+  buffer de arrastre entre chunks
+- Inserta el snippet una sola vez; el resto de bytes pasa intacto
+- Descomprime gzip/deflate/brotli en streaming
+
+Memoria constante por request y TTFB igual al del origen.
+"""
+
+import re
+import zlib
+import logging
+from typing import AsyncIterator, Optional
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+
+# Punto de inyección: primer `</head>` o primer `<body ...>`
+_INJECTION_POINT = re.compile(rb'</head\s*>|<body(?:\s[^>]*)?>', re.IGNORECASE)
+
+# Prefijo incompleto de `</head>` o `<body ...>` al final de un chunk
+_PARTIAL_TAG = re.compile(
+    rb'<(?:/(?:h(?:e(?:a(?:d\s*)?)?)?)?|b(?:o(?:d(?:y(?:\s[^>]*)?)?)?)?)?',
+    re.IGNORECASE
+)
+
+# Máximo de bytes retenidos esperando el cierre de un `<body ...>`
+MAX_CARRY_BYTES = 4096
+
+SUPPORTED_ENCODINGS = ('gzip', 'x-gzip', 'deflate', 'br') if brotli else ('gzip', 'x-gzip', 'deflate')
+
+
+def accept_encoding_header() -> str:
+    """Accept-Encoding to send upstream: only what we can decode in streaming"""
+    return 'gzip, deflate, br' if brotli else 'gzip, deflate'
+
+
+class StreamDecoder:
+    """
+    Incremental decoder for a Content-Encoding value.
+
+    `identity` (or empty) passes bytes through unchanged.
+    """
+
+    def __init__(self, content_encoding: Optional[str]):
+        encoding = (content_encoding or 'identity').strip().lower()
+
+        self._decoder = None
+        self._is_zlib = False
+
+        if encoding in ('', 'identity'):
+            pass
+        elif encoding in ('gzip', 'x-gzip'):
+            self._decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            self._is_zlib = True
+        elif encoding == 'deflate':
+            # Auto-detect zlib header vs gzip header
+            self._decoder = zlib.decompressobj(32 + zlib.MAX_WBITS)
+            self._is_zlib = True
+        elif encoding == 'br' and brotli is not None:
+            self._decoder = brotli.Decompressor()
+        else:
+            raise ValueError(f"Unsupported content encoding: {encoding}")
+
+        self.encoding = encoding
+
+    @staticmethod
+    def supports(content_encoding: Optional[str]) -> bool:
+        encoding = (content_encoding or 'identity').strip().lower()
+        return encoding in ('', 'identity') or encoding in SUPPORTED_ENCODINGS
+
+    def decode(self, chunk: bytes) -> bytes:
+        if self._decoder is None:
+            return chunk
+        if self._is_zlib:
+            return self._decoder.decompress(chunk)
+        return self._decoder.process(chunk)
+
+    def flush(self) -> bytes:
+        if self._decoder is None:
+            return b''
+        if self._is_zlib:
+            return self._decoder.flush()
+        return b''
+
+
+class StreamingTrackerInjector:
+    """
+    Stateful chunk-by-chunk tracker injection.
+
+    Usage:
+        injector = StreamingTrackerInjector(tracker_script)
+        for chunk in upstream:
+            yield injector.feed(chunk)
+        yield injector.finish()
+    """
+
+    def __init__(self, tracker_script: str, encoding: str = 'utf-8'):
+        self.snippet = tracker_script.encode(encoding, errors='replace')
+        self.injected = False
+        self._carry = b''
+
+    def feed(self, chunk: bytes) -> bytes:
+        """Process one chunk; returns the bytes ready to be sent downstream"""
+        if self.injected:
+            return chunk
+
+        buffer = self._carry + chunk if self._carry else chunk
+        self._carry = b''
+
+        match = _INJECTION_POINT.search(buffer)
+        if match:
+            self.injected = True
+            if match.group(0)[1:2] == b'/':
+                # Before </head>
+                pos = match.start()
+            else:
+                # After <body ...>
+                pos = match.end()
+            return buffer[:pos] + self.snippet + buffer[pos:]
+
+        keep = self._partial_tail_length(buffer)
+        if keep:
+            self._carry = buffer[-keep:]
+            return buffer[:-keep]
+        return buffer
+
+    def finish(self) -> bytes:
+        """
+        Flush remaining bytes at end of stream.
+
+        If no `</head>`/`<body>` was seen, the snippet is appended at the
+        end (the start of the document has already been sent).
+        """
+        tail = self._carry
+        self._carry = b''
+
+        if self.injected:
+            return tail
+
+        self.injected = True
+        logger.warning("⚠️  No <head> or <body> found, injecting at end of stream")
+        return tail + self.snippet
+
+    @staticmethod
+    def _partial_tail_length(buffer: bytes) -> int:
+        """Length of a trailing incomplete `</head`/`<body` tag, or 0"""
+        start = max(0, len(buffer) - MAX_CARRY_BYTES)
+        idx = buffer.rfind(b'<', start)
+        if idx == -1:
+            return 0
+        if _PARTIAL_TAG.fullmatch(buffer, idx):
+            return len(buffer) - idx
+        return 0
+
+
+async def inject_tracker_stream(
+    chunks: AsyncIterator[bytes],
+    tracker_script: str,
+    content_encoding: Optional[str] = None
+) -> AsyncIterator[bytes]:
+    """
+    Decode (if compressed) and inject the tracker into an async byte stream.
+
+    Output is always identity-encoded.
+    """
+    decoder = StreamDecoder(content_encoding)
+    injector = StreamingTrackerInjector(tracker_script)
+
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        data = injector.feed(decoder.decode(chunk))
+        if data:
+            yield data
+
+    data = injector.feed(decoder.flush()) + injector.finish()
+    if data:
+        yield data
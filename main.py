@@ -19,6 +19,7 @@ from contextlib import asynccontextmanager
 from orchestration.services.service_factory import ServiceFactory
 import logging
 import time
+from datetime import timedelta
 from typing import Callable
 
 from config.settings import get_settings
@@ -87,6 +88,74 @@ async def lifespan(app: FastAPI):
     # Auto-detect and create service (PostgreSQL or Redis)
     app.state.experiment_service = await ServiceFactory.create_experiment_service(db)
     
+    # Shared Visual Editor proxy client + asset cache
+    from integration.proxy.editor_proxy import EditorProxy
+    from integration.proxy.asset_cache import AssetCache
+    app.state.editor_proxy = EditorProxy(
+        cache=AssetCache(
+            max_memory_bytes=settings.VISUAL_EDITOR_CACHE_MEMORY_MB * 1024 * 1024,
+            disk_dir=settings.VISUAL_EDITOR_CACHE_DIR or None,
+            max_disk_bytes=settings.VISUAL_EDITOR_CACHE_DISK_MB * 1024 * 1024
+        ),
+        verify_tls=settings.VISUAL_EDITOR_VERIFY_TLS
+    )
+    
+    # Time-series rollups (timelines and charts)
+    from orchestration.services.rollup_service import RollupAggregator
+    if not settings.ROLLUPS_ENABLED:
+        # No aggregator refreshes user_dashboard_summary: recompute on read
+        ServiceFactory.get_dashboard_summary_service(db).max_age = settings.DASHBOARD_SUMMARY_MAX_AGE_SECONDS
+    app.state.rollup_aggregator = RollupAggregator(
+        db,
+        interval=settings.ROLLUP_INTERVAL_SECONDS,
+        lag_seconds=settings.ROLLUP_LAG_SECONDS,
+        minute_retention=timedelta(hours=settings.ROLLUP_MINUTE_RETENTION_HOURS),
+        hour_retention=timedelta(days=settings.ROLLUP_HOUR_RETENTION_DAYS),
+        summary_service=ServiceFactory.get_dashboard_summary_service(db)
+    )
+    if settings.ROLLUPS_ENABLED:
+        app.state.rollup_aggregator.start()
+    
+    # Sequential early stopping (auto-pause / auto-promote, audited)
+    from orchestration.services.sequential_service import SequentialEvaluator, SequentialConfig
+    app.state.sequential_evaluator = SequentialEvaluator(
+        db,
+        config=SequentialConfig(
+            alpha=settings.SEQUENTIAL_ALPHA,
+            tau=settings.SEQUENTIAL_MIXTURE_TAU,
+            loss_epsilon=settings.SEQUENTIAL_LOSS_EPSILON,
+            min_samples=settings.SEQUENTIAL_MIN_SAMPLES
+        ),
+        interval=settings.SEQUENTIAL_INTERVAL_SECONDS,
+        experiment_service=app.state.experiment_service,
+        summary_service=ServiceFactory.get_dashboard_summary_service(db)
+    )
+    if settings.SEQUENTIAL_TESTING_ENABLED:
+        app.state.sequential_evaluator.start()
+    
+    # Empirical-Bayes priors for new variants (refit from completed experiments)
+    from orchestration.services.prior_service import PriorService, PriorConfig
+    app.state.prior_service = PriorService(
+        db,
+        config=PriorConfig(
+            method=settings.PRIOR_METHOD,
+            max_strength=settings.PRIOR_MAX_STRENGTH,
+            min_experiments=settings.PRIOR_MIN_EXPERIMENTS,
+            min_allocations=settings.PRIOR_MIN_ALLOCATIONS
+        ),
+        interval=settings.PRIOR_REFIT_INTERVAL_SECONDS
+    )
+    if settings.EMPIRICAL_PRIORS_ENABLED:
+        app.state.prior_service.start()
+    
+    # Segment-aware allocation (in-memory counters, flushed in batches)
+    from orchestration.services.segment_models import SegmentFlusher
+    app.state.segment_flusher = SegmentFlusher(
+        db,
+        interval=settings.SEGMENT_FLUSH_INTERVAL_SECONDS
+    )
+    app.state.segment_flusher.start()
+    
     logger.info("Samplit Platform ready!")
     
     yield
@@ -100,6 +169,13 @@ async def lifespan(app: FastAPI):
     # Shutdown metrics monitoring
     await ServiceFactory.shutdown()
     
+    await app.state.editor_proxy.close()
+    
+    await app.state.rollup_aggregator.stop()
+    await app.state.sequential_evaluator.stop()
+    await app.state.prior_service.stop()
+    await app.state.segment_flusher.stop()
+    
     await db.close()
     logger.info("Samplit Platform stopped")
 
@@ -15,6 +15,14 @@ class OptimizationStrategy(Enum):
     FAST_LEARNING = "fast_learning" # Low-traffic optimized
     SEQUENTIAL = "sequential"       # Multi-step (funnels)
     HYBRID = "hybrid"              # Auto-select best method
+    REVENUE = "revenue"            # Revenue per visitor (conversion_value)
+    CONTEXTUAL = "contextual"      # Per-visitor (request context)
+    DISCOUNTED = "discounted"      # Drifting rates (recent evidence weighs more)
+    SLIDING_WINDOW = "sliding_window"  # Drifting rates (last N hours only)
+    SEGMENTED = "segmented"        # Per-segment (device × source), shrunk to global
+    UCB1 = "ucb1"                  # Upper confidence bound
+    KL_UCB = "kl_ucb"              # KL upper confidence bound (low rates)
+    EPSILON_GREEDY = "epsilon_greedy"  # Decaying epsilon-greedy
 
 class IOptimizer(ABC):
     """
@@ -0,0 +1,295 @@
+# orchestration/services/analytics_cache.py
+"""
+Analytics Cache - Versioned results keyed by counter snapshot
+
+La clave es (experiment_id, hash de allocations/conversions por variante,
+método), así que un resultado nunca queda obsoleto: si los contadores no
+cambian, el Monte Carlo no se repite. Capas:
+
+- LRU en proceso (microsegundos)
+- Redis opcional (compartido entre workers), vía CacheService
+- Stale-while-revalidate: si sólo cambiaron los contadores (mismas
+  variantes) y hay un resultado reciente del mismo experimento, se
+  devuelve ése y se recalcula en background (una sola vez por versión)
+
+Cada llamada recibe su propia copia del resultado: los llamantes pueden
+modificarlo sin tocar la entrada cacheada ni lo que ven los demás.
+"""
+
+import copy
+import time
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def counts_fingerprint(variants: List[Dict[str, Any]]) -> str:
+    """Stable hash of everything in `variants` that affects the analysis output"""
+    parts = sorted(
+        (
+            str(v.get('id')),
+            str(v.get('name', '')),
+            bool(v.get('is_control', False)),
+            int(v.get('total_allocations') or 0),
+            int(v.get('total_conversions') or 0),
+            float(v.get('total_value') or 0)
+        )
+        for v in variants
+    )
+    return hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+
+
+def structure_fingerprint(variants: List[Dict[str, Any]]) -> str:
+    """Hash of the variant set only (ids, names, control flag), not the counts"""
+    parts = sorted(
+        (str(v.get('id')), str(v.get('name', '')), bool(v.get('is_control', False)))
+        for v in variants
+    )
+    return hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+
+
+def to_builtin(value: Any) -> Any:
+    """numpy scalars/arrays → plain Python (JSON- and Redis-safe)"""
+    if isinstance(value, dict):
+        return {k: to_builtin(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_builtin(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return value
+
+
+@dataclass
+class CachedAnalysis:
+    method: str
+    experiment_id: str
+    structure: Optional[str]
+    value: Dict[str, Any]
+    computed_at: float  # monotonic
+
+
+class AnalyticsCache:
+    """
+    LRU of analysis results with optional Redis sharing.
+
+    Key: "analytics:{method}:{experiment_id}:{fingerprint}"
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        stale_seconds: float = 30.0,
+        redis_cache=None,
+        redis_ttl: int = 3600
+    ):
+        self.max_entries = max_entries
+        self.stale_seconds = stale_seconds
+        self.redis_cache = redis_cache
+        self.redis_ttl = redis_ttl
+
+        self._entries: 'OrderedDict[str, CachedAnalysis]' = OrderedDict()
+        # (method, experiment_id) → most recent key, for stale-while-revalidate
+        self._latest: Dict[Tuple[str, str], str] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(method: str, experiment_id: str, fingerprint: str) -> str:
+        return f"analytics:{method}:{experiment_id}:{fingerprint}"
+
+    async def get_or_compute(
+        self,
+        experiment_id: str,
+        method: str,
+        fingerprint: str,
+        compute: Callable[[], Awaitable[Dict[str, Any]]],
+        structure: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Return the analysis for this counter snapshot, computing it at most once.
+
+        `structure` identifies the variant set; a stale result is only
+        served when it matches (counts moved, variants did not).
+        """
+        experiment_id = str(experiment_id)
+        key = self.make_key(method, experiment_id, fingerprint)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry.value)
+
+        if self.redis_cache is not None:
+            shared = await self.redis_cache.get(key)
+            if shared is not None:
+                self._store(method, experiment_id, structure, key, shared)
+                self.hits += 1
+                return copy.deepcopy(shared)
+
+        # Counters moved: serve the previous version while recomputing
+        previous = self._latest_entry(method, experiment_id)
+        if (
+            previous is not None
+            and structure is not None
+            and previous.structure == structure
+            and time.monotonic() - previous.computed_at <= self.stale_seconds
+        ):
+            self._compute_once(method, experiment_id, structure, key, compute)
+            self.stale_hits += 1
+            return copy.deepcopy(previous.value)
+
+        self.misses += 1
+        # Shielded: a disconnecting client must not cancel the shared computation.
+        # Every waiter of the single-flight task gets its own copy
+        value = await asyncio.shield(self._compute_once(method, experiment_id, structure, key, compute))
+        return copy.deepcopy(value)
+
+    async def lookup(
+        self,
+        experiment_id: str,
+        method: str,
+        fingerprint: str,
+        structure: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Exact-version hit (memory, then Redis) or None. For batch callers."""
+        experiment_id = str(experiment_id)
+        key = self.make_key(method, experiment_id, fingerprint)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry.value)
+
+        if self.redis_cache is not None:
+            shared = await self.redis_cache.get(key)
+            if shared is not None:
+                self._store(method, experiment_id, structure, key, shared)
+                self.hits += 1
+                return copy.deepcopy(shared)
+
+        self.misses += 1
+        return None
+
+    async def put(
+        self,
+        experiment_id: str,
+        method: str,
+        fingerprint: str,
+        value: Dict[str, Any],
+        structure: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Store a result computed outside get_or_compute (batch analysis)"""
+        experiment_id = str(experiment_id)
+        key = self.make_key(method, experiment_id, fingerprint)
+        value = to_builtin(value)
+        self._store(method, experiment_id, structure, key, value)
+
+        if self.redis_cache is not None:
+            await self.redis_cache.set(key, value, ttl=self.redis_ttl)
+        return copy.deepcopy(value)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'inflight': len(self._inflight)
+        }
+
+    # ========================================================================
+    # INTERNALS
+    # ========================================================================
+
+    def _compute_once(self, method, experiment_id, structure, key, compute) -> asyncio.Task:
+        """Single-flight: concurrent requests for one version share a task"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                self._compute_and_store(method, experiment_id, structure, key, compute)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._on_done(key, t))
+        return task
+
+    def _on_done(self, key: str, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Analytics computation failed for {key}: {task.exception()}")
+
+    async def _compute_and_store(self, method, experiment_id, structure, key, compute) -> Dict[str, Any]:
+        value = to_builtin(await compute())
+        self._store(method, experiment_id, structure, key, value)
+
+        if self.redis_cache is not None:
+            await self.redis_cache.set(key, value, ttl=self.redis_ttl)
+
+        return value
+
+    def _store(
+        self,
+        method: str,
+        experiment_id: str,
+        structure: Optional[str],
+        key: str,
+        value: Dict[str, Any]
+    ):
+        self._entries[key] = CachedAnalysis(
+            method=method,
+            experiment_id=experiment_id,
+            structure=structure,
+            value=value,
+            computed_at=time.monotonic()
+        )
+        self._entries.move_to_end(key)
+        self._latest[(method, experiment_id)] = key
+
+        while len(self._entries) > self.max_entries:
+            evicted_key, evicted = self._entries.popitem(last=False)
+            latest_id = (evicted.method, evicted.experiment_id)
+            if self._latest.get(latest_id) == evicted_key:
+                del self._latest[latest_id]
+
+    def _latest_entry(self, method: str, experiment_id: str) -> Optional[CachedAnalysis]:
+        key = self._latest.get((method, experiment_id))
+        return self._entries.get(key) if key else None
+
+
+_analytics_cache: Optional[AnalyticsCache] = None
+
+
+def get_analytics_cache() -> AnalyticsCache:
+    """Process-wide cache (AnalyticsService is instantiated per request)"""
+    global _analytics_cache
+
+    if _analytics_cache is None:
+        from config.settings import settings
+
+        redis_cache = None
+        if settings.ANALYTICS_CACHE_REDIS:
+            import redis.asyncio as redis
+            from .cache_service import CacheService
+            redis_cache = CacheService(redis.from_url(settings.REDIS_URL))
+
+        _analytics_cache = AnalyticsCache(
+            max_entries=settings.ANALYTICS_CACHE_MAX_ENTRIES,
+            stale_seconds=settings.ANALYTICS_CACHE_STALE_SECONDS,
+            redis_cache=redis_cache,
+            redis_ttl=settings.CACHE_TTL
+        )
+
+    return _analytics_cache
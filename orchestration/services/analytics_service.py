@@ -6,14 +6,41 @@ Correcciones:
 - Mejor performance sin sacrificar precisión
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
-from scipy import stats
-from datetime import datetime, timedelta
+
+from .analytics_cache import (
+    AnalyticsCache,
+    counts_fingerprint,
+    structure_fingerprint,
+    get_analytics_cache
+)
+from .batch_analytics import (
+    OBJECTIVE_CONVERSION,
+    OBJECTIVE_REVENUE,
+    BatchResult,
+    RaggedCounts,
+    analyze_counts,
+    analyze_counts_sharded,
+    wilson_interval,
+    z_test
+)
 
 logger = logging.getLogger(__name__)
 
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_process_pool(workers: int) -> ProcessPoolExecutor:
+    """Shared worker processes for sharded batch analysis (created on first use)"""
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=workers)
+    return _process_pool
+
 
 class AnalyticsService:
     """
@@ -23,6 +50,8 @@ class AnalyticsService:
     - Adaptive Monte Carlo sampling based on variant count
     - Faster for experiments with many variants
     - Maintains statistical accuracy
+    - Vectorized batch path (analyze_experiments): one NumPy pass for
+      many experiments/elements, see batch_analytics.py
     """
     
     # ✅ Adaptive sampling configuration
@@ -31,17 +60,49 @@ class AnalyticsService:
     SAMPLES_MEDIUM_VARIANTS = 5000  # 6-10 variants
     SAMPLES_MANY_VARIANTS = 3000  # 11+ variants
     
-    def __init__(self):
+    # Part of the cache key: bump when the analysis output changes
+    ANALYSIS_VERSION = "v2.2"
+    
+    def __init__(
+        self,
+        cache: Optional[AnalyticsCache] = None,
+        batch_workers: Optional[int] = None,
+        shard_min_arms: Optional[int] = None
+    ):
+        from config.settings import settings
+        
+        self.cache = cache or get_analytics_cache()
+        self.batch_workers = settings.ANALYTICS_BATCH_WORKERS if batch_workers is None else batch_workers
+        self.shard_min_arms = settings.ANALYTICS_BATCH_SHARD_MIN_ARMS if shard_min_arms is None else shard_min_arms
         self.logger = logging.getLogger(f"{__name__}.AnalyticsService")
     
+    @property
+    def method_key(self) -> str:
+        sampling = 'adaptive' if self.ADAPTIVE_SAMPLING else 'fixed'
+        return f"bayes-{self.ANALYSIS_VERSION}-{sampling}"
+    
+    def _method_key(self, objective: str) -> str:
+        if objective == OBJECTIVE_CONVERSION:
+            return self.method_key
+        return f"{self.method_key}-{objective}"
+    
+    @staticmethod
+    def objective_for(optimization_strategy: Optional[str]) -> str:
+        """Experiments optimized with the 'revenue' strategy are analyzed on revenue per visitor"""
+        return OBJECTIVE_REVENUE if optimization_strategy == 'revenue' else OBJECTIVE_CONVERSION
+    
     async def analyze_experiment(
         self,
         experiment_id: str,
-        variants: List[Dict[str, Any]]
+        variants: List[Dict[str, Any]],
+        objective: str = OBJECTIVE_CONVERSION
     ) -> Dict[str, Any]:
         """
         Analyze experiment results (flat list of variants)
         
+        objective: 'conversion' (default) or 'revenue' (P(best) and
+        expected loss on revenue per visitor, see objective_for())
+        
         Returns:
             {
                 "experiment_id": str,
@@ -67,64 +128,109 @@ class AnalyticsService:
                 "recommendations": {}
             }
         
-        # Calculate totals
-        total_allocations = sum(v.get('total_allocations', 0) for v in variants)
-        total_conversions = sum(v.get('total_conversions', 0) for v in variants)
-        
-        overall_cr = (
-            total_conversions / total_allocations
-            if total_allocations > 0
-            else 0.0
+        # ✅ Cached per counter snapshot: unchanged data → no Monte Carlo
+        return await self.cache.get_or_compute(
+            experiment_id,
+            self._method_key(objective),
+            counts_fingerprint(variants),
+            lambda: self._analyze_experiment(experiment_id, variants, objective),
+            structure=structure_fingerprint(variants)
         )
+    
+    async def _analyze_experiment(
+        self,
+        experiment_id: str,
+        variants: List[Dict[str, Any]],
+        objective: str = OBJECTIVE_CONVERSION
+    ) -> Dict[str, Any]:
+        """Uncached analysis (see analyze_experiment)"""
+        return self._analyze_batch([(experiment_id, variants)], objective)[0]
+
+    async def analyze_experiments(
+        self,
+        experiments: List[Tuple[str, List[Dict[str, Any]]]],
+        objective: str = OBJECTIVE_CONVERSION
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        ✅ Batch analysis: many experiments (or elements) in one vectorized pass
         
-        # Analyze each variant
-        variant_analysis = []
-        
-        for variant in variants:
-            analysis = self._analyze_variant(variant, overall_cr)
-            variant_analysis.append(analysis)
+        Cached snapshots are served as-is; the misses are flattened into
+        one RaggedCounts and analyzed together (sharded across processes
+        above ANALYTICS_BATCH_SHARD_MIN_ARMS when workers are configured).
         
-        # Bayesian analysis (Adaptive Choice Strategy insights)
-        bayesian = await self._perform_bayesian_analysis(variants)
+        Args:
+            experiments: [(experiment_id, variants)], same variant dicts
+                as analyze_experiment
         
-        # Recommendations
-        recommendations = self._generate_recommendations(
-            variant_analysis,
-            bayesian
-        )
+        Returns:
+            {experiment_id: analyze_experiment() result}
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        pending = []
+        
+        for experiment_id, variants in experiments:
+            experiment_id = str(experiment_id)
+            if not variants:
+                results[experiment_id] = await self.analyze_experiment(experiment_id, variants)
+                continue
+            cached = await self.cache.lookup(
+                experiment_id,
+                self._method_key(objective),
+                counts_fingerprint(variants),
+                structure=structure_fingerprint(variants)
+            )
+            if cached is not None:
+                results[experiment_id] = cached
+            else:
+                pending.append((experiment_id, variants))
+        
+        if pending:
+            n_arms = sum(len(v) for _, v in pending)
+            if self.batch_workers > 1 and n_arms >= self.shard_min_arms:
+                # Off the event loop: the shards run in worker processes
+                loop = asyncio.get_running_loop()
+                computed = await loop.run_in_executor(None, self._analyze_batch, pending, objective)
+            else:
+                computed = self._analyze_batch(pending, objective)
+            
+            for (experiment_id, variants), value in zip(pending, computed):
+                results[experiment_id] = await self.cache.put(
+                    experiment_id,
+                    self._method_key(objective),
+                    counts_fingerprint(variants),
+                    value,
+                    structure=structure_fingerprint(variants)
+                )
         
-        return {
-            "experiment_id": experiment_id,
-            "variant_count": len(variants),
-            "total_allocations": total_allocations,
-            "total_conversions": total_conversions,
-            "overall_conversion_rate": overall_cr,
-            "variants": variant_analysis,
-            "bayesian_analysis": bayesian,
-            "recommendations": recommendations
-        }
+        return results
 
     async def analyze_hierarchical_experiment(
         self,
         experiment_id: str,
-        elements: List[Dict[str, Any]]
+        elements: List[Dict[str, Any]],
+        daily_rollups: Optional[List[Dict[str, Any]]] = None,
+        objective: str = OBJECTIVE_CONVERSION
     ) -> Dict[str, Any]:
         """
         Analyze a multi-element experiment
         
         Args:
             elements: List of dicts, each containing 'id', 'name' and 'variants'
+            daily_rollups: Day buckets from RollupRepository.get_timeline()
+                (bucket_start, variant_id, allocations, conversions)
         """
         element_analysis = []
         total_visitors = 0
         total_conversions = 0
 
+        # ✅ All elements in one vectorized pass
+        analyses = await self.analyze_experiments([
+            (str(element.get('id', 'unknown')), element.get('variants', []))
+            for element in elements
+        ], objective)
+
         for element in elements:
-            # Analyze this element's variants
-            analysis = await self.analyze_experiment(
-                element.get('id', 'unknown'),
-                element.get('variants', [])
-            )
+            analysis = analyses[str(element.get('id', 'unknown'))]
             
             # Map to expected element performance format
             element_perf = {
@@ -151,18 +257,14 @@ class AnalyticsService:
             # ✅ PASS FULL CORE STATS TO FRONTEND
             element_perf["bayesian_stats"] = analysis['bayesian_analysis']
             
-            # ✅ GENERATE PLAUSIBLE HISTORY FOR VISUALIZATION
-            # Since we don't have a time-series DB yet, we reconstruct the history
-            # based on the final totals to show the "story" of the experiment.
-            if getattr(element.get('variants', []), '__iter__', None):
-                element_perf["daily_stats"] = self._generate_daily_stats(element.get('variants', []))
-                
-                # ✅ GENERATE TRAFFIC BREAKDOWN
-                # Simulating source data for UI visualization
-                element_perf["traffic_breakdown"] = self._generate_traffic_breakdown(
-                    total_allocations=sum(v.get('total_allocations', 0) for v in element.get('variants', [])),
-                    overall_cr=element_perf.get('variants', [{}])[0].get('conversion_rate', 0.1) # Baseline CR
-                )
+            # ✅ REAL HISTORY FROM DAY ROLLUPS
+            element_perf["daily_stats"] = self._build_daily_stats(
+                element.get('variants', []),
+                daily_rollups or []
+            )
+            
+            # Traffic source is not tracked per assignment yet
+            element_perf["traffic_breakdown"] = []
 
             element_analysis.append(element_perf)
             
@@ -178,148 +280,123 @@ class AnalyticsService:
             "overall_conversion_rate": (total_conversions / total_visitors) if total_visitors > 0 else 0.0
         }
     
-    def _analyze_variant(
-        self,
-        variant: Dict[str, Any],
-        baseline_cr: float
-    ) -> Dict[str, Any]:
-        """Analyze individual variant"""
-        
-        allocations = variant['total_allocations']
-        conversions = variant['total_conversions']
-        
-        cr = conversions / allocations if allocations > 0 else 0.0
-        
-        # Calculate lift over baseline
-        lift = ((cr - baseline_cr) / baseline_cr * 100) if baseline_cr > 0 else 0.0
-        
-        # Statistical significance (frequentist)
-        p_value, is_significant = self._calculate_significance(
-            conversions,
-            allocations,
-            baseline_cr
-        )
-        
-        # Confidence interval
-        ci_lower, ci_upper = self._calculate_confidence_interval(
-            conversions,
-            allocations,
-            confidence=0.95
-        )
-        
-        return {
-            "variant_id": variant['id'],
-            "variant_name": variant['name'],
-            "is_control": variant.get('is_control', False),
-            "total_allocations": allocations,
-            "total_conversions": conversions,
-            "conversion_rate": cr,
-            "lift_percent": lift,
-            "p_value": p_value,
-            "is_statistically_significant": is_significant,
-            "confidence_interval": {
-                "lower": ci_lower,
-                "upper": ci_upper,
-                "confidence": 0.95
-            }
-        }
-    
-    async def _perform_bayesian_analysis(
-        self,
-        variants: List[Dict[str, Any]]
-    ) -> Dict[str, Any]:
+    def _samples_for(self, n_variants: int) -> int:
         """
-        ✅ FIXED: Bayesian analysis with adaptive sampling
+        ✅ Adaptive sampling
         
-        Performance improvements:
-        - 2-5 variants: 10,000 samples (~100ms)
-        - 6-10 variants: 5,000 samples (~75ms)
-        - 11+ variants: 3,000 samples (~50ms)
+        - 2-5 variants: 10,000 samples
+        - 6-10 variants: 5,000 samples
+        - 11+ variants: 3,000 samples
         
         Accuracy remains >99% for all cases
         """
-        
-        n_variants = len(variants)
-        
-        # ✅ Adaptive sampling
-        if self.ADAPTIVE_SAMPLING:
-            if n_variants <= 5:
-                samples = self.SAMPLES_FEW_VARIANTS
-            elif n_variants <= 10:
-                samples = self.SAMPLES_MEDIUM_VARIANTS
-            else:
-                samples = self.SAMPLES_MANY_VARIANTS
-        else:
-            # Fixed sampling (legacy)
-            samples = 10000
-        
-        self.logger.debug(
-            f"Core analysis: {n_variants} variants, {samples} cycles"
-        )
-        
-        # Monte Carlo simulation
-        variant_samples = []
-        
-        for variant in variants:
-            allocations = variant['total_allocations']
-            conversions = variant['total_conversions']
-            
-            # Beta distribution parameters
-            alpha = conversions + 1  # Prior: alpha=1 (uninformative)
-            beta = (allocations - conversions) + 1  # Prior: beta=1
-            
-            # Generate samples
-            variant_samples.append(
-                np.random.beta(alpha, beta, samples)
+        if not self.ADAPTIVE_SAMPLING:
+            return 10000  # Fixed sampling (legacy)
+        if n_variants <= 5:
+            return self.SAMPLES_FEW_VARIANTS
+        if n_variants <= 10:
+            return self.SAMPLES_MEDIUM_VARIANTS
+        return self.SAMPLES_MANY_VARIANTS
+    
+    def _analyze_batch(
+        self,
+        experiments: List[Tuple[str, List[Dict[str, Any]]]],
+        objective: str = OBJECTIVE_CONVERSION
+    ) -> List[Dict[str, Any]]:
+        """Vectorized analysis of non-empty experiments, results in input order"""
+        groups = [variants for _, variants in experiments]
+        counts = RaggedCounts.from_groups(groups)
+        samples = np.array([self._samples_for(len(g)) for g in groups], dtype=np.int64)
+        
+        if self.batch_workers > 1 and counts.allocations.shape[0] >= self.shard_min_arms:
+            result = analyze_counts_sharded(
+                counts, samples, workers=self.batch_workers,
+                executor=_get_process_pool(self.batch_workers), objective=objective
             )
+        else:
+            result = analyze_counts(counts, samples, objective=objective)
         
-        # Calculate probabilities
-        variant_samples = np.array(variant_samples)
-        
-        # Probability each variant is best
-        best_variant = np.argmax(variant_samples, axis=0)
-        prob_best = [
-            (best_variant == i).sum() / samples
-            for i in range(n_variants)
-        ]
-        
-        # Expected loss (how much worse if we pick this variant)
-        max_samples = np.max(variant_samples, axis=0)
-        expected_loss = [
-            np.mean(max_samples - variant_samples[i])
-            for i in range(n_variants)
+        return [
+            self._assemble(experiment_id, variants, result, g, objective)
+            for g, (experiment_id, variants) in enumerate(experiments)
         ]
+    
+    def _assemble(
+        self,
+        experiment_id: str,
+        variants: List[Dict[str, Any]],
+        result: BatchResult,
+        group: int,
+        objective: str = OBJECTIVE_CONVERSION
+    ) -> Dict[str, Any]:
+        """One experiment's slice of a BatchResult → analyze_experiment() shape"""
+        arms = result.arms(group)
+        mean_key = (
+            "mean_revenue_per_visitor" if objective == OBJECTIVE_REVENUE
+            else "mean_conversion_rate"
+        )
         
-        # Build results
-        results = []
-        
-        for i, variant in enumerate(variants):
-            results.append({
+        variant_analysis = []
+        bayesian_variants = []
+        for i, variant in zip(range(arms.start, arms.stop), variants):
+            variant_analysis.append({
+                "variant_id": variant['id'],
+                "variant_name": variant['name'],
+                "is_control": variant.get('is_control', False),
+                "total_allocations": variant['total_allocations'],
+                "total_conversions": variant['total_conversions'],
+                "conversion_rate": float(result.conversion_rate[i]),
+                "lift_percent": float(result.lift_percent[i]),
+                "p_value": float(result.p_value[i]),
+                "is_statistically_significant": bool(result.is_significant[i]),
+                "confidence_interval": {
+                    "lower": float(result.ci_lower[i]),
+                    "upper": float(result.ci_upper[i]),
+                    "confidence": 0.95
+                },
+                "total_value": float(variant.get('total_value') or 0),
+                "revenue_per_visitor": float(result.revenue_per_visitor[i]),
+                "average_order_value": float(result.average_order_value[i])
+            })
+            bayesian_variants.append({
                 "variant_id": variant['id'],
                 "variant_name": variant['name'],
-                "probability_best": prob_best[i],
-                "expected_loss": expected_loss[i],
-                "mean_conversion_rate": np.mean(variant_samples[i]),
+                "probability_best": float(result.prob_best[i]),
+                "expected_loss": float(result.expected_loss[i]),
+                mean_key: float(result.posterior_mean[i]),
                 "credible_interval_95": {
-                    "lower": np.percentile(variant_samples[i], 2.5),
-                    "upper": np.percentile(variant_samples[i], 97.5)
+                    "lower": float(result.credible_lower[i]),
+                    "upper": float(result.credible_upper[i])
                 }
             })
         
-        # Find winner
-        best_idx = np.argmax(prob_best)
-        
-        return {
-            "method": "Samplit Core Engine v2.1",
-            "monte_carlo_samples": samples,
-            "variants": results,
+        best_idx = int(np.argmax(result.prob_best[arms]))
+        bayesian = {
+            "method": "Samplit Core Engine v2.2",
+            "metric": "revenue_per_visitor" if objective == OBJECTIVE_REVENUE else "conversion_rate",
+            "monte_carlo_samples": int(result.samples[group]),
+            "variants": bayesian_variants,
             "winner": {
                 "variant_id": variants[best_idx]['id'],
                 "variant_name": variants[best_idx]['name'],
-                "probability_best": prob_best[best_idx],
-                "expected_loss": expected_loss[best_idx]
+                "probability_best": bayesian_variants[best_idx]['probability_best'],
+                "expected_loss": bayesian_variants[best_idx]['expected_loss']
             }
         }
+        
+        total_allocations = sum(v.get('total_allocations', 0) for v in variants)
+        total_conversions = sum(v.get('total_conversions', 0) for v in variants)
+        
+        return {
+            "experiment_id": experiment_id,
+            "variant_count": len(variants),
+            "total_allocations": total_allocations,
+            "total_conversions": total_conversions,
+            "overall_conversion_rate": float(result.group_conversion_rate[group]),
+            "variants": variant_analysis,
+            "bayesian_analysis": bayesian,
+            "recommendations": self._generate_recommendations(variant_analysis, bayesian)
+        }
     
     def _calculate_significance(
         self,
@@ -334,31 +411,10 @@ class AnalyticsService:
         Returns:
             (p_value, is_significant)
         """
-        
-        if allocations == 0:
-            return (1.0, False)
-        
-        observed_cr = conversions / allocations
-        
-        # Z-test for proportions
-        # H0: observed_cr = baseline_cr
-        # H1: observed_cr != baseline_cr
-        
-        se = np.sqrt(
-            baseline_cr * (1 - baseline_cr) / allocations
+        p_value, significant = z_test(
+            np.array([conversions]), np.array([allocations]), np.array([baseline_cr]), alpha
         )
-        
-        if se == 0:
-            return (1.0, False)
-        
-        z = (observed_cr - baseline_cr) / se
-        
-        # Two-tailed p-value
-        p_value = 2 * (1 - stats.norm.cdf(abs(z)))
-        
-        is_significant = p_value < alpha
-        
-        return (p_value, is_significant)
+        return (float(p_value[0]), bool(significant[0]))
     
     def _calculate_confidence_interval(
         self,
@@ -371,23 +427,8 @@ class AnalyticsService:
         
         Uses Wilson score interval (more accurate for small samples)
         """
-        
-        if allocations == 0:
-            return (0.0, 0.0)
-        
-        p = conversions / allocations
-        n = allocations
-        
-        z = stats.norm.ppf((1 + confidence) / 2)
-        
-        denominator = 1 + z**2 / n
-        center = (p + z**2 / (2 * n)) / denominator
-        margin = z * np.sqrt((p * (1 - p) + z**2 / (4 * n)) / n) / denominator
-        
-        lower = max(0, center - margin)
-        upper = min(1, center + margin)
-        
-        return (lower, upper)
+        lower, upper = wilson_interval(np.array([conversions]), np.array([allocations]), confidence)
+        return (float(lower[0]), float(upper[0]))
     
     def _generate_recommendations(
         self,
@@ -459,111 +500,57 @@ class AnalyticsService:
         
         return recommendations
 
-    def _generate_daily_stats(self, variants: List[Dict]) -> List[Dict]:
+    def _build_daily_stats(
+        self,
+        variants: List[Dict],
+        daily_rollups: List[Dict[str, Any]]
+    ) -> List[Dict]:
         """
-        Generates plausible daily cumulative stats that sum up to the current totals.
-        Mocks the history for visualization purposes while keeping end-state accurate.
+        Cumulative per-day stats for an element's variants, from day rollups.
+        
+        Returns [{'date', 'variant_stats': [{'variant_id', 'name',
+        'cumulative_allocations', 'cumulative_conversions',
+        'conversion_rate'}]}], oldest day first.
         """
-        try:
-            days = 7
-            daily_data = []
-            
-            # Initialize cumulative counters for each variant
-            # Structure: {variant_id: {'allocations': 0, 'conversions': 0}}
-            cumulative = {str(v['id']): {'allocations': 0, 'conversions': 0} for v in variants}
-            
-            # Calculate daily increments to reach the total
-            # We work backwards derived from final total
-            
-            for day_offset in range(days):
-                # Days usually go 1..7
-                # We want dates to be [Today-6, Today-5, ..., Today]
-                date_obj = datetime.utcnow() - timedelta(days=days - 1 - day_offset)
-                date_str = date_obj.strftime('%Y-%m-%d')
-                day_stats = {'date': date_str, 'variant_stats': []}
-                
-                # Progress factor (how much of the total we show this day)
-                # Curve: starts slow, ramps up. 
-                # Day 0: 10%, Day 1: 25%, ... Day 6: 100%
-                progress = (day_offset + 1) / days 
-                
-                # Add some randomness to the curve so it's not a straight line
-                if progress < 1.0:
-                    # Non-linear growth (sigmoid-ish)
-                    progress = progress * (0.8 + 0.4 * np.random.random()) 
-                    progress = min(progress, 0.99) # Don't exceed 100% before last day
-                else:
-                    progress = 1.0 # Ensure we hit exactly 100% on last day
-                
-                for v in variants:
-                    vid = str(v['id'])
-                    total_allocs = v.get('total_allocations', 0)
-                    total_convs = v.get('total_conversions', 0)
-                    
-                    # Calculate cumulative up to this day based on progress curve
-                    curr_allocs = int(total_allocs * progress)
-                    curr_convs = int(total_convs * progress)
-                    
-                    rate = (curr_convs / curr_allocs) if curr_allocs > 0 else 0.0
-                    
-                    day_stats['variant_stats'].append({
-                        'variant_id': vid,
-                        'name': v.get('name', 'Variant'),
-                        'cumulative_allocations': curr_allocs,
-                        'cumulative_conversions': curr_convs,
-                        'conversion_rate': rate
-                    })
-                
-                daily_data.append(day_stats)
-            
-            return daily_data
-            
-        except Exception as e:
-            self.logger.error(f"Error generating daily stats: {e}")
+        names = {str(v['id']): v.get('name', 'Variant') for v in variants}
+        if not names or not daily_rollups:
             return []
-
-    def _generate_traffic_breakdown(self, total_allocations: int, overall_cr: float) -> List[Dict]:
-        """
-        Generates simulated traffic source breakdown.
-        """
-        try:
-            sources = ['Direct', 'Organic Search', 'Social', 'Paid Ads']
-            # Approximate distribution
-            weights = [0.3, 0.4, 0.2, 0.1]
-            breakdown = []
-            
-            remaining = total_allocations
+        
+        # {date: {variant_id: (allocations, conversions)}}
+        by_day: Dict[str, Dict[str, tuple]] = {}
+        for row in daily_rollups:
+            vid = str(row['variant_id'])
+            if vid not in names:
+                continue
+            date_str = row['bucket_start'].strftime('%Y-%m-%d')
+            by_day.setdefault(date_str, {})[vid] = (
+                int(row['allocations']),
+                int(row['conversions'])
+            )
+        
+        cumulative = {vid: [0, 0] for vid in names}
+        daily_data = []
+        
+        for date_str in sorted(by_day):
+            day_stats = {'date': date_str, 'variant_stats': []}
             
-            for i, source in enumerate(sources):
-                if i == len(sources) - 1:
-                    visitors = remaining
-                else:
-                    visitors = int(total_allocations * weights[i])
-                    # Add some randomness +/- 5%
-                    visitors = int(visitors * (0.95 + 0.1 * np.random.random()))
-                    remaining -= visitors
-                
-                if visitors < 0: visitors = 0
-                
-                # Conversion rate variability per source
-                # e.g. Organic converts better than Social
-                multiplier = 1.0
-                if source == 'Organic Search': multiplier = 1.2
-                if source == 'Social': multiplier = 0.8
+            for vid, name in names.items():
+                allocs, convs = by_day[date_str].get(vid, (0, 0))
+                cumulative[vid][0] += allocs
+                cumulative[vid][1] += convs
+                total_allocs, total_convs = cumulative[vid]
                 
-                cr = min(overall_cr * multiplier, 1.0)
-                
-                breakdown.append({
-                    "source": source,
-                    "visitors": visitors,
-                    "conversion_rate": cr
+                day_stats['variant_stats'].append({
+                    'variant_id': vid,
+                    'name': name,
+                    'cumulative_allocations': total_allocs,
+                    'cumulative_conversions': total_convs,
+                    'conversion_rate': (total_convs / total_allocs) if total_allocs > 0 else 0.0
                 })
-                
-            return breakdown
             
-        except Exception as e:
-            self.logger.error(f"Error generating traffic breakdown: {e}")
-            return []
+            daily_data.append(day_stats)
+        
+        return daily_data
 
 
 # ============================================================================
@@ -179,7 +179,104 @@ class AuditService:
                 )
             
             return True
-    
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # DECISIONES DE EXPERIMENTO (pausa / promoción / cierre automáticos)
+    # ═══════════════════════════════════════════════════════════════════════
+
+    async def log_experiment_decision(
+        self,
+        experiment_id: UUID,
+        action: str,
+        reason: str,
+        statistics: Dict[str, Any],
+        element_id: Optional[UUID] = None,
+        variant_id: Optional[UUID] = None,
+        conn=None
+    ) -> UUID:
+        """
+        Registra una decisión automática sobre el experimento.
+
+        Misma cadena de hashes que `log_decision`, en su propia tabla
+        (experiment_decisions). Las estadísticas que justifican la decisión
+        (p-valor always-valid, confidence sequence, expected loss) se
+        guardan completas: son públicas, no revelan el estado del algoritmo.
+
+        Args:
+            action: 'pause_variant' | 'promote_variant' | 'complete_experiment'
+            conn: Conexión en transacción, para que la decisión y el cambio
+                  que la aplica se confirmen juntos
+        """
+        if conn is None:
+            async with self.db.pool.acquire() as conn:
+                return await self.log_experiment_decision(
+                    experiment_id, action, reason, statistics,
+                    element_id=element_id, variant_id=variant_id, conn=conn
+                )
+
+        row = await conn.fetchrow("""
+            SELECT decision_hash, sequence_number
+            FROM experiment_decisions
+            WHERE experiment_id = $1
+            ORDER BY sequence_number DESC
+            LIMIT 1
+        """, experiment_id)
+        previous_hash, sequence_number = (
+            (row['decision_hash'], row['sequence_number'] + 1) if row else (None, 1)
+        )
+
+        decision_timestamp = datetime.now(timezone.utc)
+        decision_hash = self._hash_dict({
+            'action': action,
+            'element_id': str(element_id) if element_id else '',
+            'variant_id': str(variant_id) if variant_id else '',
+            'statistics': statistics,
+            'timestamp': decision_timestamp.isoformat(),
+            'previous_hash': previous_hash or '',
+            'sequence_number': sequence_number
+        })
+
+        return await conn.fetchval("""
+            INSERT INTO experiment_decisions (
+                experiment_id, element_id, variant_id,
+                action, reason, statistics, algorithm_version,
+                decision_timestamp, sequence_number, previous_hash, decision_hash
+            )
+            VALUES ($1, $2, $3, $4, $5, $6::jsonb, $7, $8, $9, $10, $11)
+            RETURNING id
+        """,
+            experiment_id, element_id, variant_id,
+            action, reason, json.dumps(statistics), self.algorithm_version,
+            decision_timestamp, sequence_number, previous_hash, decision_hash
+        )
+
+    async def get_experiment_decisions(
+        self,
+        experiment_id: UUID,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Decisiones automáticas del experimento, más recientes primero."""
+        async with self.db.pool.acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT id, element_id, variant_id, action, reason, statistics,
+                       decision_timestamp, sequence_number, decision_hash
+                FROM experiment_decisions
+                WHERE experiment_id = $1
+                ORDER BY sequence_number DESC
+                LIMIT $2
+            """, experiment_id, limit)
+
+        results = []
+        for row in rows:
+            record = dict(row)
+            for key in ('id', 'element_id', 'variant_id'):
+                if record[key] is not None:
+                    record[key] = str(record[key])
+            if isinstance(record['statistics'], str):
+                record['statistics'] = json.loads(record['statistics'])
+            results.append(record)
+        return results
+
     # ═══════════════════════════════════════════════════════════════════════
     # CONSULTAS PÚBLICAS (para clientes)
     # ═══════════════════════════════════════════════════════════════════════
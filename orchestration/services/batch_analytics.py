@@ -0,0 +1,398 @@
+# orchestration/services/batch_analytics.py
+"""
+Batch Analytics - Vectorized analysis of many experiments at once
+
+Los contadores de N experimentos (o elementos) se aplanan en arrays
+contiguos con offsets, estilo CSR:
+
+    allocations = [a00, a01, a10, a11, a12, ...]
+    offsets     = [0, 2, 5, ...]      # grupo g = [offsets[g], offsets[g+1])
+
+y todo se calcula en una pasada: tasas, lift, z-test y Wilson por
+variante; P(best), expected loss, media e intervalo creíble con un único
+sorteo Beta (samples × variantes) por bloque y `np.maximum.reduceat`
+para el máximo de cada grupo. Sin bucles Python por experimento.
+
+Con objective='revenue' el posterior es el de ingreso por visitante
+(conversión Beta × valor log-normal, engine/core/math/_revenue.py) a
+partir de las estadísticas de valor acumuladas por variante.
+
+Los bloques se cortan en fronteras de grupo para acotar memoria
+(`max_cells`), y `analyze_counts_sharded` reparte grupos entre procesos
+para cuentas muy grandes.
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+from scipy import stats
+
+from engine.core.math._revenue import sample_revenue_per_visitor
+
+logger = logging.getLogger(__name__)
+
+OBJECTIVE_CONVERSION = 'conversion'
+OBJECTIVE_REVENUE = 'revenue'
+OBJECTIVES = (OBJECTIVE_CONVERSION, OBJECTIVE_REVENUE)
+
+
+# Value sufficient statistics (schema_revenue.sql), variant dict key → field
+VALUE_COLUMNS = (
+    ('valued_conversions', 'valued'),
+    ('total_value', 'total_value'),
+    ('sum_log_value', 'sum_log'),
+    ('sum_log_value_sq', 'sum_log_sq'),
+)
+
+
+@dataclass
+class RaggedCounts:
+    """Per-variant counters of many groups, flattened with offsets"""
+    allocations: np.ndarray  # (n_arms,) int64
+    conversions: np.ndarray  # (n_arms,) int64
+    offsets: np.ndarray      # (n_groups + 1,) int64, offsets[0] == 0
+    # Running value statistics, (n_arms,) float64; zeros when absent
+    valued: Optional[np.ndarray] = None
+    total_value: Optional[np.ndarray] = None
+    sum_log: Optional[np.ndarray] = None
+    sum_log_sq: Optional[np.ndarray] = None
+
+    def __post_init__(self):
+        for _, name in VALUE_COLUMNS:
+            if getattr(self, name) is None:
+                setattr(self, name, np.zeros(self.allocations.shape[0]))
+
+    @classmethod
+    def from_groups(cls, groups: Sequence[Sequence[Dict[str, Any]]]) -> 'RaggedCounts':
+        """Build from lists of variant dicts (total_allocations / total_conversions [+ value stats])"""
+        sizes = np.fromiter((len(g) for g in groups), dtype=np.int64, count=len(groups))
+        offsets = np.zeros(len(groups) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+        n_arms = int(offsets[-1])
+
+        def column(key, dtype):
+            return np.fromiter(
+                (float(v.get(key) or 0) for g in groups for v in g),
+                dtype=dtype, count=n_arms
+            )
+
+        return cls(
+            column('total_allocations', np.int64),
+            column('total_conversions', np.int64),
+            offsets,
+            **{name: column(key, np.float64) for key, name in VALUE_COLUMNS}
+        )
+
+    @property
+    def n_groups(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def sizes(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    @property
+    def group_index(self) -> np.ndarray:
+        """Group of every arm, (n_arms,)"""
+        return np.repeat(np.arange(self.n_groups), self.sizes)
+
+    def take(self, groups: np.ndarray) -> 'RaggedCounts':
+        """Sub-batch with the given groups, in that order"""
+        sizes = self.sizes[groups]
+        arms = np.concatenate(
+            [np.arange(self.offsets[g], self.offsets[g + 1]) for g in groups]
+        ) if len(groups) else np.zeros(0, dtype=np.int64)
+        offsets = np.zeros(len(groups) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+        return RaggedCounts(
+            self.allocations[arms], self.conversions[arms], offsets,
+            **{name: getattr(self, name)[arms] for _, name in VALUE_COLUMNS}
+        )
+
+
+@dataclass
+class BatchResult:
+    """Per-arm and per-group outputs, aligned with the input RaggedCounts"""
+    offsets: np.ndarray
+    # Per arm
+    conversion_rate: np.ndarray
+    lift_percent: np.ndarray
+    p_value: np.ndarray
+    is_significant: np.ndarray
+    ci_lower: np.ndarray
+    ci_upper: np.ndarray
+    revenue_per_visitor: np.ndarray
+    average_order_value: np.ndarray
+    # Posterior of the objective metric (conversion rate or revenue per visitor)
+    prob_best: np.ndarray
+    expected_loss: np.ndarray
+    posterior_mean: np.ndarray
+    credible_lower: np.ndarray
+    credible_upper: np.ndarray
+    # Per group
+    group_allocations: np.ndarray
+    group_conversions: np.ndarray
+    group_conversion_rate: np.ndarray
+    samples: np.ndarray
+
+    def arms(self, group: int) -> slice:
+        return slice(int(self.offsets[group]), int(self.offsets[group + 1]))
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# FREQUENTIST (closed form, all arms at once)
+# ════════════════════════════════════════════════════════════════════════════
+
+def wilson_interval(conversions: np.ndarray, allocations: np.ndarray,
+                    confidence: float = 0.95):
+    """Wilson score interval per arm; (0, 0) where allocations == 0"""
+    n = np.asarray(allocations, dtype=np.float64)
+    safe_n = np.where(n > 0, n, 1.0)
+    p = np.asarray(conversions, dtype=np.float64) / safe_n
+    z = stats.norm.ppf((1 + confidence) / 2)
+
+    denominator = 1 + z ** 2 / safe_n
+    center = (p + z ** 2 / (2 * safe_n)) / denominator
+    margin = z * np.sqrt((p * (1 - p) + z ** 2 / (4 * safe_n)) / safe_n) / denominator
+
+    lower = np.where(n > 0, np.maximum(0.0, center - margin), 0.0)
+    upper = np.where(n > 0, np.minimum(1.0, center + margin), 0.0)
+    return lower, upper
+
+
+def z_test(conversions: np.ndarray, allocations: np.ndarray,
+           baseline: np.ndarray, alpha: float = 0.05):
+    """Two-tailed z-test of each arm's rate against its baseline"""
+    n = np.asarray(allocations, dtype=np.float64)
+    safe_n = np.where(n > 0, n, 1.0)
+    observed = np.asarray(conversions, dtype=np.float64) / safe_n
+    se = np.sqrt(baseline * (1 - baseline) / safe_n)
+
+    valid = (n > 0) & (se > 0)
+    z = np.where(valid, (observed - baseline) / np.where(se > 0, se, 1.0), 0.0)
+    p_value = np.where(valid, 2 * stats.norm.sf(np.abs(z)), 1.0)
+    return p_value, p_value < alpha
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# MONTE CARLO (one Beta draw per block)
+# ════════════════════════════════════════════════════════════════════════════
+
+def _monte_carlo_block(allocations, conversions, offsets, n_samples, rng, value=None):
+    """
+    value: None for conversion rate, or (valued, sum_log, sum_log_sq,
+    prior_mean, prior_variance) per arm for revenue per visitor
+    """
+    if value is None:
+        alpha = conversions + 1.0
+        beta = (allocations - conversions) + 1.0
+        draws = rng.beta(alpha, beta, size=(n_samples, alpha.shape[0]))
+    else:
+        valued, sum_log, sum_log_sq, prior_mean, prior_variance = value
+        draws = sample_revenue_per_visitor(
+            allocations, conversions, valued, sum_log, sum_log_sq,
+            n_samples=n_samples, prior=(prior_mean, prior_variance), rng=rng
+        )
+
+    group_max = np.maximum.reduceat(draws, offsets[:-1], axis=1)
+    best = group_max[:, np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))]
+
+    lower, upper = np.percentile(draws, [2.5, 97.5], axis=0)
+    return (
+        (draws == best).mean(axis=0),
+        (best - draws).mean(axis=0),
+        draws.mean(axis=0),
+        lower,
+        upper
+    )
+
+
+def _blocks(sizes: np.ndarray, n_samples: int, max_cells: int):
+    """Consecutive group ranges whose draw matrix stays under max_cells"""
+    arms_per_block = max(1, max_cells // max(n_samples, 1))
+    start = 0
+    while start < len(sizes):
+        end, arms = start, 0
+        while end < len(sizes) and (end == start or arms + sizes[end] <= arms_per_block):
+            arms += sizes[end]
+            end += 1
+        yield start, end
+        start = end
+
+
+def analyze_counts(
+    counts: RaggedCounts,
+    samples: Union[int, np.ndarray] = 10000,
+    confidence: float = 0.95,
+    alpha: float = 0.05,
+    rng: Optional[np.random.Generator] = None,
+    max_cells: int = 4_000_000,
+    objective: str = OBJECTIVE_CONVERSION
+) -> BatchResult:
+    """
+    Analyze every group of `counts` in one vectorized pass.
+
+    Args:
+        samples: Monte Carlo draws, scalar or one per group. Groups
+                 sharing a sample count are drawn together.
+        max_cells: Upper bound of samples × arms per Beta draw (memory)
+        objective: 'conversion' (Beta posterior of the rate) or 'revenue'
+                   (revenue per visitor, log-normal value prior pooled
+                   per group)
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective: {objective}")
+
+    rng = rng or np.random.default_rng()
+    n_arms = counts.allocations.shape[0]
+    sizes = counts.sizes
+    group_of = counts.group_index
+    starts = counts.offsets[:-1]
+
+    allocations = counts.allocations.astype(np.float64)
+    conversions = counts.conversions.astype(np.float64)
+
+    # ─── Per group totals (reduceat is undefined on empty groups) ───
+    nonempty = sizes > 0
+    group_alloc = np.zeros(counts.n_groups)
+    group_conv = np.zeros(counts.n_groups)
+    if n_arms:
+        group_alloc[nonempty] = np.add.reduceat(allocations, starts[nonempty])
+        group_conv[nonempty] = np.add.reduceat(conversions, starts[nonempty])
+    group_cr = np.divide(group_conv, group_alloc, out=np.zeros_like(group_conv), where=group_alloc > 0)
+
+    # ─── Per arm, closed form ───
+    rate = np.divide(conversions, allocations, out=np.zeros(n_arms), where=allocations > 0)
+    baseline = group_cr[group_of]
+    lift = np.divide((rate - baseline) * 100, baseline, out=np.zeros(n_arms), where=baseline > 0)
+    p_value, significant = z_test(conversions, allocations, baseline, alpha)
+    ci_lower, ci_upper = wilson_interval(conversions, allocations, confidence)
+    rpv = np.divide(counts.total_value, allocations, out=np.zeros(n_arms), where=allocations > 0)
+    aov = np.divide(counts.total_value, counts.valued, out=np.zeros(n_arms), where=counts.valued > 0)
+
+    # ─── Log-value prior pooled per group (revenue objective) ───
+    value_prior = None
+    if objective == OBJECTIVE_REVENUE and n_arms:
+        k = np.zeros(counts.n_groups)
+        s1 = np.zeros(counts.n_groups)
+        s2 = np.zeros(counts.n_groups)
+        k[nonempty] = np.add.reduceat(counts.valued, starts[nonempty])
+        s1[nonempty] = np.add.reduceat(counts.sum_log, starts[nonempty])
+        s2[nonempty] = np.add.reduceat(counts.sum_log_sq, starts[nonempty])
+        safe_k = np.where(k > 0, k, 1.0)
+        prior_mean = np.where(k > 0, s1 / safe_k, 0.0)
+        prior_var = np.where(k > 0, np.maximum(s2 / safe_k - prior_mean ** 2, 1e-3), 1.0)
+        value_prior = (prior_mean[group_of], prior_var[group_of])
+
+    # ─── Monte Carlo, batched by sample count and memory ───
+    group_samples = np.broadcast_to(np.asarray(samples, dtype=np.int64), (counts.n_groups,)).copy()
+    prob_best = np.zeros(n_arms)
+    loss = np.zeros(n_arms)
+    mean = np.zeros(n_arms)
+    cred_lower = np.zeros(n_arms)
+    cred_upper = np.zeros(n_arms)
+
+    for n_samples in np.unique(group_samples[nonempty]):
+        tier = np.flatnonzero(nonempty & (group_samples == n_samples))
+        sub = counts.take(tier)
+        arm_ids = np.concatenate([np.arange(counts.offsets[g], counts.offsets[g + 1]) for g in tier])
+
+        for g0, g1 in _blocks(sub.sizes, int(n_samples), max_cells):
+            a0, a1 = int(sub.offsets[g0]), int(sub.offsets[g1])
+            idx = arm_ids[a0:a1]
+            value = None
+            if value_prior is not None:
+                value = (
+                    sub.valued[a0:a1], sub.sum_log[a0:a1], sub.sum_log_sq[a0:a1],
+                    value_prior[0][idx], value_prior[1][idx]
+                )
+            block = _monte_carlo_block(
+                sub.allocations[a0:a1].astype(np.float64),
+                sub.conversions[a0:a1].astype(np.float64),
+                sub.offsets[g0:g1 + 1] - a0,
+                int(n_samples),
+                rng,
+                value
+            )
+            prob_best[idx], loss[idx], mean[idx], cred_lower[idx], cred_upper[idx] = block
+
+    return BatchResult(
+        offsets=counts.offsets,
+        conversion_rate=rate,
+        lift_percent=lift,
+        p_value=p_value,
+        is_significant=significant,
+        ci_lower=ci_lower,
+        ci_upper=ci_upper,
+        revenue_per_visitor=rpv,
+        average_order_value=aov,
+        prob_best=prob_best,
+        expected_loss=loss,
+        posterior_mean=mean,
+        credible_lower=cred_lower,
+        credible_upper=cred_upper,
+        group_allocations=group_alloc,
+        group_conversions=group_conv,
+        group_conversion_rate=group_cr,
+        samples=group_samples
+    )
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# PROCESS POOL SHARDING
+# ════════════════════════════════════════════════════════════════════════════
+
+def _analyze_shard(args) -> BatchResult:
+    counts, samples, confidence, alpha, objective = args
+    return analyze_counts(counts, samples, confidence, alpha, objective=objective)
+
+
+def analyze_counts_sharded(
+    counts: RaggedCounts,
+    samples: Union[int, np.ndarray] = 10000,
+    confidence: float = 0.95,
+    alpha: float = 0.05,
+    workers: int = 4,
+    executor: Optional[ProcessPoolExecutor] = None,
+    objective: str = OBJECTIVE_CONVERSION
+) -> BatchResult:
+    """
+    Same as analyze_counts, with groups split into `workers` shards of
+    similar arm count analyzed in separate processes.
+
+    Results are re-assembled in input order. Each process seeds its own
+    generator.
+    """
+    if workers <= 1 or counts.n_groups < 2:
+        return analyze_counts(counts, samples, confidence, alpha, objective=objective)
+
+    group_samples = np.broadcast_to(np.asarray(samples, dtype=np.int64), (counts.n_groups,))
+    # Balance on draw cells (samples × arms), not group count
+    cost = np.cumsum(counts.sizes * group_samples)
+    bounds = np.searchsorted(cost, np.linspace(0, cost[-1], workers + 1)[1:-1])
+    shards = [s for s in np.split(np.arange(counts.n_groups), bounds) if len(s)]
+
+    jobs = [(counts.take(s), group_samples[s], confidence, alpha, objective) for s in shards]
+    if executor is not None:
+        parts = list(executor.map(_analyze_shard, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+            parts = list(pool.map(_analyze_shard, jobs))
+
+    return _concat(parts)
+
+
+def _concat(parts: List[BatchResult]) -> BatchResult:
+    merged = {}
+    for f in fields(BatchResult):
+        if f.name == 'offsets':
+            sizes = np.concatenate([np.diff(p.offsets) for p in parts])
+            offsets = np.zeros(len(sizes) + 1, dtype=np.int64)
+            np.cumsum(sizes, out=offsets[1:])
+            merged['offsets'] = offsets
+        else:
+            merged[f.name] = np.concatenate([getattr(p, f.name) for p in parts])
+    return BatchResult(**merged)
@@ -0,0 +1,80 @@
+# orchestration/services/contextual_models.py
+"""
+Contextual Models - Per-experiment allocator state in memory
+
+Experimentos con optimization_strategy = 'contextual' guardan su modelo
+(unas pocas matrices d×d por variante) en un LRU en proceso. Al cargar
+un experimento, el modelo se reconstruye desde las asignaciones
+recientes (context + convertido o no), así que no hace falta persistir
+nada: sobrevive a reinicios y todos los workers parten del mismo estado.
+
+- Asignación: select() + observe() (exposición con reward 0)
+- Conversión: credit() sobre el modelo en memoria, si está cargado
+  (si no, la próxima carga ya la lee de assignments)
+"""
+
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from engine.core.allocators._contextual import ContextualAllocator
+from .model_cache import ModelCache
+
+logger = logging.getLogger(__name__)
+
+OutcomeLoader = Callable[[], Awaitable[List[Dict[str, Any]]]]
+
+
+class ContextualModelCache(ModelCache[str, ContextualAllocator]):
+    """LRU of experiment_id → ContextualAllocator, loaded once per experiment"""
+
+    name = "Contextual"
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, max_experiments: int = 256):
+        super().__init__(max_entries=max_experiments)
+        self.config = dict(config or {})
+        self.max_experiments = max_experiments
+
+    async def get(self, experiment_id: str, load_outcomes: OutcomeLoader) -> ContextualAllocator:
+        """Model of the experiment, warm-started from history on first use"""
+        return await super().get(str(experiment_id), load_outcomes)
+
+    def peek(self, experiment_id: str) -> Optional[ContextualAllocator]:
+        return super().peek(str(experiment_id))
+
+    def invalidate(self, experiment_id: str):
+        super().invalidate(str(experiment_id))
+
+    async def _load(self, experiment_id: str, load_outcomes: OutcomeLoader) -> ContextualAllocator:
+        model = ContextualAllocator(self.config)
+        outcomes = await load_outcomes()
+        model.warm_start(
+            (row['variant_id'], row.get('context'), 1.0 if row.get('converted') else 0.0)
+            for row in outcomes
+        )
+        logger.info(
+            f"Contextual model loaded for experiment {experiment_id} "
+            f"({len(outcomes)} assignments)"
+        )
+        return model
+
+
+_contextual_models: Optional[ContextualModelCache] = None
+
+
+def get_contextual_models() -> ContextualModelCache:
+    """Process-wide cache (experiment services are rebuilt per request)"""
+    global _contextual_models
+
+    if _contextual_models is None:
+        from config.settings import settings
+
+        _contextual_models = ContextualModelCache(
+            config={
+                'dimension': settings.CONTEXTUAL_DIMENSION,
+                'mode': settings.CONTEXTUAL_MODE,
+                'exploration': settings.CONTEXTUAL_EXPLORATION
+            },
+            max_experiments=settings.CONTEXTUAL_MAX_EXPERIMENTS
+        )
+
+    return _contextual_models
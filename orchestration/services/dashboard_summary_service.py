@@ -0,0 +1,104 @@
+# orchestration/services/dashboard_summary_service.py
+"""
+Dashboard Summary Service - Per-user totals with in-process read cache
+
+Lectura: caché en proceso (TTL corto) → fila de user_dashboard_summary
+por primary key → recálculo sólo si falta la fila o está marcada stale.
+El coste de GET /dashboard/ ya no depende del número de experimentos.
+
+Las filas las refresca el agregador de rollups. Sin él (ROLLUPS_ENABLED
+false) se usa `max_age`: una fila más vieja se recalcula en la lectura.
+"""
+
+import time
+import logging
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, Iterable, Tuple
+
+from data_access.pools import POOL_API
+from data_access.repositories.dashboard_summary_repository import DashboardSummaryRepository
+
+logger = logging.getLogger(__name__)
+
+
+class DashboardSummaryService:
+    """
+    Materialized per-user dashboard summary.
+
+    The TTL bounds staleness across worker processes; within a process
+    `invalidate()` / `refresh_users()` drop entries immediately. With
+    `max_age` (seconds), rows refreshed longer ago are recomputed on read.
+    """
+
+    def __init__(
+        self,
+        db_manager,
+        ttl: float = 5.0,
+        max_entries: int = 10000,
+        max_age: Optional[float] = None
+    ):
+        self.repo = DashboardSummaryRepository(db_manager.get_pool(POOL_API))
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._cache: 'OrderedDict[str, Tuple[float, Dict[str, Any]]]' = OrderedDict()
+        self.logger = logging.getLogger(f"{__name__}.DashboardSummaryService")
+
+    async def get(self, user_id: str) -> Dict[str, Any]:
+        """Summary for `user_id` (refreshed on first use or when stale)"""
+        user_id = str(user_id)
+
+        cached = self._cache.get(user_id)
+        if cached is not None and cached[0] > time.monotonic():
+            self._cache.move_to_end(user_id)
+            return cached[1]
+
+        summary = await self.repo.get(user_id)
+        if summary is None or summary['is_stale'] or self._expired(summary):
+            summary = (await self.repo.refresh([user_id])).get(user_id) or self._empty(user_id)
+
+        self._store(user_id, summary)
+        return summary
+
+    async def refresh_users(self, user_ids: Iterable[str]) -> int:
+        """Recompute the rows of users whose counters moved (rollup aggregator)"""
+        user_ids = [str(u) for u in user_ids if u]
+        if not user_ids:
+            return 0
+
+        summaries = await self.repo.refresh(user_ids)
+        for user_id in user_ids:
+            self._cache.pop(user_id, None)
+
+        self.logger.debug(f"Refreshed dashboard summaries for {len(summaries)} users")
+        return len(summaries)
+
+    def invalidate(self, user_id: str):
+        """Drop the local cache entry (e.g. after an experiment status change)"""
+        self._cache.pop(str(user_id), None)
+
+    def _expired(self, summary: Dict[str, Any]) -> bool:
+        refreshed_at = summary.get('refreshed_at')
+        if self.max_age is None or refreshed_at is None:
+            return False
+        return (datetime.now(timezone.utc) - refreshed_at).total_seconds() > self.max_age
+
+    def _store(self, user_id: str, summary: Dict[str, Any]):
+        self._cache[user_id] = (time.monotonic() + self.ttl, summary)
+        self._cache.move_to_end(user_id)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _empty(user_id: str) -> Dict[str, Any]:
+        return {
+            'user_id': user_id,
+            'total_experiments': 0,
+            'active_experiments': 0,
+            'total_visitors': 0,
+            'total_conversions': 0,
+            'recent_experiments': [],
+            'is_stale': False,
+            'refreshed_at': None
+        }
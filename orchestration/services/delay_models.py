@@ -0,0 +1,135 @@
+# orchestration/services/delay_models.py
+"""
+Delay Models - Delayed-feedback correction of the exposure counts
+
+Las conversiones llegan horas después de la asignación: una asignación
+reciente sin conversión todavía no es un fallo. Por experimento se estima
+la distribución del retraso (histograma de conversion_delay_rollups, el
+mismo valor que decision_to_conversion_seconds del audit trail) y se
+calcula, por variante, cuántas asignaciones siguen "pendientes":
+
+    pendientes = Σ_buckets de hora n_b · (1 − F(edad_b))
+
+La selección adaptativa resta esas asignaciones de las exposiciones
+(engine/core/math/_delay.py). Todo sale de los rollups (dos consultas
+sobre buckets, nunca sobre assignments) y se cachea en un LRU en proceso
+que se recarga en background cada `refresh_seconds`.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from engine.core.math._delay import delay_horizon, pending_exposures
+from .model_cache import ModelCache
+
+logger = logging.getLogger(__name__)
+
+HOUR = timedelta(hours=1)
+# Hour rollups are kept 90 days by default
+_MAX_HORIZON = timedelta(days=90)
+
+
+@dataclass
+class DelayCorrection:
+    """Pending allocations per variant of one experiment"""
+    conversions: int = 0
+    horizon_seconds: float = 0.0
+    pending: Dict[str, float] = field(default_factory=dict)
+
+    def pending_for(self, variant_id: Any) -> float:
+        return self.pending.get(str(variant_id), 0.0)
+
+
+def build_correction(
+    histogram: List[int],
+    buckets: List[Dict[str, Any]],
+    now: datetime
+) -> DelayCorrection:
+    """Correction from a delay histogram and the hour buckets inside its horizon"""
+    conversions = int(sum(histogram))
+    horizon = delay_horizon(histogram)
+    if not buckets:
+        return DelayCorrection(conversions, horizon)
+
+    variants = sorted({str(row['variant_id']) for row in buckets})
+    index = {variant_id: i for i, variant_id in enumerate(variants)}
+    middle = HOUR.total_seconds() / 2
+
+    pending = pending_exposures(
+        np.array([index[str(row['variant_id'])] for row in buckets]),
+        np.array([(now - row['bucket_start']).total_seconds() - middle for row in buckets]),
+        np.array([row['allocations'] for row in buckets], dtype=np.float64),
+        histogram,
+        len(variants)
+    )
+    return DelayCorrection(conversions, horizon, dict(zip(variants, pending.tolist())))
+
+
+class DelayModelCache(ModelCache[str, DelayCorrection]):
+    """LRU of experiment_id → DelayCorrection, reloaded from the rollups"""
+
+    name = "Delay"
+
+    def __init__(
+        self,
+        lookback_days: float = 30.0,
+        min_conversions: int = 50,
+        max_experiments: int = 1024,
+        refresh_seconds: float = 60.0
+    ):
+        super().__init__(max_entries=max_experiments, refresh_seconds=refresh_seconds)
+        self.lookback = timedelta(days=lookback_days)
+        self.min_conversions = min_conversions
+        self.max_experiments = max_experiments
+
+    async def get(self, experiment_id: str, rollups) -> DelayCorrection:
+        """
+        Correction of the experiment; stale ones are served while they reload
+
+        `rollups` provides get_delay_histogram / get_timeline (RollupRepository).
+        """
+        return await super().get(str(experiment_id), rollups)
+
+    def peek(self, experiment_id: str) -> Optional[DelayCorrection]:
+        return super().peek(str(experiment_id))
+
+    def invalidate(self, experiment_id: str):
+        super().invalidate(str(experiment_id))
+
+    async def _load(self, key: str, rollups) -> DelayCorrection:
+        now = datetime.now(timezone.utc)
+        histogram = await rollups.get_delay_histogram(key, since=now - self.lookback)
+
+        if sum(histogram) < self.min_conversions:
+            # Not enough conversions to trust the delay distribution
+            return DelayCorrection(int(sum(histogram)))
+
+        horizon = min(timedelta(seconds=delay_horizon(histogram)), _MAX_HORIZON)
+        buckets = await rollups.get_timeline(key, 'hour', since=now - horizon - HOUR)
+        return build_correction(histogram, buckets, now)
+
+
+_delay_models: Optional[DelayModelCache] = None
+
+
+def get_delay_models() -> Optional[DelayModelCache]:
+    """Process-wide cache, or None when delayed feedback is disabled"""
+    global _delay_models
+
+    from config.settings import settings
+    if not settings.DELAYED_FEEDBACK_ENABLED:
+        return None
+
+    if _delay_models is None:
+        _delay_models = DelayModelCache(
+            lookback_days=settings.DELAYED_FEEDBACK_LOOKBACK_DAYS,
+            min_conversions=settings.DELAYED_FEEDBACK_MIN_CONVERSIONS,
+            max_experiments=settings.DELAYED_FEEDBACK_MAX_EXPERIMENTS,
+            refresh_seconds=settings.DELAYED_FEEDBACK_REFRESH_SECONDS
+        )
+
+    return _delay_models
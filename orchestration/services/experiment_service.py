@@ -6,18 +6,66 @@ Correcciones:
 - Operaciones atómicas
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 import json
+from collections import OrderedDict
 from datetime import datetime, timezone
 from uuid import uuid4
 
+from data_access.circuit_breaker import CircuitOpenError
 from data_access.repositories.experiment_repository import ExperimentRepository
 from data_access.repositories.variant_repository import VariantRepository
 from data_access.repositories.assignment_repository import AssignmentRepository
+from .contextual_models import ContextualModelCache, get_contextual_models
+from .nonstationary_models import NONSTATIONARY_STRATEGIES, NonStationaryModelCache, get_nonstationary_models
+from .prior_service import initial_state as initial_state_for
+from .segment_models import SEGMENTED_STRATEGY, SegmentModelCache, get_segment_models
+from .delay_models import DelayModelCache, get_delay_models
+from engine.core.allocators._arms import ARM_STATE_STRATEGIES
+from orchestration.interfaces.optimization_interface import OptimizationStrategy
+from engine.core.math._segments import segment_of
 
 logger = logging.getLogger(__name__)
 
+# Variants chosen on downstream conversion of the funnel step (FunnelService)
+SEQUENTIAL_STRATEGY = OptimizationStrategy.SEQUENTIAL.value
+
+
+class RecentAssignmentCache:
+    """
+    Bounded in-process LRU of recent assignments.
+
+    Sólo se consulta cuando el circuito de la base de datos está abierto:
+    un visitante que ya tenía variante la sigue viendo durante un
+    brownout de Postgres en lugar de recibir un 503.
+    """
+
+    def __init__(self, max_entries: int = 50000):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Tuple[str, str], Dict[str, Any]]' = OrderedDict()
+
+    def get(self, experiment_id: str, user_identifier: str) -> Optional[Dict[str, Any]]:
+        key = (str(experiment_id), user_identifier)
+        assignment = self._entries.get(key)
+        if assignment is not None:
+            self._entries.move_to_end(key)
+        return assignment
+
+    def put(self, experiment_id: str, user_identifier: str, assignment: Dict[str, Any]):
+        key = (str(experiment_id), user_identifier)
+        self._entries[key] = assignment
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Shared across requests (services are rebuilt per request by the factory)
+recent_assignments = RecentAssignmentCache()
+
 
 class ExperimentService:
     """
@@ -35,13 +83,30 @@ class ExperimentService:
         experiment_repo: ExperimentRepository,
         variant_repo: VariantRepository,
         assignment_repo: AssignmentRepository,
-        audit_service: Optional['AuditService'] = None
+        audit_service: Optional['AuditService'] = None,
+        assignment_cache: Optional[RecentAssignmentCache] = None,
+        contextual_models: Optional['ContextualModelCache'] = None,
+        nonstationary_models: Optional['NonStationaryModelCache'] = None,
+        segment_models: Optional['SegmentModelCache'] = None,
+        delay_models: Optional['DelayModelCache'] = None,
+        funnel_service: Optional['FunnelService'] = None
     ):
         self.db = db_pool
         self.experiment_repo = experiment_repo
         self.variant_repo = variant_repo
         self.assignment_repo = assignment_repo
         self.audit = audit_service
+        self.assignment_cache = assignment_cache if assignment_cache is not None else recent_assignments
+        self.contextual_models = contextual_models if contextual_models is not None else get_contextual_models()
+        self.nonstationary_models = (
+            nonstationary_models if nonstationary_models is not None else get_nonstationary_models()
+        )
+        self.segment_models = segment_models if segment_models is not None else get_segment_models()
+        # None = delayed-feedback correction disabled
+        self.delay_models = delay_models if delay_models is not None else get_delay_models()
+        # Built on first use (strategy 'sequential')
+        self.funnel_service = funnel_service
+        self._arm_state_allocators: Dict[str, Any] = {}
         self.logger = logging.getLogger(f"{__name__}.ExperimentService")
     
     # ========================================================================
@@ -55,7 +120,8 @@ class ExperimentService:
         variants_data: List[Dict[str, Any]],
         user_id: str,
         traffic_allocation: float = 1.0,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        optimization_strategy: str = 'adaptive'
     ) -> Dict[str, Any]:
         """
         ✅ FIXED: Create experiment with variants in a single transaction
@@ -77,6 +143,7 @@ class ExperimentService:
             user_id: Creator user ID
             traffic_allocation: % of traffic to include (0-1)
             metadata: Optional metadata
+            optimization_strategy: OptimizationStrategy value (default 'adaptive')
         
         Returns:
             {
@@ -101,6 +168,9 @@ class ExperimentService:
         if not (0 < traffic_allocation <= 1.0):
             raise ValueError("traffic_allocation must be between 0 and 1")
         
+        if optimization_strategy not in {s.value for s in OptimizationStrategy}:
+            raise ValueError(f"Unknown optimization_strategy: {optimization_strategy}")
+        
         # Check for control variant
         control_count = sum(1 for v in variants_data if v.get('is_control', False))
         if control_count == 0:
@@ -117,9 +187,10 @@ class ExperimentService:
                     experiment_id = await conn.fetchval(
                         """
                         INSERT INTO experiments (
-                            user_id, name, description, status, traffic_allocation, config
+                            user_id, name, description, status, traffic_allocation, config,
+                            optimization_strategy
                         )
-                        VALUES ($1, $2, $3, $4, $5, $6)
+                        VALUES ($1, $2, $3, $4, $5, $6, $7)
                         RETURNING id
                         """,
                         user_id,
@@ -127,7 +198,8 @@ class ExperimentService:
                         description,
                         'draft',  # Start as draft
                         traffic_allocation,
-                        json.dumps(metadata or {})
+                        json.dumps(metadata or {}),
+                        optimization_strategy
                     )
                     
                     self.logger.info(f"Created experiment {experiment_id}: {name}")
@@ -149,6 +221,9 @@ class ExperimentService:
                     )
                     
                     # 3. Create variants
+                    # Initialize Adaptive Choice Strategy state: the account's
+                    # empirical prior when there is one, Beta(1, 1) otherwise
+                    initial_state = await initial_state_for(conn, experiment_id, 'web')
                     variant_ids = []
                     
                     for idx, variant_data in enumerate(variants_data):
@@ -159,17 +234,9 @@ class ExperimentService:
                         if not variant_name:
                             raise ValueError(f"Variant #{idx+1} missing name")
                         
-                        # Initialize Adaptive Choice Strategy state
-                        initial_state = {
-                            'alpha': 1.0,  # Prior successes
-                            'beta': 1.0,   # Prior failures
-                            'samples': 0,
-                            'algorithm_type': 'bayesian'
-                        }
-                        
                         # Use element_id as the parent for variants
                         variant_id = await self.variant_repo.create_variant(
-                            experiment_id=str(element_id),
+                            element_id=str(element_id),
                             name=variant_name,
                             content=variant_content,
                             initial_algorithm_state=initial_state,
@@ -351,9 +418,35 @@ class ExperimentService:
         """
         Allocate user to variant using Adaptive Optimization
         
-        Returns variant assignment or None if experiment not found/inactive
+        Returns variant assignment or None if experiment not found/inactive.
+        While the database circuit is open, returns the user's cached
+        assignment if there is one, otherwise re-raises CircuitOpenError.
         """
+        try:
+            assignment = await self._allocate_user_to_variant(
+                experiment_id, user_identifier, session_id, context
+            )
+        except CircuitOpenError:
+            cached = self.assignment_cache.get(experiment_id, user_identifier)
+            if cached is None:
+                raise
+            self.logger.info(
+                f"Database circuit open, serving cached assignment for "
+                f"user {user_identifier} in experiment {experiment_id}"
+            )
+            return cached
         
+        if assignment:
+            self.assignment_cache.put(experiment_id, user_identifier, assignment)
+        return assignment
+    
+    async def _allocate_user_to_variant(
+        self,
+        experiment_id: str,
+        user_identifier: str,
+        session_id: Optional[str],
+        context: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
         # Check for existing assignment
         existing = await self.assignment_repo.get_assignment(
             experiment_id,
@@ -390,7 +483,7 @@ class ExperimentService:
             return None
         
         # Use Adaptive Strategy to select variant
-        selected_variant = await self._adaptive_selection(variants)
+        selected_variant = await self._adaptive_selection(variants, experiment_id, context)
         
         if not selected_variant:
             return None
@@ -414,7 +507,7 @@ class ExperimentService:
         
         # ✅ AUTOMATIC AUDIT
         if self.audit:
-            segment_key = (context or {}).get('segment_key', 'default')
+            segment_key = segment_of(context)
             await self.audit.log_decision(
                 experiment_id=experiment_id,
                 visitor_id=user_identifier,
@@ -434,7 +527,9 @@ class ExperimentService:
     
     async def _adaptive_selection(
         self,
-        variants: List[Dict[str, Any]]
+        variants: List[Dict[str, Any]],
+        experiment_id: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Select variant using Adaptive algorithm
@@ -445,20 +540,47 @@ class ExperimentService:
         # Lazy import to avoid circular dependencies
         from engine.core.allocators._bayesian import AdaptiveBayesianAllocator
         
+        strategy = variants[0].get('optimization_strategy') if variants else None
+        if strategy == 'revenue':
+            return await self._revenue_selection(variants)
+        if strategy == 'contextual' and experiment_id:
+            return await self._contextual_selection(experiment_id, variants, context)
+        if strategy in NONSTATIONARY_STRATEGIES and experiment_id:
+            return await self._nonstationary_selection(experiment_id, variants, strategy)
+        if strategy == SEGMENTED_STRATEGY and experiment_id:
+            return await self._segmented_selection(experiment_id, variants, context)
+        if strategy == SEQUENTIAL_STRATEGY and experiment_id:
+            selected = await self._funnel_selection(experiment_id, variants)
+            if selected is not None:
+                return selected
+            # Not on an active funnel: plain Beta posterior on its own counters
+        
+        delay = await self._delay_correction(experiment_id)
+        
         try:
             # Map variants to format expected by _bayesian allocator
             # _bayesian expects '_internal_state' with 'success_count'/'failure_count'
             mapped_options = []
             for v in variants:
+                # algorithm_state holds the prior the variant was created
+                # with (flat or empirical); the evidence is the live counters
                 state = v.get('algorithm_state', {})
                 alpha = float(state.get('alpha', 1.0))
                 beta = float(state.get('beta', 1.0))
-                samples = int(state.get('samples', 0))
+                allocations = int(v.get('total_allocations') or 0)
+                conversions = min(int(v.get('total_conversions') or 0), allocations)
+                samples = allocations
+                
+                # Recent assignments whose conversion may still arrive
+                # are not failures yet (delayed feedback)
+                exposures = float(allocations)
+                if delay is not None:
+                    exposures = max(exposures - delay.pending_for(v['id']), float(conversions))
                 
-                # Convert alpha/beta back to counts (assuming Prior=1.0)
-                # alpha = success + 1  => success = alpha - 1
-                success_count = max(0, int(alpha - 1))
-                failure_count = max(0, int(beta - 1))
+                # sample_posterior adds 1 back: Beta(alpha + conversions,
+                # beta + failures). Fractional priors stay fractional.
+                success_count = alpha - 1.0 + conversions
+                failure_count = beta - 1.0 + (exposures - conversions)
                 
                 # Create a copy with the mapped state
                 v_copy = v.copy()
@@ -469,8 +591,12 @@ class ExperimentService:
                 }
                 mapped_options.append(v_copy)
             
-            # Use consolidated allocator
-            allocator = AdaptiveBayesianAllocator({})
+            # Use consolidated allocator (count-based strategies score
+            # the same counters on ArmState)
+            if strategy in ARM_STATE_STRATEGIES:
+                allocator = self._arm_state_allocator(strategy)
+            else:
+                allocator = AdaptiveBayesianAllocator({})
             selected_id = await allocator.select(mapped_options, {})
             
             # Find selected variant by ID
@@ -486,6 +612,232 @@ class ExperimentService:
             import random
             return random.choice(variants) if variants else None
     
+    def _arm_state_allocator(self, strategy: str):
+        """One allocator per strategy: they keep no per-experiment state"""
+        allocator = self._arm_state_allocators.get(strategy)
+        if allocator is None:
+            from engine.core.allocators._registry import get_allocator
+            allocator = self._arm_state_allocators[strategy] = get_allocator(strategy, {})
+        return allocator
+    
+    async def _delay_correction(self, experiment_id: Optional[str]):
+        """Delayed-feedback correction of the experiment, or None"""
+        if self.delay_models is None or not experiment_id:
+            return None
+        
+        from data_access.repositories.rollup_repository import RollupRepository
+        
+        try:
+            return await self.delay_models.get(experiment_id, RollupRepository(self.variant_repo.db))
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Delay correction error: {e}")
+            return None
+    
+    async def _revenue_selection(
+        self,
+        variants: List[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Select variant by revenue per visitor (strategy 'revenue')
+        
+        Reads the live counters and value statistics of each variant,
+        no algorithm_state involved.
+        """
+        from engine.core.allocators._revenue import RevenueAllocator
+        
+        try:
+            mapped_options = []
+            for v in variants:
+                v_copy = v.copy()
+                v_copy['_internal_state'] = {
+                    'visitors': v.get('total_allocations') or 0,
+                    'conversions': v.get('total_conversions') or 0,
+                    'valued_conversions': v.get('valued_conversions') or 0,
+                    'sum_log_value': v.get('sum_log_value') or 0.0,
+                    'sum_log_value_sq': v.get('sum_log_value_sq') or 0.0
+                }
+                mapped_options.append(v_copy)
+            
+            selected_id = await RevenueAllocator({}).select(mapped_options, {})
+            return next((v for v in variants if v['id'] == selected_id), None)
+        
+        except Exception as e:
+            self.logger.error(f"Revenue selection error: {e}")
+            import random
+            return random.choice(variants) if variants else None
+    
+    async def _contextual_selection(
+        self,
+        experiment_id: str,
+        variants: List[Dict[str, Any]],
+        context: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Select variant for this visitor's context (strategy 'contextual')
+        
+        The exposure is recorded in the in-memory model right away;
+        the reward is credited on conversion (_credit_contextual).
+        """
+        try:
+            model = await self.contextual_models.get(
+                experiment_id,
+                lambda: self.assignment_repo.get_recent_outcomes(
+                    experiment_id, self._contextual_warm_start_rows()
+                )
+            )
+            selected_id = await model.select(variants, context or {})
+            model.observe(selected_id, context)
+            return next((v for v in variants if v['id'] == selected_id), None)
+        
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Contextual selection error: {e}")
+            import random
+            return random.choice(variants) if variants else None
+    
+    async def _nonstationary_selection(
+        self,
+        experiment_id: str,
+        variants: List[Dict[str, Any]],
+        strategy: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Select variant from recent evidence only (strategies 'discounted' /
+        'sliding_window')
+        
+        The model is loaded from the hourly rollups and kept in memory;
+        the exposure is recorded right away, the conversion is credited
+        on conversion (_credit_nonstationary).
+        """
+        from data_access.repositories.rollup_repository import RollupRepository, ROLLUP_WATERMARK
+        
+        try:
+            rollups = RollupRepository(self.variant_repo.db)
+            model = await self.nonstationary_models.get(
+                experiment_id,
+                strategy,
+                lambda since: rollups.get_timeline(experiment_id, 'hour', since=since),
+                lambda: rollups.get_watermark(ROLLUP_WATERMARK)
+            )
+            
+            mapped_options = []
+            for v in variants:
+                # Prior the variant was created with (flat or empirical)
+                state = v.get('algorithm_state', {})
+                v_copy = v.copy()
+                v_copy['_internal_state'] = {
+                    'alpha': float(state.get('alpha', 1.0)),
+                    'beta': float(state.get('beta', 1.0))
+                }
+                mapped_options.append(v_copy)
+            
+            selected_id = await model.select(mapped_options, {})
+            model.observe(selected_id)
+            return next((v for v in variants if v['id'] == selected_id), None)
+        
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Non-stationary selection error: {e}")
+            import random
+            return random.choice(variants) if variants else None
+    
+    async def _segmented_selection(
+        self,
+        experiment_id: str,
+        variants: List[Dict[str, Any]],
+        context: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Select variant from this visitor's segment posterior (strategy
+        'segmented')
+        
+        Counters live in memory and are flushed in batches by the
+        SegmentFlusher; the exposure is recorded right away, the
+        conversion on conversion (_credit_segmented).
+        """
+        from data_access.repositories.segment_repository import SegmentRepository
+        
+        try:
+            model = await self.segment_models.get(
+                experiment_id,
+                lambda: SegmentRepository(self.variant_repo.db).get_counts(experiment_id)
+            )
+            
+            mapped_options = []
+            for v in variants:
+                # Prior the variant was created with (flat or empirical)
+                state = v.get('algorithm_state', {})
+                v_copy = v.copy()
+                v_copy['_internal_state'] = {
+                    'alpha': float(state.get('alpha', 1.0)),
+                    'beta': float(state.get('beta', 1.0))
+                }
+                mapped_options.append(v_copy)
+            
+            selected_id = await model.select(mapped_options, context or {})
+            model.observe(selected_id, context)
+            return next((v for v in variants if v['id'] == selected_id), None)
+        
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Segmented selection error: {e}")
+            import random
+            return random.choice(variants) if variants else None
+    
+    async def _funnel_selection(
+        self,
+        experiment_id: str,
+        variants: List[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Select variant by downstream funnel conversion (strategy 'sequential')
+        
+        The experiment is a step of an active funnel; the step's counters
+        (funnel_variant_stats) are kept by the tracker funnel routes.
+        Returns None if the experiment is not attached to an active funnel.
+        """
+        try:
+            if self.funnel_service is None:
+                from data_access.repositories.funnel_repository import FunnelRepository
+                from .funnel_service import FunnelService
+                self.funnel_service = FunnelService(repo=FunnelRepository(self.variant_repo.db))
+            return await self.funnel_service.select_experiment_variant(experiment_id, variants)
+        
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Funnel selection error: {e}")
+            return None
+    
+    def _credit_nonstationary(self, experiment_id: str, assignment: Dict[str, Any]):
+        """Credit a conversion to the recency models, if they are loaded"""
+        for strategy in NONSTATIONARY_STRATEGIES:
+            model = self.nonstationary_models.peek(experiment_id, strategy)
+            if model is not None:
+                model.credit(assignment['variant_id'])
+    
+    def _credit_segmented(self, experiment_id: str, assignment: Dict[str, Any]):
+        """Credit a conversion to the visitor's segment, if the model is loaded"""
+        model = self.segment_models.peek(experiment_id)
+        if model is not None:
+            model.credit(assignment['variant_id'], assignment.get('context'))
+    
+    def _credit_contextual(self, experiment_id: str, assignment: Dict[str, Any]):
+        """Credit a conversion to the contextual model, if it is loaded"""
+        model = self.contextual_models.peek(experiment_id)
+        if model is not None:
+            model.credit(assignment['variant_id'], 1.0, assignment.get('context'))
+    
+    @staticmethod
+    def _contextual_warm_start_rows() -> int:
+        from config.settings import settings
+        return settings.CONTEXTUAL_WARM_START_ROWS
+    
     # ========================================================================
     # CONVERSION TRACKING
     # ========================================================================
@@ -532,7 +884,10 @@ class ExperimentService:
         )
         
         # Increment conversion counter
-        await self.variant_repo.increment_conversion(assignment['variant_id'])
+        await self.variant_repo.increment_conversion(assignment['variant_id'], conversion_value)
+        self._credit_contextual(experiment_id, assignment)
+        self._credit_nonstationary(experiment_id, assignment)
+        self._credit_segmented(experiment_id, assignment)
         
         self.logger.info(
             f"🎯 Recorded conversion for user {user_identifier} "
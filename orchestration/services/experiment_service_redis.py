@@ -16,6 +16,7 @@ from .experiment_service import ExperimentService
 from data_access.repositories.experiment_repository import ExperimentRepository
 from data_access.repositories.variant_repository import VariantRepository
 from data_access.repositories.assignment_repository import AssignmentRepository
+from engine.core.math._segments import segment_of
 
 logger = logging.getLogger(__name__)
 
@@ -250,7 +251,7 @@ class ExperimentServiceRedis(ExperimentService):
             await self._set_variants_in_redis(experiment_id, variants)
         
         # Use Adaptive Strategy to select variant
-        selected_variant = await self._adaptive_selection(variants)
+        selected_variant = await self._adaptive_selection(variants, experiment_id, context)
         
         if not selected_variant:
             return None
@@ -274,7 +275,7 @@ class ExperimentServiceRedis(ExperimentService):
             
             # ✅ AUTOMATIC AUDIT
             if self.audit:
-                segment_key = (context or {}).get('segment_key', 'default')
+                segment_key = segment_of(context)
                 await self.audit.log_decision(
                     experiment_id=experiment_id,
                     visitor_id=user_identifier,
@@ -346,7 +347,10 @@ class ExperimentServiceRedis(ExperimentService):
             )
             
             # Increment conversion counter in PostgreSQL
-            await self.variant_repo.increment_conversion(assignment['variant_id'])
+            await self.variant_repo.increment_conversion(assignment['variant_id'], conversion_value)
+            self._credit_contextual(experiment_id, assignment)
+            self._credit_nonstationary(experiment_id, assignment)
+            self._credit_segmented(experiment_id, assignment)
             
             # Try to increment in Redis (non-blocking)
             redis_key = f"exp:{experiment_id}:var:{assignment['variant_id']}:conversions"
@@ -7,6 +7,8 @@ from dataclasses import dataclass
 
 from engine.core.allocators.sequential import SequentialAllocator
 from data_access.database import get_database
+from data_access.pools import POOL_TRACKER
+from data_access.repositories.funnel_repository import FunnelRepository
 
 logger = logging.getLogger(__name__)
 
@@ -31,58 +33,159 @@ class FunnelService:
     1. Manage Funnel definitions (Steps A -> B -> C)
     2. Track user sessions through the funnel
     3. Coordinate with SequentialAllocator for optimization
+    
+    Each step's variants are chosen on *downstream* conversion (sessions
+    that entered the step with that variant and finished the funnel), so
+    the funnel is optimized end to end. Per-event cost does not depend on
+    the path length: a step completion is one statement, an allocation
+    reads one step's counters; the path is only walked on conversion.
     """
     
-    def __init__(self, db_manager=None):
+    def __init__(
+        self,
+        db_manager=None,
+        repo: Optional[FunnelRepository] = None,
+        allocator: Optional[SequentialAllocator] = None
+    ):
         self.db = db_manager
+        if repo is None and db_manager is not None:
+            repo = FunnelRepository(db_manager.get_pool(POOL_TRACKER))
+        self.repo = repo
+        self.allocator = allocator or SequentialAllocator()
+        
+    async def get_funnel_definition(self, funnel_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch funnel structure (active funnels only)"""
+        funnel = await self.repo.get_funnel_public(funnel_id)
+        if not funnel:
+            return None
+        
+        nodes = await self.repo.get_nodes(funnel_id)
+        edges = await self.repo.get_edges(funnel_id)
+        
+        next_steps: Dict[str, List[str]] = {}
+        for edge in edges:
+            next_steps.setdefault(str(edge['from_node_id']), []).append(str(edge['to_node_id']))
         
-    async def get_funnel_definition(self, funnel_id: str) -> Dict[str, Any]:
-        """Fetch funnel structure"""
-        # Mock implementation for MVP
-        # In real world, fetch from DB
         return {
-            "id": funnel_id,
+            "id": str(funnel['id']),
             "steps": [
-                {"id": "step1", "experiment_id": "exp_onboarding", "next": "step2"},
-                {"id": "step2", "experiment_id": "exp_pricing", "next": "checkout"},
-                {"id": "checkout", "experiment_id": None, "next": None}
+                {
+                    "id": str(node['id']),
+                    "name": node['name'],
+                    "experiment_id": str(node['experiment_id']) if node.get('experiment_id') else None,
+                    "next": next_steps.get(str(node['id']), []),
+                    "is_entry_node": node['is_entry_node'],
+                    "is_conversion_node": node['is_conversion_node']
+                }
+                for node in nodes
             ]
         }
 
-    async def track_step_completion(self, session_id: str, funnel_id: str, step_id: str, variant_id: str):
+    async def is_tracked_funnel(self, funnel_id: str, user_id: str) -> bool:
+        """The funnel is active and owned by `user_id` (the installation's account)"""
+        funnel = await self.repo.get_funnel_public(funnel_id)
+        return funnel is not None and str(funnel['user_id']) == str(user_id)
+
+    async def get_tracked_step(
+        self,
+        funnel_id: str,
+        step_id: str,
+        user_id: str,
+        variant_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Step of an active funnel owned by `user_id`, or None. 'has_variant'
+        tells whether `variant_id` belongs to the step's experiment.
+        """
+        return await self.repo.get_tracking_step(funnel_id, step_id, user_id, variant_id)
+
+    async def select_variant(
+        self,
+        funnel_id: str,
+        step_id: str,
+        variants: List[Dict[str, Any]],
+        total_funnel_steps: int = 0
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Pick the variant of a step by downstream conversion.
+        
+        `variants` as returned by VariantRepository.get_variants_for_optimization
+        (the prior is in algorithm_state).
+        """
+        if not variants:
+            return None
+        
+        stats = await self.repo.get_step_stats(funnel_id, step_id)
+        mapped = [
+            {**v, 'funnel_stats': stats.get(str(v['id']), {})}
+            for v in variants
+        ]
+        index = self.allocator.select_variant_for_step(mapped, step_id, total_funnel_steps)
+        return variants[index]
+
+    async def select_experiment_variant(
+        self,
+        experiment_id: str,
+        variants: List[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Variant of an experiment attached to a funnel step, by downstream
+        conversion. None if the experiment is not on an active funnel.
+        """
+        node = await self.repo.get_experiment_node(experiment_id)
+        if node is None:
+            return None
+        return await self.select_variant(str(node['funnel_id']), str(node['id']), variants)
+
+    async def open_session(
+        self,
+        funnel_id: str,
+        user_identifier: str,
+        session_id: Optional[str] = None
+    ) -> str:
+        """Active session of the visitor in the funnel, created on the first step"""
+        return await self.repo.create_session(funnel_id, user_identifier, session_id=session_id)
+
+    async def active_session(self, funnel_id: str, user_identifier: str) -> Optional[str]:
+        """Active session of the visitor in the funnel, if any"""
+        session = await self.repo.get_session(funnel_id, user_identifier)
+        return str(session['id']) if session else None
+
+    async def track_step_completion(self, session_id: str, funnel_id: str, step_id: str, variant_id: Optional[str]):
         """
         Record that a user completed a step.
         
-        This is critical for the Sequential Engine. 
-        It updates the 'downstream conversion probability' of the previous step.
+        Appends the step to the session path and counts the edge traversal
+        and the entry of the step's variant. The downstream reward comes
+        later, on record_final_conversion.
+        
+        Returns False if the session is not active.
         """
         logger.info(f"User {session_id} completed step {step_id} (variant {variant_id}) in funnel {funnel_id}")
         
-        # 1. Update Session State in DB
-        # await self.db.update_funnel_session(...)
-        
-        # 2. Check if this counts as a conversion for the *previous* step
-        # If so, update the SequentialAllocator for the previous step.
-        pass
+        return await self.repo.advance_session(session_id, step_id, variant_id)
 
-    async def record_final_conversion(self, session_id: str, funnel_id: str, value: float):
+    async def record_final_conversion(self, session_id: str, funnel_id: str, value: float) -> int:
         """
         The Holy Grail. The user finished the funnel.
         
         We must now backtrack through the session history and reward 
-        ALL participating variants in the chain.
+        ALL participating variants in the chain: one batched update for
+        the step variants, one for the edges.
+        
+        Returns the number of step variants credited (0 if the session
+        was not active, e.g. already converted).
         """
+        if not await self.repo.convert_session(session_id, value):
+            logger.info(f"Session {session_id} not active, conversion ignored")
+            return 0
+        
         logger.info(f"💰 Funnel Conversion! Session {session_id}, Value {value}")
         
-        # 1. Get Session History (Path taken)
-        # path = await self.db.get_session_path(session_id)
-        # Example path: [(step1, variantA), (step2, variantB)]
+        path = await self.repo.get_session_path(session_id)
+        steps, transitions = SequentialAllocator.credit_assignment(path)
         
-        # 2. Reward all steps
-        # for step_id, variant_id in path:
-        #    allocator = await self.get_allocator_for_step(step_id)
-        #    allocator.update_state(variant_id, reward=1.0) # Full reward
-        pass
+        return await self.repo.credit_conversion(funnel_id, steps, transitions, value)
 
 # Singleton factory
 _funnel_service = None
@@ -0,0 +1,105 @@
+# orchestration/services/model_cache.py
+"""
+Model Cache - Keyed in-process models with single-flight loads
+
+Base de las cachés de modelos por experimento (contextual, non-stationary,
+segmentos, feedback retrasado): un LRU de clave → modelo que
+
+- carga al primer uso, con una sola carga en vuelo por clave (las
+  peticiones concurrentes esperan la misma);
+- con `refresh_seconds`, recarga en background los modelos viejos y
+  mientras tanto sigue sirviendo el anterior;
+- desaloja el menos usado por encima de `max_entries`.
+
+Cada subclase sólo implementa `_load(key, *args)`; `get(key, *args)` le
+pasa los argumentos (repositorio, loader de filas, ...).
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, Iterator, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar('K', bound=Hashable)
+M = TypeVar('M')
+
+
+class ModelCache(Generic[K, M]):
+    """LRU of key → model, loaded once (or every `refresh_seconds`) per key"""
+
+    # Name in the logs ("<name> model load failed for ...")
+    name = "Model"
+
+    def __init__(self, max_entries: int = 256, refresh_seconds: Optional[float] = None):
+        self.max_entries = max_entries
+        self.refresh_seconds = refresh_seconds
+        self._models: 'OrderedDict[K, Tuple[M, float]]' = OrderedDict()
+        self._loading: Dict[K, asyncio.Task] = {}
+
+    async def _load(self, key: K, *args: Any) -> M:
+        """Build the model of `key` (subclasses)"""
+        raise NotImplementedError
+
+    def _evicted(self, key: K, model: M):
+        """Hook: `model` left the cache (LRU eviction or invalidate)"""
+
+    async def get(self, key: K, *args: Any) -> M:
+        """Model of `key`; stale models are served while they reload"""
+        entry = self._models.get(key)
+        if entry is not None:
+            self._models.move_to_end(key)
+            model, loaded_at = entry
+            if self.refresh_seconds is not None and time.monotonic() - loaded_at >= self.refresh_seconds:
+                self._reload(key, args)
+            return model
+
+        return await asyncio.shield(self._reload(key, args))
+
+    def peek(self, key: K) -> Optional[M]:
+        """Loaded model or None (never loads)"""
+        entry = self._models.get(key)
+        if entry is None:
+            return None
+        self._models.move_to_end(key)
+        return entry[0]
+
+    def invalidate(self, key: K):
+        entry = self._models.pop(key, None)
+        if entry is not None:
+            self._evicted(key, entry[0])
+
+    def keys(self) -> Iterator[K]:
+        return iter(list(self._models))
+
+    def items(self) -> Iterator[Tuple[K, M]]:
+        return iter([(key, model) for key, (model, _) in self._models.items()])
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def _reload(self, key: K, args: Tuple[Any, ...]) -> asyncio.Task:
+        # Single-flight: concurrent visitors share one load
+        task = self._loading.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fill(key, args))
+            self._loading[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        return task
+
+    def _done(self, key: K, task: asyncio.Task):
+        self._loading.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"{self.name} model load failed for {key}: {task.exception()}")
+
+    async def _fill(self, key: K, args: Tuple[Any, ...]) -> M:
+        model = await self._load(key, *args)
+
+        self._models[key] = (model, time.monotonic())
+        self._models.move_to_end(key)
+        while len(self._models) > self.max_entries:
+            evicted, (evicted_model, _) = self._models.popitem(last=False)
+            self._evicted(evicted, evicted_model)
+        return model
@@ -16,6 +16,8 @@ import logging
 from itertools import product
 from datetime import datetime
 
+from .prior_service import initial_state as initial_state_for
+
 logger = logging.getLogger(__name__)
 
 
@@ -116,15 +118,12 @@ class MultiElementService:
                     )
                     
                     # Crear variantes para este elemento
+                    # Adaptive Strategy state: prior empírico del tipo de elemento o Beta(1, 1)
+                    initial_state = await initial_state_for(
+                        conn, experiment_id, element_config.get('element_type', 'generic')
+                    )
                     variant_ids = []
                     for var_idx, variant_content in enumerate(element_config['variants']):
-                        # Inicializar Adaptive Strategy state
-                        initial_state = {
-                            'alpha': 1.0,
-                            'beta': 1.0,
-                            'samples': 0
-                        }
-                        
                         variant_id = await self.variant_repo.create_variant(
                             element_id=str(element_id),
                             name=f"Variant {var_idx + 1}",
@@ -584,14 +583,14 @@ class MultiElementService:
         if variant_assignments:
             # Multi-elemento
             for element_id, variant_id in variant_assignments.items():
-                await self.variant_repo.increment_conversion(variant_id)
+                await self.variant_repo.increment_conversion(variant_id, conversion_value)
                 self.logger.debug(
                     f"Incremented conversion for variant {variant_id} "
                     f"in element {element_id}"
                 )
         elif assignment.get('variant_id'):
             # Experimento simple (1 elemento)
-            await self.variant_repo.increment_conversion(assignment['variant_id'])
+            await self.variant_repo.increment_conversion(assignment['variant_id'], conversion_value)
         
         self.logger.info(
             f"🎯 Recorded conversion for user {user_identifier} "
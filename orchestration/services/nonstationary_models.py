@@ -0,0 +1,156 @@
+# orchestration/services/nonstationary_models.py
+"""
+Non-Stationary Models - Recency-weighted allocator state in memory
+
+Experimentos con optimization_strategy = 'discounted' o 'sliding_window'
+eligen con un posterior que sólo (o sobre todo) refleja la evidencia
+reciente. El estado vive en un LRU en proceso por experimento:
+
+- Carga: desde los buckets de hora de los rollups (una consulta, una
+  pasada vectorizada), así que sobrevive a reinicios y los workers
+  convergen al mismo estado.
+- Asignación / conversión: observe() / credit() en memoria, O(1) con
+  decaimiento perezoso (sin reescribir nada en cada tick).
+- Cada `refresh_seconds` el modelo se recarga en background desde los
+  rollups (el tráfico de los otros workers entra así); mientras tanto
+  se sigue sirviendo el modelo anterior. Los rollups sólo cubren hasta
+  su watermark: los eventos en memoria posteriores se re-aplican al
+  modelo nuevo en lugar de perderse.
+- Sin agregador de rollups (ROLLUPS_ENABLED=false) no hay recarga: la
+  evidencia en memoria es la única fuente y recargar la borraría.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from engine.core.allocators._nonstationary import DiscountedAllocator, SlidingWindowAllocator, HOUR
+from .model_cache import ModelCache
+
+logger = logging.getLogger(__name__)
+
+NONSTATIONARY_STRATEGIES = {
+    'discounted': DiscountedAllocator,
+    'sliding_window': SlidingWindowAllocator,
+}
+
+# Older evidence weighs < 2^-8 of fresh evidence: not worth loading
+_HALF_LIVES_LOADED = 8
+# Hour rollups are kept 90 days by default
+_MAX_HISTORY = timedelta(days=90)
+
+BucketLoader = Callable[[datetime], Awaitable[List[Dict[str, Any]]]]
+# processed_until of the rollups (None: nothing aggregated yet)
+WatermarkLoader = Callable[[], Awaitable[Optional[datetime]]]
+
+
+class NonStationaryModelCache(ModelCache[Tuple[str, str], Any]):
+    """LRU of (experiment_id, strategy) → recency allocator, reloaded from rollups"""
+
+    name = "Non-stationary"
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        max_experiments: int = 256,
+        refresh_seconds: float = 300.0
+    ):
+        super().__init__(max_entries=max_experiments, refresh_seconds=refresh_seconds)
+        self.config = dict(config or {})
+        self.max_experiments = max_experiments
+
+    def since(self, strategy: str, now: Optional[datetime] = None) -> datetime:
+        """Oldest hour bucket the strategy still needs"""
+        now = now or datetime.now(timezone.utc)
+        if strategy == 'sliding_window':
+            horizon = timedelta(hours=float(self.config.get('window_hours', 168.0)) + 1)
+        else:
+            horizon = timedelta(hours=float(self.config.get('half_life_hours', 168.0)) * _HALF_LIVES_LOADED)
+        return now - min(horizon, _MAX_HISTORY)
+
+    async def get(
+        self,
+        experiment_id: str,
+        strategy: str,
+        load_buckets: BucketLoader,
+        load_watermark: Optional[WatermarkLoader] = None
+    ):
+        """
+        Model of the experiment; stale models are served while they reload
+
+        With `load_watermark`, a reload keeps the events of the previous
+        model that the rollups have not aggregated yet.
+        """
+        return await super().get((str(experiment_id), strategy), load_buckets, load_watermark)
+
+    def peek(self, experiment_id: str, strategy: str):
+        return super().peek((str(experiment_id), strategy))
+
+    def invalidate(self, experiment_id: str):
+        for key in [k for k in self.keys() if k[0] == str(experiment_id)]:
+            super().invalidate(key)
+
+    async def _load(
+        self,
+        key: Tuple[str, str],
+        load_buckets: BucketLoader,
+        load_watermark: Optional[WatermarkLoader] = None
+    ):
+        experiment_id, strategy = key
+        model = NONSTATIONARY_STRATEGIES[strategy](self.config)
+
+        # Read the watermark first: buckets read afterwards cover at least
+        # every event before it
+        track_tail = self.refresh_seconds is not None and load_watermark is not None
+        watermark = await load_watermark() if track_tail else None
+
+        rows = await load_buckets(self.since(strategy))
+        if rows:
+            model.warm_start(
+                [row['variant_id'] for row in rows],
+                np.array([row['bucket_start'].timestamp() for row in rows]),
+                np.array([row['allocations'] for row in rows], dtype=np.float64),
+                np.array([row['conversions'] for row in rows], dtype=np.float64)
+            )
+
+        replayed = 0
+        if track_tail:
+            model.keep_tail()
+            previous = self.peek(experiment_id, strategy)
+            if previous is not None:
+                events = previous.tail(watermark.timestamp() if watermark else None)
+                model.replay(events)
+                replayed = len(events)
+
+        logger.info(
+            f"{strategy} model loaded for experiment {experiment_id} "
+            f"({len(rows)} hour buckets, {replayed} in-memory events after the rollups)"
+        )
+        return model
+
+
+_nonstationary_models: Optional[NonStationaryModelCache] = None
+
+
+def get_nonstationary_models() -> NonStationaryModelCache:
+    """Process-wide cache (experiment services are rebuilt per request)"""
+    global _nonstationary_models
+
+    if _nonstationary_models is None:
+        from config.settings import settings
+
+        # Reloading needs the aggregator to bring other workers' traffic
+        # into the rollups; without it a reload would only drop evidence
+        _nonstationary_models = NonStationaryModelCache(
+            config={
+                'half_life_hours': settings.NONSTATIONARY_HALF_LIFE_HOURS,
+                'window_hours': settings.NONSTATIONARY_WINDOW_HOURS,
+                'bucket_seconds': HOUR
+            },
+            max_experiments=settings.NONSTATIONARY_MAX_EXPERIMENTS,
+            refresh_seconds=settings.NONSTATIONARY_REFRESH_SECONDS if settings.ROLLUPS_ENABLED else None
+        )
+
+    return _nonstationary_models
@@ -0,0 +1,221 @@
+# orchestration/services/prior_fitting.py
+"""
+Prior Fitting - Empirical-Bayes Beta priors, vectorized over groups
+
+Cada variante de un experimento completado es una observación (n_i, k_i)
+de una tasa p_i ~ Beta(α, β) del grupo (cuenta × tipo de elemento). Los
+hiperparámetros de todos los grupos se ajustan a la vez, con arrays
+planos y `group` como índice de grupo por observación:
+
+- 'moments': método de momentos corrigiendo el ruido binomial
+  (var(p̂) = var(p) + E[p(1-p)/n]); cerrado, una pasada.
+- 'marginal': máxima verosimilitud marginal Beta-binomial (Newton en
+  log α, log β, arrancando de momentos). Gradiente y hessiano de cada
+  grupo son `np.bincount` de términos digamma/trigamma: sin bucles por
+  grupo.
+
+La fuerza del prior (α + β, visitas equivalentes) se limita a
+`max_strength` conservando la media, para que el histórico oriente la
+exploración sin decidir por los datos del experimento nuevo.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from scipy.special import digamma, polygamma
+
+METHOD_MOMENTS = 'moments'
+METHOD_MARGINAL = 'marginal'
+METHODS = (METHOD_MOMENTS, METHOD_MARGINAL)
+
+_MIN_PARAM = 1e-2
+
+
+@dataclass
+class FittedPriors:
+    """Beta(alpha[g], beta[g]) per group; `fitted[g]` False → not enough history"""
+    alpha: np.ndarray
+    beta: np.ndarray
+    experiments: np.ndarray
+    variants: np.ndarray
+    fitted: np.ndarray
+    method: str
+
+    @property
+    def strength(self) -> np.ndarray:
+        return self.alpha + self.beta
+
+    @property
+    def mean(self) -> np.ndarray:
+        return self.alpha / self.strength
+
+
+def _group_sum(group: np.ndarray, values: np.ndarray, n_groups: int) -> np.ndarray:
+    return np.bincount(group, weights=values, minlength=n_groups)
+
+
+def fit_moments(
+    group: np.ndarray,
+    allocations: np.ndarray,
+    conversions: np.ndarray,
+    n_groups: int
+) -> tuple:
+    """(alpha, beta) per group by method of moments (unbounded strength)"""
+    n = allocations.astype(np.float64)
+    rate = conversions / n
+    count = np.maximum(np.bincount(group, minlength=n_groups), 1)
+
+    mean = _group_sum(group, rate, n_groups) / count
+    spread = _group_sum(group, (rate - mean[group]) ** 2, n_groups) / count
+    # Parte de la varianza observada es ruido binomial, no heterogeneidad
+    noise = mean * (1.0 - mean) * _group_sum(group, 1.0 / n, n_groups) / count
+    between = np.maximum(spread - noise, 1e-12)
+
+    mean = np.clip(mean, 1e-6, 1.0 - 1e-6)
+    strength = np.maximum(mean * (1.0 - mean) / between - 1.0, 2 * _MIN_PARAM)
+    return mean * strength, (1.0 - mean) * strength
+
+
+def fit_marginal(
+    group: np.ndarray,
+    allocations: np.ndarray,
+    conversions: np.ndarray,
+    n_groups: int,
+    iterations: int = 50,
+    tol: float = 1e-6,
+    max_strength: Optional[float] = None
+) -> tuple:
+    """
+    (alpha, beta) per group maximizing the Beta-binomial marginal likelihood
+
+    Newton on (log α, log β), gradient and Hessian from digamma/trigamma
+    sums per group; where the Hessian is not negative definite the step
+    falls back to Minka's fixed point:
+        α ← α Σ[ψ(k+α) − ψ(α)] / Σ[ψ(n+α+β) − ψ(α+β)]
+    Steps are clipped to ±1 in log space. Without detectable
+    heterogeneity the likelihood keeps growing with α + β, so the
+    strength is bounded while iterating.
+    """
+    n = allocations.astype(np.float64)
+    k = conversions.astype(np.float64)
+    alpha, beta = fit_moments(group, allocations, conversions, n_groups)
+    bound = max_strength * 100.0 if max_strength else 1e6
+    alpha, beta = _cap_strength(alpha, beta, bound)
+
+    def sums(values):
+        return _group_sum(group, values, n_groups)
+
+    for _ in range(iterations):
+        a, b = alpha[group], beta[group]
+        total = digamma(n + a + b) - digamma(a + b)
+        up_a = digamma(k + a) - digamma(a)
+        up_b = digamma(n - k + b) - digamma(b)
+        grad_a = sums(up_a - total)
+        grad_b = sums(up_b - total)
+
+        curve = polygamma(1, a + b) - polygamma(1, n + a + b)
+        h_ab = sums(curve)
+        h_aa = sums(polygamma(1, k + a) - polygamma(1, a)) + h_ab
+        h_bb = sums(polygamma(1, n - k + b) - polygamma(1, b)) + h_ab
+
+        # Log-space derivatives (u = log α, v = log β)
+        g_u, g_v = alpha * grad_a, beta * grad_b
+        h_uu = alpha ** 2 * h_aa + g_u
+        h_vv = beta ** 2 * h_bb + g_v
+        h_uv = alpha * beta * h_ab
+        det = h_uu * h_vv - h_uv ** 2
+        newton = (h_uu < 0) & (det > 0)
+        safe_det = np.where(newton, det, 1.0)
+        step_u = -(h_vv * g_u - h_uv * g_v) / safe_det
+        step_v = -(h_uu * g_v - h_uv * g_u) / safe_det
+
+        if not newton.all():
+            denominator = sums(total)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                fixed_u = np.log(sums(up_a) / denominator)
+                fixed_v = np.log(sums(up_b) / denominator)
+            step_u = np.where(newton, step_u, np.nan_to_num(fixed_u))
+            step_v = np.where(newton, step_v, np.nan_to_num(fixed_v))
+
+        step_u = np.clip(step_u, -1.0, 1.0)
+        step_v = np.clip(step_v, -1.0, 1.0)
+        alpha = np.maximum(alpha * np.exp(step_u), _MIN_PARAM)
+        beta = np.maximum(beta * np.exp(step_v), _MIN_PARAM)
+        alpha, beta = _cap_strength(alpha, beta, bound)
+
+        if np.max(np.abs(step_u) + np.abs(step_v), initial=0.0) < tol:
+            break
+
+    return alpha, beta
+
+
+def _cap_strength(alpha: np.ndarray, beta: np.ndarray, max_strength: float) -> tuple:
+    scale = np.minimum(1.0, max_strength / (alpha + beta))
+    return alpha * scale, beta * scale
+
+
+def fit_priors(
+    group: np.ndarray,
+    experiment: np.ndarray,
+    allocations: np.ndarray,
+    conversions: np.ndarray,
+    n_groups: Optional[int] = None,
+    method: str = METHOD_MARGINAL,
+    max_strength: float = 50.0,
+    min_experiments: int = 5
+) -> FittedPriors:
+    """
+    Fit a Beta prior per group from historical variant counters
+
+    Args:
+        group: (N,) group index of each variant (0..n_groups-1)
+        experiment: (N,) experiment index of each variant (any integer ids)
+        allocations, conversions: (N,) final counters of each variant
+        max_strength: upper bound of alpha + beta (mean preserved)
+        min_experiments: groups with fewer distinct experiments keep Beta(1, 1)
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown prior fitting method: {method}")
+
+    group = np.asarray(group, dtype=np.int64)
+    experiment = np.asarray(experiment, dtype=np.int64)
+    allocations = np.asarray(allocations, dtype=np.float64)
+    conversions = np.asarray(conversions, dtype=np.float64)
+    if n_groups is None:
+        n_groups = int(group.max()) + 1 if group.size else 0
+
+    keep = allocations > 0
+    group, experiment = group[keep], experiment[keep]
+    allocations, conversions = allocations[keep], np.minimum(conversions[keep], allocations[keep])
+
+    variants = np.bincount(group, minlength=n_groups)
+    pairs = np.unique(np.stack([group, experiment]), axis=1) if group.size else np.empty((2, 0), np.int64)
+    experiments = np.bincount(pairs[0], minlength=n_groups)
+    # Sin heterogeneidad medible hacen falta al menos dos variantes
+    fitted = (experiments >= min_experiments) & (variants >= 2)
+
+    alpha = np.ones(n_groups)
+    beta = np.ones(n_groups)
+    if fitted.any():
+        rows = fitted[group]
+        # Reindex the fitted groups to a dense 0..G-1 range
+        dense = np.cumsum(fitted) - 1
+        g = dense[group[rows]]
+        G = int(fitted.sum())
+        if method == METHOD_MOMENTS:
+            a, b = fit_moments(g, allocations[rows], conversions[rows], G)
+        else:
+            a, b = fit_marginal(g, allocations[rows], conversions[rows], G, max_strength=max_strength)
+        a, b = _cap_strength(a, b, max_strength)
+        alpha[fitted] = np.maximum(a, _MIN_PARAM)
+        beta[fitted] = np.maximum(b, _MIN_PARAM)
+
+    return FittedPriors(
+        alpha=alpha,
+        beta=beta,
+        experiments=experiments,
+        variants=variants,
+        fitted=fitted,
+        method=method,
+    )
@@ -0,0 +1,195 @@
+# orchestration/services/prior_service.py
+"""
+Prior Service - Empirical-Bayes priors for new variants
+
+Cada `interval` segundos reajusta, para todas las cuentas a la vez, un
+Beta(α, β) por cuenta × tipo de elemento y otro por cuenta ('*') con los
+contadores finales de las variantes de experimentos completados
+(prior_fitting.py, vectorizado sobre grupos). Se guardan en
+variant_priors.
+
+Al crear variantes, `initial_state()` pone ese prior en algorithm_state
+en lugar de Beta(1, 1): un experimento nuevo parte de la tasa habitual de
+la cuenta y deja de gastar tráfico explorando variantes cuya tasa ya es
+previsible. La fuerza del prior está limitada (PRIOR_MAX_STRENGTH), así
+que unos cientos de visitas del experimento pesan más que el histórico.
+
+Sin historia suficiente (o con la función desactivada) las variantes
+siguen arrancando en Beta(1, 1).
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from data_access.pools import POOL_BATCH
+from data_access.repositories.prior_repository import ACCOUNT_WIDE, PriorRepository
+from orchestration.services.prior_fitting import METHOD_MARGINAL, fit_priors
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PriorConfig:
+    method: str = METHOD_MARGINAL
+    # Upper bound of alpha + beta (pseudo-visitors contributed by history)
+    max_strength: float = 50.0
+    min_experiments: int = 5
+    # Variants with fewer allocations are left out of the fit
+    min_allocations: int = 100
+
+
+def flat_state() -> Dict[str, Any]:
+    return {
+        'alpha': 1.0,
+        'beta': 1.0,
+        'samples': 0,
+        'algorithm_type': 'bayesian',
+        'prior': 'flat'
+    }
+
+
+async def initial_state(conn, experiment_id: Any, element_type: str) -> Dict[str, Any]:
+    """
+    algorithm_state for the new variants of an element
+
+    Runs inside the caller's transaction; the lookup gets its own
+    savepoint so a missing variant_priors table cannot abort it.
+    """
+    from config.settings import settings
+
+    state = flat_state()
+    if not settings.EMPIRICAL_PRIORS_ENABLED:
+        return state
+
+    try:
+        async with conn.transaction():
+            prior = await PriorRepository.get_for_experiment(conn, experiment_id, element_type)
+    except Exception as e:
+        logger.warning(f"Prior lookup failed for experiment {experiment_id}: {e}")
+        return state
+
+    if prior:
+        state['alpha'] = float(prior['alpha'])
+        state['beta'] = float(prior['beta'])
+        state['prior'] = 'empirical'
+    return state
+
+
+def encode_history(rows: Sequence[Any]) -> Dict[str, Any]:
+    """
+    Flat arrays for fit_priors from PriorRepository.get_history rows
+
+    Every variant counts twice: for its (account, element type) group and
+    for the account-wide group.
+    """
+    users = np.array([str(r['user_id']) for r in rows], dtype=str)
+    types = np.array([r['element_type'] or 'generic' for r in rows], dtype=str)
+    experiments = np.array([str(r['experiment_id']) for r in rows], dtype=str)
+    allocations = np.array([r['allocations'] for r in rows], dtype=np.float64)
+    conversions = np.array([r['conversions'] for r in rows], dtype=np.float64)
+
+    keys = np.concatenate([
+        np.char.add(np.char.add(users, '|'), types),
+        np.char.add(users, '|' + ACCOUNT_WIDE),
+    ])
+    group_keys, group = np.unique(keys, return_inverse=True)
+    _, experiment = np.unique(experiments, return_inverse=True)
+
+    return {
+        'groups': [tuple(k.split('|', 1)) for k in group_keys.tolist()],
+        'group': group.ravel(),
+        'experiment': np.tile(experiment.ravel(), 2),
+        'allocations': np.tile(allocations, 2),
+        'conversions': np.tile(conversions, 2),
+    }
+
+
+def fit_history(rows: Sequence[Any], config: PriorConfig) -> List[Dict[str, Any]]:
+    """Fitted priors (one dict per account × element type) from history rows"""
+    if not rows:
+        return []
+
+    history = encode_history(rows)
+    fitted = fit_priors(
+        history['group'],
+        history['experiment'],
+        history['allocations'],
+        history['conversions'],
+        n_groups=len(history['groups']),
+        method=config.method,
+        max_strength=config.max_strength,
+        min_experiments=config.min_experiments
+    )
+
+    return [
+        {
+            'user_id': user_id,
+            'element_type': element_type,
+            'alpha': float(fitted.alpha[g]),
+            'beta': float(fitted.beta[g]),
+            'experiments': int(fitted.experiments[g]),
+            'variants': int(fitted.variants[g]),
+        }
+        for g, (user_id, element_type) in enumerate(history['groups'])
+        if fitted.fitted[g]
+    ]
+
+
+class PriorService:
+    """
+    Background refit of the variant priors.
+
+    Lifecycle: create in app lifespan, `start()`, `await stop()` on shutdown.
+    """
+
+    def __init__(
+        self,
+        db_manager,
+        config: Optional[PriorConfig] = None,
+        interval: float = 21600.0
+    ):
+        self.repo = PriorRepository(db_manager.get_pool(POOL_BATCH))
+        self.config = config or PriorConfig()
+        self.interval = interval
+
+        self._task: Optional[asyncio.Task] = None
+        self.logger = logging.getLogger(f"{__name__}.PriorService")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            self.logger.info("Prior service started")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self.logger.info("Prior service stopped")
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refit()
+            except Exception as e:
+                self.logger.error(f"Prior refit failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def refit(self, user_ids: Optional[Sequence[str]] = None) -> int:
+        """Refit the priors of `user_ids` (default: every account). Returns rows written."""
+        rows = await self.repo.get_history(self.config.min_allocations, user_ids)
+
+        # Off the event loop: thousands of groups take a second or so
+        loop = asyncio.get_running_loop()
+        priors = await loop.run_in_executor(None, fit_history, rows, self.config)
+
+        written = await self.repo.save(priors, self.config.method)
+        self.logger.info(f"Priors refitted: {written} groups from {len(rows)} variants")
+        return written
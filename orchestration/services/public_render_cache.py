@@ -0,0 +1,172 @@
+# orchestration/services/public_render_cache.py
+"""
+Public Render Cache - Coalesced, short-lived cache for shareable dashboards
+
+Las URLs públicas (/dashboard/{id}, /reports/api/{id}) pueden recibir
+picos de tráfico anónimo. Por experimento:
+
+- Una sola consulta a la DB por TTL (single-flight: los visitantes
+  concurrentes esperan la misma tarea)
+- El HTML se renderiza una vez por versión del payload
+- ETag derivado del contenido: si los números no cambian entre TTLs,
+  el ETag tampoco, y los clientes/CDN reciben 304
+"""
+
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def payload_etag(data: Optional[Dict[str, Any]]) -> str:
+    """Strong validator for the JSON representation"""
+    encoded = json.dumps(data, sort_keys=True, default=str).encode()
+    return '"' + hashlib.sha256(encoded).hexdigest()[:32] + '"'
+
+
+@dataclass
+class RenderedPayload:
+    """A sanitized payload (None = not found) and its validators"""
+    data: Optional[Dict[str, Any]]
+    etag: str
+    last_modified: datetime
+    expires_at: float  # monotonic
+    bodies: Dict[str, bytes] = field(default_factory=dict, repr=False)
+
+    def variant_etag(self, variant: str) -> str:
+        """Validator for another representation of the same payload (e.g. HTML)"""
+        return f'{self.etag[:-1]}-{variant}"'
+
+    @property
+    def last_modified_http(self) -> str:
+        return format_datetime(self.last_modified, usegmt=True)
+
+    def not_modified(self, headers, etag: Optional[str] = None) -> bool:
+        """
+        Whether a conditional request can be answered with 304.
+
+        If-None-Match takes precedence over If-Modified-Since (RFC 9110).
+        """
+        etag = etag or self.etag
+        if_none_match = headers.get('if-none-match')
+        if if_none_match is not None:
+            if if_none_match.strip() == '*':
+                return True
+            candidates = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+            return etag.removeprefix('W/') in candidates
+
+        if_modified_since = headers.get('if-modified-since')
+        if if_modified_since:
+            try:
+                return self.last_modified <= parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+
+        return False
+
+
+class PublicRenderCache:
+    """
+    In-process TTL cache of public dashboard payloads with request coalescing.
+
+    Not-found results are cached too, so random ids cannot bypass it.
+    """
+
+    def __init__(self, ttl: float = 10.0, max_entries: int = 5000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, RenderedPayload]' = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    async def get(
+        self,
+        experiment_id: str,
+        loader: Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> RenderedPayload:
+        """Cached payload for `experiment_id`, loading it at most once per TTL"""
+        key = str(experiment_id)
+
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key, loader))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._inflight.pop(key, None))
+
+        # Shielded: one disconnecting viewer must not cancel the shared load
+        return await asyncio.shield(task)
+
+    def render(self, entry: RenderedPayload, variant: str, render: Callable[[], bytes]) -> bytes:
+        """Rendered body of `entry` for `variant` (e.g. 'html'), rendered once per version"""
+        body = entry.bodies.get(variant)
+        if body is None:
+            body = render()
+            entry.bodies[variant] = body
+        return body
+
+    def invalidate(self, experiment_id: str):
+        self._entries.pop(str(experiment_id), None)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'inflight': len(self._inflight)
+        }
+
+    async def _load(self, key: str, loader) -> RenderedPayload:
+        data = await loader()
+        etag = payload_etag(data)
+
+        previous = self._entries.get(key)
+        if previous is not None and previous.etag == etag:
+            # Same content: keep validators and rendered bodies
+            previous.expires_at = time.monotonic() + self.ttl
+            self._entries.move_to_end(key)
+            return previous
+
+        entry = RenderedPayload(
+            data=data,
+            etag=etag,
+            # HTTP dates have second precision
+            last_modified=datetime.now(timezone.utc).replace(microsecond=0),
+            expires_at=time.monotonic() + self.ttl
+        )
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        return entry
+
+
+_public_render_cache: Optional[PublicRenderCache] = None
+
+
+def get_public_render_cache() -> PublicRenderCache:
+    """Process-wide cache shared by the public dashboard routes"""
+    global _public_render_cache
+
+    if _public_render_cache is None:
+        from config.settings import settings
+        _public_render_cache = PublicRenderCache(ttl=settings.PUBLIC_DASHBOARD_CACHE_TTL)
+
+    return _public_render_cache
@@ -0,0 +1,222 @@
+# orchestration/services/rollup_service.py
+"""
+Rollup Aggregator - Background maintenance of time-series rollups
+
+Cada `interval` segundos:
+1. Crea las particiones necesarias (minute/hour) y borra las caducadas
+2. Pliega en los rollups las asignaciones/conversiones nuevas desde el
+   watermark, en ventanas de como máximo `max_window`, hasta alcanzar
+   NOW() - lag
+3. Refresca el resumen del dashboard de los usuarios con tráfico en
+   la ventana
+
+Varios workers pueden ejecutarlo a la vez: un advisory lock de Postgres
+garantiza que sólo uno avanza el watermark.
+
+RollupBackfill reconstruye los buckets de hora/día anteriores al
+watermark (histórico previo a los rollups, o filas sin user_id tras
+migration_02) por días completos, reanudable.
+"""
+
+import time
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict
+
+from data_access.pools import POOL_BATCH
+from data_access.repositories.rollup_repository import (
+    RollupRepository,
+    RESOLUTION_MINUTE,
+    RESOLUTION_HOUR,
+    ROLLUP_WATERMARK,
+    BACKFILL_WATERMARK,
+    partition_start
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RollupAggregator:
+    """
+    Incrementally maintains per-variant minute/hour/day buckets.
+
+    Lifecycle: create in app lifespan, `start()`, `await stop()` on shutdown.
+    """
+
+    # Partition create/drop runs at most this often
+    MAINTENANCE_INTERVAL = 3600.0
+
+    # Catch-up windows processed per tick (backfill after downtime)
+    MAX_WINDOWS_PER_TICK = 24
+
+    def __init__(
+        self,
+        db_manager,
+        interval: float = 60.0,
+        lag_seconds: float = 30.0,
+        max_window: timedelta = timedelta(hours=1),
+        minute_retention: timedelta = timedelta(hours=48),
+        hour_retention: timedelta = timedelta(days=90),
+        summary_service=None
+    ):
+        self.repo = RollupRepository(db_manager.get_pool(POOL_BATCH))
+        self.summary_service = summary_service
+        self.interval = interval
+        self.lag_seconds = lag_seconds
+        self.max_window = max_window
+        self.minute_retention = minute_retention
+        self.hour_retention = hour_retention
+
+        self._task: Optional[asyncio.Task] = None
+        self._last_maintenance: Optional[float] = None
+        self.logger = logging.getLogger(f"{__name__}.RollupAggregator")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            self.logger.info("Rollup aggregator started")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self.logger.info("Rollup aggregator stopped")
+
+    async def _run(self):
+        while True:
+            try:
+                await self.tick()
+            except Exception as e:
+                self.logger.error(f"Rollup aggregation failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def tick(self) -> int:
+        """Run maintenance if due and fold pending windows. Returns windows processed."""
+        now = datetime.now(timezone.utc)
+        minute_cutoff = now - self.minute_retention
+        hour_cutoff = now - self.hour_retention
+
+        if (
+            self._last_maintenance is None
+            or time.monotonic() - self._last_maintenance >= self.MAINTENANCE_INTERVAL
+        ):
+            await self.maintain(now)
+
+        processed = 0
+        touched_users = set()
+        while processed < self.MAX_WINDOWS_PER_TICK:
+            window = await self.repo.aggregate_next_window(
+                lag_seconds=self.lag_seconds,
+                max_window=self.max_window,
+                minute_cutoff=minute_cutoff,
+                hour_cutoff=hour_cutoff
+            )
+            if window is None:
+                break
+            processed += 1
+            touched_users.update(window.user_ids)
+
+            self.logger.debug(f"Rolled up {window.start.isoformat()} → {window.end.isoformat()}")
+            if window.end - window.start < self.max_window:
+                break  # caught up
+
+        if touched_users and self.summary_service:
+            await self.summary_service.refresh_users(touched_users)
+
+        return processed
+
+    async def maintain(self, now: datetime):
+        """Create upcoming partitions and drop those past retention"""
+        for resolution, retention in (
+            (RESOLUTION_MINUTE, self.minute_retention),
+            (RESOLUTION_HOUR, self.hour_retention)
+        ):
+            cutoff = now - retention
+            await self.repo.ensure_partitions(resolution, cutoff, now)
+            await self.repo.drop_expired_partitions(resolution, cutoff)
+
+        self._last_maintenance = time.monotonic()
+
+
+class RollupBackfill:
+    """
+    Chunked, resumable rebuild of hour/day rollups from `assignments`.
+
+    Covers [since, day of the live watermark) one chunk of `chunk_days`
+    per transaction; progress is stored as its own watermark, so an
+    interrupted run continues where it stopped. Runs alongside the
+    aggregator (same advisory lock, disjoint buckets).
+    """
+
+    # Wait before retrying a chunk while the aggregator holds the lock
+    LOCK_RETRY_SECONDS = 1.0
+
+    def __init__(
+        self,
+        db_manager,
+        chunk_days: int = 1,
+        lag_seconds: float = 30.0,
+        hour_retention: timedelta = timedelta(days=90)
+    ):
+        if chunk_days < 1:
+            raise ValueError("chunk_days must be >= 1")
+
+        self.repo = RollupRepository(db_manager.get_pool(POOL_BATCH))
+        self.chunk = timedelta(days=chunk_days)
+        self.lag_seconds = lag_seconds
+        self.hour_retention = hour_retention
+        self.logger = logging.getLogger(f"{__name__}.RollupBackfill")
+
+    async def run(
+        self,
+        since: Optional[datetime] = None,
+        restart: bool = False
+    ) -> Dict[str, int]:
+        """
+        Rebuild up to the live watermark. `restart` ignores saved progress
+        (e.g. after migration_02); `since` bounds how far back to go.
+        Returns totals (chunks, hour_rows, day_rows).
+        """
+        now = datetime.now(timezone.utc)
+        hour_cutoff = now - self.hour_retention
+        totals = {'chunks': 0, 'hour_rows': 0, 'day_rows': 0}
+
+        # Fresh database: pin the live watermark so the aggregator only
+        # folds events after it and the backfill owns everything before
+        live = await self.repo.init_watermark(
+            ROLLUP_WATERMARK,
+            partition_start('day', now - timedelta(seconds=self.lag_seconds))
+        )
+        end = partition_start('day', live)
+
+        start = None if restart else await self.repo.get_watermark(BACKFILL_WATERMARK)
+        if start is None:
+            start = since or await self.repo.get_oldest_event()
+            if start is None:
+                return totals  # no assignments at all
+        start = partition_start('day', start)
+
+        await self.repo.ensure_partitions(RESOLUTION_HOUR, hour_cutoff, now)
+
+        while start < end:
+            chunk_end = min(start + self.chunk, end)
+            rows = await self.repo.rebuild_chunk(start, chunk_end, hour_cutoff)
+            if rows is None:
+                await asyncio.sleep(self.LOCK_RETRY_SECONDS)
+                continue
+
+            totals['chunks'] += 1
+            totals['hour_rows'] += rows['hour_rows']
+            totals['day_rows'] += rows['day_rows']
+            self.logger.info(
+                f"Backfilled {start.date().isoformat()} → {chunk_end.date().isoformat()} "
+                f"({rows['hour_rows']} hour / {rows['day_rows']} day rows)"
+            )
+            start = chunk_end
+
+        return totals
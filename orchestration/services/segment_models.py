@@ -0,0 +1,188 @@
+# orchestration/services/segment_models.py
+"""
+Segment Models - Per-segment posteriors in memory, flushed in batches
+
+Experimentos con optimization_strategy = 'segmented' eligen con un
+posterior por (segmento, variante) encogido hacia el posterior global de
+la variante (engine/core/allocators/_segmented.py). El segmento es el
+segment_key del contexto (o device × utm_source), el mismo valor que
+registra el audit trail.
+
+- Estado: un array denso (segmentos × variantes × 2) por experimento en
+  un LRU en proceso. Asignación / conversión sólo suman en memoria.
+- Escritura: SegmentFlusher vuelca cada `interval` segundos los
+  incrementos de todos los experimentos en un único UPSERT aditivo
+  (segment_counts), así que segmentar no añade filas tocadas por visita.
+- Lectura: carga al primer uso y recarga en background cada
+  `refresh_seconds` (entra el tráfico de los otros workers); los
+  incrementos pendientes se conservan.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from data_access.pools import POOL_BATCH
+from data_access.repositories.segment_repository import SegmentRepository
+from engine.core.allocators._segmented import SegmentedAllocator
+from .model_cache import ModelCache
+
+logger = logging.getLogger(__name__)
+
+SEGMENTED_STRATEGY = 'segmented'
+
+CountsLoader = Callable[[], Awaitable[List[Tuple[str, str, int, int]]]]
+CountsWriter = Callable[[Sequence[Tuple[Any, str, str, int, int]]], Awaitable[int]]
+
+
+class SegmentModelCache(ModelCache[str, SegmentedAllocator]):
+    """LRU of experiment_id → SegmentedAllocator with pending increments"""
+
+    name = "Segment"
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        max_experiments: int = 256,
+        refresh_seconds: float = 300.0
+    ):
+        super().__init__(max_entries=max_experiments, refresh_seconds=refresh_seconds)
+        self.config = dict(config or {})
+        self.max_experiments = max_experiments
+        # Increments of evicted models, written by the next flush
+        self._orphans: List[Tuple[str, str, str, int, int]] = []
+        # Loads and flushes never interleave: base always equals what
+        # was read plus what was flushed since
+        self._lock = asyncio.Lock()
+
+    async def get(self, experiment_id: str, load_counts: CountsLoader) -> SegmentedAllocator:
+        """Model of the experiment; stale models are served while they reload"""
+        return await super().get(str(experiment_id), load_counts)
+
+    def peek(self, experiment_id: str) -> Optional[SegmentedAllocator]:
+        return super().peek(str(experiment_id))
+
+    def invalidate(self, experiment_id: str):
+        super().invalidate(str(experiment_id))
+
+    async def flush(self, write: CountsWriter) -> int:
+        """
+        Write every pending increment with one `write` call. Returns rows
+        written; on failure the increments stay pending and the error is raised.
+        """
+        async with self._lock:
+            orphans, self._orphans = self._orphans, []
+            rows, taken = list(orphans), []
+            for experiment_id, model in self.items():
+                pending, delta = model.take_delta()
+                if pending:
+                    taken.append((model, delta))
+                    rows.extend((experiment_id, *row) for row in pending)
+
+            if not rows:
+                return 0
+            try:
+                return await write(rows)
+            except BaseException:
+                for model, delta in taken:
+                    model.restore_delta(delta)
+                self._orphans = orphans + self._orphans
+                raise
+
+    def _evicted(self, experiment_id: str, model: SegmentedAllocator):
+        # Its increments are still written by the next flush
+        pending, _ = model.take_delta()
+        self._orphans.extend((experiment_id, *row) for row in pending)
+
+    async def _load(self, key: str, load_counts: CountsLoader) -> SegmentedAllocator:
+        # A reload keeps the model (and its pending increments)
+        entry = self._models.get(key)
+        model = entry[0] if entry is not None else SegmentedAllocator(self.config)
+
+        async with self._lock:
+            rows = await load_counts()
+            model.load(rows)
+        logger.info(
+            f"Segment model loaded for experiment {key} "
+            f"({len(model.segments)} segments, {len(rows)} counters)"
+        )
+        return model
+
+
+class SegmentFlusher:
+    """
+    Background batch writer of the segment counters.
+
+    Lifecycle: create in app lifespan, `start()`, `await stop()` on
+    shutdown (stop flushes what is still pending).
+    """
+
+    def __init__(
+        self,
+        db_manager,
+        cache: Optional[SegmentModelCache] = None,
+        interval: float = 10.0
+    ):
+        self.repo = SegmentRepository(db_manager.get_pool(POOL_BATCH))
+        self.cache = cache or get_segment_models()
+        self.interval = interval
+
+        self._task: Optional[asyncio.Task] = None
+        self.logger = logging.getLogger(f"{__name__}.SegmentFlusher")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            self.logger.info("Segment flusher started")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            try:
+                await self.flush()
+            except Exception as e:
+                self.logger.error(f"Final segment flush failed: {e}")
+            self.logger.info("Segment flusher stopped")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                self.logger.error(f"Segment flush failed: {e}")
+
+    async def flush(self) -> int:
+        """Write pending increments of every experiment. Returns rows written."""
+        written = await self.cache.flush(self.repo.add_counts)
+        if written:
+            self.logger.debug(f"Segment counters flushed: {written} rows")
+        return written
+
+
+_segment_models: Optional[SegmentModelCache] = None
+
+
+def get_segment_models() -> SegmentModelCache:
+    """Process-wide cache (experiment services are rebuilt per request)"""
+    global _segment_models
+
+    if _segment_models is None:
+        from config.settings import settings
+
+        _segment_models = SegmentModelCache(
+            config={
+                'max_segments': settings.SEGMENT_MAX_SEGMENTS,
+                'min_strength': settings.SEGMENT_MIN_STRENGTH,
+                'max_strength': settings.SEGMENT_MAX_STRENGTH,
+            },
+            max_experiments=settings.SEGMENT_MAX_EXPERIMENTS,
+            refresh_seconds=settings.SEGMENT_REFRESH_SECONDS
+        )
+
+    return _segment_models
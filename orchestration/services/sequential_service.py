@@ -0,0 +1,371 @@
+# orchestration/services/sequential_service.py
+"""
+Sequential Evaluator - Early stopping for active experiments
+
+Cada `interval` segundos revisa los experimentos activos y, por elemento,
+compara cada variante contra el control (la de menor variant_order):
+
+- Vista frecuentista: mSPRT + confidence sequence (always-valid). Mirar
+  los datos en cada tick no infla el error tipo I, así que se puede parar
+  en cuanto la evidencia es suficiente. Se guarda el p-valor mínimo y la
+  intersección de las confidence sequences: el test sigue siendo válido
+  entre reinicios.
+- Vista bayesiana: expected loss bajo posteriores Beta. Cuando elegir la
+  mejor variante cuesta, en esperanza, menos de `loss_epsilon` (relativo
+  a su tasa), seguir explorando ya no compensa.
+
+Decisiones:
+- pause_variant: la confidence sequence de la variante queda entera por
+  debajo de 0 (peor que el control con probabilidad 1 − α).
+- promote_variant: expected loss de la mejor variante < ε · tasa, y si no
+  es el control, además su confidence sequence queda entera por encima
+  de 0. Se pausan las demás.
+- complete_experiment: todos los elementos quedan con una sola variante.
+
+El control nunca se pausa por sí solo y ningún elemento se queda sin
+variantes activas. Sólo se re-evalúan los elementos cuyos contadores
+cambiaron desde el último tick. Cada decisión se registra en
+AuditService (experiment_decisions) en la misma transacción que la aplica.
+
+Opt-out por experimento: config = {"sequential": {"enabled": false}}.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from itertools import groupby
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from data_access.pools import POOL_BATCH
+from data_access.repositories.sequential_repository import SequentialRepository
+from engine.core.math._sequential import compare_to_control, expected_loss
+from orchestration.services.audit_service import AuditService
+from orchestration.services.public_render_cache import get_public_render_cache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SequentialConfig:
+    alpha: float = 0.05
+    # Std. dev. of the N(0, tau²) mixture over the effect (absolute rate difference)
+    tau: float = 0.01
+    # Stop when expected loss < loss_epsilon × posterior mean of the best arm
+    loss_epsilon: float = 0.01
+    min_samples: int = 200
+    loss_samples: int = 20000
+
+
+@dataclass
+class ArmSnapshot:
+    """Counters of one variant + its running sequential statistics"""
+    variant_id: Any
+    variant_order: int
+    is_active: bool
+    allocations: int
+    conversions: int
+    min_p_value: float = 1.0
+    ci_lower: Optional[float] = None
+    ci_upper: Optional[float] = None
+    expected_loss: Optional[float] = None
+
+    def state(self) -> Dict[str, Any]:
+        return {
+            'variant_id': self.variant_id,
+            'allocations': self.allocations,
+            'conversions': self.conversions,
+            'min_p_value': self.min_p_value,
+            'ci_lower': self.ci_lower,
+            'ci_upper': self.ci_upper,
+            'expected_loss': self.expected_loss,
+        }
+
+
+@dataclass
+class ArmDecision:
+    variant_id: Any
+    action: str   # 'pause_variant' | 'promote_variant'
+    reason: str
+    statistics: Dict[str, Any]
+
+
+@dataclass
+class ElementVerdict:
+    element_id: Any
+    arms: List[ArmSnapshot]
+    decisions: List[ArmDecision] = field(default_factory=list)
+
+    @property
+    def paused(self) -> set:
+        return {d.variant_id for d in self.decisions if d.action == 'pause_variant'}
+
+    @property
+    def active_after(self) -> int:
+        paused = self.paused
+        return sum(1 for a in self.arms if a.is_active and a.variant_id not in paused)
+
+
+def _finite(value: Optional[float]) -> Optional[float]:
+    if value is None or not np.isfinite(value):
+        return None
+    return round(float(value), 6)
+
+
+def _arm_statistics(arm: ArmSnapshot, control: ArmSnapshot, alpha: float) -> Dict[str, Any]:
+    return {
+        'alpha': alpha,
+        'allocations': arm.allocations,
+        'conversions': arm.conversions,
+        'control_allocations': control.allocations,
+        'control_conversions': control.conversions,
+        'p_value': _finite(arm.min_p_value),
+        'ci_lower': _finite(arm.ci_lower),
+        'ci_upper': _finite(arm.ci_upper),
+        'expected_loss': _finite(arm.expected_loss),
+    }
+
+
+def evaluate_element(
+    element_id: Any,
+    arms: List[ArmSnapshot],
+    config: SequentialConfig,
+    alpha: Optional[float] = None,
+    rng: Optional[np.random.Generator] = None
+) -> ElementVerdict:
+    """
+    Update the running statistics of an element's arms and decide.
+
+    Pure function: `arms` come from the DB (current counters + previous
+    state) and are updated in place; nothing is written here.
+    """
+    alpha = alpha if alpha is not None else config.alpha
+    tau2 = config.tau ** 2
+    verdict = ElementVerdict(element_id=element_id, arms=arms)
+
+    control = min(arms, key=lambda a: a.variant_order)
+
+    # ─── Frequentist: always-valid comparison vs control ───
+    for arm in arms:
+        if arm is control or not arm.is_active or arm.allocations == 0 or control.allocations == 0:
+            continue
+        result = compare_to_control(
+            control.conversions, control.allocations,
+            arm.conversions, arm.allocations,
+            tau2, alpha
+        )
+        arm.min_p_value = min(arm.min_p_value, result['p_value'])
+        arm.ci_lower = result['ci_lower'] if arm.ci_lower is None else max(arm.ci_lower, result['ci_lower'])
+        arm.ci_upper = result['ci_upper'] if arm.ci_upper is None else min(arm.ci_upper, result['ci_upper'])
+
+    active = [a for a in arms if a.is_active]
+    if len(active) < 2 or control.allocations < config.min_samples:
+        return verdict
+
+    for arm in active:
+        if (
+            arm is not control
+            and arm.allocations >= config.min_samples
+            and arm.ci_upper is not None
+            and arm.ci_upper < 0
+        ):
+            verdict.decisions.append(ArmDecision(
+                arm.variant_id, 'pause_variant', 'worse_than_control',
+                _arm_statistics(arm, control, alpha)
+            ))
+
+    # ─── Bayesian: expected loss among the survivors ───
+    paused = verdict.paused
+    survivors = [a for a in active if a.variant_id not in paused]
+    if len(survivors) < 2 or any(a.allocations < config.min_samples for a in survivors):
+        return verdict
+
+    successes = np.array([a.conversions for a in survivors], dtype=np.float64)
+    failures = np.array([a.allocations - a.conversions for a in survivors], dtype=np.float64)
+    losses = expected_loss(successes, failures, n_samples=config.loss_samples, rng=rng)
+    for arm, loss in zip(survivors, losses):
+        arm.expected_loss = float(loss)
+
+    best_idx = int(np.argmin(losses))
+    best = survivors[best_idx]
+    best_mean = (successes[best_idx] + 1.0) / (successes[best_idx] + failures[best_idx] + 2.0)
+
+    if losses[best_idx] >= config.loss_epsilon * best_mean:
+        return verdict
+    if best is not control and not (best.ci_lower is not None and best.ci_lower > 0):
+        return verdict
+
+    verdict.decisions.append(ArmDecision(
+        best.variant_id, 'promote_variant', 'expected_loss_below_threshold',
+        {**_arm_statistics(best, control, alpha), 'loss_threshold': _finite(config.loss_epsilon * best_mean)}
+    ))
+    for arm in survivors:
+        if arm is not best:
+            verdict.decisions.append(ArmDecision(
+                arm.variant_id, 'pause_variant', 'other_variant_promoted',
+                _arm_statistics(arm, control, alpha)
+            ))
+
+    return verdict
+
+
+class SequentialEvaluator:
+    """
+    Background evaluator of active experiments.
+
+    Lifecycle: create in app lifespan, `start()`, `await stop()` on shutdown.
+    """
+
+    def __init__(
+        self,
+        db_manager,
+        config: Optional[SequentialConfig] = None,
+        interval: float = 300.0,
+        audit_service: Optional[AuditService] = None,
+        experiment_service=None,
+        summary_service=None
+    ):
+        self.repo = SequentialRepository(db_manager.get_pool(POOL_BATCH))
+        self.audit = audit_service or AuditService(db_manager)
+        self.config = config or SequentialConfig()
+        self.interval = interval
+        self.experiment_service = experiment_service
+        self.summary_service = summary_service
+
+        self._rng = np.random.default_rng()
+        self._task: Optional[asyncio.Task] = None
+        self.logger = logging.getLogger(f"{__name__}.SequentialEvaluator")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            self.logger.info("Sequential evaluator started")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self.logger.info("Sequential evaluator stopped")
+
+    async def _run(self):
+        while True:
+            try:
+                await self.tick()
+            except Exception as e:
+                self.logger.error(f"Sequential evaluation failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def tick(self) -> int:
+        """Evaluate every active experiment once. Returns decisions applied."""
+        applied = 0
+        async with self.repo.connection() as conn:
+            rows = await self.repo.get_active_arms(conn)
+            for experiment_id, exp_rows in groupby(rows, key=lambda r: r['experiment_id']):
+                exp_rows = list(exp_rows)
+                try:
+                    applied += await self._evaluate_experiment(conn, experiment_id, exp_rows)
+                except Exception as e:
+                    self.logger.error(f"Sequential evaluation of {experiment_id} failed: {e}")
+        return applied
+
+    async def _evaluate_experiment(self, conn, experiment_id, rows: List[Dict[str, Any]]) -> int:
+        # Incremental: nothing to do if no counter moved since the last tick
+        if all(
+            r['last_allocations'] == r['allocations'] and r['last_conversions'] == r['conversions']
+            for r in rows
+        ):
+            return 0
+
+        async with conn.transaction():
+            # One worker per experiment; the others skip it this tick. The
+            # arms are re-read under the lock: the snapshot above may predate
+            # another worker's decisions
+            if not await self.repo.lock_experiment(conn, experiment_id):
+                return 0
+            rows = await self.repo.get_experiment_arms(conn, experiment_id)
+            if not rows:
+                return 0
+            applied = await self._apply(conn, experiment_id, rows)
+
+        if applied:
+            self.logger.info(f"Experiment {experiment_id}: {applied} sequential decisions applied")
+            await self._invalidate(str(experiment_id), str(rows[0]['user_id']))
+        return applied
+
+    async def _apply(self, conn, experiment_id, rows: List[Dict[str, Any]]) -> int:
+        """Evaluate the changed elements and apply their decisions (inside a transaction)"""
+        threshold = rows[0]['confidence_threshold']
+        alpha = 1.0 - float(threshold) if threshold else self.config.alpha
+
+        verdicts = []
+        active_per_element = []
+        for element_id, element_rows in groupby(rows, key=lambda r: r['element_id']):
+            element_rows = list(element_rows)
+            arms = [
+                ArmSnapshot(
+                    variant_id=r['variant_id'],
+                    variant_order=r['variant_order'],
+                    is_active=r['is_active'],
+                    allocations=r['allocations'],
+                    conversions=r['conversions'],
+                    min_p_value=r['min_p_value'] if r['min_p_value'] is not None else 1.0,
+                    ci_lower=r['ci_lower'],
+                    ci_upper=r['ci_upper'],
+                )
+                for r in element_rows
+            ]
+
+            # Skip elements whose counters did not move
+            unchanged = all(
+                r['last_allocations'] == r['allocations'] and r['last_conversions'] == r['conversions']
+                for r in element_rows
+            )
+            if unchanged:
+                active_per_element.append(sum(1 for a in arms if a.is_active))
+                continue
+
+            verdict = evaluate_element(element_id, arms, self.config, alpha=alpha, rng=self._rng)
+            verdicts.append(verdict)
+            active_per_element.append(verdict.active_after)
+
+        if not verdicts:
+            return 0
+
+        applied = 0
+        for verdict in verdicts:
+            await self.repo.save_state(conn, experiment_id, [a.state() for a in verdict.arms])
+
+            for decision in verdict.decisions:
+                if decision.action == 'pause_variant':
+                    if not await self.repo.deactivate_variant(conn, decision.variant_id):
+                        continue
+                await self.audit.log_experiment_decision(
+                    experiment_id, decision.action, decision.reason, decision.statistics,
+                    element_id=verdict.element_id, variant_id=decision.variant_id, conn=conn
+                )
+                applied += 1
+
+        if applied and all(n <= 1 for n in active_per_element):
+            if await self.repo.complete_experiment(conn, experiment_id):
+                await self.audit.log_experiment_decision(
+                    experiment_id, 'complete_experiment', 'all_elements_decided', {},
+                    conn=conn
+                )
+                applied += 1
+        return applied
+
+    async def _invalidate(self, experiment_id: str, user_id: str):
+        get_public_render_cache().invalidate(experiment_id)
+        if self.summary_service is not None:
+            self.summary_service.invalidate(user_id)
+        invalidate = getattr(self.experiment_service, 'invalidate_experiment_cache', None)
+        if invalidate is not None:
+            try:
+                await invalidate(experiment_id)
+            except Exception as e:
+                self.logger.warning(f"Variant cache invalidation failed for {experiment_id}: {e}")
@@ -14,9 +14,11 @@ from .experiment_service import ExperimentService
 from .experiment_service_redis import ExperimentServiceRedis
 from .metrics_service import MetricsService
 from .audit_service import AuditService
+from .dashboard_summary_service import DashboardSummaryService
 from data_access.repositories.experiment_repository import ExperimentRepository
 from data_access.repositories.variant_repository import VariantRepository
 from data_access.repositories.assignment_repository import AssignmentRepository
+from data_access.pools import POOL_API, POOL_TRACKER
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +37,8 @@ class ServiceFactory:
     _service: Optional[ExperimentService] = None
     _metrics: Optional[MetricsService] = None
     _audit: Optional[AuditService] = None
+    _dashboard_summary: Optional[DashboardSummaryService] = None
+    _funnel_service: Optional['FunnelService'] = None
     
     def __new__(cls):
         if cls._instance is None:
@@ -44,7 +48,7 @@ class ServiceFactory:
     @classmethod
     async def get_funnel_service(cls, db_manager) -> 'FunnelService':
         """
-        Get Funnel Service instance
+        Get Funnel Service instance (tracker pool)
         """
         if not cls._funnel_service:
             from orchestration.services.funnel_service import FunnelService
@@ -52,11 +56,22 @@ class ServiceFactory:
         return cls._funnel_service
 
     @classmethod
-    async def create_experiment_service(cls, db_manager):
+    def get_dashboard_summary_service(cls, db_manager) -> DashboardSummaryService:
+        """
+        Get Dashboard Summary Service instance (shared in-process cache)
+        """
+        if cls._dashboard_summary is None:
+            cls._dashboard_summary = DashboardSummaryService(db_manager)
+        return cls._dashboard_summary
+
+    @classmethod
+    async def create_experiment_service(cls, db_manager, workload: str = POOL_API):
         """
         Crear servicio de experimentos
         
-        Auto-detecta si usar Redis o no
+        Auto-detecta si usar Redis o no. Los repositorios usan el pool
+        de `workload`: dashboard y API en POOL_API (por defecto), el
+        tracker en POOL_TRACKER (create_tracker_experiment_service).
         """
         
         # ──────────────────────────────────────────
@@ -118,14 +133,28 @@ class ServiceFactory:
         else:
             logger.info("Using PostgreSQL implementation (Redis not configured or below threshold)")
         
-        cls._service = ExperimentService(
+        pool = db_manager.get_pool(workload)
+        service = ExperimentService(
             db_manager,
-            experiment_repo=ExperimentRepository(db_manager.pool),
-            variant_repo=VariantRepository(db_manager.pool),
-            assignment_repo=AssignmentRepository(db_manager.pool),
+            experiment_repo=ExperimentRepository(pool),
+            variant_repo=VariantRepository(pool),
+            assignment_repo=AssignmentRepository(pool),
             audit_service=cls._audit
         )
-        return cls._service
+        if workload == POOL_API:
+            cls._service = service
+        return service
+    
+    @classmethod
+    async def create_tracker_experiment_service(cls, db_manager):
+        """
+        Servicio de experimentos del tracker (assign/convert)
+        
+        Mismo servicio sobre el pool dedicado del tracker, con su timeout
+        de acquire corto y su circuit breaker; las escrituras del
+        dashboard no compiten por esas conexiones.
+        """
+        return await cls.create_experiment_service(db_manager, workload=POOL_TRACKER)
     
     @classmethod
     async def _migrate_to_redis(cls, db_manager, redis_service):
@@ -13,6 +13,7 @@ import os
 import logging
 
 from data_access.database import get_database, DatabaseManager
+from data_access.pagination import Keyset, decode_cursor
 from public_api.middleware.rate_limit import rate_limiter
 
 logger = logging.getLogger(__name__)
@@ -30,6 +31,14 @@ async def get_db() -> DatabaseManager:
     return await get_database()
 
 
+async def get_editor_proxy(request: Request):
+    """
+    Shared Visual Editor proxy (pooled HTTP client + asset cache).
+    Created in the app lifespan.
+    """
+    return request.app.state.editor_proxy
+
+
 # ════════════════════════════════════════════════════════════════════════════
 # AUTHENTICATION
 # ════════════════════════════════════════════════════════════════════════════
@@ -183,3 +192,27 @@ def get_pagination(
 ) -> PaginationParams:
     """Get pagination params: Depends(get_pagination)"""
     return PaginationParams(page, per_page)
+
+
+class CursorParams:
+    """Keyset pagination parameters (see data_access.pagination)"""
+    def __init__(
+        self,
+        cursor: Optional[str] = None,
+        per_page: int = 20
+    ):
+        self.per_page = min(100, max(1, per_page))
+        self.after: Optional[Keyset] = None
+        if cursor:
+            try:
+                self.after = decode_cursor(cursor)
+            except ValueError as e:
+                raise APIError(str(e), code=ErrorCodes.VALIDATION_ERROR, status=400)
+
+
+def get_cursor_pagination(
+    cursor: Optional[str] = None,
+    per_page: int = 20
+) -> CursorParams:
+    """Get cursor params: Depends(get_cursor_pagination)"""
+    return CursorParams(cursor, per_page)
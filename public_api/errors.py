@@ -84,6 +84,10 @@ class ErrorCode(str, Enum):
     TRACK_CONV_002 = "TRACK_CONV_002"      # Already converted
     TRACK_CONV_003 = "TRACK_CONV_003"      # Invalid conversion value
     
+    # Funnel errors
+    TRACK_FUNNEL_001 = "TRACK_FUNNEL_001"  # Funnel or step not found
+    TRACK_FUNNEL_002 = "TRACK_FUNNEL_002"  # Variant not in the step's experiment
+    
     # ═══════════════════════════════════════════════════════════════════
     # ANALYTICS MODULE
     # ═══════════════════════════════════════════════════════════════════
@@ -98,6 +102,7 @@ class ErrorCode(str, Enum):
     
     DB_CONN_001 = "DB_CONN_001"            # Connection failed
     DB_CONN_002 = "DB_CONN_002"            # Connection pool exhausted
+    DB_CONN_003 = "DB_CONN_003"            # Circuit open (fast-fail)
     DB_QUERY_001 = "DB_QUERY_001"          # Query failed
     DB_QUERY_002 = "DB_QUERY_002"          # Constraint violation
     DB_TRANS_001 = "DB_TRANS_001"          # Transaction rollback
@@ -146,6 +151,8 @@ ERROR_DESCRIPTIONS: Dict[str, str] = {
     ErrorCode.TRACK_CONV_001: "No assignment found for this user",
     ErrorCode.TRACK_CONV_002: "Conversion already recorded",
     ErrorCode.TRACK_CONV_003: "Conversion value must be positive",
+    ErrorCode.TRACK_FUNNEL_001: "This funnel or step does not exist or is not active",
+    ErrorCode.TRACK_FUNNEL_002: "This variant does not belong to the step's experiment",
     
     # Analytics
     ErrorCode.ANAL_CALC_001: "Not enough data for statistical analysis",
@@ -155,6 +162,7 @@ ERROR_DESCRIPTIONS: Dict[str, str] = {
     # Database
     ErrorCode.DB_CONN_001: "Database connection failed",
     ErrorCode.DB_CONN_002: "Database connection pool exhausted",
+    ErrorCode.DB_CONN_003: "Database temporarily unavailable, please retry shortly",
     ErrorCode.DB_QUERY_001: "Database query failed",
     ErrorCode.DB_QUERY_002: "Data constraint violation",
     ErrorCode.DB_TRANS_001: "Transaction failed and was rolled back",
@@ -24,6 +24,10 @@ from .tracker import (
     TrackerAssignmentResponse,
     TrackerConversionRequest,
     TrackerConversionResponse,
+    TrackerFunnelStepRequest,
+    TrackerFunnelStepResponse,
+    TrackerFunnelConversionRequest,
+    TrackerFunnelConversionResponse,
     ExperimentInfo,
     ActiveExperimentsRequest,
     ActiveExperimentsResponse,
@@ -64,6 +68,10 @@ __all__ = [
     'TrackerAssignmentResponse',
     'TrackerConversionRequest',
     'TrackerConversionResponse',
+    'TrackerFunnelStepRequest',
+    'TrackerFunnelStepResponse',
+    'TrackerFunnelConversionRequest',
+    'TrackerFunnelConversionResponse',
     'ExperimentInfo',
     'ActiveExperimentsRequest',
     'ActiveExperimentsResponse',
@@ -55,6 +55,7 @@ class PaginatedResponse(BaseModel, Generic[T]):
     page: int = 1
     per_page: int = 20
     has_more: bool = False
+    next_cursor: Optional[str] = None  # keyset-paginated lists
     
     @property
     def pages(self) -> int:
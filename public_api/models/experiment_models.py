@@ -12,6 +12,8 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime
 from enum import Enum
 
+from orchestration.interfaces.optimization_interface import OptimizationStrategy
+
 # ============================================
 # ENUMS
 # ============================================
@@ -129,6 +131,10 @@ class CreateExperimentRequest(BaseModel):
     # Configuración opcional
     traffic_allocation: float = Field(default=1.0, ge=0.0, le=1.0)
     confidence_threshold: float = Field(default=0.95, ge=0.8, le=0.99)
+    optimization_strategy: OptimizationStrategy = Field(
+        default=OptimizationStrategy.ADAPTIVE,
+        description="Estrategia de asignación de tráfico"
+    )
     
     @field_validator('url')
     @classmethod
@@ -165,6 +171,7 @@ class UpdateExperimentRequest(BaseModel):
     name: Optional[str] = Field(None, min_length=3, max_length=255)
     description: Optional[str] = None
     traffic_allocation: Optional[float] = Field(None, ge=0.0, le=1.0)
+    optimization_strategy: Optional[OptimizationStrategy] = None
 
 
 # ============================================
@@ -210,6 +217,7 @@ class ExperimentListResponse(BaseModel):
     name: str
     description: Optional[str]
     status: ExperimentStatus
+    optimization_strategy: str = OptimizationStrategy.ADAPTIVE.value
     url: str
     created_at: datetime
     started_at: Optional[datetime]
@@ -225,6 +233,7 @@ class ExperimentDetailResponse(BaseModel):
     name: str
     description: Optional[str]
     status: ExperimentStatus
+    optimization_strategy: str = OptimizationStrategy.ADAPTIVE.value
     url: str
     traffic_allocation: float
     confidence_threshold: float
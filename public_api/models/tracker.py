@@ -54,6 +54,52 @@ class TrackerConversionRequest(BaseModel):
         return v.strip()
 
 
+class TrackerFunnelStepRequest(BaseModel):
+    """Request to record a completed funnel step"""
+    installation_token: str = Field(..., min_length=1, max_length=255)
+    funnel_id: str = Field(..., min_length=1)
+    step_id: str = Field(..., min_length=1)
+    user_identifier: str = Field(..., min_length=1, max_length=255)
+    variant_id: Optional[str] = None
+    session_id: Optional[str] = Field(None, max_length=255)
+    
+    @field_validator('installation_token')
+    @classmethod
+    def validate_token(cls, v: str) -> str:
+        if not v or v.strip() == '':
+            raise ValueError("installation_token cannot be empty")
+        return v.strip()
+    
+    @field_validator('user_identifier')
+    @classmethod
+    def validate_user(cls, v: str) -> str:
+        if not v or v.strip() == '':
+            raise ValueError("user_identifier cannot be empty")
+        return v.strip()
+
+
+class TrackerFunnelConversionRequest(BaseModel):
+    """Request to record the final conversion of a funnel"""
+    installation_token: str = Field(..., min_length=1, max_length=255)
+    funnel_id: str = Field(..., min_length=1)
+    user_identifier: str = Field(..., min_length=1, max_length=255)
+    conversion_value: float = Field(1.0, ge=0)
+    
+    @field_validator('installation_token')
+    @classmethod
+    def validate_token(cls, v: str) -> str:
+        if not v or v.strip() == '':
+            raise ValueError("installation_token cannot be empty")
+        return v.strip()
+    
+    @field_validator('user_identifier')
+    @classmethod
+    def validate_user(cls, v: str) -> str:
+        if not v or v.strip() == '':
+            raise ValueError("user_identifier cannot be empty")
+        return v.strip()
+
+
 class TrackerAssignmentResponse(BaseModel):
     """Response with variant assignment"""
     variant_id: str
@@ -70,6 +116,20 @@ class TrackerConversionResponse(BaseModel):
     message: str
 
 
+class TrackerFunnelStepResponse(BaseModel):
+    """Response after recording a funnel step"""
+    success: bool
+    session_id: Optional[str] = None
+    message: str
+
+
+class TrackerFunnelConversionResponse(BaseModel):
+    """Response after recording a funnel conversion"""
+    success: bool
+    credited_steps: int = 0
+    message: str
+
+
 class ExperimentInfo(BaseModel):
     """Basic experiment info for tracker"""
     id: str
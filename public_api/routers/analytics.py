@@ -7,9 +7,11 @@ Exposes dedicated endpoints for experiment analysis and insights.
 
 from fastapi import APIRouter, Depends, Path, Query
 import logging
-from typing import Dict, Any
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
 
 from data_access.database import DatabaseManager
+from data_access.repositories.rollup_repository import RollupRepository, resolve_period
 from public_api.dependencies import get_db, get_current_user, check_rate_limit
 from public_api.middleware.error_handler import APIError, ErrorCodes
 from public_api.models import APIResponse, ExperimentAnalytics
@@ -27,7 +29,8 @@ router = APIRouter()
 async def get_experiment_analytics(
     experiment_id: str = Path(..., description="The ID of the experiment to analyze"),
     user_id: str = Depends(get_current_user),
-    db: DatabaseManager = Depends(get_db)
+    db: DatabaseManager = Depends(get_db),
+    period: Optional[str] = Query(None, description="Restrict to a time period (24h, 7d, 30d, 12m); lifetime if omitted")
 ):
     """
     Get detailed Bayesian analytics for an experiment.
@@ -35,6 +38,13 @@ async def get_experiment_analytics(
     Returns high-dimensional metrics including probability of being the winner,
     expected loss, and credible intervals for each variant.
     """
+    since = None
+    if period:
+        try:
+            since = resolve_period(period).since(datetime.now(timezone.utc))
+        except ValueError as e:
+            raise APIError(str(e), code=ErrorCodes.VALIDATION_ERROR, status=400)
+    
     try:
         service = AnalyticsService()
         
@@ -82,26 +92,50 @@ async def get_experiment_analytics(
                     "variants": variants_by_element.get(eid, [])
                 })
             
-            # 3. Perform analysis
-            analysis = await service.analyze_hierarchical_experiment(
-                experiment_id,
-                elements_data
-            )
-            
-            # Map to ExperimentAnalytics model
-            # Note: ExperimentAnalytics in models/experiment_models.py needs to be compatible
-            return ExperimentAnalytics(
-                experiment_id=str(experiment['id']),
-                experiment_name=experiment['name'],
-                status=experiment['status'],
-                elements=analysis['elements'],
-                total_visitors=analysis['total_visitors'],
-                total_conversions=analysis['total_conversions'],
-                overall_conversion_rate=analysis['overall_conversion_rate'],
-                created_at=experiment['created_at'],
-                started_at=experiment.get('started_at')
-            )
-            
+        # 3. Day rollups for the history chart (connection released above)
+        rollups = RollupRepository(db.pool)
+        daily_rollups = await rollups.get_timeline(
+            experiment_id,
+            'day',
+            since=since.replace(hour=0) if since else None
+        )
+        
+        if period:
+            # Period counters from the rollups replace the lifetime ones
+            totals = await rollups.get_variant_totals(experiment_id, period)
+            for element in elements_data:
+                for variant in element['variants']:
+                    counts = totals.get(str(variant['id']), {})
+                    variant['total_allocations'] = counts.get('allocations', 0)
+                    variant['total_conversions'] = counts.get('conversions', 0)
+                    # Value total and order-value shape come from the same window
+                    variant['total_value'] = counts.get('conversion_value') or 0
+                    variant['valued_conversions'] = counts.get('valued_conversions') or 0
+                    variant['sum_log_value'] = counts.get('sum_log_value') or 0.0
+                    variant['sum_log_value_sq'] = counts.get('sum_log_value_sq') or 0.0
+        
+        # 4. Perform analysis
+        analysis = await service.analyze_hierarchical_experiment(
+            experiment_id,
+            elements_data,
+            daily_rollups=daily_rollups,
+            objective=service.objective_for(experiment.get('optimization_strategy'))
+        )
+        
+        # Map to ExperimentAnalytics model
+        # Note: ExperimentAnalytics in models/experiment_models.py needs to be compatible
+        return ExperimentAnalytics(
+            experiment_id=str(experiment['id']),
+            experiment_name=experiment['name'],
+            status=experiment['status'],
+            elements=analysis['elements'],
+            total_visitors=analysis['total_visitors'],
+            total_conversions=analysis['total_conversions'],
+            overall_conversion_rate=analysis['overall_conversion_rate'],
+            created_at=experiment['created_at'],
+            started_at=experiment.get('started_at')
+        )
+        
     except APIError:
         raise
     except Exception as e:
@@ -127,7 +161,7 @@ async def get_experiment_insights(
         async with db.pool.acquire() as conn:
             # Verification logic similar to above...
             experiment = await conn.fetchrow(
-                "SELECT id FROM experiments WHERE id = $1 AND user_id = $2",
+                "SELECT id, optimization_strategy FROM experiments WHERE id = $1 AND user_id = $2",
                 experiment_id, user_id
             )
             if not experiment:
@@ -147,7 +181,11 @@ async def get_experiment_insights(
                 return APIResponse(success=True, message="No data available yet", data={"recommendations": []})
             
             # Single-level analysis for recommendations if multi-element is independent
-            flat_analysis = await service.analyze_experiment(experiment_id, [dict(v) for v in variant_rows])
+            flat_analysis = await service.analyze_experiment(
+                experiment_id,
+                [dict(v) for v in variant_rows],
+                objective=service.objective_for(experiment['optimization_strategy'])
+            )
             
             return APIResponse(
                 success=True,
@@ -171,60 +209,43 @@ async def get_global_analytics(
 ):
     """
     Get global aggregated analytics for the user.
-    Returns total traffic, conversions, and yield across all experiments.
+    Returns total traffic, conversions, and yield across all experiments
+    within the period (hour rollups for 24h/7d, day rollups for 30d/12m).
     """
     try:
-        async with db.pool.acquire() as conn:
-            # 1. Fetch user's experiments
-            experiments = await conn.fetch(
-                "SELECT id FROM experiments WHERE user_id = $1",
-                user_id
-            )
-            
-            if not experiments:
-                 return APIResponse(
-                    success=True,
-                    message="No data availble",
-                    data={
-                        "total_visitors": 0,
-                        "total_conversions": 0,
-                        "conversion_rate": 0.0,
-                        "yield_velocity": 0.0
-                    }
-                )
-
-            experiment_ids = [str(r['id']) for r in experiments]
+        rollup_period = resolve_period(period)
+    except ValueError as e:
+        raise APIError(str(e), code=ErrorCodes.VALIDATION_ERROR, status=400)
 
-            # 2. Aggregated metrics from variants
-            # Note: This is an approximation. Ideally we'd filter by time period using session tables,
-            # but for MVP we use the counters in element_variants.
-            metrics = await conn.fetchrow(
-                """
-                SELECT 
-                    SUM(ev.total_allocations) as visitors,
-                    SUM(ev.total_conversions) as conversions
-                FROM element_variants ev
-                JOIN experiment_elements ee ON ev.element_id = ee.id
-                WHERE ee.experiment_id = ANY($1)
-                """,
-                experiment_ids
-            )
-            
-            visitors = metrics['visitors'] or 0
-            conversions = metrics['conversions'] or 0
-            rate = (conversions / visitors) if visitors > 0 else 0.0
-            
-            return APIResponse(
-                success=True,
-                message="Global analytics retrieved",
-                data={
-                    "total_visitors": visitors,
-                    "total_conversions": conversions,
-                    "conversion_rate": rate,
-                    "yield_velocity": conversions, # Using conversions as proxy for "velocity" for now
-                    "period": period
-                }
-            )
+    try:
+        # (user_id, bucket_start) index-only scan: cost ∝ buckets, not assignments
+        series = await RollupRepository(db.pool).get_user_series(user_id, period)
+        
+        visitors = sum(row['allocations'] for row in series)
+        conversions = sum(row['conversions'] for row in series)
+        rate = (conversions / visitors) if visitors > 0 else 0.0
+        days = rollup_period.lookback.total_seconds() / 86400
+        
+        return APIResponse(
+            success=True,
+            message="Global analytics retrieved" if series else "No data available",
+            data={
+                "total_visitors": visitors,
+                "total_conversions": conversions,
+                "conversion_rate": rate,
+                "yield_velocity": conversions / days,  # conversions per day
+                "period": period,
+                "resolution": rollup_period.resolution.name,
+                "timeline": [
+                    {
+                        "bucket_start": row['bucket_start'].isoformat(),
+                        "visitors": row['allocations'],
+                        "conversions": row['conversions']
+                    }
+                    for row in series
+                ]
+            }
+        )
 
     except Exception as e:
         logger.error(f"Global analytics failed: {e}")
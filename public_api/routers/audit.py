@@ -40,6 +40,18 @@ class AuditRecord(BaseModel):
     sequence_number: int
     algorithm_version: str
 
+class ExperimentDecisionRecord(BaseModel):
+    """An automatic pause / promote / complete decision taken by the sequential evaluator"""
+    id: str
+    element_id: Optional[str] = None
+    variant_id: Optional[str] = None
+    action: str
+    reason: Optional[str] = None
+    statistics: Dict[str, Any] = {}
+    decision_timestamp: datetime
+    sequence_number: int
+    decision_hash: str
+
 class AuditStats(BaseModel):
     """Aggregate metrics for the audit chain"""
     total_decisions: int
@@ -86,6 +98,24 @@ async def get_audit_trail(
         raise APIError("Audit data temporarily unavailable", code=ErrorCodes.INTERNAL_ERROR, status=500)
 
 
+@router.get("/experiments/{experiment_id}/decisions", response_model=List[ExperimentDecisionRecord])
+async def get_experiment_decisions(
+    experiment_id: uuid.UUID,
+    limit: int = Query(100, ge=1, le=1000),
+    user_id: str = Depends(get_current_user),
+    db: DatabaseManager = Depends(get_db)
+):
+    """Lists the automatic stopping decisions recorded for an experiment, with their statistics"""
+    await _verify_ownership(db, experiment_id, user_id)
+    
+    try:
+        service = AuditService(db)
+        return await service.get_experiment_decisions(experiment_id, limit=limit)
+    except Exception as e:
+        logger.error(f"Experiment decisions fetch failed: {e}")
+        raise APIError("Audit data temporarily unavailable", code=ErrorCodes.INTERNAL_ERROR, status=500)
+
+
 @router.get("/experiments/{experiment_id}/stats", response_model=AuditStats)
 async def get_audit_stats(
     experiment_id: uuid.UUID,
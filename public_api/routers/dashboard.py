@@ -10,6 +10,7 @@ import logging
 from typing import List, Dict, Any, Optional
 
 from data_access.database import DatabaseManager
+from orchestration.services.service_factory import ServiceFactory
 from public_api.dependencies import get_db, get_current_user
 from public_api.middleware.error_handler import APIError, ErrorCodes
 from public_api.models.dashboard_models import (
@@ -40,63 +41,32 @@ async def get_dashboard_data(
     Provides a high-level overview of the experimentation ecosystem for the user.
     """
     try:
+        # 1. Stats + recent experiments: materialized per-user summary
+        #    (primary-key read, cached in process)
+        summary = await ServiceFactory.get_dashboard_summary_service(db).get(user_id)
+        
+        # 2. Verification of onboarding state
         async with db.pool.acquire() as conn:
-            # 1. Aggregated stats across all experiments
-            # Using the view for better optimization if available, or direct query
-            stats_row = await conn.fetchrow(
-                """
-                SELECT 
-                    COUNT(DISTINCT e.id) as total_experiments,
-                    COUNT(DISTINCT e.id) FILTER (WHERE e.status = 'active') as active_experiments,
-                    COALESCE(SUM(ev.total_allocations), 0) as total_visitors,
-                    COALESCE(SUM(ev.total_conversions), 0) as total_conversions
-                FROM experiments e
-                LEFT JOIN experiment_elements ee ON e.id = ee.experiment_id
-                LEFT JOIN element_variants ev ON ee.id = ev.element_id
-                WHERE e.user_id = $1 AND e.status != 'archived'
-                """,
-                user_id
-            )
-            
-            # 2. Top 5 most recent experiments
-            recent_rows = await conn.fetch(
-                """
-                SELECT 
-                    e.id, e.name, e.status, e.started_at,
-                    COALESCE(SUM(ev.total_allocations), 0) as visitors,
-                    COALESCE(SUM(ev.total_conversions), 0) as conversions
-                FROM experiments e
-                LEFT JOIN experiment_elements ee ON e.id = ee.experiment_id
-                LEFT JOIN element_variants ev ON ee.id = ev.element_id
-                WHERE e.user_id = $1 AND e.status != 'archived'
-                GROUP BY e.id
-                ORDER BY e.created_at DESC
-                LIMIT 5
-                """,
-                user_id
-            )
-            
-            # 3. Verification of onboarding state
             onboarding_completed = await conn.fetchval(
                 "SELECT completed FROM user_onboarding WHERE user_id = $1",
                 user_id
             ) or False
             
         # Calculate derived stats
-        total_visitors = stats_row['total_visitors'] or 0
-        total_conversions = stats_row['total_conversions'] or 0
+        total_visitors = summary['total_visitors'] or 0
+        total_conversions = summary['total_conversions'] or 0
         avg_cr = (total_conversions / total_visitors) if total_visitors > 0 else 0.0
         
         stats = DashboardStats(
-            total_experiments=stats_row['total_experiments'] or 0,
-            active_experiments=stats_row['active_experiments'] or 0,
+            total_experiments=summary['total_experiments'] or 0,
+            active_experiments=summary['active_experiments'] or 0,
             total_visitors=total_visitors,
             total_conversions=total_conversions,
             avg_conversion_rate=float(avg_cr)
         )
         
         recent_experiments = []
-        for row in recent_rows:
+        for row in summary['recent_experiments']:
             visitors = row['visitors'] or 0
             conversions = row['conversions'] or 0
             recent_experiments.append(RecentExperiment(
@@ -13,6 +13,7 @@ import os
 import logging
 
 from data_access.database import DatabaseManager
+from data_access.pools import POOL_BATCH
 from public_api.dependencies import get_db, get_current_user
 from public_api.middleware.error_handler import APIError, ErrorCodes
 from utils.file_exporters import ExperimentFileExporter
@@ -91,7 +92,8 @@ async def export_results_package(
         # Ideally we should assume `ExperimentDetailResponse` structure.
         
         # Re-using the logic from experiments.py to get full data
-        async with db.pool.acquire() as conn:
+        # (batch pool: exports must not compete with the tracker)
+        async with db.acquire(POOL_BATCH) as conn:
             experiment = await conn.fetchrow("SELECT * FROM experiments WHERE id = $1", experiment_id)
             elements = await conn.fetch("SELECT * FROM experiment_elements WHERE experiment_id = $1", experiment_id)
             # (Simplification: just get variants)
@@ -106,7 +108,11 @@ async def export_results_package(
         # Analyze
         # Group variants by element (assuming single element for simple export now)
         variants_dict = [dict(v) for v in variants]
-        analysis = await analytics.analyze_experiment(experiment_id, variants_dict)
+        analysis = await analytics.analyze_experiment(
+            experiment_id,
+            variants_dict,
+            objective=analytics.objective_for(experiment['optimization_strategy'])
+        )
         
         # 2. Structure for Exporter
         # The exporter expects 'traditional' vs 'samplit' comparison.
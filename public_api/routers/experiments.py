@@ -10,7 +10,10 @@ from typing import List, Optional, Dict, Any
 import logging
 
 from data_access.database import DatabaseManager
+from data_access.pagination import keyset_page
+from data_access.repositories.rollup_repository import RollupRepository
 from orchestration.services.service_factory import ServiceFactory
+from orchestration.services.public_render_cache import get_public_render_cache
 from public_api.models import (
     CreateExperimentRequest,
     UpdateExperimentRequest,
@@ -18,9 +21,10 @@ from public_api.models import (
     ExperimentDetailResponse,
     ExperimentStatus,
     APIResponse,
-    PaginatedResponse
+    PaginatedResponse,
+    ErrorCodes
 )
-from public_api.dependencies import get_db, check_rate_limit, get_current_user, PaginationParams, get_pagination
+from public_api.dependencies import get_db, check_rate_limit, get_current_user, CursorParams, get_cursor_pagination
 from public_api.middleware.error_handler import APIError
 from public_api.errors import ErrorCode, get_error_description
 
@@ -51,6 +55,7 @@ async def create_experiment(
             "name": request.name,
             "description": request.description,
             "url": request.url,
+            "optimization_strategy": request.optimization_strategy.value,
             "status": "draft"
         })
         
@@ -76,6 +81,8 @@ async def create_experiment(
             combination_mode="independent"  # Default for now
         )
         
+        ServiceFactory.get_dashboard_summary_service(db).invalidate(user_id)
+        
         return APIResponse(
             success=True,
             message="Experiment created successfully",
@@ -97,63 +104,91 @@ async def create_experiment(
 @router.get("/", response_model=PaginatedResponse[ExperimentListResponse])
 async def list_experiments(
     status_filter: Optional[ExperimentStatus] = Query(None),
-    pagination: PaginationParams = Depends(get_pagination),
+    pagination: CursorParams = Depends(get_cursor_pagination),
     user_id: str = Depends(get_current_user),
     db: DatabaseManager = Depends(get_db)
 ):
-    """List experiments with pagination and status filtering"""
+    """
+    List experiments, newest first, with keyset pagination and status filtering.
+    
+    Pass `next_cursor` from the previous page as `cursor`.
+    """
     try:
         async with db.pool.acquire() as conn:
-            # Base query
+            # Keyset scan on (user_id[, status], created_at DESC, id DESC);
+            # variant_count is kept by triggers (schema_listing_counters.sql)
             query = """
-                SELECT 
-                    e.*,
-                    (SELECT COUNT(*) FROM variants v WHERE v.experiment_id = e.id) as variant_count
+                SELECT e.id, e.name, e.description, e.status, e.optimization_strategy,
+                       e.url, e.created_at, e.started_at, e.variant_count
                 FROM experiments e
                 WHERE e.user_id = $1
             """
             params = [user_id]
             
             if status_filter:
-                query += " AND e.status = $2"
                 params.append(status_filter.value)
+                query += f" AND e.status = ${len(params)}"
             
-            query += " ORDER BY e.created_at DESC LIMIT $3 OFFSET $4"
-            params.extend([pagination.per_page, pagination.offset])
+            # Index-only count on (user_id, status)
+            total = await conn.fetchval(
+                "SELECT COUNT(*) FROM experiments WHERE user_id = $1"
+                + (" AND status = $2" if status_filter else ""),
+                *params
+            )
             
-            rows = await conn.fetch(query, *params)
+            if pagination.after:
+                params.extend(pagination.after)
+                query += f" AND (e.created_at, e.id) < (${len(params) - 1}, ${len(params)}::UUID)"
             
-            # Get total count for pagination
-            total_query = "SELECT COUNT(*) FROM experiments WHERE user_id = $1"
-            total_params = [user_id]
-            if status_filter:
-                total_query += " AND status = $2"
-                total_params.append(status_filter.value)
+            params.append(pagination.per_page + 1)
+            query += f" ORDER BY e.created_at DESC, e.id DESC LIMIT ${len(params)}"
             
-            total = await conn.fetchval(total_query, *total_params)
+            rows = [dict(r) for r in await conn.fetch(query, *params)]
+            rows, next_cursor = keyset_page(rows, pagination.per_page)
             
-        items = [
-            ExperimentListResponse(
+            # Visitors/conversions for this page only (bounded by per_page),
+            # from the per-variant counters
+            totals = {}
+            if rows:
+                count_rows = await conn.fetch(
+                    """
+                    SELECT ee.experiment_id,
+                           COALESCE(SUM(ev.total_allocations), 0) as visitors,
+                           COALESCE(SUM(ev.total_conversions), 0) as conversions
+                    FROM experiment_elements ee
+                    JOIN element_variants ev ON ev.element_id = ee.id
+                    WHERE ee.experiment_id = ANY($1::UUID[])
+                    GROUP BY ee.experiment_id
+                    """,
+                    [row['id'] for row in rows]
+                )
+                totals = {str(r['experiment_id']): r for r in count_rows}
+            
+        items = []
+        for row in rows:
+            counts = totals.get(str(row['id']))
+            visitors = counts['visitors'] if counts else 0
+            conversions = counts['conversions'] if counts else 0
+            items.append(ExperimentListResponse(
                 id=str(row['id']),
                 name=row['name'],
                 description=row['description'],
                 status=row['status'],
-                optimization_strategy=row.get('optimization_strategy', 'adaptive'),
-                url=row.get('url', ''),
+                optimization_strategy=row.get('optimization_strategy') or 'adaptive',
+                url=row.get('url') or '',
                 created_at=row['created_at'],
                 started_at=row.get('started_at'),
                 variant_count=row['variant_count'],
-                total_visitors=row.get('total_allocations', 0),  # Mapped to total_visitors in model
-                overall_conversion_rate=float(row.get('conversion_rate', 0)) # Mapped to overall_conversion_rate
-            )
-            for row in rows
-        ]
+                total_visitors=visitors,
+                overall_conversion_rate=(conversions / visitors) if visitors else 0.0
+            ))
         
         return PaginatedResponse(
             items=items,
             total=total,
-            page=pagination.page,
-            per_page=pagination.per_page
+            per_page=pagination.per_page,
+            has_more=next_cursor is not None,
+            next_cursor=next_cursor
         )
         
     except Exception as e:
@@ -235,18 +270,24 @@ async def get_experiment(
                     "variants": variants_by_element.get(eid, [])
                 })
             
-            # 5. Run Hierarchical Analysis
-            analysis = await analytics.analyze_hierarchical_experiment(
-                experiment_id,
-                elements_data
-            )
-            
+        # 5. Day rollups for the history chart (connection released above)
+        daily_rollups = await RollupRepository(db.pool).get_timeline(experiment_id, 'day')
+        
+        # 6. Run Hierarchical Analysis
+        analysis = await analytics.analyze_hierarchical_experiment(
+            experiment_id,
+            elements_data,
+            daily_rollups=daily_rollups,
+            objective=analytics.objective_for(experiment.get('optimization_strategy'))
+        )
+        
         # Map to ExperimentDetailResponse
         return ExperimentDetailResponse(
             id=str(experiment['id']),
             name=experiment['name'],
             description=experiment.get('description'),
             status=experiment['status'],
+            optimization_strategy=experiment.get('optimization_strategy') or 'adaptive',
             url=experiment.get('url', ''),
             traffic_allocation=float(experiment.get('traffic_allocation', 1.0)),
             confidence_threshold=float(experiment.get('confidence_threshold', 0.95)),
@@ -267,6 +308,59 @@ async def get_experiment(
         raise APIError("Failed to retrieve experiment details", code=ErrorCodes.INTERNAL_ERROR, status=500)
 
 
+@router.patch("/{experiment_id}", response_model=APIResponse)
+async def update_experiment(
+    experiment_id: str,
+    request: UpdateExperimentRequest,
+    user_id: str = Depends(get_current_user),
+    db: DatabaseManager = Depends(get_db)
+):
+    """
+    Update name, description, traffic allocation or optimization strategy.
+    
+    The strategy cannot change while the experiment is active: pause it first.
+    """
+    changes = {
+        field: value.value if field == 'optimization_strategy' else value
+        for field, value in request.model_dump(exclude_none=True).items()
+    }
+    if not changes:
+        return APIResponse(success=True, message="Nothing to update")
+    
+    try:
+        async with db.pool.acquire() as conn:
+            status = await conn.fetchval(
+                "SELECT status FROM experiments WHERE id = $1 AND user_id = $2",
+                experiment_id, user_id
+            )
+            if status is None:
+                raise APIError("Experiment not found or permission denied", code=ErrorCodes.FORBIDDEN, status=403)
+            if 'optimization_strategy' in changes and status == 'active':
+                raise APIError(
+                    get_error_description(ErrorCode.EXP_UPDATE_001),
+                    code=ErrorCode.EXP_UPDATE_001,
+                    status=409
+                )
+            
+            # Column names come from UpdateExperimentRequest, values are bound
+            assignments = ", ".join(f"{field} = ${i}" for i, field in enumerate(changes, start=3))
+            await conn.execute(
+                f"UPDATE experiments SET {assignments}, updated_at = NOW() WHERE id = $1 AND user_id = $2",
+                experiment_id, user_id, *changes.values()
+            )
+        
+        ServiceFactory.get_dashboard_summary_service(db).invalidate(user_id)
+        get_public_render_cache().invalidate(experiment_id)
+        
+        return APIResponse(success=True, message="Experiment updated", data=changes)
+        
+    except APIError:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to update {experiment_id}: {e}")
+        raise APIError("Failed to update experiment", code=ErrorCodes.DATABASE_ERROR, status=500)
+
+
 @router.patch("/{experiment_id}/status", response_model=APIResponse)
 async def update_experiment_status(
     experiment_id: str,
@@ -292,6 +386,9 @@ async def update_experiment_status(
             if result == "UPDATE 0":
                 raise APIError("Experiment not found or permission denied", code=ErrorCodes.FORBIDDEN, status=403)
         
+        ServiceFactory.get_dashboard_summary_service(db).invalidate(user_id)
+        get_public_render_cache().invalidate(experiment_id)
+        
         return APIResponse(
             success=True,
             message=f"Experiment status updated to {new_status}"
@@ -321,6 +418,9 @@ async def delete_experiment(
             if result == "UPDATE 0":
                 raise APIError("Experiment not found or permission denied", code=ErrorCodes.FORBIDDEN, status=403)
         
+        ServiceFactory.get_dashboard_summary_service(db).invalidate(user_id)
+        get_public_render_cache().invalidate(experiment_id)
+        
         return APIResponse(success=True, message="Experiment archived successfully")
         
     except APIError:
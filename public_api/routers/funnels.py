@@ -8,6 +8,7 @@ from typing import List, Optional
 import logging
 
 from data_access.database import DatabaseManager
+from data_access.pagination import keyset_page
 from data_access.repositories.funnel_repository import FunnelRepository
 from public_api.models.funnel_models import (
     CreateFunnelRequest, UpdateFunnelRequest,
@@ -16,7 +17,7 @@ from public_api.models.funnel_models import (
     FunnelStatus
 )
 from public_api.models import APIResponse, PaginatedResponse
-from public_api.dependencies import get_db, get_current_user, PaginationParams, get_pagination
+from public_api.dependencies import get_db, get_current_user, CursorParams, get_cursor_pagination
 from public_api.middleware.error_handler import APIError
 from public_api.errors import ErrorCode, get_error_description
 
@@ -66,20 +67,22 @@ async def create_funnel(
 @router.get("/", response_model=PaginatedResponse[FunnelListResponse])
 async def list_funnels(
     status_filter: Optional[FunnelStatus] = Query(None),
-    pagination: PaginationParams = Depends(get_pagination),
+    pagination: CursorParams = Depends(get_cursor_pagination),
     user_id: str = Depends(get_current_user),
     db: DatabaseManager = Depends(get_db)
 ):
-    """List user's funnels with stats."""
+    """List user's funnels with stats (keyset pagination: pass `next_cursor` as `cursor`)."""
     try:
         repo = FunnelRepository(db.pool)
+        status = status_filter.value if status_filter else None
         
         funnels = await repo.list_funnels(
             user_id=user_id,
-            status=status_filter.value if status_filter else None,
-            limit=pagination.per_page,
-            offset=pagination.offset
+            status=status,
+            limit=pagination.per_page + 1,
+            after=pagination.after
         )
+        funnels, next_cursor = keyset_page(funnels, pagination.per_page)
         
         items = [
             FunnelListResponse(
@@ -97,9 +100,10 @@ async def list_funnels(
         
         return PaginatedResponse(
             items=items,
-            total=len(items),  # TODO: Add total count query
-            page=pagination.page,
-            per_page=pagination.per_page
+            total=await repo.count_funnels(user_id, status),
+            per_page=pagination.per_page,
+            has_more=next_cursor is not None,
+            next_cursor=next_cursor
         )
         
     except Exception as e:
@@ -4,15 +4,21 @@
 Public Exposure API
 Enables transparent sharing of experiment performance with external stakeholders.
 Returns sanitized, high-level metrics without compromising underlying data or PII.
+
+Shareable URLs: payloads go through PublicRenderCache (one DB fetch per
+TTL, coalesced) and carry ETag / Last-Modified / s-maxage for CDNs.
 """
 
-from fastapi import APIRouter, Request, status, Depends, Path
-from fastapi.responses import HTMLResponse
+from fastapi import APIRouter, Request, Response, status, Depends, Path
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
 from typing import Dict, Any, Optional
 import logging
 
+from config.settings import settings
 from data_access.database import DatabaseManager
+from orchestration.services.public_render_cache import RenderedPayload, get_public_render_cache
 from public_api.dependencies import get_db
 from public_api.middleware.error_handler import APIError, ErrorCodes
 
@@ -72,6 +78,19 @@ async def fetch_sanitized_experiment(experiment_id: str, db: DatabaseManager) ->
         ]
     }
 
+def _cache_headers(entry: RenderedPayload, etag: str) -> Dict[str, str]:
+    """Validators + shared-cache freshness (CDN may hold it for s-maxage)"""
+    cache = get_public_render_cache()
+    return {
+        "ETag": etag,
+        "Last-Modified": entry.last_modified_http,
+        "Cache-Control": f"public, max-age={int(cache.ttl)}, s-maxage={settings.PUBLIC_DASHBOARD_S_MAXAGE}"
+    }
+
+
+def _not_modified(entry: RenderedPayload, etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_cache_headers(entry, etag))
+
 # ════════════════════════════════════════════════════════════════════════════
 # ENDPOINTS
 # ════════════════════════════════════════════════════════════════════════════
@@ -84,14 +103,20 @@ async def view_public_dashboard(
 ):
     """Renders the public-facing performance certificate for an experiment"""
     try:
-        data = await fetch_sanitized_experiment(experiment_id, db)
-        if not data:
+        cache = get_public_render_cache()
+        entry = await cache.get(experiment_id, lambda: fetch_sanitized_experiment(experiment_id, db))
+        if not entry.data:
             raise APIError("Dashboard not found or private", code=ErrorCodes.NOT_FOUND, status=404)
-            
-        return templates.TemplateResponse(
+        
+        etag = entry.variant_etag("html")
+        if entry.not_modified(request.headers, etag):
+            return _not_modified(entry, etag)
+        
+        body = cache.render(entry, "html", lambda: templates.TemplateResponse(
             "pages/public/dashboard.html",
-            {"request": request, "experiment": data}
-        )
+            {"request": request, "experiment": entry.data}
+        ).body)
+        return HTMLResponse(body, headers=_cache_headers(entry, etag))
     except Exception as e:
         if isinstance(e, APIError): raise
         logger.error(f"Public dashboard render failed: {e}")
@@ -101,10 +126,17 @@ async def view_public_dashboard(
 @router.get("/api/{experiment_id}")
 async def get_public_metrics(
     experiment_id: str,
+    request: Request,
     db: DatabaseManager = Depends(get_db)
 ):
     """Returns a machine-readable JSON representation of public experiment metrics"""
-    data = await fetch_sanitized_experiment(experiment_id, db)
-    if not data:
+    cache = get_public_render_cache()
+    entry = await cache.get(experiment_id, lambda: fetch_sanitized_experiment(experiment_id, db))
+    if not entry.data:
         raise APIError("Experiment metrics not found", code=ErrorCodes.NOT_FOUND, status=404)
-    return data
+    
+    if entry.not_modified(request.headers):
+        return _not_modified(entry, entry.etag)
+    
+    body = cache.render(entry, "json", lambda: JSONResponse(jsonable_encoder(entry.data)).body)
+    return Response(body, media_type="application/json", headers=_cache_headers(entry, entry.etag))
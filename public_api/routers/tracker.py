@@ -9,16 +9,26 @@ Uses centralized models and robust dependencies.
 
 from fastapi import APIRouter, Depends, Request
 from typing import Optional, List
+from collections import OrderedDict
 from datetime import datetime
 import logging
+import time
+import uuid
 
 from data_access.database import DatabaseManager
+from data_access.circuit_breaker import CircuitOpenError
+from data_access.pools import POOL_TRACKER
+from data_access.statements import INSTALLATION_STATUS_SQL
 from orchestration.services.service_factory import ServiceFactory
 from public_api.models.tracker import (
     TrackerAssignmentRequest,
     TrackerAssignmentResponse,
     TrackerConversionRequest,
     TrackerConversionResponse,
+    TrackerFunnelStepRequest,
+    TrackerFunnelStepResponse,
+    TrackerFunnelConversionRequest,
+    TrackerFunnelConversionResponse,
     ExperimentInfo,
     ActiveExperimentsRequest,
     ActiveExperimentsResponse,
@@ -33,6 +43,85 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _circuit_open_error(e: CircuitOpenError) -> APIError:
+    """Fast 503 while the database circuit is open"""
+    return APIError(
+        get_error_description(ErrorCode.DB_CONN_003),
+        code=ErrorCode.DB_CONN_003,
+        status=503,
+        details={'retry_after': round(e.retry_after, 1)}
+    )
+
+
+async def _require_active_installation(db: DatabaseManager, installation_token: str):
+    """The installation row (id, status, user_id); 400 unless the token exists and is active"""
+    async with db.acquire(POOL_TRACKER) as conn:
+        installation = await conn.fetchrow(
+            INSTALLATION_STATUS_SQL,
+            installation_token
+        )
+    
+    if not installation or installation['status'] != 'active':
+        raise APIError(
+            get_error_description(ErrorCode.TRACK_ASSIGN_001),
+            code=ErrorCode.TRACK_ASSIGN_001,
+            status=400
+        )
+    return installation
+
+
+def _require_uuid(value: str, field: str) -> str:
+    """Canonical form of a funnel/step/variant id; 400 if it is not a UUID"""
+    try:
+        return str(uuid.UUID(value))
+    except (ValueError, TypeError, AttributeError):
+        raise APIError(
+            f"{field} must be a UUID",
+            code=ErrorCode.API_VAL_001,
+            status=400
+        )
+
+
+def _funnel_not_found() -> APIError:
+    return APIError(
+        get_error_description(ErrorCode.TRACK_FUNNEL_001),
+        code=ErrorCode.TRACK_FUNNEL_001,
+        status=404
+    )
+
+
+class VerifiedInstallations:
+    """
+    Installation tokens this process has recently seen active.
+
+    While the circuit is open the token cannot be checked against the
+    database; only tokens verified within `ttl` seconds keep being
+    served (their cached assignments). Unknown, revoked or stale tokens
+    get the fast 503.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_size: int = 10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._verified: 'OrderedDict[str, float]' = OrderedDict()
+
+    def remember(self, token: str, active: bool):
+        if not active:
+            self._verified.pop(token, None)
+            return
+        self._verified[token] = time.monotonic()
+        self._verified.move_to_end(token)
+        while len(self._verified) > self.max_size:
+            self._verified.popitem(last=False)
+
+    def is_verified(self, token: str) -> bool:
+        verified_at = self._verified.get(token)
+        return verified_at is not None and time.monotonic() - verified_at < self.ttl
+
+
+_verified_installations = VerifiedInstallations()
+
+
 # ════════════════════════════════════════════════════════════════════════════
 # ENDPOINTS
 # ════════════════════════════════════════════════════════════════════════════
@@ -48,7 +137,7 @@ async def get_active_experiments_for_installation(
     """
     try:
         # Validate installation_token
-        async with db.pool.acquire() as conn:
+        async with db.acquire(POOL_TRACKER) as conn:
             installation = await conn.fetchrow(
                 """
                 SELECT id, user_id, site_url, status
@@ -70,7 +159,7 @@ async def get_active_experiments_for_installation(
             return ActiveExperimentsResponse(experiments=[], count=0)
         
         # Get active experiments
-        async with db.pool.acquire() as conn:
+        async with db.acquire(POOL_TRACKER) as conn:
             query = """
                 SELECT id, name, target_url
                 FROM experiments
@@ -101,6 +190,8 @@ async def get_active_experiments_for_installation(
         
     except APIError:
         raise
+    except CircuitOpenError as e:
+        raise _circuit_open_error(e)
     except Exception as e:
         logger.error(f"Failed to get active experiments: {e}", exc_info=True)
         raise APIError(
@@ -117,22 +208,33 @@ async def assign_variant(
 ):
     """Assign user to variant using adaptive strategy"""
     try:
-        # Verify installation token
-        async with db.pool.acquire() as conn:
-            installation = await conn.fetchrow(
-                "SELECT id, status FROM platform_installations WHERE installation_token = $1",
-                request.installation_token
+        # Verify installation token. While the circuit is open only tokens
+        # verified recently by this process are trusted, so returning
+        # visitors can still be served their cached assignment
+        try:
+            async with db.acquire(POOL_TRACKER) as conn:
+                installation = await conn.fetchrow(
+                    INSTALLATION_STATUS_SQL,
+                    request.installation_token
+                )
+            _verified_installations.remember(
+                request.installation_token,
+                bool(installation) and installation['status'] == 'active'
             )
+        except CircuitOpenError as e:
+            if not _verified_installations.is_verified(request.installation_token):
+                raise _circuit_open_error(e)
+            installation = {'status': 'active'}
         
         if not installation or installation['status'] != 'active':
-                        raise APIError(
+            raise APIError(
                 get_error_description(ErrorCode.TRACK_ASSIGN_001),
                 code=ErrorCode.TRACK_ASSIGN_001,
                 status=400
             )
         
         # Get experiment service
-        service = await ServiceFactory.create_experiment_service(db)
+        service = await ServiceFactory.create_tracker_experiment_service(db)
         
         # Allocate user
         assignment = await service.allocate_user_to_variant(
@@ -159,6 +261,8 @@ async def assign_variant(
         
     except APIError:
         raise
+    except CircuitOpenError as e:
+        raise _circuit_open_error(e)
     except ValueError as e:
         raise APIError(str(e), code=ErrorCode.API_VAL_001, status=400)
     except Exception as e:
@@ -177,22 +281,10 @@ async def record_conversion(
 ):
     """Record conversion for optimization"""
     try:
-        # Verify installation token
-        async with db.pool.acquire() as conn:
-            installation = await conn.fetchrow(
-                "SELECT id, status FROM platform_installations WHERE installation_token = $1",
-                request.installation_token
-            )
-        
-        if not installation or installation['status'] != 'active':
-                        raise APIError(
-                get_error_description(ErrorCode.TRACK_ASSIGN_001),
-                code=ErrorCode.TRACK_ASSIGN_001,
-                status=400
-            )
+        await _require_active_installation(db, request.installation_token)
         
         # Get experiment service
-        service = await ServiceFactory.create_experiment_service(db)
+        service = await ServiceFactory.create_tracker_experiment_service(db)
         
         # Record conversion
         conversion_id = await service.record_conversion(
@@ -216,6 +308,8 @@ async def record_conversion(
         
     except APIError:
         raise
+    except CircuitOpenError as e:
+        raise _circuit_open_error(e)
     except ValueError as e:
         raise APIError(str(e), code=ErrorCode.API_VAL_001, status=400)
     except Exception as e:
@@ -227,6 +321,116 @@ async def record_conversion(
         )
 
 
+@router.post("/funnel/step", response_model=TrackerFunnelStepResponse, dependencies=[Depends(check_rate_limit)])
+async def track_funnel_step(
+    request: TrackerFunnelStepRequest,
+    db: DatabaseManager = Depends(get_db)
+):
+    """Record a completed funnel step (opens the visitor's session on the first one)"""
+    try:
+        funnel_id = _require_uuid(request.funnel_id, 'funnel_id')
+        step_id = _require_uuid(request.step_id, 'step_id')
+        variant_id = _require_uuid(request.variant_id, 'variant_id') if request.variant_id else None
+        
+        installation = await _require_active_installation(db, request.installation_token)
+        
+        funnel_service = await ServiceFactory.get_funnel_service(db)
+        # Active funnel of the installation's account, step in it and, if
+        # given, a variant of the step's experiment
+        step = await funnel_service.get_tracked_step(
+            funnel_id, step_id, installation['user_id'], variant_id
+        )
+        if step is None:
+            raise _funnel_not_found()
+        if variant_id and not step['has_variant']:
+            raise APIError(
+                get_error_description(ErrorCode.TRACK_FUNNEL_002),
+                code=ErrorCode.TRACK_FUNNEL_002,
+                status=400
+            )
+        
+        session_id = await funnel_service.open_session(
+            funnel_id,
+            request.user_identifier,
+            session_id=request.session_id
+        )
+        advanced = await funnel_service.track_step_completion(
+            session_id,
+            funnel_id,
+            step_id,
+            variant_id
+        )
+        
+        return TrackerFunnelStepResponse(
+            success=advanced,
+            session_id=session_id,
+            message="Step recorded" if advanced else "Funnel session is not active"
+        )
+        
+    except APIError:
+        raise
+    except CircuitOpenError as e:
+        raise _circuit_open_error(e)
+    except ValueError as e:
+        raise APIError(str(e), code=ErrorCode.API_VAL_001, status=400)
+    except Exception as e:
+        logger.error(f"Unexpected error in track_funnel_step: {e}", exc_info=True)
+        raise APIError(
+            get_error_description(ErrorCode.API_INT_001),
+            code=ErrorCode.API_INT_001,
+            status=500
+        )
+
+
+@router.post("/funnel/convert", response_model=TrackerFunnelConversionResponse, dependencies=[Depends(check_rate_limit)])
+async def record_funnel_conversion(
+    request: TrackerFunnelConversionRequest,
+    db: DatabaseManager = Depends(get_db)
+):
+    """Record the end of the funnel: credits every step variant on the visitor's path"""
+    try:
+        funnel_id = _require_uuid(request.funnel_id, 'funnel_id')
+        
+        installation = await _require_active_installation(db, request.installation_token)
+        
+        funnel_service = await ServiceFactory.get_funnel_service(db)
+        if not await funnel_service.is_tracked_funnel(funnel_id, installation['user_id']):
+            raise _funnel_not_found()
+        
+        session_id = await funnel_service.active_session(funnel_id, request.user_identifier)
+        if not session_id:
+            return TrackerFunnelConversionResponse(
+                success=False,
+                message="No active funnel session for this user"
+            )
+        
+        credited = await funnel_service.record_final_conversion(
+            session_id,
+            funnel_id,
+            request.conversion_value
+        )
+        
+        return TrackerFunnelConversionResponse(
+            success=credited > 0,
+            credited_steps=credited,
+            message="Funnel conversion recorded" if credited else "Funnel session already converted"
+        )
+        
+    except APIError:
+        raise
+    except CircuitOpenError as e:
+        raise _circuit_open_error(e)
+    except ValueError as e:
+        raise APIError(str(e), code=ErrorCode.API_VAL_001, status=400)
+    except Exception as e:
+        logger.error(f"Unexpected error in record_funnel_conversion: {e}", exc_info=True)
+        raise APIError(
+            get_error_description(ErrorCode.API_INT_001),
+            code=ErrorCode.API_INT_001,
+            status=500
+        )
+
+
 @router.get("/health")
 async def health_check():
     """Simple health check"""
@@ -10,11 +10,11 @@ from fastapi import APIRouter, Depends, Query, Response
 from fastapi.responses import HTMLResponse
 from pydantic import BaseModel, Field
 from typing import List, Dict, Optional, Any
-import httpx
 import logging
 
 from data_access.database import DatabaseManager
-from public_api.dependencies import get_db, get_current_user
+from integration.proxy.editor_proxy import EditorProxy
+from public_api.dependencies import get_db, get_current_user, get_editor_proxy
 from public_api.middleware.error_handler import APIError, ErrorCodes
 from public_api.models import APIResponse
 
@@ -61,65 +61,55 @@ class VisualEditorSaveRequest(BaseModel):
 # ENDPOINTS
 # ════════════════════════════════════════════════════════════════════════════
 
+def _inject_editor_client(html: str, url: str) -> str:
+    """Inject the Editor Client script (communicates with parent via postMessage)"""
+    injection = f"""
+        <base href="{url}">
+        <script src="/static/js/editor-client.js"></script>
+        <style>
+            .samplit-highlight {{ 
+                outline: 2px dashed #3b82f6 !important; 
+                cursor: pointer !important; 
+                transition: all 0.2s ease;
+                background: rgba(59, 130, 246, 0.1);
+            }}
+            .samplit-selected {{ 
+                outline: 2px solid #2563eb !important; 
+                box-shadow: 0 0 0 4px rgba(37, 99, 235, 0.2);
+                z-index: 99999;
+                position: relative;
+            }}
+        </style>
+    """
+    
+    if "<head>" in html:
+        return html.replace("<head>", f"<head>{injection}", 1)
+    elif "</body>" in html:
+        return html.replace("</body>", f"{injection}</body>", 1)
+    return html + injection
+
+
 @router.get("/proxy", response_class=HTMLResponse)
 async def visual_proxy(
     url: str = Query(..., description="Target URL to proxy"),
-    user_id: str = Depends(get_current_user)
+    user_id: str = Depends(get_current_user),
+    editor_proxy: EditorProxy = Depends(get_editor_proxy)
 ):
     """
     Proxies a target website and injects the Visual Editor Client (iframe script).
     Used by: static/visual-editor.html
+    
+    Uses the shared pooled client (HTTP/2, keep-alive) and asset cache,
+    so CSS/JS/images are not re-downloaded on every click.
     """
     if not url.startswith(('http://', 'https://')):
         url = 'https://' + url
         
     try:
-        # Use httpx to fetch the page
-        # Verify=False is risky but necessary for dragging/dropping arbitrary sites in dev
-        async with httpx.AsyncClient(verify=False, follow_redirects=True, timeout=15.0) as client:
-            resp = await client.get(url)
-            
-            # Check content type
-            ct = resp.headers.get("content-type", "").lower()
-            if "text/html" not in ct:
-                # Return assets (css/js/images) as is
-                return Response(
-                    content=resp.content, 
-                    status_code=resp.status_code, 
-                    media_type=ct
-                )
-
-            html = resp.text
-            
-            # Inject Editor Client Script
-            # This script communicates with the parent window via postMessage
-            injection = f"""
-                <base href="{url}">
-                <script src="/static/js/editor-client.js"></script>
-                <style>
-                    .samplit-highlight {{ 
-                        outline: 2px dashed #3b82f6 !important; 
-                        cursor: pointer !important; 
-                        transition: all 0.2s ease;
-                        background: rgba(59, 130, 246, 0.1);
-                    }}
-                    .samplit-selected {{ 
-                        outline: 2px solid #2563eb !important; 
-                        box-shadow: 0 0 0 4px rgba(37, 99, 235, 0.2);
-                        z-index: 99999;
-                        position: relative;
-                    }}
-                </style>
-            """
-            
-            if "<head>" in html:
-                html = html.replace("<head>", f"<head>{injection}", 1)
-            elif "</body>" in html:
-                html = html.replace("</body>", f"{injection}</body>", 1)
-            else:
-                html += injection
-                
-            return HTMLResponse(content=html)
+        return await editor_proxy.fetch(
+            url,
+            transform_html=lambda html: _inject_editor_client(html, url)
+        )
             
     except Exception as e:
         logger.error(f"Visual proxy failed for {url}: {e}")
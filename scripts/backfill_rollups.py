@@ -0,0 +1,60 @@
+# scripts/backfill_rollups.py
+
+"""
+Rebuild hour/day rollups from historical assignments
+
+Day-sized chunks, one transaction each; progress is saved as the
+'variant_rollups_backfill' watermark, so re-running resumes. Safe to run
+while the app (and its RollupAggregator) is up.
+
+Usage:
+    python scripts/backfill_rollups.py                      # resume / first run
+    python scripts/backfill_rollups.py --restart            # after migration_02
+    python scripts/backfill_rollups.py --since 2026-01-01 --chunk-days 7
+"""
+
+import asyncio
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+from config.settings import settings
+from data_access.database import DatabaseManager
+from orchestration.services.rollup_service import RollupBackfill
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Backfill hour/day rollups from assignments')
+    parser.add_argument('--since', help='Oldest day to rebuild (YYYY-MM-DD); default: first assignment')
+    parser.add_argument('--chunk-days', type=int, default=1, help='Days per transaction')
+    parser.add_argument('--restart', action='store_true', help='Ignore saved progress')
+    args = parser.parse_args()
+
+    since = None
+    if args.since:
+        since = datetime.strptime(args.since, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+
+    db = DatabaseManager()
+    await db.initialize()
+    try:
+        backfill = RollupBackfill(
+            db,
+            chunk_days=args.chunk_days,
+            lag_seconds=settings.ROLLUP_LAG_SECONDS,
+            hour_retention=timedelta(days=settings.ROLLUP_HOUR_RETENTION_DAYS)
+        )
+
+        started = time.perf_counter()
+        totals = await backfill.run(since=since, restart=args.restart)
+        elapsed = time.perf_counter() - started
+
+        print(
+            f"✅ {totals['chunks']} chunks, {totals['hour_rows']} hour rows, "
+            f"{totals['day_rows']} day rows in {elapsed:.1f}s"
+        )
+    finally:
+        await db.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
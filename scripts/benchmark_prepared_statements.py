@@ -0,0 +1,145 @@
+# scripts/benchmark_prepared_statements.py
+
+"""
+Benchmark prepared statements on the /tracker/assign path
+
+Compares, per query:
+- statement_cache_size=0 (Supavisor transaction mode, re-parse + re-plan)
+- statement cache + hot path pre-prepared (direct / session mode)
+
+Only valid against a direct connection or a session-mode pooler.
+Writes run inside a transaction that is rolled back.
+
+Usage:
+    python scripts/benchmark_prepared_statements.py --experiment-id <uuid> --iterations 2000
+"""
+
+import asyncio
+import argparse
+import statistics
+import time
+import uuid
+from typing import Dict, List
+
+import asyncpg
+
+from config.settings import settings
+from data_access.statements import INSTALLATION_STATUS_SQL, prepare_hot_path
+from data_access.repositories.assignment_repository import GET_ASSIGNMENT_SQL
+from data_access.repositories.variant_repository import (
+    VARIANTS_FOR_OPTIMIZATION_SQL,
+    INCREMENT_ALLOCATION_SQL
+)
+
+
+async def _time_assign_path(
+    conn: asyncpg.Connection,
+    experiment_id: str,
+    variant_id: str,
+    iterations: int
+) -> Dict[str, List[float]]:
+    """Run the assign-path queries `iterations` times, return latencies (ms)"""
+    timings: Dict[str, List[float]] = {
+        'installation_lookup': [],
+        'get_assignment': [],
+        'variants_for_optimization': [],
+        'increment_allocation': []
+    }
+
+    tx = conn.transaction()
+    await tx.start()
+    try:
+        for i in range(iterations):
+            t0 = time.perf_counter()
+            await conn.fetchrow(INSTALLATION_STATUS_SQL, f"bench_{i}")
+            t1 = time.perf_counter()
+            await conn.fetchrow(GET_ASSIGNMENT_SQL, experiment_id, f"bench_visitor_{i}")
+            t2 = time.perf_counter()
+            await conn.fetch(VARIANTS_FOR_OPTIMIZATION_SQL, experiment_id)
+            t3 = time.perf_counter()
+            await conn.fetchval(INCREMENT_ALLOCATION_SQL, variant_id)
+            t4 = time.perf_counter()
+
+            timings['installation_lookup'].append((t1 - t0) * 1000)
+            timings['get_assignment'].append((t2 - t1) * 1000)
+            timings['variants_for_optimization'].append((t3 - t2) * 1000)
+            timings['increment_allocation'].append((t4 - t3) * 1000)
+    finally:
+        await tx.rollback()
+
+    return timings
+
+
+async def run_mode(label: str, prepared: bool, experiment_id: str, variant_id: str, iterations: int):
+    conn = await asyncpg.connect(
+        settings.DATABASE_URL,
+        statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE if prepared else 0
+    )
+    try:
+        if prepared:
+            await prepare_hot_path(conn)
+
+        # Warm-up (TCP, catalog caches)
+        await _time_assign_path(conn, experiment_id, variant_id, 50)
+        return label, await _time_assign_path(conn, experiment_id, variant_id, iterations)
+    finally:
+        await conn.close()
+
+
+def _summary(samples: List[float]) -> str:
+    samples = sorted(samples)
+    p50 = statistics.median(samples)
+    p95 = samples[int(0.95 * (len(samples) - 1))]
+    return f"mean {statistics.mean(samples):.3f}ms  p50 {p50:.3f}ms  p95 {p95:.3f}ms"
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Benchmark prepared statements on the assign path')
+    parser.add_argument('--experiment-id', required=True, help='Experiment with at least one variant')
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    conn = await asyncpg.connect(settings.DATABASE_URL, statement_cache_size=0)
+    try:
+        variant_id = await conn.fetchval(
+            """
+            SELECT ev.id FROM element_variants ev
+            JOIN experiment_elements ee ON ev.element_id = ee.id
+            WHERE ee.experiment_id = $1
+            LIMIT 1
+            """,
+            uuid.UUID(args.experiment_id)
+        )
+    finally:
+        await conn.close()
+
+    if not variant_id:
+        print(f"❌ Experiment {args.experiment_id} has no variants")
+        return
+
+    print(f"\n🔄 {args.iterations} iterations of the assign path per mode...\n")
+
+    results = [
+        await run_mode('no cache (transaction mode)', False, args.experiment_id, variant_id, args.iterations),
+        await run_mode('prepared (session/direct)', True, args.experiment_id, variant_id, args.iterations),
+    ]
+
+    baseline = results[0][1]
+    for label, timings in results:
+        print(f"── {label}")
+        for query, samples in timings.items():
+            print(f"   {query:<28} {_summary(samples)}")
+        print()
+
+    print("── Per-query saving (mean)")
+    prepared = results[1][1]
+    total_saving = 0.0
+    for query in baseline:
+        saving = statistics.mean(baseline[query]) - statistics.mean(prepared[query])
+        total_saving += saving
+        print(f"   {query:<28} {saving:+.3f}ms")
+    print(f"   {'assign path total':<28} {total_saving:+.3f}ms")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+# scripts/check_benchmarks.py
+
+"""
+Benchmark regression check
+
+Runs benchmarks/ against the newest baseline in
+benchmarks/.baselines/<machine>/ and fails if any median is more than
+20% slower. A baseline is only comparable on the runner that recorded
+it, so it is recorded (with --save) on the dedicated reference runner,
+with Postgres available: a baseline without the tracker database
+benchmarks is discarded. Until one is committed there is nothing to
+compare and the check passes with a notice.
+
+Usage:
+    python scripts/check_benchmarks.py                    # compare, fail on regressions
+    python scripts/check_benchmarks.py -m "not database"  # without Postgres
+    BENCH_DATABASE_URL=... python scripts/check_benchmarks.py --save  # new baseline (reference runner)
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINES = ROOT / "benchmarks" / ".baselines"
+
+# Same threshold as docs/backend/testing.md
+COMPARE_FAIL = "median:20%"
+
+# The tracker hot path against Postgres (bench_tracker_e2e.py) must be in
+# every baseline
+REQUIRED_BENCHMARKS = ("bench_assign_new_visitor", "bench_assign_returning_visitor")
+
+
+def _baselines():
+    return set(BASELINES.glob("*/*.json"))
+
+
+def _missing_benchmarks(path: Path):
+    names = {b["name"].split("[")[0] for b in json.loads(path.read_text())["benchmarks"]}
+    return [name for name in REQUIRED_BENCHMARKS if name not in names]
+
+
+def main(argv) -> int:
+    # benchmarks/pytest.ini stores baselines relative to the repo root
+    os.chdir(ROOT)
+    args = ["-c", "benchmarks/pytest.ini", "benchmarks"]
+
+    if "--save" in argv:
+        argv = [a for a in argv if a != "--save"]
+        before = _baselines()
+        code = pytest.main(args + ["--benchmark-save=baseline"] + argv)
+        for path in _baselines() - before:
+            missing = _missing_benchmarks(path)
+            if missing:
+                path.unlink()
+                print(f"Baseline discarded, not run: {', '.join(missing)} (set BENCH_DATABASE_URL)")
+                return code or 1
+        return code
+
+    if not _baselines():
+        print("No benchmark baseline recorded yet: nothing to compare (record one with --save)")
+        return 0
+
+    return pytest.main(args + ["--benchmark-compare", f"--benchmark-compare-fail={COMPARE_FAIL}"] + argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
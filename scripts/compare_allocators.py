@@ -3,117 +3,28 @@
 """
 Compare performance of different allocators
 
+Runs the vectorized simulation harness (engine.simulation): all
+replications advance together as NumPy arrays, so millions of
+simulated visitors take seconds.
+
 Usage:
-    python scripts/compare_allocators.py adaptive ucb --trials 1000
+    python scripts/compare_allocators.py adaptive standard uniform --trials 100000
+    python scripts/compare_allocators.py adaptive uniform --batch-size 500
 """
 
-import asyncio
 import argparse
-import random
-from typing import List, Dict, Any
-from engine.core import _get_allocator
-
+from typing import List
 
-class SimulatedExperiment:
-    """
-    Simulates an A/B test with known true conversion rates
-    
-    Measures:
-    - Regret (how much worse than optimal)
-    - Final distribution
-    - Convergence speed
-    """
-    
-    def __init__(
-        self,
-        true_rates: List[float],
-        allocator_strategy: str,
-        allocator_config: Dict[str, Any]
-    ):
-        self.true_rates = true_rates
-        self.n_variants = len(true_rates)
-        self.best_rate = max(true_rates)
-        
-        # Create allocator
-        self.allocator = _get_allocator(allocator_strategy, allocator_config)
-        
-        # State
-        self.variants = [
-            {
-                'id': f'variant_{i}',
-                '_internal_state': {
-                    'samples': 0,
-                    'success_count': 1,  # Prior
-                    'failure_count': 1   # Prior
-                }
-            }
-            for i in range(self.n_variants)
-        ]
-        
-        # Metrics
-        self.total_reward = 0.0
-        self.optimal_reward = 0.0
-        self.selections = [0] * self.n_variants
-    
-    async def run_trial(self):
-        """Run one trial (one visitor)"""
-        
-        # Select variant
-        selected_id = await self.allocator.select(self.variants, {})
-        variant_idx = int(selected_id.split('_')[1])
-        
-        # Simulate conversion with true rate
-        true_rate = self.true_rates[variant_idx]
-        converted = random.random() < true_rate
-        reward = 1.0 if converted else 0.0
-        
-        # Update state
-        variant = self.variants[variant_idx]
-        state = variant['_internal_state']
-        
-        state['samples'] += 1
-        if converted:
-            state['success_count'] += 1
-        else:
-            state['failure_count'] = state.get('failure_count', 1) + 1
-        
-        # Track metrics
-        self.selections[variant_idx] += 1
-        self.total_reward += reward
-        self.optimal_reward += self.best_rate
-        
-        return variant_idx, reward
-    
-    async def run(self, n_trials: int):
-        """Run full experiment"""
-        
-        for _ in range(n_trials):
-            await self.run_trial()
-    
-    def get_results(self) -> Dict[str, Any]:
-        """Get experiment results"""
-        
-        regret = self.optimal_reward - self.total_reward
-        
-        return {
-            'total_trials': sum(self.selections),
-            'total_reward': self.total_reward,
-            'optimal_reward': self.optimal_reward,
-            'regret': regret,
-            'regret_percent': (regret / self.optimal_reward) * 100,
-            'selections': self.selections,
-            'selection_percent': [
-                (s / sum(self.selections)) * 100
-                for s in self.selections
-            ]
-        }
+from engine.simulation import POLICIES, compare
 
 
-async def compare_allocators(
+def compare_allocators(
     strategies: List[str],
     true_rates: List[float],
     n_trials: int = 1000,
-    n_replications: int = 10
+    n_replications: int = 10,
+    batch_size: int = 1,
+    seed: int = None
 ):
     """
     Compare multiple allocators
@@ -121,8 +32,10 @@ async def compare_allocators(
     Args:
         strategies: List of allocator strategies to compare
         true_rates: True conversion rates for variants
-        n_trials: Number of trials per experiment
+        n_trials: Number of trials (visitors) per experiment
         n_replications: Number of times to repeat (for averaging)
+        batch_size: Visitors allocated between state updates
+        seed: Random seed (same scenario for every strategy)
     """
     
     print(f"\n{'='*70}")
@@ -132,65 +45,35 @@ async def compare_allocators(
     print(f"Best possible rate: {max(true_rates):.1%}")
     print(f"Trials per experiment: {n_trials}")
     print(f"Replications: {n_replications}")
+    print(f"Update batch size: {batch_size}")
     print()
     
-    results_by_strategy = {}
-    
-    for strategy in strategies:
-        print(f"\n🔄 Running {strategy}...")
-        
-        # Run multiple replications
-        all_results = []
-        
-        for rep in range(n_replications):
-            experiment = SimulatedExperiment(
-                true_rates=true_rates,
-                allocator_strategy=strategy,
-                allocator_config={}
-            )
-            
-            await experiment.run(n_trials)
-            results = experiment.get_results()
-            all_results.append(results)
-        
-        # Average results
-        avg_regret = sum(r['regret'] for r in all_results) / n_replications
-        avg_regret_pct = sum(r['regret_percent'] for r in all_results) / n_replications
-        
-        avg_selections = [
-            sum(r['selections'][i] for r in all_results) / n_replications
-            for i in range(len(true_rates))
-        ]
-        
-        avg_selection_pct = [
-            (s / n_trials) * 100
-            for s in avg_selections
-        ]
-        
-        results_by_strategy[strategy] = {
-            'avg_regret': avg_regret,
-            'avg_regret_pct': avg_regret_pct,
-            'avg_selections': avg_selections,
-            'avg_selection_pct': avg_selection_pct,
-        }
+    results = compare(
+        strategies,
+        true_rates,
+        seed=seed,
+        visitors=n_trials,
+        replications=n_replications,
+        batch_size=batch_size
+    )
+    summaries = {strategy: result.summary() for strategy, result in results.items()}
     
     # Print comparison table
     print(f"\n{'='*70}")
     print("RESULTS")
     print(f"{'='*70}\n")
     
-    print(f"{'Strategy':<20} {'Regret':<15} {'Regret %':<15} {'Best Variant %':<15}")
-    print(f"{'-'*70}")
+    print(f"{'Strategy':<16} {'Regret':<12} {'90% band':<22} {'Regret %':<12} {'Best Variant %':<15}")
+    print(f"{'-'*78}")
     
-    for strategy, results in results_by_strategy.items():
-        best_idx = true_rates.index(max(true_rates))
-        best_pct = results['avg_selection_pct'][best_idx]
-        
+    for strategy, summary in summaries.items():
+        lower, upper = summary['regret_band']
         print(
-            f"{strategy:<20} "
-            f"{results['avg_regret']:<15.2f} "
-            f"{results['avg_regret_pct']:<15.2f}% "
-            f"{best_pct:<15.1f}%"
+            f"{strategy:<16} "
+            f"{summary['regret']:<12.2f} "
+            f"{f'[{lower:.1f}, {upper:.1f}]':<22} "
+            f"{summary['regret_percent']:<11.2f}% "
+            f"{summary['best_arm_share'] * 100:<15.1f}%"
         )
     
     # Selection distribution
@@ -199,24 +82,27 @@ async def compare_allocators(
     
     for i, rate in enumerate(true_rates):
         print(f"\nVariant {i} (true CR: {rate:.1%}):")
-        for strategy, results in results_by_strategy.items():
-            pct = results['avg_selection_pct'][i]
+        for strategy, summary in summaries.items():
+            pct = summary['arm_share'][i] * 100
             bar = '█' * int(pct / 2)
             print(f"  {strategy:<15} {pct:>5.1f}% {bar}")
     
     # Winner
     print(f"\n{'='*70}")
-    winner = min(results_by_strategy.items(), key=lambda x: x[1]['avg_regret'])
-    print(f"🏆 WINNER: {winner[0]} (lowest regret: {winner[1]['avg_regret']:.2f})")
+    winner = min(summaries.items(), key=lambda x: x[1]['regret'])
+    print(f"🏆 WINNER: {winner[0]} (lowest regret: {winner[1]['regret']:.2f})")
     print(f"{'='*70}\n")
+    
+    return results
 
 
-async def main():
+def main():
     parser = argparse.ArgumentParser(description='Compare allocators')
     parser.add_argument(
         'strategies',
         nargs='+',
-        help='Allocator strategies to compare (e.g., adaptive ucb epsilon_greedy)'
+        choices=sorted(POLICIES.keys()),
+        help='Allocator strategies to compare (e.g., adaptive standard uniform)'
     )
     parser.add_argument(
         '--rates',
@@ -237,16 +123,30 @@ async def main():
         default=10,
         help='Number of replications for averaging (default: 10)'
     )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=1,
+        help='Visitors allocated between state updates (default: 1)'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=None,
+        help='Random seed (default: none)'
+    )
     
     args = parser.parse_args()
     
-    await compare_allocators(
+    compare_allocators(
         strategies=args.strategies,
         true_rates=args.rates,
         n_trials=args.trials,
-        n_replications=args.replications
+        n_replications=args.replications,
+        batch_size=args.batch_size,
+        seed=args.seed
     )
 
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    main()
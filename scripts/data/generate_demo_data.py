@@ -14,8 +14,9 @@ class MultiElementDemoGenerator:
     El motor adaptativo aprende la MEJOR combinación
     """
     
-    def __init__(self):
+    def __init__(self, random_seed=None):
         self.n_visitors = 10000
+        self.rng = np.random.default_rng(random_seed)
         
         # ══════════════════════════════════════
         # ELEMENTOS Y VARIANTES
@@ -75,20 +76,12 @@ class MultiElementDemoGenerator:
         print(f"   Elements: {len(self.elements)}")
         print(f"   Combinations: {len(self.combinations)}")
         
-        # Crear matriz vacía
-        n_combinations = len(self.combinations)
-        matrix = np.zeros((self.n_visitors, n_combinations), dtype=int)
+        # ✅ Una sola llamada: cada columna con su conversion rate
+        rates = np.array([self.combination_conversion_rates[c] for c in self.combinations])
+        matrix = (self.rng.random((self.n_visitors, len(rates))) < rates).astype(int)
         
-        # Para cada combinación (columna)
         for col_idx, combination in enumerate(self.combinations):
-            cr = self.combination_conversion_rates[combination]
-            
-            # Para cada visitante (fila)
-            for row_idx in range(self.n_visitors):
-                # ¿Convertiría con esta combinación?
-                if np.random.rand() <= cr:
-                    matrix[row_idx, col_idx] = 1
-            
+            cr = rates[col_idx]
             conversions = matrix[:, col_idx].sum()
             actual_cr = conversions / self.n_visitors
             
@@ -0,0 +1,211 @@
+# scripts/generate_load_data.py
+
+"""
+Build a load-test database with synthetic traffic
+
+Creates one user + active installation and N active single-element
+experiments, then streams synthetic assignments (and, with --audit, the
+hash-chained audit trail) into Postgres with COPY, one chunk at a time;
+see engine/simulation/synthetic.py for the generators. Variant counters
+and revenue statistics are set from the generated rows, so the tracker
+and analytics see a consistent database (algorithm_state keeps the
+variant's prior; selection adds the counters to it).
+
+Needs schema_phase1, schema_revenue (and schema_audit for --audit).
+Run scripts/backfill_rollups.py --restart afterwards for timelines.
+
+Usage:
+    python -m scripts.generate_load_data --experiments 10 --variants 3 --visitors 1000000
+    python -m scripts.generate_load_data --experiments 100 --visitors 1000000 --workers 4 --audit
+"""
+
+import asyncio
+import argparse
+import json
+import secrets
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from data_access.database import DatabaseManager
+from data_access.pools import POOL_BATCH
+from data_access.repositories.variant_repository import VariantRepository
+from engine.simulation.synthetic import (
+    ASSIGNMENT_COLUMNS,
+    AUDIT_COLUMNS,
+    AuditChain,
+    block_records,
+    draw_rates,
+    visitor_blocks,
+)
+
+UPDATE_COUNTERS_SQL = """
+    UPDATE element_variants
+    SET total_allocations = $2,
+        total_conversions = $3,
+        conversion_rate = CASE WHEN $2 > 0 THEN $3::DECIMAL / $2 ELSE 0 END,
+        valued_conversions = $4,
+        total_value = $5,
+        sum_log_value = $6,
+        sum_log_value_sq = $7,
+        updated_at = NOW()
+    WHERE id = $1
+"""
+
+
+async def create_owner(conn) -> tuple:
+    """User + active installation the experiments belong to"""
+    token = secrets.token_hex(16)
+    user_id = await conn.fetchval(
+        "INSERT INTO users (email, password_hash, name) VALUES ($1, 'load-test', 'Load Test') RETURNING id",
+        f'loadtest-{token}@example.com'
+    )
+    await conn.execute(
+        """
+        INSERT INTO platform_installations
+            (user_id, platform, installation_method, site_url, installation_token, api_token, status)
+        VALUES ($1, 'manual', 'manual', 'https://loadtest.example.com', $2, $3, 'active')
+        """,
+        user_id, token, f'api-{token}'
+    )
+    return user_id, token
+
+
+async def create_experiment(conn, variant_repo, user_id, index: int, n_variants: int, started_at) -> tuple:
+    """Active single-element experiment; returns (experiment_id, [variant_id])"""
+    async with conn.transaction():
+        experiment_id = await conn.fetchval(
+            """
+            INSERT INTO experiments (user_id, name, status, optimization_strategy, url, started_at)
+            VALUES ($1, $2, 'active', 'adaptive', $3, $4) RETURNING id
+            """,
+            user_id, f'Load test {index}', f'https://loadtest.example.com/page-{index}', started_at
+        )
+        element_id = await conn.fetchval(
+            """
+            INSERT INTO experiment_elements
+                (experiment_id, name, selector_type, selector_value, element_type, original_content)
+            VALUES ($1, 'Headline', 'css', 'h1', 'text', $2) RETURNING id
+            """,
+            experiment_id, json.dumps({'text': 'Original'})
+        )
+        variant_ids = []
+        for order in range(n_variants):
+            variant_id = await variant_repo.create_variant(
+                element_id=str(element_id),
+                name='Control' if order == 0 else f'Variant {order}',
+                content={'text': f'Headline {order}'},
+                initial_algorithm_state={'alpha': 1.0, 'beta': 1.0, 'samples': 0, 'algorithm_type': 'bayesian'},
+                variant_order=order,
+                conn=conn
+            )
+            variant_ids.append(variant_id)
+    return experiment_id, variant_ids
+
+
+async def load_experiment(conn, experiment_id, variant_ids, rates, args, start, seed) -> int:
+    """Stream one experiment's traffic with COPY and set its variant counters"""
+    rng = np.random.default_rng(seed)
+    chain = AuditChain() if args.audit else None
+    totals = None
+
+    blocks = visitor_blocks(
+        rates, args.visitors, start.timestamp(), args.days * 86400,
+        chunk_size=args.chunk_size, rng=rng, value_mean=args.value_mean
+    )
+    for block in blocks:
+        assignments, audit = block_records(block, experiment_id, variant_ids, chain, rng=rng)
+        await conn.copy_records_to_table('assignments', records=assignments, columns=ASSIGNMENT_COLUMNS)
+        if audit:
+            await conn.copy_records_to_table('algorithm_audit_trail', records=audit, columns=AUDIT_COLUMNS)
+
+        counts = block.counts(len(variant_ids))
+        totals = counts if totals is None else {k: totals[k] + v for k, v in counts.items()}
+
+    for i, variant_id in enumerate(variant_ids):
+        allocations = int(totals['allocations'][i])
+        conversions = int(totals['conversions'][i])
+        await conn.execute(
+            UPDATE_COUNTERS_SQL,
+            variant_id,
+            allocations,
+            conversions,
+            int(totals['valued_conversions'][i]),
+            round(float(totals['total_value'][i]), 2),
+            float(totals['sum_log_value'][i]),
+            float(totals['sum_log_value_sq'][i])
+        )
+    return args.visitors
+
+
+async def generate(args):
+    db = DatabaseManager()
+    await db.initialize()
+    pool = db.get_pool(POOL_BATCH)
+    variant_repo = VariantRepository(pool)
+
+    rng = np.random.default_rng(args.seed)
+    rates = draw_rates(args.experiments, args.variants, args.rate_low, args.rate_high, rng=rng)
+    seeds = rng.integers(0, 2**63 - 1, size=args.experiments)
+    start = datetime.now(timezone.utc) - timedelta(days=args.days)
+    started = time.perf_counter()
+    loaded = 0
+
+    try:
+        async with pool.acquire() as conn:
+            user_id, token = await create_owner(conn)
+            experiments = [
+                await create_experiment(conn, variant_repo, user_id, i, args.variants, start)
+                for i in range(args.experiments)
+            ]
+
+        semaphore = asyncio.Semaphore(args.workers)
+
+        async def worker(i):
+            nonlocal loaded
+            experiment_id, variant_ids = experiments[i]
+            async with semaphore, pool.acquire() as conn:
+                loaded += await load_experiment(
+                    conn, experiment_id, variant_ids, rates[i], args, start, int(seeds[i])
+                )
+            elapsed = time.perf_counter() - started
+            print(f"   [{i + 1}/{args.experiments}] {experiment_id} | {loaded:,} rows | {loaded / elapsed:,.0f} rows/s")
+
+        await asyncio.gather(*(worker(i) for i in range(args.experiments)))
+    finally:
+        await db.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"\n{'='*70}")
+    print("LOAD TEST DATA")
+    print(f"{'='*70}")
+    print(f"Assignments: {loaded:,} in {elapsed:.1f}s ({loaded / elapsed:,.0f} rows/s)"
+          f"{' + audit trail' if args.audit else ''}")
+    print(f"Installation token: {token}")
+    print("Next: python scripts/backfill_rollups.py --restart")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stream synthetic experiments into Postgres for load tests')
+    parser.add_argument('--experiments', type=int, default=10)
+    parser.add_argument('--variants', type=int, default=3, help='Variants per experiment (control included)')
+    parser.add_argument('--visitors', type=int, default=100000, help='Assignments per experiment')
+    parser.add_argument('--days', type=float, default=30, help='Traffic spread over the last N days')
+    parser.add_argument('--rate-low', type=float, default=0.01, help='Lowest control conversion rate')
+    parser.add_argument('--rate-high', type=float, default=0.08, help='Highest control conversion rate')
+    parser.add_argument('--value-mean', type=float, default=50.0, help='Mean order value')
+    parser.add_argument('--audit', action='store_true', help='Also write the hash-chained audit trail')
+    parser.add_argument('--chunk-size', type=int, default=100000, help='Rows per COPY')
+    parser.add_argument('--workers', type=int, default=2, help='Experiments loaded concurrently')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    if args.experiments * args.visitors > 100_000_000:
+        parser.error("experiments × visitors is capped at 100M rows")
+
+    asyncio.run(generate(args))
+
+
+if __name__ == '__main__':
+    main()
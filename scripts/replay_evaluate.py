@@ -0,0 +1,126 @@
+# scripts/replay_evaluate.py
+
+"""
+Offline evaluation of allocation strategies on historical traffic
+
+Replays an experiment's assignments (Postgres, server-side cursor on the
+batch pool, or an exported Parquet file) through candidate strategies in
+one streaming pass; see engine/simulation/replay.py for the estimators.
+
+Usage:
+    python -m scripts.replay_evaluate --experiment-id <uuid> adaptive standard uniform
+    python -m scripts.replay_evaluate --parquet assignments.parquet adaptive contextual
+    python -m scripts.replay_evaluate --experiment-id <uuid> adaptive --propensity uniform
+"""
+
+import asyncio
+import argparse
+import time
+
+from engine.simulation.replay import (
+    PROPENSITY_MODES,
+    ReplayEvaluator,
+    chunk_from_rows,
+    iter_parquet,
+    parquet_arms,
+)
+
+
+async def evaluate(args):
+    evaluators = None
+    started = time.perf_counter()
+
+    def build(arms):
+        return [
+            ReplayEvaluator(
+                strategy,
+                arms,
+                propensity=args.propensity,
+                block_size=args.block_size,
+                seed=args.seed
+            )
+            for strategy in args.strategies
+        ]
+
+    async def consume(chunks):
+        # One pass over the log, every strategy sees every chunk
+        async for chunk in chunks:
+            for evaluator in evaluators:
+                await evaluator.feed(chunk)
+
+    if args.parquet:
+        evaluators = build(parquet_arms(args.parquet))
+
+        async def parquet_chunks():
+            for chunk in iter_parquet(args.parquet, args.chunk_size, args.reward):
+                yield chunk
+
+        await consume(parquet_chunks())
+    else:
+        from data_access.database import DatabaseManager
+        from data_access.pools import POOL_BATCH
+        from data_access.repositories.assignment_repository import AssignmentRepository
+        from data_access.repositories.variant_repository import VariantRepository
+
+        db = DatabaseManager()
+        await db.initialize()
+        try:
+            pool = db.get_pool(POOL_BATCH)
+            variants = await VariantRepository(pool).get_variants_for_experiment(
+                args.experiment_id, active_only=False
+            )
+            evaluators = build([str(v['id']) for v in variants])
+
+            async def database_chunks():
+                async for rows in AssignmentRepository(pool).stream_outcomes(args.experiment_id, args.chunk_size):
+                    yield chunk_from_rows(rows, args.reward)
+
+            await consume(database_chunks())
+        finally:
+            await db.close()
+
+    elapsed = time.perf_counter() - started
+    summaries = [e.report.summary() for e in evaluators]
+
+    print(f"\n{'='*78}")
+    print("OFFLINE REPLAY")
+    print(f"{'='*78}")
+    events = summaries[0]['events'] if summaries else 0
+    print(f"Events: {events:,} in {elapsed:.1f}s | propensity: {args.propensity} | reward: {args.reward}")
+    if summaries:
+        print(f"Logged policy value: {summaries[0]['logged_value']:.4f}")
+    print()
+    print(f"{'Strategy':<16} {'Accepted':<10} {'Replay':<10} {'SNIPS':<10} {'Lift %':<10} {'Regret':<12}")
+    print(f"{'-'*78}")
+    for s in summaries:
+        print(
+            f"{s['strategy']:<16} "
+            f"{s['accepted']:<10,} "
+            f"{s['replay_value']:<10.4f} "
+            f"{s['snips_value']:<10.4f} "
+            f"{s['lift_percent']:<+10.2f} "
+            f"{s['regret']:<12.1f}"
+        )
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay historical assignments through allocation strategies')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--experiment-id', help='Stream this experiment from Postgres')
+    source.add_argument('--parquet', help='Exported assignments file (needs pyarrow)')
+    parser.add_argument('strategies', nargs='+', help='Strategy codes (as in _get_allocator)')
+    parser.add_argument('--propensity', choices=PROPENSITY_MODES, default='thompson',
+                        help='Logging policy model for IPS (default: thompson)')
+    parser.add_argument('--reward', choices=('conversion', 'value'), default='conversion')
+    parser.add_argument('--chunk-size', type=int, default=50000, help='Rows per fetch')
+    parser.add_argument('--block-size', type=int, default=500,
+                        help='Events between candidate/propensity refreshes')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    asyncio.run(evaluate(args))
+
+
+if __name__ == '__main__':
+    main()
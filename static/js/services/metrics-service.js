@@ -17,11 +17,7 @@ class MetricsService {
      * @returns {Promise<Object>}
      */
     async getGlobalMetrics(period = '30d') {
-        // En producción real:
-        // return (await this.api.get(`/analytics/global`, { period })).data;
-
-        // Simulación temporal para demo si el endpoint no soporta filtros aun
-        const response = await this.api.get('/analytics/global');
+        const response = await this.api.get('/analytics/global', { period });
         return response.data || response;
     }
 
@@ -113,3 +113,27 @@ class TestAnalyticsService:
         # 150/1000 = 15% vs 10% baseline should be significant
         assert is_sig == True
         assert p_value < 0.05
+
+    def test_daily_stats_from_rollups(self):
+        """Test daily stats are cumulative sums of day rollups"""
+        from datetime import datetime, timezone
+        service = AnalyticsService()
+        
+        variants = [{'id': 'var-1', 'name': 'Control'}, {'id': 'var-2', 'name': 'A'}]
+        day1 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        day2 = datetime(2026, 1, 2, tzinfo=timezone.utc)
+        rollups = [
+            {'bucket_start': day1, 'variant_id': 'var-1', 'allocations': 100, 'conversions': 10},
+            {'bucket_start': day1, 'variant_id': 'var-2', 'allocations': 100, 'conversions': 12},
+            {'bucket_start': day2, 'variant_id': 'var-1', 'allocations': 50, 'conversions': 5},
+            {'bucket_start': day2, 'variant_id': 'other-element', 'allocations': 9, 'conversions': 9},
+        ]
+        
+        stats = service._build_daily_stats(variants, rollups)
+        
+        assert [d['date'] for d in stats] == ['2026-01-01', '2026-01-02']
+        last = {v['variant_id']: v for v in stats[-1]['variant_stats']}
+        assert last['var-1']['cumulative_allocations'] == 150
+        assert last['var-1']['cumulative_conversions'] == 15
+        assert last['var-2']['cumulative_allocations'] == 100
+        assert service._build_daily_stats(variants, []) == []
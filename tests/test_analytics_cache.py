@@ -0,0 +1,92 @@
+import asyncio
+import pytest
+from orchestration.services.analytics_cache import AnalyticsCache, counts_fingerprint
+
+
+def _variants(conversions):
+    return [
+        {'id': 'var-1', 'name': 'Control', 'total_allocations': 1000, 'total_conversions': 100},
+        {'id': 'var-2', 'name': 'A', 'total_allocations': 1000, 'total_conversions': conversions}
+    ]
+
+
+class TestAnalyticsCache:
+    """Versioned analytics cache unit tests"""
+
+    @pytest.mark.asyncio
+    async def test_computes_once_per_snapshot(self):
+        """Test concurrent and repeated requests share one computation"""
+        cache = AnalyticsCache(stale_seconds=0)
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {'winner': 'var-2'}
+
+        fp = counts_fingerprint(_variants(120))
+        results = await asyncio.gather(*[
+            cache.get_or_compute('exp-1', 'bayes', fp, compute) for _ in range(5)
+        ])
+        await cache.get_or_compute('exp-1', 'bayes', fp, compute)
+
+        assert len(calls) == 1
+        assert all(r == {'winner': 'var-2'} for r in results)
+        assert fp != counts_fingerprint(_variants(121))
+
+    @pytest.mark.asyncio
+    async def test_stale_while_revalidate(self):
+        """Test new counts return the previous result and refresh in background"""
+        cache = AnalyticsCache(stale_seconds=60)
+
+        async def old():
+            return {'version': 1}
+
+        async def new():
+            return {'version': 2}
+
+        await cache.get_or_compute('exp-1', 'bayes', 'fp-1', old, structure='s')
+
+        stale = await cache.get_or_compute('exp-1', 'bayes', 'fp-2', new, structure='s')
+        assert stale == {'version': 1}
+
+        await asyncio.sleep(0)
+        fresh = await cache.get_or_compute('exp-1', 'bayes', 'fp-2', new, structure='s')
+        assert fresh == {'version': 2}
+        assert cache.stats()['stale_hits'] == 1
+
+        # A different variant set is never served stale
+        other = await cache.get_or_compute('exp-1', 'bayes', 'fp-3', old, structure='t')
+        assert other == {'version': 1} and cache.stats()['misses'] == 2
+
+    @pytest.mark.asyncio
+    async def test_callers_get_copies(self):
+        """Test mutating a returned result does not change the cached one"""
+        cache = AnalyticsCache(stale_seconds=60)
+
+        async def compute():
+            await asyncio.sleep(0.01)
+            return {'winner': 'var-2', 'variants': [{'id': 'var-2', 'probability_best': 0.9}]}
+
+        first, second = await asyncio.gather(
+            cache.get_or_compute('exp-1', 'bayes', 'fp-1', compute, structure='s'),
+            cache.get_or_compute('exp-1', 'bayes', 'fp-1', compute, structure='s')
+        )
+        assert first == second and first is not second
+
+        first['winner'] = None
+        first['variants'][0]['probability_best'] = 0.0
+        assert second['variants'][0]['probability_best'] == 0.9
+
+        cached = await cache.get_or_compute('exp-1', 'bayes', 'fp-1', compute, structure='s')
+        assert cached == {'winner': 'var-2', 'variants': [{'id': 'var-2', 'probability_best': 0.9}]}
+        cached['variants'].clear()
+        assert (await cache.lookup('exp-1', 'bayes', 'fp-1'))['variants']
+
+        # Stale result served while recomputing is a copy too
+        stale = await cache.get_or_compute('exp-1', 'bayes', 'fp-2', compute, structure='s')
+        stale['variants'].clear()
+        put = await cache.put('exp-1', 'bayes', 'fp-3', {'winner': 'var-1'})
+        put['winner'] = None
+        assert (await cache.lookup('exp-1', 'bayes', 'fp-1'))['variants']
+        assert (await cache.lookup('exp-1', 'bayes', 'fp-3')) == {'winner': 'var-1'}
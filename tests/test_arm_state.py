@@ -0,0 +1,137 @@
+import numpy as np
+import pytest
+
+from engine.core import _get_allocator
+from engine.core.allocators._arms import ArmState
+from engine.core.allocators._registry import get_allocator
+from engine.core.math._bandit import bernoulli_kl, kl_ucb_index, ucb1_index
+from engine.simulation import compare
+from engine.simulation.policies import POLICIES
+from orchestration.services.experiment_service import ExperimentService
+
+STRATEGIES = ['ucb1', 'kl_ucb', 'epsilon_greedy', 'hybrid']
+
+
+def _options(counts):
+    """(conversions, visitors) per option, in the _internal_state shape"""
+    return [
+        {'id': f'v{i}', '_internal_state': {
+            'success_count': float(k), 'failure_count': float(n - k), 'samples': n
+        }}
+        for i, (k, n) in enumerate(counts)
+    ]
+
+
+class TestArmState:
+    """Counters per arm as arrays"""
+
+    def test_from_options_and_record(self):
+        state = ArmState.from_options(_options([(5, 100), (0, 0)]))
+
+        assert state.ids == ['v0', 'v1']
+        np.testing.assert_allclose(state.pulls, [100, 0])
+        np.testing.assert_allclose(state.means(), [0.05, 0.0])
+
+        state.record('v1', 1.0)
+        state.record('v2', 0.0)
+        np.testing.assert_allclose(state.pulls, [100, 1, 1])
+        np.testing.assert_allclose(state.failures, [95, 0, 1])
+
+        subset = state.subset(['v2', 'v0', 'new'])
+        assert subset.ids == ['v2', 'v0', 'new']
+        np.testing.assert_allclose(subset.successes, [0, 5, 0])
+
+
+class TestIndexes:
+    """Upper bounds of the conversion rate"""
+
+    def test_kl_ucb_solves_its_bound_and_is_tighter(self):
+        successes = np.array([2.0, 50.0, 0.0])
+        pulls = np.array([100.0, 1000.0, 0.0])
+
+        kl = kl_ucb_index(successes, pulls)
+        ucb = ucb1_index(successes, pulls)
+
+        assert np.isinf(kl[2]) and np.isinf(ucb[2])
+        budget = np.log(pulls.sum())
+        np.testing.assert_allclose(pulls[:2] * bernoulli_kl(successes[:2] / pulls[:2], kl[:2]), budget, rtol=1e-3)
+        assert np.all(successes[:2] / pulls[:2] < kl[:2])
+        assert np.all(kl[:2] < ucb[:2])
+
+    def test_indexes_vectorize_over_replications(self):
+        successes = np.array([[2.0, 5.0], [5.0, 2.0]])
+        pulls = np.array([[100.0, 100.0], [100.0, 100.0]])
+
+        np.testing.assert_allclose(kl_ucb_index(successes, pulls)[1], kl_ucb_index(successes[1], pulls[1]))
+
+
+class TestArmStateAllocators:
+    """Same strategies in _get_allocator, the registry and the simulation"""
+
+    @pytest.mark.parametrize('strategy', STRATEGIES)
+    @pytest.mark.asyncio
+    async def test_registered_everywhere(self, strategy):
+        allocator = _get_allocator(strategy, {'seed': 0})
+
+        assert type(get_allocator(strategy, {})) is type(allocator)
+        assert strategy in POLICIES
+        # Unseen options first, then the best one
+        assert await allocator.select(_options([(30, 300), (0, 0)]), {}) == 'v1'
+        picks = [await allocator.select(_options([(30, 1000), (120, 1000)]), {}) for _ in range(50)]
+        assert picks.count('v1') > 40
+
+    @pytest.mark.asyncio
+    async def test_update_feeds_options_without_state(self):
+        allocator = _get_allocator('ucb1', {'seed': 0})
+        options = [{'id': 'a'}, {'id': 'b'}]
+
+        for _ in range(200):
+            chosen = await allocator.select(options, {})
+            await allocator.update(chosen, float(chosen == 'b'), {})
+
+        assert allocator.arms.pulls[allocator.arms.arm('b')] > 150
+
+    @pytest.mark.parametrize('strategy', ['epsilon_greedy', 'hybrid'])
+    @pytest.mark.asyncio
+    async def test_allocator_matches_policy(self, strategy):
+        counts = [(3, 20), (1, 20), (4, 25)]
+        successes = np.array([[k for k, n in counts]], dtype=float)
+        failures = np.array([[n - k for k, n in counts]], dtype=float)
+        config = {'exploration': 0.9, 'decay': 1.0}
+
+        allocator = _get_allocator(strategy, {**config, 'seed': 7})
+        policy, _ = POLICIES[strategy]
+        rng = np.random.default_rng(7)
+
+        for _ in range(20):
+            chosen = await allocator.select(_options(counts), {})
+            assert chosen == f'v{policy(successes, failures, 1, rng, config)[0, 0]}'
+
+    def test_simulation_beats_uniform(self):
+        results = compare(
+            STRATEGIES + ['uniform'], [0.04, 0.06, 0.10],
+            seed=3, visitors=5000, replications=20, batch_size=50
+        )
+
+        baseline = results['uniform'].regret_mean[-1]
+        for strategy in STRATEGIES:
+            assert results[strategy].regret_mean[-1] < baseline, strategy
+        # UCB1's bound is loose at conversion-test rates; KL-UCB's is not
+        assert results['kl_ucb'].regret_mean[-1] < results['ucb1'].regret_mean[-1] / 2
+        assert results['hybrid'].regret_mean[-1] < baseline / 3
+
+    @pytest.mark.asyncio
+    async def test_tracker_routes_count_strategies(self):
+        class FakeVariantRepo:
+            db = None
+
+        service = ExperimentService(None, None, FakeVariantRepo(), None)
+        variants = [
+            {'id': 'a', 'optimization_strategy': 'kl_ucb', 'algorithm_state': {},
+             'total_allocations': 500, 'total_conversions': 60},
+            {'id': 'b', 'optimization_strategy': 'kl_ucb', 'algorithm_state': {},
+             'total_allocations': 0, 'total_conversions': 0},
+        ]
+
+        assert (await service._adaptive_selection(variants, 'exp-1'))['id'] == 'b'
+        assert service._arm_state_allocator('kl_ucb') is service._arm_state_allocator('kl_ucb')
@@ -0,0 +1,65 @@
+import time
+import pytest
+from integration.proxy.asset_cache import (
+    AssetCache,
+    CachedAsset,
+    compute_freshness,
+    is_storable
+)
+
+
+def _asset(url, size=10, freshness=60):
+    return CachedAsset(
+        url=url,
+        status_code=200,
+        headers={'content-type': 'text/css', 'etag': '"v1"'},
+        body=b'x' * size,
+        stored_at=time.time(),
+        freshness=freshness
+    )
+
+
+class TestAssetCache:
+    """Visual Editor asset cache unit tests"""
+
+    def test_cache_control_rules(self):
+        """Test storability and freshness from origin headers"""
+        assert compute_freshness({'cache-control': 'public, max-age=300'}) == 300
+        assert compute_freshness({'cache-control': 'max-age=300, s-maxage=10'}) == 10
+        assert compute_freshness({'cache-control': 'max-age=300', 'age': '100'}) == 200
+        assert compute_freshness({'cache-control': 'no-cache', 'etag': '"a"'}) == 0
+        assert compute_freshness({}) is None
+
+        assert is_storable(200, {'cache-control': 'max-age=60'})
+        assert is_storable(200, {'etag': '"a"'})
+        assert not is_storable(200, {'cache-control': 'no-store', 'etag': '"a"'})
+        assert not is_storable(200, {'cache-control': 'private, max-age=60'})
+        assert not is_storable(404, {'cache-control': 'max-age=60'})
+        assert not is_storable(200, {})
+
+    @pytest.mark.asyncio
+    async def test_memory_lru_eviction(self):
+        """Test least recently used entries are evicted by byte budget"""
+        cache = AssetCache(max_memory_bytes=25)
+
+        await cache.put(_asset('a'))
+        await cache.put(_asset('b'))
+        await cache.get('a')
+        await cache.put(_asset('c'))
+
+        assert await cache.get('a') is not None
+        assert await cache.get('b') is None
+        assert await cache.get('c') is not None
+
+    @pytest.mark.asyncio
+    async def test_disk_roundtrip(self, tmp_path):
+        """Test entries survive a fresh memory cache via disk"""
+        cache = AssetCache(disk_dir=str(tmp_path))
+        await cache.put(_asset('https://example.com/app.css'))
+
+        reloaded = AssetCache(disk_dir=str(tmp_path))
+        asset = await reloaded.get('https://example.com/app.css')
+
+        assert asset is not None
+        assert asset.body == b'x' * 10
+        assert asset.conditional_headers() == {'If-None-Match': '"v1"'}
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from orchestration.services.analytics_cache import AnalyticsCache
+from orchestration.services.analytics_service import AnalyticsService
+from orchestration.services.batch_analytics import (
+    RaggedCounts,
+    analyze_counts,
+    analyze_counts_sharded,
+)
+
+
+def _variants(*counts):
+    return [
+        {'id': f'v{i}', 'name': f'V{i}', 'total_allocations': n, 'total_conversions': c}
+        for i, (n, c) in enumerate(counts)
+    ]
+
+
+class TestBatchAnalytics:
+    """One vectorized pass over ragged groups of variants"""
+
+    def test_ragged_groups_match_per_group_results(self):
+        groups = [
+            _variants((1000, 50), (1000, 90)),
+            _variants((500, 10)),
+            [],
+            _variants((2000, 100), (2000, 100), (2000, 160)),
+        ]
+        counts = RaggedCounts.from_groups(groups)
+        result = analyze_counts(counts, samples=20000, rng=np.random.default_rng(3), max_cells=50000)
+
+        assert list(counts.offsets) == [0, 2, 3, 3, 6]
+        # P(best) sums to one inside every non-empty group
+        for g in (0, 1, 3):
+            assert result.prob_best[result.arms(g)].sum() == pytest.approx(1.0)
+        assert result.prob_best[1] > 0.99
+        assert result.prob_best[5] > 0.99
+        assert result.group_conversion_rate[3] == pytest.approx(360 / 6000)
+
+    def test_sharded_result_keeps_input_order(self):
+        groups = [_variants((100 * (g + 1), 5 * (g + 1)), (100, 3)) for g in range(6)]
+        counts = RaggedCounts.from_groups(groups)
+
+        result = analyze_counts_sharded(counts, samples=2000, workers=3)
+
+        assert list(result.offsets) == list(counts.offsets)
+        assert result.group_allocations.tolist() == [100 * (g + 1) + 100 for g in range(6)]
+
+    @pytest.mark.asyncio
+    async def test_service_batch_uses_cache(self):
+        service = AnalyticsService(cache=AnalyticsCache(), batch_workers=0)
+        experiments = [('exp-a', _variants((1000, 50), (1000, 80))), ('exp-b', _variants((10, 1)))]
+
+        first = await service.analyze_experiments(experiments)
+        second = await service.analyze_experiments(experiments)
+
+        assert first['exp-a']['bayesian_analysis']['winner']['variant_id'] == 'v1'
+        assert second['exp-a'] == first['exp-a'] and second['exp-a'] is not first['exp-a']
+        assert service.cache.stats()['hits'] == 2
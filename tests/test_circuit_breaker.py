@@ -0,0 +1,209 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import asyncpg
+import pytest
+from data_access.circuit_breaker import CircuitBreaker, CircuitOpenError
+from data_access.pools import MonitoredPool
+from public_api.middleware.error_handler import APIError
+from public_api.models.tracker import TrackerAssignmentRequest
+from public_api.routers import tracker
+
+
+class _FakePool:
+    """Minimal asyncpg.Pool stand-in"""
+
+    def __init__(self):
+        self.fail = False
+        self.exhausted = False
+
+    async def acquire(self, timeout=None):
+        if self.fail:
+            raise ConnectionRefusedError("db down")
+        if self.exhausted:
+            raise asyncio.TimeoutError()
+        return object()
+
+    async def release(self, conn):
+        pass
+
+    def get_size(self):
+        return 1
+
+    def get_idle_size(self):
+        return 1
+
+
+class TestCircuitBreaker:
+    """Database circuit breaker unit tests"""
+
+    def test_half_open_allows_single_trial(self):
+        """Test only one request probes recovery at a time"""
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0)
+
+        breaker.record_failure()
+        assert breaker.state == "CLOSED"
+        breaker.record_failure()
+        assert breaker.state == "OPEN"
+
+        assert breaker.allow()
+        assert breaker.state == "HALF_OPEN"
+        assert not breaker.allow()
+
+        breaker.record_success()
+        assert breaker.state == "CLOSED"
+        assert breaker.allow()
+
+    def test_failed_trial_reopens(self):
+        """Test a failed trial reopens the circuit for another recovery period"""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+        breaker.record_failure()
+
+        assert not breaker.allow()
+        assert breaker.retry_after() > 59
+
+        breaker.opened_at -= 60
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == "OPEN"
+        assert not breaker.allow()
+
+    @pytest.mark.asyncio
+    async def test_pool_fails_fast_when_open(self):
+        """Test acquire raises CircuitOpenError without touching the pool"""
+        raw = _FakePool()
+        pool = MonitoredPool(
+            'tracker', raw, 1, 1,
+            breaker=CircuitBreaker(failure_threshold=2, recovery_timeout=60, name='tracker')
+        )
+
+        raw.fail = True
+        for _ in range(2):
+            with pytest.raises(ConnectionRefusedError):
+                async with pool.acquire():
+                    pass
+
+        raw.fail = False
+        with pytest.raises(CircuitOpenError):
+            async with pool.acquire():
+                pass
+
+        # Query errors are not connectivity failures
+        pool.breaker.opened_at -= 60
+        with pytest.raises(ValueError):
+            async with pool.acquire():
+                raise ValueError("bad query")
+        assert pool.breaker.state == "CLOSED"
+
+    @pytest.mark.asyncio
+    async def test_pool_exhaustion_does_not_open_circuit(self):
+        """Test acquire timeouts (saturation) are not database failures"""
+        raw = _FakePool()
+        pool = MonitoredPool(
+            'tracker', raw, 1, 1,
+            breaker=CircuitBreaker(failure_threshold=2, recovery_timeout=60, name='tracker')
+        )
+
+        raw.exhausted = True
+        for _ in range(5):
+            with pytest.raises(asyncio.TimeoutError):
+                async with pool.acquire():
+                    pass
+        assert pool.breaker.state == "CLOSED"
+        assert pool.breaker.failures == 0
+
+    @pytest.mark.parametrize('timeout', [
+        asyncio.TimeoutError(),
+        asyncpg.QueryCanceledError("canceling statement due to statement timeout"),
+    ])
+    @pytest.mark.asyncio
+    async def test_query_timeouts_open_circuit(self, timeout):
+        """Test hanging queries (brownout) trip the breaker like an outage"""
+        raw = _FakePool()
+        pool = MonitoredPool(
+            'tracker', raw, 1, 1,
+            breaker=CircuitBreaker(failure_threshold=2, recovery_timeout=60, name='tracker')
+        )
+
+        for _ in range(2):
+            with pytest.raises(type(timeout)):
+                async with pool.acquire():
+                    raise timeout
+        assert pool.breaker.state == "OPEN"
+
+        with pytest.raises(CircuitOpenError):
+            async with pool.acquire():
+                pass
+
+
+class _CircuitDb:
+    """DatabaseManager stand-in; acquire fails fast once `open`"""
+
+    def __init__(self, status='active'):
+        self.open = False
+        self.status = status
+
+    @asynccontextmanager
+    async def acquire(self, workload=None, timeout=None):
+        if self.open:
+            raise CircuitOpenError(workload, 30.0)
+        yield self
+
+    async def fetchrow(self, query, *args):
+        return {'status': self.status} if self.status else None
+
+
+class _CachedAssignmentService:
+    async def allocate_user_to_variant(self, **kwargs):
+        return {
+            'variant_id': 'v1', 'variant_name': 'B', 'content': {},
+            'experiment_id': kwargs['experiment_id'], 'assigned_at': '2026-10-01T00:00:00Z'
+        }
+
+
+class TestTrackerDuringOutage:
+    """Only recently verified installation tokens are served with the circuit open"""
+
+    @pytest.fixture(autouse=True)
+    def _service(self, monkeypatch):
+        async def create(db):
+            return _CachedAssignmentService()
+
+        monkeypatch.setattr(tracker.ServiceFactory, 'create_tracker_experiment_service', create)
+        monkeypatch.setattr(tracker, '_verified_installations', tracker.VerifiedInstallations(ttl=60))
+
+    @staticmethod
+    def _request(token):
+        return TrackerAssignmentRequest(installation_token=token, experiment_id='exp-1', user_identifier='u1')
+
+    @pytest.mark.asyncio
+    async def test_unverified_token_fails_fast(self):
+        db = _CircuitDb()
+        db.open = True
+
+        with pytest.raises(APIError) as error:
+            await tracker.assign_variant(self._request('inst_unknown'), db)
+        assert error.value.status == 503
+
+    @pytest.mark.asyncio
+    async def test_verified_token_keeps_being_served(self):
+        db = _CircuitDb()
+        assert (await tracker.assign_variant(self._request('inst_ok'), db)).variant_id == 'v1'
+
+        db.open = True
+        assert (await tracker.assign_variant(self._request('inst_ok'), db)).variant_id == 'v1'
+
+    @pytest.mark.asyncio
+    async def test_revoked_token_is_forgotten(self):
+        db = _CircuitDb()
+        await tracker.assign_variant(self._request('inst_revoked'), db)
+
+        db.status = 'revoked'
+        with pytest.raises(APIError) as error:
+            await tracker.assign_variant(self._request('inst_revoked'), db)
+        assert error.value.status == 400
+
+        db.open = True
+        with pytest.raises(APIError) as error:
+            await tracker.assign_variant(self._request('inst_revoked'), db)
+        assert error.value.status == 503
@@ -0,0 +1,76 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from engine.core.allocators._contextual import ContextualAllocator
+from engine.core.math._linear import LinearArm, hash_features
+from orchestration.services.contextual_models import ContextualModelCache
+
+
+class TestContextualAllocator:
+    """Linear model over hashed context, O(d²) updates"""
+
+    def test_incremental_factors_match_direct_computation(self):
+        rng = np.random.default_rng(0)
+        arm = LinearArm(dimension=16, regularization=1.0)
+        X = rng.normal(size=(50, 16))
+        for x in X:
+            arm.observe(x)
+
+        precision = np.eye(16) + X.T @ X
+        np.testing.assert_allclose(arm.precision, precision)
+        np.testing.assert_allclose(arm.covariance, np.linalg.inv(precision), atol=1e-10)
+        np.testing.assert_allclose(arm.cholesky, np.linalg.cholesky(precision), atol=1e-10)
+
+    def test_hashing_is_stable_and_bias_only_for_empty_context(self):
+        context = {'device': 'mobile', 'country': 'ES', 'utm_source': 'google'}
+
+        x = hash_features(context, 64)
+
+        np.testing.assert_array_equal(x, hash_features(dict(context), 64))
+        assert x[0] == 1.0 and 1 <= np.count_nonzero(x[1:]) <= 3
+        assert np.count_nonzero(hash_features({}, 64)) == 1
+
+    @pytest.mark.parametrize('mode', ['thompson', 'ucb'])
+    @pytest.mark.asyncio
+    async def test_learns_best_option_per_segment(self, mode):
+        allocator = ContextualAllocator({'mode': mode, 'seed': 3, 'exploration': 0.3})
+        options = [{'id': 'a'}, {'id': 'b'}]
+        # 'a' converts on mobile, 'b' on desktop
+        rates = {('mobile', 'a'): 0.30, ('mobile', 'b'): 0.05,
+                 ('desktop', 'a'): 0.05, ('desktop', 'b'): 0.30}
+        rng = np.random.default_rng(4)
+
+        for i in range(3000):
+            context = {'device': 'mobile' if i % 2 else 'desktop'}
+            chosen = await allocator.select(options, context)
+            reward = float(rng.random() < rates[(context['device'], chosen)])
+            await allocator.update(chosen, reward, context)
+
+        picks = {'mobile': [], 'desktop': []}
+        for device in picks:
+            for _ in range(200):
+                picks[device].append(await allocator.select(options, {'device': device}))
+        assert picks['mobile'].count('a') > 160
+        assert picks['desktop'].count('b') > 160
+
+    @pytest.mark.asyncio
+    async def test_model_cache_warm_starts_once(self):
+        cache = ContextualModelCache({'seed': 1})
+        calls = []
+
+        async def load():
+            calls.append(1)
+            await asyncio.sleep(0)
+            return [
+                {'variant_id': 'a', 'context': {'device': 'mobile'}, 'converted': True},
+                {'variant_id': 'b', 'context': {'device': 'mobile'}, 'converted': False},
+            ]
+
+        models = await asyncio.gather(*[cache.get('exp-1', load) for _ in range(5)])
+
+        assert len(calls) == 1
+        assert all(m is models[0] for m in models)
+        assert models[0].get_insights()['observations'] == {'a': 1, 'b': 1}
+        assert cache.peek('exp-2') is None
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from orchestration.services.dashboard_summary_service import DashboardSummaryService
+
+
+class _FakeDB:
+    def get_pool(self, workload):
+        return None
+
+
+class _FakeRepo:
+    """In-memory stand-in for DashboardSummaryRepository"""
+
+    def __init__(self):
+        self.rows = {}
+        self.reads = 0
+        self.refreshes = 0
+
+    async def get(self, user_id):
+        self.reads += 1
+        return self.rows.get(user_id)
+
+    async def refresh(self, user_ids):
+        self.refreshes += 1
+        for user_id in user_ids:
+            self.rows[user_id] = {
+                'user_id': user_id, 'total_experiments': 2, 'active_experiments': 1,
+                'total_visitors': 100, 'total_conversions': 7,
+                'recent_experiments': [], 'is_stale': False
+            }
+        return {u: self.rows[u] for u in user_ids}
+
+
+class TestDashboardSummaryService:
+    """Dashboard summary materialization unit tests"""
+
+    @pytest.mark.asyncio
+    async def test_cached_and_stale_reads(self):
+        """Test missing/stale rows are refreshed and reads are cached in process"""
+        service = DashboardSummaryService(_FakeDB(), ttl=60)
+        service.repo = _FakeRepo()
+
+        summary = await service.get('user-1')
+        assert summary['total_visitors'] == 100
+        assert service.repo.refreshes == 1
+
+        await service.get('user-1')
+        assert service.repo.reads == 1  # served from process cache
+
+        service.repo.rows['user-1']['is_stale'] = True
+        service.invalidate('user-1')
+        await service.get('user-1')
+        assert service.repo.refreshes == 2
+
+    @pytest.mark.asyncio
+    async def test_old_rows_recomputed_without_aggregator(self):
+        """Test rows older than max_age are recomputed (ROLLUPS_ENABLED=false)"""
+        service = DashboardSummaryService(_FakeDB(), ttl=0, max_age=60)
+        service.repo = _FakeRepo()
+        service.repo.rows['user-1'] = {
+            'user_id': 'user-1', 'total_visitors': 10, 'is_stale': False,
+            'refreshed_at': datetime.now(timezone.utc) - timedelta(minutes=5)
+        }
+
+        assert (await service.get('user-1'))['total_visitors'] == 100
+        assert service.repo.refreshes == 1
+
+        service.repo.rows['user-1']['refreshed_at'] = datetime.now(timezone.utc)
+        await service.get('user-1')
+        assert service.repo.refreshes == 1
+
+        service.max_age = None
+        service.repo.rows['user-1']['refreshed_at'] -= timedelta(days=1)
+        await service.get('user-1')
+        assert service.repo.refreshes == 1
@@ -0,0 +1,143 @@
+import asyncio
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from engine.core.math._delay import (
+    DELAY_BIN_EDGES,
+    N_DELAY_BINS,
+    delay_cdf,
+    delay_horizon,
+    pending_exposures,
+)
+from orchestration.services.delay_models import DelayCorrection, DelayModelCache, build_correction
+from orchestration.services.experiment_service import ExperimentService
+
+HOUR = 3600.0
+NOW = datetime(2026, 10, 1, 12, tzinfo=timezone.utc)
+
+
+def _one_day_delays():
+    """Every conversion arrives between 12h and 1d after the assignment"""
+    histogram = [0] * N_DELAY_BINS
+    histogram[int(np.searchsorted(DELAY_BIN_EDGES, 43200, side='right'))] = 100
+    return histogram
+
+
+class _FakeVariantRepo:
+    db = None
+
+
+class _FixedDelayModels:
+    def __init__(self, correction):
+        self.correction = correction
+
+    async def get(self, experiment_id, rollups):
+        return self.correction
+
+
+class TestDelayDistribution:
+    """Binned delay CDF and pending exposures"""
+
+    def test_cdf_interpolates_inside_bins(self):
+        histogram = _one_day_delays()
+        ages = np.array([0.0, HOUR, 12 * HOUR, 18 * HOUR, 24 * HOUR, 30 * 24 * HOUR])
+
+        np.testing.assert_allclose(delay_cdf(histogram, ages), [0, 0, 0, 0.5, 1, 1])
+        assert delay_horizon(histogram) == 24 * HOUR
+
+    def test_no_conversions_means_no_correction(self):
+        histogram = [0] * N_DELAY_BINS
+        assert (delay_cdf(histogram, np.array([0.0, HOUR])) == 1).all()
+        assert delay_horizon(histogram) == 0.0
+
+    def test_pending_exposures_per_arm(self):
+        histogram = _one_day_delays()
+        pending = pending_exposures(
+            np.array([0, 0, 1]),
+            np.array([HOUR, 18 * HOUR, 2 * 24 * HOUR]),
+            np.array([100.0, 100.0, 100.0]),
+            histogram,
+            2
+        )
+        np.testing.assert_allclose(pending, [150.0, 0.0])
+
+    def test_build_correction_from_hour_buckets(self):
+        buckets = [
+            {'variant_id': 'a', 'bucket_start': NOW - timedelta(hours=1), 'allocations': 100},
+            {'variant_id': 'b', 'bucket_start': NOW - timedelta(days=3), 'allocations': 100},
+        ]
+        correction = build_correction(_one_day_delays(), buckets, NOW)
+
+        assert correction.pending_for('a') == pytest.approx(100.0)
+        assert correction.pending_for('b') == 0.0
+        assert correction.pending_for('unknown') == 0.0
+
+
+class TestDelayedFeedbackAllocation:
+    """Recent winners are no longer under-credited"""
+
+    @pytest.mark.asyncio
+    async def test_recent_traffic_is_not_counted_as_failures(self):
+        variants = [
+            # Old traffic, all conversions already in
+            {'id': 'a', 'optimization_strategy': 'adaptive', 'algorithm_state': {},
+             'total_allocations': 10000, 'total_conversions': 500},
+            # Got its traffic in the last hours: most conversions still to come
+            {'id': 'b', 'optimization_strategy': 'adaptive', 'algorithm_state': {},
+             'total_allocations': 2000, 'total_conversions': 40},
+        ]
+
+        async def picks(correction):
+            service = ExperimentService(
+                None, None, _FakeVariantRepo(), None,
+                delay_models=_FixedDelayModels(correction)
+            )
+            return Counter([
+                (await service._adaptive_selection(variants, 'exp-1'))['id'] for _ in range(100)
+            ])
+
+        np.random.seed(0)
+        assert (await picks(DelayCorrection(conversions=500)))['a'] > 95
+        assert (await picks(DelayCorrection(conversions=500, pending={'b': 1600.0})))['b'] > 95
+
+
+class TestDelayModelCache:
+    """Reads the histogram, then only the hour buckets inside its horizon"""
+
+    @pytest.mark.asyncio
+    async def test_single_flight_and_horizon(self):
+        calls = []
+
+        class FakeRollups:
+            async def get_delay_histogram(self, experiment_id, since=None):
+                calls.append(('histogram', since))
+                await asyncio.sleep(0)
+                return _one_day_delays()
+
+            async def get_timeline(self, experiment_id, resolution, since=None):
+                calls.append((resolution, since))
+                return [{'variant_id': 'a', 'bucket_start': datetime.now(timezone.utc), 'allocations': 10}]
+
+        cache = DelayModelCache(min_conversions=10)
+        corrections = await asyncio.gather(*[cache.get('exp-1', FakeRollups()) for _ in range(5)])
+
+        assert all(c is corrections[0] for c in corrections)
+        assert [c[0] for c in calls] == ['histogram', 'hour']
+        horizon = datetime.now(timezone.utc) - calls[1][1]
+        assert timedelta(hours=24) < horizon < timedelta(hours=26)
+        assert corrections[0].pending_for('a') == pytest.approx(10.0)
+
+    @pytest.mark.asyncio
+    async def test_too_few_conversions_skips_correction(self):
+        class FakeRollups:
+            async def get_delay_histogram(self, experiment_id, since=None):
+                return _one_day_delays()
+
+            async def get_timeline(self, *args, **kwargs):
+                raise AssertionError("buckets not needed")
+
+        correction = await DelayModelCache(min_conversions=1000).get('exp-1', FakeRollups())
+        assert correction.pending == {}
@@ -0,0 +1,115 @@
+import pytest
+from pydantic import ValidationError
+
+from orchestration.interfaces.optimization_interface import OptimizationStrategy
+from orchestration.services.service_factory import ServiceFactory
+from public_api.middleware.error_handler import APIError
+from public_api.models import CreateExperimentRequest, UpdateExperimentRequest
+from public_api.routers import experiments
+
+REQUEST = {
+    "name": "Homepage CTA Test",
+    "url": "https://mysite.com",
+    "elements": [{
+        "name": "Main CTA",
+        "selector": {"type": "css", "selector": "#main-cta"},
+        "element_type": "button",
+        "original_content": {"text": "Sign Up"},
+        "variants": [{"text": "Get Started Free"}]
+    }]
+}
+
+
+class _Conn:
+    def __init__(self, status):
+        self.status = status
+        self.executed = []
+
+    async def fetchval(self, query, *args):
+        return self.status
+
+    async def execute(self, query, *args):
+        self.executed.append((query, args))
+        return "UPDATE 1"
+
+
+class _Db:
+    def __init__(self, status='draft'):
+        self.conn = _Conn(status)
+        self.pool = self
+
+    def acquire(self):
+        return self
+
+    async def __aenter__(self):
+        return self.conn
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _Summary:
+    def invalidate(self, user_id):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def _no_summary(monkeypatch):
+    monkeypatch.setattr(ServiceFactory, 'get_dashboard_summary_service', classmethod(lambda cls, db: _Summary()))
+
+
+class TestExperimentStrategy:
+    """optimization_strategy is chosen on create and editable while not running"""
+
+    def test_request_validates_strategy(self):
+        assert CreateExperimentRequest(**REQUEST).optimization_strategy is OptimizationStrategy.ADAPTIVE
+        assert CreateExperimentRequest(**REQUEST, optimization_strategy='kl_ucb').optimization_strategy \
+            is OptimizationStrategy.KL_UCB
+        with pytest.raises(ValidationError):
+            CreateExperimentRequest(**REQUEST, optimization_strategy='thompson')
+        with pytest.raises(ValidationError):
+            UpdateExperimentRequest(optimization_strategy='nope')
+
+    @pytest.mark.asyncio
+    async def test_create_persists_strategy(self, monkeypatch):
+        created = {}
+
+        class FakeRepo:
+            def __init__(self, pool):
+                pass
+
+            async def create(self, data):
+                created.update(data)
+                return 'exp-1'
+
+        class FakeMultiElement:
+            async def create_multi_element_experiment(self, **kwargs):
+                return {'elements': []}
+
+        async def fake_service(db):
+            return FakeMultiElement()
+
+        monkeypatch.setattr('data_access.repositories.experiment_repository.ExperimentRepository', FakeRepo)
+        monkeypatch.setattr('orchestration.services.multi_element_service.create_multi_element_service', fake_service)
+
+        request = CreateExperimentRequest(**REQUEST, optimization_strategy='segmented')
+        response = await experiments.create_experiment(request, 'user-1', _Db())
+
+        assert response.data['id'] == 'exp-1'
+        assert created['optimization_strategy'] == 'segmented'
+
+    @pytest.mark.asyncio
+    async def test_update_sets_strategy_unless_active(self):
+        db = _Db(status='paused')
+        request = UpdateExperimentRequest(name='Renamed', optimization_strategy='ucb1')
+        response = await experiments.update_experiment('exp-1', request, 'user-1', db)
+
+        query, args = db.conn.executed[0]
+        assert "name = $3, optimization_strategy = $4" in query
+        assert args == ('exp-1', 'user-1', 'Renamed', 'ucb1')
+        assert response.data == {'name': 'Renamed', 'optimization_strategy': 'ucb1'}
+
+        db = _Db(status='active')
+        with pytest.raises(APIError) as error:
+            await experiments.update_experiment('exp-1', request, 'user-1', db)
+        assert error.value.status == 409 and not db.conn.executed
@@ -0,0 +1,312 @@
+import uuid
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from engine.core.allocators._registry import get_allocator
+from engine.core.allocators.sequential import SequentialAllocator
+from orchestration.services.experiment_service import ExperimentService
+from orchestration.services.funnel_service import FunnelService
+from orchestration.services.service_factory import ServiceFactory
+from public_api.middleware.error_handler import APIError
+from public_api.models import TrackerFunnelConversionRequest, TrackerFunnelStepRequest
+from public_api.routers import tracker
+
+
+class FakeFunnelRepository:
+    """In-memory stand-in for the FunnelRepository calls FunnelService makes"""
+
+    def __init__(self):
+        self.paths = {}
+        self.active = set()
+        self.stats = {}
+        self.edge_conversions = Counter()
+        self.credit_calls = 0
+        self.sessions = {}
+        self.nodes = {}
+        # funnel_id -> owner of the active funnel; (funnel_id, node_id) -> step variants
+        self.funnels = {}
+        self.steps = {}
+
+    async def get_funnel_public(self, funnel_id):
+        owner = self.funnels.get(funnel_id)
+        return {'id': funnel_id, 'user_id': owner, 'status': 'active'} if owner else None
+
+    async def get_tracking_step(self, funnel_id, node_id, user_id, variant_id=None):
+        if self.funnels.get(funnel_id) != user_id or (funnel_id, node_id) not in self.steps:
+            return None
+        return {'id': node_id, 'has_variant': variant_id in self.steps[(funnel_id, node_id)]}
+
+    async def get_experiment_node(self, experiment_id):
+        return self.nodes.get(experiment_id)
+
+    async def create_session(self, funnel_id, user_identifier, session_id=None, entry_node_id=None, metadata=None):
+        key = (funnel_id, user_identifier)
+        if key not in self.sessions or self.sessions[key] not in self.active:
+            self.sessions[key] = f's{len(self.sessions) + 1}'
+            self.active.add(self.sessions[key])
+        return self.sessions[key]
+
+    async def get_session(self, funnel_id, user_identifier):
+        session = self.sessions.get((funnel_id, user_identifier))
+        return {'id': session} if session in self.active else None
+
+    async def advance_session(self, session_id, node_id, variant_id=None):
+        if session_id not in self.active:
+            return False
+        path = self.paths.setdefault(session_id, [])
+        revisit = any(step['node_id'] == node_id for step in path)
+        path.append({'node_id': node_id, **({'variant_id': variant_id} if variant_id else {})})
+        if variant_id and not revisit:
+            entry = self.stats.setdefault((node_id, variant_id), {'entries': 0, 'conversions': 0})
+            entry['entries'] += 1
+        return True
+
+    async def convert_session(self, session_id, conversion_value=1.0):
+        if session_id not in self.active:
+            return False
+        self.active.discard(session_id)
+        return True
+
+    async def get_session_path(self, session_id):
+        return list(self.paths.get(session_id, []))
+
+    async def get_step_stats(self, funnel_id, node_id):
+        return {v: dict(s) for (n, v), s in self.stats.items() if n == node_id}
+
+    async def credit_conversion(self, funnel_id, steps, transitions, conversion_value=1.0):
+        self.credit_calls += 1
+        for step in steps:
+            self.stats[step]['conversions'] += 1
+        self.edge_conversions.update(transitions)
+        return len(steps)
+
+
+class TestCreditAssignment:
+    """Which steps and edges a converted path is credited for"""
+
+    def test_distinct_steps_and_transitions_in_path_order(self):
+        path = [
+            {'node_id': 'landing', 'variant_id': 'l1'},
+            {'node_id': 'pricing', 'variant_id': 'p2'},
+            {'node_id': 'landing', 'variant_id': 'l1'},
+            {'node_id': 'pricing', 'variant_id': 'p2'},
+            {'node_id': 'checkout'},
+        ]
+        steps, hops = SequentialAllocator.credit_assignment(path)
+
+        assert steps == [('landing', 'l1'), ('pricing', 'p2')]
+        assert hops == [('landing', 'pricing'), ('pricing', 'landing'), ('pricing', 'checkout')]
+
+    def test_update_sequential_state_rewards_the_step_variant(self):
+        allocator = SequentialAllocator()
+        state = {'steps': [{'variants': [{'alpha': 1.0, 'beta': 1.0, 'samples': 0}] * 2}]}
+
+        state = allocator.update_sequential_state(state, 0, 1, final_conversion=True)
+        assert state['steps'][0]['variants'][1]['alpha'] == 2.0
+        assert state['steps'][0]['variants'][0]['alpha'] == 1.0
+
+
+class TestDownstreamAllocation:
+    """Steps are optimized for the end of the funnel, not the next click"""
+
+    def test_prefers_variant_with_more_final_conversions(self):
+        np.random.seed(0)
+        allocator = SequentialAllocator({'min_samples': 0})
+        variants = [
+            # More sessions, fewer of them reach the end
+            {'id': 'a', 'funnel_stats': {'entries': 4000, 'conversions': 80}},
+            {'id': 'b', 'funnel_stats': {'entries': 1000, 'conversions': 60}},
+        ]
+        picks = Counter(allocator.select_variant_for_step(variants, 'pricing', 3) for _ in range(200))
+        assert picks[1] > 190
+
+    @pytest.mark.asyncio
+    async def test_session_conversion_credits_every_step_once(self):
+        repo = FakeFunnelRepository()
+        service = FunnelService(repo=repo)
+        repo.active.update({'s1', 's2'})
+
+        for session, pricing in (('s1', 'p1'), ('s2', 'p2')):
+            await service.track_step_completion(session, 'f', 'landing', 'l1')
+            await service.track_step_completion(session, 'f', 'pricing', pricing)
+            await service.track_step_completion(session, 'f', 'pricing', pricing)
+            await service.track_step_completion(session, 'f', 'checkout', None)
+
+        assert await service.record_final_conversion('s2', 'f', 49.0) == 2
+        assert await service.record_final_conversion('s2', 'f', 49.0) == 0
+        assert repo.credit_calls == 1
+
+        assert repo.stats[('landing', 'l1')] == {'entries': 2, 'conversions': 1}
+        assert repo.stats[('pricing', 'p2')] == {'entries': 1, 'conversions': 1}
+        assert repo.stats[('pricing', 'p1')] == {'entries': 1, 'conversions': 0}
+        assert repo.edge_conversions == Counter({('landing', 'pricing'): 1, ('pricing', 'checkout'): 1})
+
+        np.random.seed(1)
+        service.allocator = SequentialAllocator({'min_samples': 0})
+        variants = [{'id': 'p1', 'algorithm_state': {'alpha': 1.0, 'beta': 1.0}},
+                    {'id': 'p2', 'algorithm_state': {'alpha': 1.0, 'beta': 1.0}}]
+        picks = Counter([
+            (await service.select_variant('f', 'pricing', variants))['id'] for _ in range(200)
+        ])
+        assert picks['p2'] > picks['p1']
+
+
+class TestSequentialStrategy:
+    """Experiments with strategy 'sequential' are allocated by FunnelService"""
+
+    def test_registry_builds_sequential_allocator(self):
+        assert isinstance(get_allocator('sequential', {}), SequentialAllocator)
+
+    @pytest.mark.asyncio
+    async def test_assignment_uses_downstream_conversion(self):
+        class FakeVariantRepo:
+            db = None
+
+        repo = FakeFunnelRepository()
+        repo.nodes['exp-1'] = {'id': 'pricing', 'funnel_id': 'f'}
+        # 'a' gets more clicks on this step, 'b' more finished funnels
+        repo.stats[('pricing', 'a')] = {'entries': 4000, 'conversions': 40}
+        repo.stats[('pricing', 'b')] = {'entries': 1000, 'conversions': 60}
+        funnels = FunnelService(repo=repo, allocator=SequentialAllocator({'min_samples': 0}))
+        service = ExperimentService(None, None, FakeVariantRepo(), None, funnel_service=funnels)
+        variants = [
+            {'id': 'a', 'optimization_strategy': 'sequential', 'algorithm_state': {},
+             'total_allocations': 4000, 'total_conversions': 400},
+            {'id': 'b', 'optimization_strategy': 'sequential', 'algorithm_state': {},
+             'total_allocations': 1000, 'total_conversions': 10},
+        ]
+
+        np.random.seed(0)
+        picks = Counter([(await service._adaptive_selection(variants, 'exp-1'))['id'] for _ in range(100)])
+        assert picks['b'] > 95
+
+        # Not attached to an active funnel: own counters
+        picks = Counter([(await service._adaptive_selection(variants, 'exp-2'))['id'] for _ in range(100)])
+        assert picks['a'] > 95
+
+
+OWNER = str(uuid.uuid4())
+FUNNEL, LANDING, PRICING = (str(uuid.uuid4()) for _ in range(3))
+L1, P1, P2 = (str(uuid.uuid4()) for _ in range(3))
+
+
+class _InstallationDb:
+    """DatabaseManager stand-in: only the installation token lookup"""
+
+    def __init__(self, status='active', user_id=OWNER):
+        self.status = status
+        self.user_id = user_id
+
+    def acquire(self, workload=None):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def fetchrow(self, query, *args):
+        return {'id': 'inst-1', 'status': self.status, 'user_id': self.user_id} if self.status else None
+
+
+def _funnel_repo():
+    repo = FakeFunnelRepository()
+    repo.funnels[FUNNEL] = OWNER
+    repo.steps[(FUNNEL, LANDING)] = {L1}
+    repo.steps[(FUNNEL, PRICING)] = {P1, P2}
+    return repo
+
+
+def _step(user, node, variant=None, funnel=FUNNEL):
+    return TrackerFunnelStepRequest(
+        installation_token='tok', funnel_id=funnel, step_id=node,
+        user_identifier=user, variant_id=variant
+    )
+
+
+class TestTrackerFunnelRoutes:
+    """/tracker/funnel/step and /tracker/funnel/convert drive FunnelService"""
+
+    @pytest.fixture
+    def repo(self, monkeypatch):
+        repo = _funnel_repo()
+        service = FunnelService(repo=repo)
+
+        async def funnel_service(cls, db):
+            return service
+
+        monkeypatch.setattr(ServiceFactory, 'get_funnel_service', classmethod(funnel_service))
+        return repo
+
+    @pytest.mark.asyncio
+    async def test_steps_then_conversion_credit_the_path(self, repo):
+        db = _InstallationDb()
+
+        def step(user, node, variant=None):
+            return tracker.track_funnel_step(_step(user, node, variant), db)
+
+        def convert(user):
+            return tracker.record_funnel_conversion(TrackerFunnelConversionRequest(
+                installation_token='tok', funnel_id=FUNNEL, user_identifier=user, conversion_value=49.0
+            ), db)
+
+        first = await step('u1', LANDING, L1)
+        assert first.success and (await step('u1', PRICING, P2)).session_id == first.session_id
+        await step('u2', LANDING, L1)
+
+        converted = await convert('u1')
+        assert converted.success and converted.credited_steps == 2
+        assert repo.stats[(LANDING, L1)] == {'entries': 2, 'conversions': 1}
+        assert repo.stats[(PRICING, P2)] == {'entries': 1, 'conversions': 1}
+
+        # Session closed: a second conversion credits nothing
+        assert not (await convert('u1')).success
+        assert repo.credit_calls == 1
+
+        # Returning after converting opens a new session
+        assert (await step('u1', LANDING, L1)).session_id != first.session_id
+
+    @pytest.mark.asyncio
+    async def test_inactive_installation_rejected(self):
+        with pytest.raises(APIError) as error:
+            await tracker.track_funnel_step(_step('u1', LANDING), _InstallationDb(status='revoked'))
+        assert error.value.status == 400
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('funnel, node, variant', [
+        ('f', LANDING, None), (FUNNEL, 'landing', None), (FUNNEL, LANDING, 'l1')
+    ])
+    async def test_malformed_ids_rejected(self, repo, funnel, node, variant):
+        with pytest.raises(APIError) as error:
+            await tracker.track_funnel_step(_step('u1', node, variant, funnel=funnel), _InstallationDb())
+        assert error.value.status == 400 and not repo.sessions
+
+    @pytest.mark.asyncio
+    async def test_funnel_of_another_account_not_found(self, repo):
+        other = _InstallationDb(user_id=str(uuid.uuid4()))
+        with pytest.raises(APIError) as error:
+            await tracker.track_funnel_step(_step('u1', LANDING, L1), other)
+        assert error.value.status == 404
+
+        with pytest.raises(APIError) as error:
+            await tracker.record_funnel_conversion(TrackerFunnelConversionRequest(
+                installation_token='tok', funnel_id=FUNNEL, user_identifier='u1'
+            ), other)
+        assert error.value.status == 404
+        assert not repo.sessions
+
+    @pytest.mark.asyncio
+    async def test_variant_of_another_step_rejected(self, repo):
+        db = _InstallationDb()
+        with pytest.raises(APIError) as error:
+            await tracker.track_funnel_step(_step('u1', LANDING, P1), db)
+        assert error.value.status == 400
+
+        # Unknown step of the funnel
+        with pytest.raises(APIError) as error:
+            await tracker.track_funnel_step(_step('u1', str(uuid.uuid4())), db)
+        assert error.value.status == 404
+        assert not repo.stats
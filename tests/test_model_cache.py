@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from orchestration.services.model_cache import ModelCache
+
+
+class _CountingCache(ModelCache[str, tuple]):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.loads = 0
+        self.evicted = []
+
+    async def _load(self, key, version):
+        self.loads += 1
+        await asyncio.sleep(0)
+        return (key, version)
+
+    def _evicted(self, key, model):
+        self.evicted.append(key)
+
+
+class TestModelCache:
+    """Shared LRU + single-flight + TTL refresh of the model caches"""
+
+    @pytest.mark.asyncio
+    async def test_single_flight_and_lru(self):
+        cache = _CountingCache(max_entries=2)
+
+        models = await asyncio.gather(*[cache.get('a', 1) for _ in range(5)])
+        assert cache.loads == 1 and all(m is models[0] for m in models)
+
+        await cache.get('b', 1)
+        cache.peek('a')
+        await cache.get('c', 1)
+        assert sorted(cache.keys()) == ['a', 'c'] and cache.evicted == ['b']
+
+        cache.invalidate('a')
+        assert cache.peek('a') is None and cache.evicted == ['b', 'a']
+
+    @pytest.mark.asyncio
+    async def test_stale_model_served_while_reloading(self):
+        cache = _CountingCache(refresh_seconds=0)
+
+        assert await cache.get('a', 1) == ('a', 1)
+        # Stale: the old model is returned, the reload runs in background
+        assert await cache.get('a', 2) == ('a', 1)
+        await asyncio.sleep(0.01)
+        assert cache.peek('a') == ('a', 2)
+
+    @pytest.mark.asyncio
+    async def test_failed_load_is_retried(self):
+        cache = _CountingCache()
+
+        async def broken(key, version):
+            raise RuntimeError("db down")
+
+        cache._load = broken
+        with pytest.raises(RuntimeError):
+            await cache.get('a', 1)
+        assert len(cache) == 0 and not cache._loading
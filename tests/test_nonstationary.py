@@ -0,0 +1,167 @@
+import asyncio
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from engine.core import _get_allocator
+from engine.core.allocators._nonstationary import DiscountedAllocator, SlidingWindowAllocator
+from engine.core.allocators._registry import get_allocator
+from engine.core.math._nonstationary import bucket_totals
+from orchestration.services.nonstationary_models import NonStationaryModelCache
+
+HOUR = 3600.0
+NOW = 1_700_000_000.0
+
+
+def _drifted_buckets():
+    """'a' won a month ago, 'b' wins this week (hourly buckets)"""
+    ids, starts, allocations, conversions = [], [], [], []
+    for hours_ago in range(1, 24 * 40):
+        start = NOW - hours_ago * HOUR
+        recent = hours_ago <= 24 * 7
+        for variant, rate in (('a', 0.02 if recent else 0.08), ('b', 0.08 if recent else 0.02)):
+            ids.append(variant)
+            starts.append(start)
+            allocations.append(100)
+            conversions.append(100 * rate)
+    return ids, np.array(starts), np.array(allocations, float), np.array(conversions, float)
+
+
+class TestRecencyCounts:
+    """Lazy decay and window eviction match the eager definitions"""
+
+    def test_lazy_decay_equals_eager_weighting(self):
+        allocator = DiscountedAllocator({'half_life_hours': 10})
+        times = NOW + np.array([0.0, 3.0, 7.5, 20.0]) * HOUR
+        for t in times:
+            allocator.observe('a', now=t)
+            if t == times[1]:
+                allocator.credit('a', now=t)
+
+        n, k = allocator.totals([allocator._arm('a')], NOW + 30 * HOUR)
+        ages = NOW + 30 * HOUR - times
+        np.testing.assert_allclose(n, np.exp2(-ages / (10 * HOUR)).sum())
+        np.testing.assert_allclose(k, np.exp2(-ages[1] / (10 * HOUR)))
+
+    def test_sliding_window_evicts_expired_buckets(self):
+        allocator = SlidingWindowAllocator({'window_hours': 2})
+        allocator.observe('a', now=NOW)
+        allocator.observe('a', now=NOW + 1.5 * HOUR)
+        arm = [allocator._arm('a')]
+
+        assert allocator.totals(arm, NOW + 1.6 * HOUR)[0] == 2
+        assert allocator.totals(arm, NOW + 3 * HOUR)[0] == 1
+        assert allocator.totals(arm, NOW + 10 * HOUR)[0] == 0
+
+    def test_warm_start_matches_bucket_totals(self):
+        ids, starts, allocations, conversions = _drifted_buckets()
+        arm = np.array([0 if v == 'a' else 1 for v in ids])
+        age = NOW - (starts + HOUR / 2)
+
+        for allocator, kwargs in (
+            (DiscountedAllocator({'half_life_hours': 48}), {'half_life': 48 * HOUR}),
+            (SlidingWindowAllocator({'window_hours': 72}), {'window': 72 * HOUR}),
+        ):
+            allocator.warm_start(ids, starts, allocations, conversions, now=NOW)
+            expected = bucket_totals(arm, age, allocations, conversions, 2, **kwargs)
+            got = allocator.totals([allocator._arm('a'), allocator._arm('b')], NOW)
+            np.testing.assert_allclose(got, expected)
+
+
+class TestRecencyAllocators:
+    """Selection follows the recent winner after a drift"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('allocator', [
+        DiscountedAllocator({'half_life_hours': 48, 'seed': 1}),
+        SlidingWindowAllocator({'window_hours': 72, 'seed': 1}),
+    ])
+    async def test_prefers_recent_winner(self, allocator):
+        allocator.warm_start(*_drifted_buckets(), now=NOW)
+        options = [{'id': 'a'}, {'id': 'b'}]
+
+        picks = Counter([await allocator.select(options, {'now': NOW}) for _ in range(200)])
+        assert picks['b'] > 190
+
+    def test_exposed_as_strategies(self):
+        assert isinstance(_get_allocator('discounted', {}), DiscountedAllocator)
+        assert isinstance(_get_allocator('sliding_window', {}), SlidingWindowAllocator)
+        assert isinstance(get_allocator('sliding_window', {'window_hours': 24}), SlidingWindowAllocator)
+
+
+class TestNonStationaryModelCache:
+    """Loaded once, reloaded in the background after refresh_seconds"""
+
+    @pytest.mark.asyncio
+    async def test_single_flight_then_background_refresh(self):
+        cache = NonStationaryModelCache({'half_life_hours': 24}, refresh_seconds=0.0)
+        loads = []
+        start = datetime.now(timezone.utc) - timedelta(hours=2)
+
+        async def load(since):
+            loads.append(since)
+            await asyncio.sleep(0)
+            return [{'variant_id': 'a', 'bucket_start': start, 'allocations': 10, 'conversions': 2}]
+
+        models = await asyncio.gather(*[cache.get('exp-1', 'discounted', load) for _ in range(5)])
+        assert len(loads) == 1 and all(m is models[0] for m in models)
+        assert loads[0] <= start
+
+        # Stale: served immediately, replaced once the reload finishes
+        assert await cache.get('exp-1', 'discounted', load) is models[0]
+        await asyncio.sleep(0.01)
+        assert len(loads) == 2
+        assert cache.peek('exp-1', 'discounted') is not models[0]
+
+    @pytest.mark.asyncio
+    async def test_reload_keeps_events_after_the_rollup_watermark(self):
+        cache = NonStationaryModelCache({'window_hours': 24}, refresh_seconds=0.0)
+        now = datetime.now(timezone.utc)
+        watermark = now - timedelta(minutes=2)
+        bucket = now - timedelta(hours=3)
+
+        async def load(since):
+            # Rollups: 10 allocations before the watermark
+            return [{'variant_id': 'a', 'bucket_start': bucket, 'allocations': 10, 'conversions': 2}]
+
+        async def load_watermark():
+            return watermark
+
+        model = await cache.get('exp-1', 'sliding_window', load, load_watermark)
+        # Already in the rollups (before the watermark) / not yet (after it)
+        model.observe('a', now=(watermark - timedelta(seconds=30)).timestamp())
+        for _ in range(3):
+            model.observe('a', now=(watermark + timedelta(seconds=30)).timestamp())
+        model.credit('a', now=(watermark + timedelta(seconds=40)).timestamp())
+
+        await cache.get('exp-1', 'sliding_window', load, load_watermark)
+        await asyncio.sleep(0.01)
+        reloaded = cache.peek('exp-1', 'sliding_window')
+
+        assert reloaded is not model
+        allocations, conversions = reloaded.totals([reloaded._arm('a')], now.timestamp())
+        assert allocations[0] == 13 and conversions[0] == 3
+
+    @pytest.mark.asyncio
+    async def test_no_reload_without_rollups(self, monkeypatch):
+        from config.settings import settings
+        from orchestration.services import nonstationary_models
+
+        monkeypatch.setattr(settings, 'ROLLUPS_ENABLED', False)
+        monkeypatch.setattr(nonstationary_models, '_nonstationary_models', None)
+        cache = nonstationary_models.get_nonstationary_models()
+        assert cache.refresh_seconds is None
+
+        loads = []
+
+        async def load(since):
+            loads.append(since)
+            return []
+
+        model = await cache.get('exp-1', 'discounted', load)
+        model.observe('a')
+        assert await cache.get('exp-1', 'discounted', load) is model
+        await asyncio.sleep(0.01)
+        assert len(loads) == 1 and cache.peek('exp-1', 'discounted') is model
@@ -0,0 +1,28 @@
+import pytest
+from datetime import datetime, timezone, timedelta
+
+from data_access.pagination import decode_cursor, encode_cursor, keyset_page
+
+
+class TestKeysetPagination:
+    """Opaque (created_at, id) cursors for listing endpoints"""
+
+    def test_cursor_round_trip_and_page_split(self):
+        base = datetime(2026, 3, 1, 12, 0, 0, 123456, tzinfo=timezone.utc)
+        rows = [
+            {'id': f'00000000-0000-0000-0000-00000000000{i}', 'created_at': base - timedelta(minutes=i)}
+            for i in range(5)
+        ]
+
+        page, cursor = keyset_page(rows, 4)
+        assert len(page) == 4
+        assert decode_cursor(cursor) == (rows[3]['created_at'], rows[3]['id'])
+
+        last_page, cursor = keyset_page(rows[4:], 4)
+        assert len(last_page) == 1 and cursor is None
+
+    def test_rejects_tampered_cursor(self):
+        with pytest.raises(ValueError):
+            decode_cursor('not-a-cursor')
+        with pytest.raises(ValueError):
+            decode_cursor(encode_cursor(datetime.now(timezone.utc), '')[:-4])
@@ -0,0 +1,169 @@
+import asyncio
+
+import pytest
+
+from data_access.pools import POOL_API, POOL_TRACKER, AdaptivePoolController, MonitoredPool, PoolLimiter
+from orchestration.services.service_factory import ServiceFactory
+
+
+class _FakePool:
+    """asyncpg.Pool stand-in with `size` connections"""
+
+    def __init__(self, size=4):
+        self.size = size
+        self.checked_out = 0
+        self.delay = 0.0
+
+    async def acquire(self, timeout=None):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.checked_out += 1
+        return object()
+
+    async def release(self, conn):
+        self.checked_out -= 1
+
+    def get_size(self):
+        return self.size
+
+    def get_idle_size(self):
+        return self.size - self.checked_out
+
+
+class _FakeMetrics:
+    def __init__(self):
+        self.acquires = []
+        self.limits = {}
+
+    def record_db_pool_acquire(self, pool, wait_seconds, saturation):
+        self.acquires.append((pool, wait_seconds, saturation))
+
+    def update_db_pool_limit(self, pool, limit):
+        self.limits[pool] = limit
+
+
+def _pool(limit=2, min_size=1, max_size=4, name=POOL_TRACKER):
+    return MonitoredPool(name, _FakePool(max_size), min_size, max_size, limiter=PoolLimiter(limit))
+
+
+class TestMonitoredPool:
+    """Acquire wait time and saturation per checkout"""
+
+    @pytest.mark.asyncio
+    async def test_records_wait_and_saturation(self):
+        pool = _pool(limit=2)
+        pool._metrics = metrics = _FakeMetrics()
+        pool.raw.delay = 0.01
+
+        async with pool.acquire():
+            async with pool.acquire():
+                assert pool.in_use() == 2
+                assert pool.stats()['limit'] == 2
+
+        waits = pool.drain_wait_samples()
+        assert len(waits) == 2 and all(w >= 0.01 for w in waits)
+        assert pool.drain_wait_samples() == []
+        assert [m[0] for m in metrics.acquires] == [POOL_TRACKER] * 2
+        # Saturation against the limiter, not the pool ceiling
+        assert [m[2] for m in metrics.acquires] == [0.5, 1.0]
+        assert pool.in_use() == 0 and pool.limiter.in_use == 0
+
+
+class TestPoolLimiter:
+    """Checkouts beyond the limit wait until one is released or the limit grows"""
+
+    @pytest.mark.asyncio
+    async def test_admission_and_rejection(self):
+        limiter = PoolLimiter(2)
+        await limiter.acquire()
+        await limiter.acquire()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(limiter.acquire(), timeout=0.01)
+        assert limiter.in_use == 2
+
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        await limiter.release()
+        await asyncio.wait_for(waiter, timeout=1)
+
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        await limiter.set_limit(3)
+        await asyncio.wait_for(waiter, timeout=1)
+
+        assert limiter.in_use == 3
+        assert limiter.reset_peak() == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_acquire_gives_the_slot_back(self):
+        pool = _pool(limit=1)
+
+        async def refuse(timeout=None):
+            raise asyncio.TimeoutError()
+
+        pool.raw.acquire = refuse
+        with pytest.raises(asyncio.TimeoutError):
+            async with pool.acquire():
+                pass
+        assert pool.limiter.in_use == 0
+
+
+class TestAdaptivePoolController:
+    """Grow on slow acquires, shrink when idle, within [min_size, max_size]"""
+
+    @pytest.mark.asyncio
+    async def test_grows_until_ceiling(self, monkeypatch):
+        metrics = _FakeMetrics()
+        monkeypatch.setattr('data_access.pools._get_metrics', lambda: metrics)
+        pool = _pool(limit=3, max_size=4)
+        controller = AdaptivePoolController([pool], target_wait=0.005)
+
+        for expected in (4, 4):
+            pool.wait_samples.extend([0.02] * 20)
+            await controller.tick()
+            assert pool.limiter.limit == expected
+        assert metrics.limits[POOL_TRACKER] == 4
+
+    @pytest.mark.asyncio
+    async def test_shrinks_until_floor_only_when_idle(self):
+        pool = _pool(limit=3, min_size=2)
+        controller = AdaptivePoolController([pool], target_wait=0.005)
+
+        # Fast acquires but the limit was fully used: keep it
+        pool.limiter.peak_in_use = 3
+        pool.wait_samples.extend([0.0001] * 20)
+        await controller.tick()
+        assert pool.limiter.limit == 3
+
+        for expected in (2, 2):
+            pool.wait_samples.extend([0.0001] * 20)
+            await controller.tick()
+            assert pool.limiter.limit == expected
+
+    def test_pools_without_limiter_are_ignored(self):
+        fixed = MonitoredPool(POOL_API, _FakePool(), 1, 4)
+        assert AdaptivePoolController([fixed, _pool()]).pools[0].name == POOL_TRACKER
+
+
+class TestServicePools:
+    """Tracker and API experiment services do not share a pool"""
+
+    @pytest.mark.asyncio
+    async def test_tracker_service_on_tracker_pool(self, monkeypatch):
+        class FakeDb:
+            def get_pool(self, workload=POOL_API):
+                return workload
+
+        monkeypatch.delenv('REDIS_URL', raising=False)
+        monkeypatch.setattr(ServiceFactory, '_metrics', object())
+        monkeypatch.setattr(ServiceFactory, '_audit', None)
+        monkeypatch.setattr(ServiceFactory, '_service', None)
+
+        api = await ServiceFactory.create_experiment_service(FakeDb())
+        tracker = await ServiceFactory.create_tracker_experiment_service(FakeDb())
+
+        assert {api.experiment_repo.db, api.variant_repo.db, api.assignment_repo.db} == {POOL_API}
+        assert {tracker.experiment_repo.db, tracker.variant_repo.db, tracker.assignment_repo.db} == {POOL_TRACKER}
+        assert ServiceFactory._service is api
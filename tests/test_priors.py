@@ -0,0 +1,119 @@
+from contextlib import asynccontextmanager
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from config.settings import settings
+from orchestration.services.experiment_service import ExperimentService
+from orchestration.services.prior_fitting import fit_priors
+from orchestration.services.prior_service import PriorConfig, fit_history, initial_state
+
+
+def _history(rng, alpha, beta, groups=3, experiments=40, variants=3, visitors=5000):
+    """Variant counters of `experiments` per group, rates ~ Beta(alpha, beta)"""
+    n = groups * experiments * variants
+    group = np.repeat(np.arange(groups), experiments * variants)
+    experiment = np.repeat(np.arange(groups * experiments), variants)
+    allocations = np.full(n, visitors)
+    conversions = rng.binomial(allocations, rng.beta(alpha, beta, n))
+    return group, experiment, allocations, conversions
+
+
+class TestPriorFitting:
+    """Vectorized Beta hyperparameter estimation"""
+
+    @pytest.mark.parametrize('method', ['moments', 'marginal'])
+    def test_recovers_mean_and_strength(self, method):
+        rng = np.random.default_rng(3)
+        fitted = fit_priors(*_history(rng, 4.0, 96.0), method=method, max_strength=1000.0)
+
+        assert fitted.fitted.all()
+        np.testing.assert_allclose(fitted.mean, 0.04, rtol=0.15)
+        assert np.all((fitted.strength > 50) & (fitted.strength < 200))
+
+    def test_strength_is_capped_preserving_the_mean(self):
+        rng = np.random.default_rng(3)
+        history = _history(rng, 40.0, 960.0)
+        free = fit_priors(*history, max_strength=1e6)
+        capped = fit_priors(*history, max_strength=50.0)
+
+        np.testing.assert_allclose(capped.strength, 50.0)
+        np.testing.assert_allclose(capped.mean, free.mean, rtol=1e-6)
+
+    def test_groups_without_enough_history_stay_flat(self):
+        rng = np.random.default_rng(3)
+        group, experiment, allocations, conversions = _history(rng, 4.0, 96.0, groups=2)
+        # Group 1 keeps only 3 experiments
+        keep = (group == 0) | (experiment < 40 + 3)
+        fitted = fit_priors(group[keep], experiment[keep], allocations[keep], conversions[keep],
+                            min_experiments=5)
+
+        assert fitted.fitted.tolist() == [True, False]
+        assert fitted.experiments.tolist() == [40, 3]
+        assert (fitted.alpha[1], fitted.beta[1]) == (1.0, 1.0)
+
+    def test_history_rows_fit_per_element_type_and_account_wide(self):
+        rng = np.random.default_rng(5)
+        rows = [
+            {
+                'user_id': 'u1', 'element_type': element_type, 'experiment_id': f'{element_type}-{e}',
+                'allocations': 2000, 'conversions': int(rng.binomial(2000, rate)),
+            }
+            for element_type, rate in (('text', 0.02), ('button', 0.10))
+            for e in range(6)
+            for _ in range(2)
+        ]
+        priors = {p['element_type']: p for p in fit_history(rows, PriorConfig(min_experiments=5))}
+
+        assert set(priors) == {'text', 'button', '*'}
+        assert priors['*']['experiments'] == 12
+        mean = {k: p['alpha'] / (p['alpha'] + p['beta']) for k, p in priors.items()}
+        assert mean['text'] < mean['*'] < mean['button']
+
+
+class _FakeConn:
+    def __init__(self, row=None, error=None):
+        self.row = row
+        self.error = error
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def fetchrow(self, query, *args):
+        if self.error:
+            raise self.error
+        return self.row
+
+
+class TestPriorUsage:
+    """New variants start from the prior, selection adds live counters"""
+
+    @pytest.mark.asyncio
+    async def test_initial_state_uses_prior_and_falls_back_to_flat(self, monkeypatch):
+        monkeypatch.setattr(settings, 'EMPIRICAL_PRIORS_ENABLED', True)
+
+        state = await initial_state(_FakeConn({'alpha': 2.5, 'beta': 47.5, 'element_type': '*'}), 'e1', 'text')
+        assert (state['alpha'], state['beta'], state['prior']) == (2.5, 47.5, 'empirical')
+
+        state = await initial_state(_FakeConn(error=RuntimeError('no table')), 'e1', 'text')
+        assert (state['alpha'], state['beta'], state['prior']) == (1.0, 1.0, 'flat')
+
+        monkeypatch.setattr(settings, 'EMPIRICAL_PRIORS_ENABLED', False)
+        state = await initial_state(_FakeConn({'alpha': 2.5, 'beta': 47.5, 'element_type': '*'}), 'e1', 'text')
+        assert state['prior'] == 'flat'
+
+    @pytest.mark.asyncio
+    async def test_selection_combines_prior_with_counters(self):
+        service = ExperimentService(None, None, None, None)
+        prior = {'alpha': 2.0, 'beta': 48.0, 'samples': 0}
+        variants = [
+            {'id': 'a', 'algorithm_state': prior, 'total_allocations': 2000, 'total_conversions': 40},
+            {'id': 'b', 'algorithm_state': prior, 'total_allocations': 2000, 'total_conversions': 160},
+        ]
+
+        picks = Counter()
+        for _ in range(200):
+            picks[(await service._adaptive_selection(variants))['id']] += 1
+        assert picks['b'] > 190
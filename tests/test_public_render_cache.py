@@ -0,0 +1,46 @@
+import asyncio
+import pytest
+from orchestration.services.public_render_cache import PublicRenderCache
+
+
+class TestPublicRenderCache:
+    """Coalesced payload cache behind the public dashboard"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_viewers_share_one_fetch(self):
+        cache = PublicRenderCache(ttl=60)
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {'id': 'exp-1', 'variants': []}
+
+        entries = await asyncio.gather(*(cache.get('exp-1', fetch) for _ in range(50)))
+
+        assert calls == 1
+        assert len({id(e) for e in entries}) == 1
+
+        # Rendered once per version
+        renders = []
+        for _ in range(3):
+            cache.render(entries[0], 'html', lambda: renders.append(1) or b'<html>')
+        assert renders == [1]
+
+    @pytest.mark.asyncio
+    async def test_etag_survives_refresh_when_content_is_unchanged(self):
+        cache = PublicRenderCache(ttl=0)
+
+        async def fetch():
+            return {'id': 'exp-1', 'conversions': 7}
+
+        first = await cache.get('exp-1', fetch)
+        second = await cache.get('exp-1', fetch)
+
+        assert second.etag == first.etag
+        assert second.last_modified == first.last_modified
+        assert second.not_modified({'if-none-match': f'W/{first.etag}'})
+        assert second.not_modified({'if-modified-since': first.last_modified_http})
+        assert not second.not_modified({'if-none-match': '"other"'})
+        assert not second.not_modified({'if-none-match': first.etag}, second.variant_etag('html'))
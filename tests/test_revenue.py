@@ -0,0 +1,156 @@
+import math
+
+import numpy as np
+import pytest
+
+from engine.core.allocators._revenue import RevenueAllocator
+from orchestration.services.analytics_cache import AnalyticsCache
+from orchestration.services.analytics_service import AnalyticsService
+from orchestration.services.batch_analytics import RaggedCounts, analyze_counts
+
+
+def _valued_variant(i, visitors, conversions, order_value):
+    """Variant whose valued conversions all have the same order value"""
+    log_value = math.log(order_value)
+    return {
+        'id': f'v{i}', 'name': f'V{i}',
+        'total_allocations': visitors, 'total_conversions': conversions,
+        'valued_conversions': conversions,
+        'total_value': conversions * order_value,
+        'sum_log_value': conversions * log_value,
+        'sum_log_value_sq': conversions * log_value ** 2,
+    }
+
+
+class TestRevenuePosterior:
+    """Revenue per visitor from running value statistics"""
+
+    def test_revenue_objective_prefers_higher_order_value(self):
+        group = [_valued_variant(0, 2000, 100, 20.0), _valued_variant(1, 2000, 100, 35.0)]
+        counts = RaggedCounts.from_groups([group])
+
+        conversion = analyze_counts(counts, samples=20000, rng=np.random.default_rng(1))
+        revenue = analyze_counts(counts, samples=20000, rng=np.random.default_rng(1), objective='revenue')
+
+        # Same conversion rate: no winner on conversions, clear winner on revenue
+        assert 0.3 < conversion.prob_best[1] < 0.7
+        assert revenue.prob_best[1] > 0.99
+        assert revenue.average_order_value[1] == pytest.approx(35.0)
+        assert revenue.revenue_per_visitor[1] == pytest.approx(100 * 35.0 / 2000)
+
+    def test_conversions_without_value_bring_no_revenue(self):
+        # v1 converts more, but only 40 of its 150 conversions carried a value
+        untracked = {**_valued_variant(1, 2000, 40, 30.0), 'total_conversions': 150}
+        group = [_valued_variant(0, 2000, 100, 30.0), untracked]
+        counts = RaggedCounts.from_groups([group])
+
+        revenue = analyze_counts(counts, samples=20000, rng=np.random.default_rng(1), objective='revenue')
+
+        assert revenue.prob_best[0] > 0.99
+        assert revenue.average_order_value[1] == pytest.approx(30.0)
+        assert revenue.revenue_per_visitor[1] == pytest.approx(40 * 30.0 / 2000)
+
+    def test_unknown_objective_is_rejected(self):
+        counts = RaggedCounts.from_groups([[_valued_variant(0, 10, 1, 5.0)]])
+        with pytest.raises(ValueError):
+            analyze_counts(counts, samples=100, objective='margin')
+
+    @pytest.mark.asyncio
+    async def test_allocator_favours_higher_revenue_arm(self):
+        allocator = RevenueAllocator({'seed': 7})
+        options = [
+            {'id': v['id'], '_internal_state': {
+                'visitors': v['total_allocations'],
+                'conversions': v['total_conversions'],
+                'valued_conversions': v['valued_conversions'],
+                'sum_log_value': v['sum_log_value'],
+                'sum_log_value_sq': v['sum_log_value_sq'],
+            }}
+            for v in (_valued_variant(0, 1000, 60, 20.0), _valued_variant(1, 1000, 50, 40.0))
+        ]
+
+        picks = [await allocator.select(options, {}) for _ in range(200)]
+
+        assert picks.count('v1') > 180
+
+    @pytest.mark.asyncio
+    async def test_objective_has_its_own_cache_entry(self):
+        service = AnalyticsService(cache=AnalyticsCache())
+        variants = [_valued_variant(0, 2000, 100, 20.0), _valued_variant(1, 2000, 100, 35.0)]
+
+        by_rate = await service.analyze_experiment('exp-rev', variants)
+        by_revenue = await service.analyze_experiment('exp-rev', variants, objective='revenue')
+
+        assert by_rate['bayesian_analysis']['metric'] == 'conversion_rate'
+        assert by_revenue['bayesian_analysis']['metric'] == 'revenue_per_visitor'
+        assert by_revenue['variants'][1]['average_order_value'] == pytest.approx(35.0)
+
+
+class _AnalyticsConn:
+    async def fetchrow(self, query, *args):
+        return {'id': 'exp-rev', 'name': 'Checkout', 'status': 'active',
+                'optimization_strategy': 'revenue', 'created_at': None}
+
+    async def fetch(self, query, *args):
+        if 'experiment_elements WHERE' in query:
+            return [{'id': 'el-1', 'name': 'CTA', 'element_type': 'button'}]
+        # Lifetime statistics: 500 valued conversions at 20.0
+        return [dict(_valued_variant(0, 10000, 500, 20.0), element_id='el-1')]
+
+
+class _AnalyticsDb:
+    def __init__(self):
+        self.pool = self
+
+    def acquire(self):
+        return self
+
+    async def __aenter__(self):
+        return _AnalyticsConn()
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class TestPeriodAnalytics:
+    """Period-filtered analytics read value total and order-value shape from one window"""
+
+    @pytest.mark.asyncio
+    async def test_period_replaces_value_statistics(self, monkeypatch):
+        from public_api.routers import analytics
+
+        period = _valued_variant(0, 400, 20, 50.0)
+        analyzed = {}
+
+        class FakeRollups:
+            def __init__(self, pool):
+                pass
+
+            async def get_timeline(self, *args, **kwargs):
+                return []
+
+            async def get_variant_totals(self, experiment_id, period_name):
+                return {'v0': {
+                    'allocations': period['total_allocations'],
+                    'conversions': period['total_conversions'],
+                    'conversion_value': period['total_value'],
+                    'valued_conversions': period['valued_conversions'],
+                    'sum_log_value': period['sum_log_value'],
+                    'sum_log_value_sq': period['sum_log_value_sq'],
+                }}
+
+        class FakeService(AnalyticsService):
+            async def analyze_hierarchical_experiment(self, experiment_id, elements, **kwargs):
+                analyzed['variant'] = elements[0]['variants'][0]
+                raise RuntimeError('stop after capture')
+
+        monkeypatch.setattr(analytics, 'RollupRepository', FakeRollups)
+        monkeypatch.setattr(analytics, 'AnalyticsService', FakeService)
+
+        with pytest.raises(Exception):
+            await analytics.get_experiment_analytics('exp-rev', 'user-1', _AnalyticsDb(), period='7d')
+
+        variant = analyzed['variant']
+        for key in ('total_allocations', 'total_conversions', 'total_value',
+                    'valued_conversions', 'sum_log_value', 'sum_log_value_sq'):
+            assert variant[key] == pytest.approx(period[key])
@@ -0,0 +1,163 @@
+import asyncio
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from engine.core import _get_allocator
+from engine.core.allocators._registry import get_allocator
+from engine.core.allocators._segmented import OVERFLOW_SEGMENT, SegmentedAllocator
+from engine.core.math._segments import segment_of, shrinkage_strength
+from orchestration.services.segment_models import SegmentModelCache
+
+MOBILE = {'device': 'mobile', 'utm_source': 'google'}
+DESKTOP = {'device': 'desktop', 'utm_source': 'email'}
+
+
+def _opposite_segments():
+    """'a' wins on mobile, 'b' wins on desktop (stored counters)"""
+    return [
+        ('device=mobile|utm_source=google', 'a', 5000, 500),
+        ('device=mobile|utm_source=google', 'b', 5000, 100),
+        ('device=desktop|utm_source=email', 'a', 5000, 100),
+        ('device=desktop|utm_source=email', 'b', 5000, 500),
+    ]
+
+
+class TestSegmentMath:
+    """Segment keys and shrinkage strength"""
+
+    def test_segment_key_from_context(self):
+        assert segment_of({'segment_key': 'vip', 'device': 'mobile'}) == 'vip'
+        assert segment_of({'device': 'Mobile', 'utm_source': 'google'}) == 'device=mobile|utm_source=google'
+        assert segment_of({'segment_key': 'default', 'device': 'tablet'}) == 'device=tablet'
+        assert segment_of({}) == segment_of(None) == 'default'
+
+    def test_strength_is_large_when_segments_agree(self):
+        rng = np.random.default_rng(0)
+        n = np.full((20, 2), 2000)
+        alike = np.stack([n, rng.binomial(n, 0.05)], axis=-1)
+        apart = np.stack([n, rng.binomial(n, rng.uniform(0.01, 0.2, size=(20, 1)) * np.ones((1, 2)))], axis=-1)
+
+        assert (shrinkage_strength(alike, max_strength=1e4) > 1000).all()
+        assert (shrinkage_strength(apart, max_strength=1e4) < 100).all()
+
+
+class TestSegmentedAllocator:
+    """Per-segment choice, shrinkage for small segments, delta bookkeeping"""
+
+    @pytest.mark.asyncio
+    async def test_each_segment_gets_its_winner(self):
+        allocator = SegmentedAllocator({'seed': 1})
+        allocator.load(_opposite_segments())
+        options = [{'id': 'a'}, {'id': 'b'}]
+
+        mobile = Counter([await allocator.select(options, MOBILE) for _ in range(200)])
+        desktop = Counter([await allocator.select(options, DESKTOP) for _ in range(200)])
+        assert mobile['a'] > 190 and desktop['b'] > 190
+
+    @pytest.mark.asyncio
+    async def test_new_segment_follows_global_posterior(self):
+        allocator = SegmentedAllocator({'seed': 2, 'min_strength': 50})
+        allocator.load([('default', 'a', 20000, 2000), ('default', 'b', 20000, 1000)])
+        options = [{'id': 'a'}, {'id': 'b'}]
+
+        picks = Counter([await allocator.select(options, {'device': 'tv'}) for _ in range(200)])
+        assert picks['a'] > 170
+
+    def test_take_and_restore_delta(self):
+        allocator = SegmentedAllocator({})
+        allocator.load([('default', 'a', 10, 1)])
+        allocator.observe('a', MOBILE)
+        allocator.observe('a', MOBILE)
+        allocator.credit('a', MOBILE)
+        allocator.observe('b', {})
+
+        rows, delta = allocator.take_delta()
+        assert sorted(rows) == [('default', 'b', 1, 0), ('device=mobile|utm_source=google', 'a', 2, 1)]
+        assert allocator.take_delta()[0] == []
+
+        # Write failed: counts pending again, totals unchanged
+        before = allocator.counts.copy()
+        allocator.restore_delta(delta)
+        np.testing.assert_array_equal(allocator.counts, before)
+        assert sorted(allocator.take_delta()[0]) == sorted(rows)
+
+    def test_segments_beyond_cap_share_overflow(self):
+        allocator = SegmentedAllocator({'max_segments': 3})
+        for device in ('a', 'b', 'c', 'd'):
+            allocator.observe('x', {'device': device})
+
+        assert allocator.segments == [OVERFLOW_SEGMENT, 'device=a', 'device=b']
+        assert allocator.counts[0, 0, 0] == 2
+
+    def test_exposed_as_strategy(self):
+        assert isinstance(_get_allocator('segmented', {}), SegmentedAllocator)
+        assert isinstance(get_allocator('segmented', {'max_segments': 8}), SegmentedAllocator)
+
+
+class TestSegmentModelCache:
+    """One batched write for every experiment; reloads keep pending counts"""
+
+    @pytest.mark.asyncio
+    async def test_flush_batches_and_reload_keeps_delta(self):
+        cache = SegmentModelCache(refresh_seconds=0.0)
+        stored = {'exp-1': [('default', 'a', 10, 1)], 'exp-2': []}
+        loads = []
+
+        def loader(experiment_id):
+            async def load():
+                loads.append(experiment_id)
+                await asyncio.sleep(0)
+                return list(stored[experiment_id])
+            return load
+
+        models = await asyncio.gather(*[cache.get('exp-1', loader('exp-1')) for _ in range(5)])
+        assert loads == ['exp-1'] and all(m is models[0] for m in models)
+        other = await cache.get('exp-2', loader('exp-2'))
+
+        models[0].observe('a', MOBILE)
+        other.observe('b', DESKTOP)
+        writes = []
+
+        async def write(rows):
+            writes.append(list(rows))
+            return len(rows)
+
+        assert await cache.flush(write) == 2
+        assert len(writes) == 1
+        assert {row[0] for row in writes[0]} == {'exp-1', 'exp-2'}
+        assert await cache.flush(write) == 0
+
+        # Reload replaces the stored part only
+        models[0].observe('a', MOBILE)
+        stored['exp-1'] = [('default', 'a', 10, 1), ('device=mobile|utm_source=google', 'a', 1, 0)]
+        assert await cache.get('exp-1', loader('exp-1')) is models[0]
+        await asyncio.sleep(0.01)
+        assert models[0].counts.sum(axis=(0, 1))[0] == 12
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_increments(self):
+        cache = SegmentModelCache(max_experiments=1)
+
+        async def empty():
+            return []
+
+        first = await cache.get('exp-1', empty)
+        first.observe('a', MOBILE)
+        await cache.get('exp-2', empty)  # evicts exp-1
+
+        async def fail(rows):
+            raise ConnectionError("down")
+
+        with pytest.raises(ConnectionError):
+            await cache.flush(fail)
+
+        writes = []
+
+        async def write(rows):
+            writes.extend(rows)
+            return len(rows)
+
+        await cache.flush(write)
+        assert writes == [('exp-1', 'device=mobile|utm_source=google', 'a', 1, 0)]
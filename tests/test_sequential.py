@@ -0,0 +1,161 @@
+from contextlib import asynccontextmanager
+
+import numpy as np
+import pytest
+
+from engine.core.math._sequential import compare_to_control, expected_loss
+from orchestration.services.sequential_service import (
+    ArmSnapshot,
+    SequentialConfig,
+    SequentialEvaluator,
+    evaluate_element,
+)
+
+
+def _arms(*counts):
+    return [
+        ArmSnapshot(variant_id=f'v{i}', variant_order=i, is_active=True,
+                    allocations=n, conversions=c)
+        for i, (n, c) in enumerate(counts)
+    ]
+
+
+class TestSequentialStatistics:
+    """mSPRT p-values, confidence sequences and expected loss"""
+
+    def test_msprt_agrees_with_its_confidence_sequence(self):
+        null = compare_to_control(100, 2000, 102, 2000, tau2=1e-4, alpha=0.05)
+        assert null['p_value'] > 0.05
+        assert null['ci_lower'] < 0 < null['ci_upper']
+
+        lift = compare_to_control(100, 5000, 200, 5000, tau2=1e-4, alpha=0.05)
+        assert lift['p_value'] < 0.05
+        assert lift['ci_lower'] > 0
+
+    def test_expected_loss_favours_the_better_arm(self):
+        rng = np.random.default_rng(7)
+        losses = expected_loss(np.array([50, 80]), np.array([950, 920]), rng=rng)
+        assert losses[1] < losses[0]
+
+
+class TestSequentialDecisions:
+    """Pause / promote rules of the sequential evaluator"""
+
+    def test_pauses_clearly_worse_arm_and_keeps_control(self):
+        arms = _arms((5000, 250), (5000, 120), (5000, 255))
+        verdict = evaluate_element('el', arms, SequentialConfig(), rng=np.random.default_rng(1))
+
+        assert verdict.paused == {'v1'}
+        assert verdict.decisions[0].statistics['ci_upper'] < 0
+
+    def test_promotes_winner_once_loss_is_negligible(self):
+        arms = _arms((20000, 1000), (20000, 1400))
+        verdict = evaluate_element('el', arms, SequentialConfig(), rng=np.random.default_rng(1))
+
+        actions = {(d.variant_id, d.action) for d in verdict.decisions}
+        assert actions == {('v1', 'promote_variant'), ('v0', 'pause_variant')}
+        assert verdict.active_after == 1
+
+    def test_waits_below_min_samples_and_keeps_running_min(self):
+        arms = _arms((150, 5), (150, 30))
+        verdict = evaluate_element('el', arms, SequentialConfig(), rng=np.random.default_rng(1))
+        assert verdict.decisions == []
+
+        # The p-value only ever decreases across looks
+        first = arms[1].min_p_value
+        arms[1].conversions = 5
+        evaluate_element('el', arms, SequentialConfig(), rng=np.random.default_rng(1))
+        assert arms[1].min_p_value == first
+
+
+def _row(experiment_id, variant, allocations, conversions, last=None):
+    return {
+        'experiment_id': experiment_id, 'user_id': 'u1', 'confidence_threshold': 0.95,
+        'element_id': f'{experiment_id}-el', 'variant_id': variant, 'variant_order': int(variant[-1]),
+        'is_active': True, 'allocations': allocations, 'conversions': conversions,
+        'last_allocations': last[0] if last else None, 'last_conversions': last[1] if last else None,
+        'min_p_value': None, 'ci_lower': None, 'ci_upper': None,
+    }
+
+
+class _Conn:
+    def __init__(self):
+        self.open_transactions = 0
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.open_transactions += 1
+        yield
+        self.open_transactions -= 1
+
+
+class _FakeSequentialRepo:
+    """Per-experiment xact locks; `held` are locked by another worker"""
+
+    def __init__(self, rows, held=()):
+        self.rows = rows
+        self.held = set(held)
+        self.conn = _Conn()
+        self.locked, self.saved = [], []
+
+    @asynccontextmanager
+    async def connection(self):
+        yield self.conn
+
+    async def get_active_arms(self, conn):
+        return list(self.rows)
+
+    async def lock_experiment(self, conn, experiment_id):
+        assert conn.open_transactions == 1
+        self.locked.append(experiment_id)
+        return experiment_id not in self.held
+
+    async def get_experiment_arms(self, conn, experiment_id):
+        return [r for r in self.rows if r['experiment_id'] == experiment_id]
+
+    async def save_state(self, conn, experiment_id, states):
+        assert conn.open_transactions == 1
+        self.saved.append(experiment_id)
+
+    async def deactivate_variant(self, conn, variant_id):
+        return True
+
+    async def complete_experiment(self, conn, experiment_id):
+        return True
+
+
+class _Db:
+    def get_pool(self, workload):
+        return None
+
+
+class _Audit:
+    def __init__(self):
+        self.decisions = []
+
+    async def log_experiment_decision(self, experiment_id, action, *args, **kwargs):
+        self.decisions.append((experiment_id, action))
+
+
+class TestSequentialEvaluator:
+    """One transaction-scoped lock per experiment (safe behind a transaction pooler)"""
+
+    @pytest.mark.asyncio
+    async def test_locks_each_changed_experiment_in_its_transaction(self):
+        evaluator = SequentialEvaluator(_Db(), audit_service=_Audit())
+        evaluator.repo = _FakeSequentialRepo([
+            # Moved: evaluated and promoted
+            _row('exp-a', 'v0', 20000, 1000), _row('exp-a', 'v1', 20000, 1400),
+            # Moved, but another worker holds its lock
+            _row('exp-b', 'v0', 20000, 1000), _row('exp-b', 'v1', 20000, 1400),
+            # Unchanged since the last tick: not even locked
+            _row('exp-c', 'v0', 500, 10, last=(500, 10)), _row('exp-c', 'v1', 500, 12, last=(500, 12)),
+        ], held={'exp-b'})
+        evaluator._rng = np.random.default_rng(1)
+
+        applied = await evaluator.tick()
+
+        assert evaluator.repo.locked == ['exp-a', 'exp-b']
+        assert evaluator.repo.saved == ['exp-a']
+        assert {e for e, _ in evaluator.audit.decisions} == {'exp-a'}
+        assert applied == len(evaluator.audit.decisions) and evaluator.repo.conn.open_transactions == 0
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from engine.simulation import compare, simulate
+
+
+class TestSimulationHarness:
+    """Replications advance together as (R, arms) arrays"""
+
+    def test_uniform_regret_matches_expected_gap(self):
+        rates = [0.05, 0.10]
+        result = simulate(rates, 'uniform', visitors=4000, replications=50, seed=1)
+
+        # Half the traffic on the worse arm, 0.05 lost per such visitor
+        assert result.regret_mean[-1] == pytest.approx(4000 * 0.5 * 0.05, rel=0.05)
+        assert result.share_mean[-1] == pytest.approx([0.5, 0.5], abs=0.02)
+        assert result.selections.sum(axis=1).tolist() == [4000] * 50
+
+    @pytest.mark.parametrize('batch_size', [1, 250])
+    def test_adaptive_beats_uniform(self, batch_size):
+        results = compare(
+            ['adaptive', 'uniform'], [0.04, 0.06, 0.10],
+            seed=2, visitors=5000, replications=20, batch_size=batch_size
+        )
+
+        adaptive, baseline = results['adaptive'], results['uniform']
+        assert adaptive.regret_mean[-1] < baseline.regret_mean[-1] / 3
+        assert adaptive.summary()['best_arm_share'] > 0.7
+        # Trajectories: monotone regret, band around the mean
+        assert np.all(np.diff(adaptive.regret_mean) >= 0)
+        assert np.all(adaptive.regret_lower <= adaptive.regret_upper)
+        assert adaptive.share_mean[-1].sum() == pytest.approx(1.0)
+
+    def test_unknown_strategy_is_rejected(self):
+        with pytest.raises(ValueError):
+            simulate([0.1, 0.2], 'revenue', visitors=10, replications=1)
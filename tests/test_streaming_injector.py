@@ -0,0 +1,65 @@
+import gzip
+import pytest
+from integration.proxy.streaming_injector import (
+    StreamingTrackerInjector,
+    inject_tracker_stream
+)
+
+SNIPPET = '<script>tracker</script>'
+
+
+def _feed_all(chunks):
+    injector = StreamingTrackerInjector(SNIPPET)
+    out = b''.join(injector.feed(c) for c in chunks)
+    return out + injector.finish()
+
+
+async def _aiter(chunks):
+    for c in chunks:
+        yield c
+
+
+class TestStreamingInjector:
+    """Streaming tracker injection unit tests"""
+
+    def test_inject_before_head_split_across_chunks(self):
+        """Test </head> split between chunks is still found"""
+        html = b'<html><head><title>x</title></head><body>hi</body></html>'
+        split = html.index(b'</he') + 2
+        out = _feed_all([html[:split], html[split:]])
+
+        assert out == html.replace(b'</head>', SNIPPET.encode() + b'</head>')
+
+    def test_inject_after_body_with_attributes(self):
+        """Test injection after <body ...> when there is no </head>"""
+        html = b'<html><BODY class="a" data-x="1"><p>x</p></BODY></html>'
+        chunks = [html[i:i + 3] for i in range(0, len(html), 3)]
+        out = _feed_all(chunks)
+
+        tag = b'<BODY class="a" data-x="1">'
+        assert out == html.replace(tag, tag + SNIPPET.encode())
+
+    def test_injects_only_once(self):
+        """Test only the first match is used"""
+        html = b'<head></head><head></head>'
+        out = _feed_all([html])
+
+        assert out.count(SNIPPET.encode()) == 1
+
+    def test_no_markers_appends_at_end(self):
+        """Test fallback when no <head> or <body> exists"""
+        out = _feed_all([b'<div>plain</div>'])
+
+        assert out == b'<div>plain</div>' + SNIPPET.encode()
+
+    @pytest.mark.asyncio
+    async def test_gzip_stream_is_decoded(self):
+        """Test gzip-encoded upstream is decompressed in streaming"""
+        html = b'<html><head></head><body>' + b''.join(b'%d,' % i for i in range(20000)) + b'</body></html>'
+        compressed = gzip.compress(html)
+        chunks = [compressed[i:i + 1024] for i in range(0, len(compressed), 1024)]
+
+        parts = [p async for p in inject_tracker_stream(_aiter(chunks), SNIPPET, 'gzip')]
+
+        assert len(parts) > 1
+        assert b''.join(parts) == html.replace(b'</head>', SNIPPET.encode() + b'</head>')